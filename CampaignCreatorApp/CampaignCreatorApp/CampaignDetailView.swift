@@ -231,6 +231,7 @@ struct CampaignDetailView: View {
                 self.campaign.theme_background_image_opacity = refreshedCampaignData.themeBackgroundImageOpacity
                 self.campaign.mood_board_image_urls = refreshedCampaignData.moodBoardImageURLs
                 self.campaign.sections = refreshedCampaignData.sections.map { CampaignSection(id: $0.id, campaign_id: $0.campaign_id ?? 0, title: $0.title, content: $0.content, order: $0.order, type: $0.type) }
+                self.campaign.sections_version = refreshedCampaignData.version
             }
         } catch {
             errorMessage = "Failed to refresh campaign: \(error.localizedDescription)"
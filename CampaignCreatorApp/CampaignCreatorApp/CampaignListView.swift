@@ -132,15 +132,20 @@ struct CampaignListView: View {
         }
 
         do {
+            // The list endpoint returns campaign headers without sections, so campaigns are
+            // merged into the local store instead of being rebuilt; offline section copies survive.
             let fetchedCampaigns = try await apiService.fetchCampaigns()
+            let fetchedIDs = Set(fetchedCampaigns.map { $0.id })
+            var staleSectionModels: [Int: CampaignModel] = [:]
 
-            // Clear out existing campaigns to avoid duplicates
-            for campaign in campaigns {
+            // Remove campaigns that no longer exist on the server
+            for campaign in campaigns where !fetchedIDs.contains(campaign.id) && !campaign.needsSync {
                 modelContext.delete(campaign)
             }
 
             // Insert or update campaigns
             for campaign in fetchedCampaigns {
+                let campaignModel: CampaignModel
                 if let existingCampaign = campaigns.first(where: { $0.id == campaign.id }) {
                     existingCampaign.title = campaign.title
                     existingCampaign.concept = campaign.concept
@@ -158,11 +163,25 @@ struct CampaignListView: View {
                     existingCampaign.theme_background_image_url = campaign.themeBackgroundImageURL
                     existingCampaign.theme_background_image_opacity = campaign.themeBackgroundImageOpacity
                     existingCampaign.mood_board_image_urls = campaign.moodBoardImageURLs
-                    existingCampaign.sections = campaign.sections.map { CampaignSection(id: $0.id, campaign_id: $0.campaign_id ?? 0, title: $0.title, content: $0.content, order: $0.order, type: $0.type) }
+                    existingCampaign.display_toc = campaign.displayTOC?.map { TOCEntry(from: $0) }
+                    campaignModel = existingCampaign
                 } else {
-                    let campaignModel = CampaignModel.from(campaign: campaign)
+                    campaignModel = CampaignModel.from(campaign: campaign)
                     modelContext.insert(campaignModel)
                 }
+
+                // Sections only come with the single-campaign read; refetch them when the server's
+                // version differs from the one the local copy was fetched at
+                if campaignModel.sections_version == nil || campaignModel.sections_version != campaign.version {
+                    staleSectionModels[campaign.id] = campaignModel
+                }
+            }
+
+            let fullCampaigns = await fetchFullCampaigns(ids: Array(staleSectionModels.keys))
+            for (id, fullCampaign) in fullCampaigns {
+                guard let campaignModel = staleSectionModels[id] else { continue }
+                campaignModel.sections = fullCampaign.sections.map { CampaignSection(id: $0.id, campaign_id: $0.campaign_id ?? 0, title: $0.title, content: $0.content, order: $0.order, type: $0.type) }
+                campaignModel.sections_version = fullCampaign.version
             }
 
             try modelContext.save()
@@ -172,6 +191,38 @@ struct CampaignListView: View {
         }
     }
 
+    // Fetches full campaigns (with sections), a few requests at a time. Campaigns that fail to load are left out.
+    private func fetchFullCampaigns(ids: [Int]) async -> [Int: CampaignCreatorLib.Campaign] {
+        let maxConcurrentFetches = 4
+        var results: [Int: CampaignCreatorLib.Campaign] = [:]
+        await withTaskGroup(of: (Int, CampaignCreatorLib.Campaign?).self) { group in
+            var nextIndex = 0
+            func addNextFetch() {
+                guard nextIndex < ids.count else { return }
+                let id = ids[nextIndex]
+                nextIndex += 1
+                group.addTask { [apiService] in
+                    do {
+                        return (id, try await apiService.fetchCampaign(id: id))
+                    } catch {
+                        print("Failed to load sections for campaign \(id): \(error.localizedDescription)")
+                        return (id, nil)
+                    }
+                }
+            }
+            for _ in 0..<maxConcurrentFetches {
+                addNextFetch()
+            }
+            while let (id, campaign) = await group.next() {
+                if let campaign {
+                    results[id] = campaign
+                }
+                addNextFetch()
+            }
+        }
+        return results
+    }
+
     private func syncDirtyCampaigns() async {
         let dirtyCampaigns = campaigns.filter { $0.needsSync }
         for campaign in dirtyCampaigns {
@@ -26,6 +26,8 @@ final class CampaignModel: Identifiable {
     var linked_character_ids_string: String?
     var needsSync: Bool = false
     var display_toc: [TOCEntry]?
+    // Server campaign version the local `sections` were fetched at; nil until they have been fetched
+    var sections_version: Int?
 
     var mood_board_image_urls: [String]? {
         get {
@@ -114,6 +116,8 @@ final class CampaignModel: Identifiable {
         )
         model.mood_board_image_urls = campaign.moodBoardImageURLs
         model.linked_character_ids = campaign.linkedCharacterIDs
+        // Empty when built from the campaign list (/campaigns/), which omits sections; sections_version
+        // stays nil so the list refresh fetches them
         model.sections = campaign.sections.map { CampaignSection(id: $0.id, campaign_id: $0.campaign_id ?? 0, title: $0.title, content: $0.content, order: $0.order, type: $0.type) }
         return model
     }
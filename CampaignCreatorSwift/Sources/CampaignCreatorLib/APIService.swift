@@ -558,6 +558,7 @@ public final class APIService: ObservableObject, Sendable { // Added ObservableO
     }
 
     // MARK: - Campaign Methods
+    // Campaign headers only: `sections` is empty in the list response; fetchCampaign(id:) returns them
     public func fetchCampaigns() async throws -> [Campaign] {
         try await performRequest(endpoint: "/campaigns/")
     }
@@ -132,6 +132,7 @@ public struct Campaign: Identifiable, Codable, Sendable {
     public var fileURL: URL? // Keep if direct file association is needed for saving/loading whole campaign
     public var createdAt: Date? // Changed to optional
     public var modifiedAt: Date? // Changed to optional
+    public var version: Int? // Bumped by the server on every change to the campaign or its sections
 
     // Linking characters
     public var linkedCharacterIDs: [Int]? // CHANGED from [UUID]?
@@ -158,6 +159,7 @@ public struct Campaign: Identifiable, Codable, Sendable {
         case fileURL // Assuming fileURL is not snake_case from backend, if it is, map it.
         case createdAt = "created_at"
         case modifiedAt = "modified_at"
+        case version
         case linkedCharacterIDs = "linked_character_ids"
         case customSections = "custom_sections"
         // WordCount is a computed property, not decoded
@@ -171,7 +173,8 @@ public struct Campaign: Identifiable, Codable, Sendable {
         initialUserPrompt = try container.decodeIfPresent(String.self, forKey: .initialUserPrompt)
         concept = try container.decodeIfPresent(String.self, forKey: .concept)
         displayTOC = try container.decodeIfPresent([TOCEntry].self, forKey: .displayTOC)
-        sections = try container.decode([CampaignSection].self, forKey: .sections)
+        // The campaign list (/campaigns/) omits sections; they come with the single-campaign read
+        sections = try container.decodeIfPresent([CampaignSection].self, forKey: .sections) ?? []
 
         print("[Campaign Decodable] --- Aggressive Debug for badgeImageURL ---")
         print("[Campaign Decodable] Checking for key .badgeImageURL using string value '\(CodingKeys.badgeImageURL.stringValue)': \(container.contains(.badgeImageURL))")
@@ -244,6 +247,7 @@ public struct Campaign: Identifiable, Codable, Sendable {
         fileURL = try container.decodeIfPresent(URL.self, forKey: .fileURL) // URL might need special handling if it's just a string in JSON
         createdAt = try container.decodeIfPresent(Date.self, forKey: .createdAt)
         modifiedAt = try container.decodeIfPresent(Date.self, forKey: .modifiedAt)
+        version = try container.decodeIfPresent(Int.self, forKey: .version)
 
         linkedCharacterIDs = try container.decodeIfPresent([Int].self, forKey: .linkedCharacterIDs)
         customSections = try container.decodeIfPresent([CampaignCustomSection].self, forKey: .customSections)
@@ -281,6 +285,7 @@ public struct Campaign: Identifiable, Codable, Sendable {
         try container.encodeIfPresent(fileURL, forKey: .fileURL)
         try container.encodeIfPresent(createdAt, forKey: .createdAt)
         try container.encodeIfPresent(modifiedAt, forKey: .modifiedAt)
+        try container.encodeIfPresent(version, forKey: .version)
 
         try container.encodeIfPresent(linkedCharacterIDs, forKey: .linkedCharacterIDs)
         try container.encodeIfPresent(customSections, forKey: .customSections)
@@ -0,0 +1,29 @@
+"""add_campaign_owner_keyset_index
+
+Revision ID: a7c41e9b2d30
+Revises: 737cb3ada9c6
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c41e9b2d30'
+down_revision: Union[str, None] = '737cb3ada9c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Supports owner-scoped, id-ordered campaign listing (keyset pagination)
+    op.create_index('ix_campaigns_owner_id_id', 'campaigns', ['owner_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_campaigns_owner_id_id', table_name='campaigns')
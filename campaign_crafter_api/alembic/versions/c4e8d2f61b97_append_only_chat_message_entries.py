@@ -0,0 +1,116 @@
+"""append_only_chat_message_entries
+
+Revision ID: c4e8d2f61b97
+Revises: a7c41e9b2d30
+Create Date: 2026-10-17 10:03:27.551962
+
+"""
+import json
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8d2f61b97'
+down_revision: Union[str, None] = 'a7c41e9b2d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _load_history(raw):
+    # JSON columns come back as lists on most drivers, but as text on some SQLite setups
+    if raw is None:
+        return []
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return []
+    return raw if isinstance(raw, list) else []
+
+
+def _parse_timestamp(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return datetime.utcnow()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chat_message_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('conversation_id', sa.Integer(), nullable=False),
+    sa.Column('speaker', sa.String(), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['conversation_id'], ['chat_messages.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_chat_message_entries_conversation_id_id', 'chat_message_entries', ['conversation_id', 'id'], unique=False)
+    op.add_column('chat_messages', sa.Column('message_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Copy every JSON history into one row per message, preserving order
+    conn = op.get_bind()
+    entries_table = sa.table('chat_message_entries',
+        sa.column('conversation_id', sa.Integer),
+        sa.column('speaker', sa.String),
+        sa.column('text', sa.Text),
+        sa.column('timestamp', sa.DateTime(timezone=True)),
+    )
+    conversations = conn.execute(sa.text("SELECT id, conversation_history FROM chat_messages")).fetchall()
+    for conversation_id, raw_history in conversations:
+        rows = [
+            {
+                "conversation_id": conversation_id,
+                "speaker": msg.get("speaker") or "user",
+                "text": msg.get("text") or "",
+                "timestamp": _parse_timestamp(msg.get("timestamp")),
+            }
+            for msg in _load_history(raw_history) if isinstance(msg, dict)
+        ]
+        if rows:
+            conn.execute(entries_table.insert(), rows)
+        conn.execute(
+            sa.text("UPDATE chat_messages SET message_count = :count WHERE id = :id"),
+            {"count": len(rows), "id": conversation_id}
+        )
+
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.drop_column('conversation_history')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('conversation_history', sa.JSON(), server_default='[]', nullable=False))
+
+    # Fold the per-message rows back into the JSON history
+    conn = op.get_bind()
+    histories = {}
+    entries = conn.execute(sa.text(
+        "SELECT conversation_id, speaker, text, timestamp FROM chat_message_entries ORDER BY conversation_id, id"
+    )).fetchall()
+    for conversation_id, speaker, text, timestamp in entries:
+        histories.setdefault(conversation_id, []).append({
+            "speaker": speaker,
+            "text": text,
+            "timestamp": timestamp.isoformat() if isinstance(timestamp, datetime) else str(timestamp),
+        })
+    for conversation_id, history in histories.items():
+        conn.execute(
+            sa.text("UPDATE chat_messages SET conversation_history = :history WHERE id = :id"),
+            {"history": json.dumps(history), "id": conversation_id}
+        )
+
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.drop_column('message_count')
+    op.drop_index('ix_chat_message_entries_conversation_id_id', table_name='chat_message_entries')
+    op.drop_table('chat_message_entries')
@@ -0,0 +1,34 @@
+"""add_cache_versions_table
+
+Revision ID: e5b19a7c3d42
+Revises: c4e8d2f61b97
+Create Date: 2026-10-17 14:05:11.402817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b19a7c3d42'
+down_revision: Union[str, None] = 'c4e8d2f61b97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Shared version stamps that let every worker detect changes to cached catalogs
+    op.create_table(
+        'cache_versions',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('cache_versions')
@@ -0,0 +1,33 @@
+"""add_campaign_version
+
+Revision ID: f7a3c9d21b58
+Revises: e5b19a7c3d42
+Create Date: 2026-10-17 16:42:37.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a3c9d21b58'
+down_revision: Union[str, None] = 'e5b19a7c3d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Change counter and timestamp behind the ETag / Last-Modified of the campaign read endpoints
+    with op.batch_alter_table('campaigns') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('campaigns') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('version')
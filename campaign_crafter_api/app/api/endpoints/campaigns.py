@@ -1,22 +1,24 @@
-from typing import Optional, List, Dict, Annotated
+from typing import Any, AsyncIterator, Callable, Optional, List, Dict, Annotated
 import re
 import json
 import asyncio
 import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app import external_models, crud, orm_models, models # Standardized
-from app.db import get_db # Standardized
+from app.db import AsyncDB, get_async_db, get_db # Standardized
 from app.core.config import settings # For default LLM settings
 from app.services.image_generation_service import ImageGenerationService
 from app.services.auth_service import get_current_active_user # Standardized
 from sse_starlette.sse import EventSourceResponse
-from app.services.llm_service import LLMServiceUnavailableError, LLMGenerationError # Standardized
-from app.services.llm_factory import get_llm_service # Standardized
+from app.services.llm_service import AbstractLLMService, LLMServiceUnavailableError, LLMGenerationError # Standardized
+from app.services.llm_factory import get_llm_service, get_provider_semaphore # Standardized
 from app.services.export_service import HomebreweryExportService # Standardized
 from app.external_models.export_models import PrepareHomebreweryPostResponse # Standardized
 
@@ -38,6 +40,40 @@ def _extract_provider_and_model(model_id_with_prefix: Optional[str]) -> tuple[Op
         return None, model_id_with_prefix 
     return None, None
 
+# Ordered by specificity (more specific first); used to infer a section type from its title
+# when the TOC entry does not carry a useful one.
+SEED_SECTION_TYPES = [
+    "monster", "character", "npc", "location", "item", "quest", "chapter", "note", "world_detail", "generic"
+]
+
+def _infer_seed_section_type(title: str, type_from_toc: str) -> str:
+    """Refines a generic TOC type by looking for a known section type in the title."""
+    if type_from_toc.lower() in ["unknown", "generic", "other", ""]:
+        title_lower = title.lower()
+        for potential_type in SEED_SECTION_TYPES:
+            # Use \b for whole word matching
+            if re.search(r"\b" + re.escape(potential_type) + r"\b", title_lower):
+                return potential_type # Found the first, most specific match
+    return type_from_toc
+
+def _build_seed_section_prompt(title: str, section_type_for_llm: str) -> str:
+    """Builds the per-type prompt used when auto-populating a section seeded from the TOC."""
+    if section_type_for_llm == "character" or section_type_for_llm == "npc": # Combined NPC and Character
+        return f"Generate a detailed description for a character named '{title}'. Include their appearance, personality, motivations, and potential plot hooks related to them."
+    elif section_type_for_llm == "location":
+        return f"Describe the location '{title}'. Include its key features, atmosphere, inhabitants (if any), and any notable points of interest or secrets."
+    elif section_type_for_llm == "monster":
+        return f"Generate a detailed description for a monster named '{title}'. Include its appearance, abilities, lair, and potential combat tactics."
+    elif section_type_for_llm == "item":
+        return f"Describe the magical item '{title}'. Include its appearance, powers, history, and how it can be obtained or used."
+    elif section_type_for_llm == "quest":
+        return f"Outline the quest '{title}'. Include the objectives, key NPCs involved, steps to complete it, and potential rewards or consequences."
+    elif section_type_for_llm == "chapter":
+        return f"Outline the main events and encounters for the chapter titled '{title}'. Provide a brief overview of the objectives, challenges, and potential rewards."
+    # Note: "note", "world_detail" will fall into the else "generic" category for now, which is acceptable.
+    # Generic or other specific types from TOC not explicitly handled above
+    return f"Generate content for a section titled '{title}' of type '{section_type_for_llm}' as part of a larger campaign document."
+
 # --- Campaign Endpoints ---
 
 @router.post("/", response_model=models.Campaign)
@@ -71,29 +107,95 @@ async def create_new_campaign(
         raise HTTPException(status_code=500, detail=f"Failed to create campaign due to an external service or unexpected error: {str(e)}")
     return db_campaign
 
-@router.get("/", response_model=List[models.Campaign])
+# Response header carrying the `after_id` value for the next page of a listing
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def _set_next_cursor(response: Response, page: list, limit: Optional[int]) -> None:
+    # A full page means there may be more rows after the last id
+    if limit is not None and len(page) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(page[-1].id)
+
+# --- Conditional GET for campaign reads ---
+# Campaign.version changes on every write to the campaign, its sections, TOCs or character links
+# (crud.touch_campaign), so it validates everything these endpoints return.
+
+def _campaign_cache_headers(campaign_id: int, version: int, updated_at: Optional[datetime]) -> Dict[str, str]:
+    headers = {
+        "ETag": f'W/"campaign-{campaign_id}-v{version}"',
+        "Cache-Control": "private, no-cache", # Clients may keep a copy but must revalidate
+    }
+    if updated_at is not None:
+        if updated_at.tzinfo is None: # SQLite returns naive datetimes; they are stored as UTC
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(updated_at.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+def _is_not_modified(request: Request, cache_headers: Dict[str, str]) -> bool:
+    """True if the request's If-None-Match (or, without it, If-Modified-Since) still matches."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, as for GET/HEAD
+        current = cache_headers["ETag"].removeprefix("W/")
+        return any(tag.strip() == "*" or tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and "Last-Modified" in cache_headers:
+        try:
+            return parsedate_to_datetime(cache_headers["Last-Modified"]) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def _check_campaign_validators(validators: Optional[tuple], current_user: models.User, forbidden_detail: str) -> tuple:
+    """Raises 404/403 for a missing or foreign campaign; returns (version, updated_at)."""
+    if validators is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    owner_id, version, updated_at = validators
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail=forbidden_detail)
+    return version, updated_at
+
+@router.get("/", response_model=List[models.CampaignHeader])
 async def list_campaigns(
-    db: Annotated[Session, Depends(get_db)],
-    current_user: Annotated[models.User, Depends(get_current_active_user)]
-    # TODO: Modify crud.get_all_campaigns to filter by current_user.id
+    response: Response,
+    db: Annotated[AsyncDB, Depends(get_async_db)],
+    current_user: Annotated[models.User, Depends(get_current_active_user)],
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size. Omit to return all of the user's campaigns."),
+    after_id: Optional[int] = Query(None, ge=0, description="Return campaigns with an id greater than this (value of the X-Next-Cursor header).")
+):
+    campaigns = await crud.get_campaigns_by_owner_async(db, owner_id=current_user.id, limit=limit, after_id=after_id)
+    _set_next_cursor(response, campaigns, limit)
+    return campaigns
+
+@router.get("/summaries", response_model=List[models.CampaignSummary])
+async def list_campaign_summaries(
+    response: Response,
+    db: Annotated[AsyncDB, Depends(get_async_db)],
+    current_user: Annotated[models.User, Depends(get_current_active_user)],
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size. Omit to return all of the user's campaigns."),
+    after_id: Optional[int] = Query(None, ge=0, description="Return campaigns with an id greater than this (value of the X-Next-Cursor header).")
 ):
-    campaigns = crud.get_all_campaigns(db=db) # This currently gets ALL campaigns
-    # Filter campaigns for the current user (temporary fix until CRUD is updated)
-    user_campaigns = [c for c in campaigns if c.owner_id == current_user.id]
-    return user_campaigns
+    """Lightweight listing of the user's campaigns without concept, export, TOC or section data."""
+    summaries = await crud.get_campaign_summaries_by_owner_async(db, owner_id=current_user.id, limit=limit, after_id=after_id)
+    _set_next_cursor(response, summaries, limit)
+    return summaries
 
-@router.get("/{campaign_id}", response_model=models.Campaign)
+@router.get("/{campaign_id}", response_model=models.Campaign, responses={304: {"description": "Not modified (If-None-Match / If-Modified-Since)"}})
 async def read_campaign(
     campaign_id: int, 
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncDB, Depends(get_async_db)],
     current_user: Annotated[models.User, Depends(get_current_active_user)]
 ):
-    logger.debug(f"Attempting to generate concept for campaign_id: {campaign_id}") # DEBUG PRINT
-    db_campaign = crud.get_campaign(db=db, campaign_id=campaign_id)
+    validators = await crud.get_campaign_validators_async(db, campaign_id=campaign_id)
+    cache_headers = _campaign_cache_headers(campaign_id, *_check_campaign_validators(validators, current_user, "Not authorized to access this campaign"))
+    if _is_not_modified(request, cache_headers):
+        return Response(status_code=304, headers=cache_headers)
+
+    db_campaign = await crud.get_campaign_async(db, campaign_id=campaign_id)
     if db_campaign is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    if db_campaign.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to access this campaign")
+    response.headers.update(cache_headers)
     return db_campaign
 
 @router.put("/{campaign_id}", response_model=models.Campaign)
@@ -463,7 +565,8 @@ async def seed_sections_from_toc_endpoint(
     campaign_id: int,
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[models.User, Depends(get_current_active_user)],
-    auto_populate: bool = False
+    auto_populate: bool = False,
+    max_concurrency: Optional[int] = Query(None, ge=1, le=16, description="Max sections generated in parallel. Defaults to settings.SECTION_SEED_CONCURRENCY.")
 ):
     db_campaign = crud.get_campaign(db=db, campaign_id=campaign_id)
     if db_campaign is None:
@@ -535,6 +638,42 @@ async def seed_sections_from_toc_endpoint(
         logger.debug(f"Auto-population requested but campaign.concept is not set. Skipping LLM generation.")
 
 
+    # Bounded parallelism for auto-population: a per-request limit (query param or setting)
+    # and a process-wide per-provider limit shared with other requests.
+    request_concurrency = max(1, max_concurrency or settings.SECTION_SEED_CONCURRENCY)
+    request_semaphore = asyncio.Semaphore(request_concurrency)
+    seed_provider_name, _ = _extract_provider_and_model(llm_model_to_use)
+    _, model_specific_id_for_call = _extract_provider_and_model(db_campaign.selected_llm_id)
+
+    async def _generate_seed_section_content(index: int, title: str, section_type_for_llm: str):
+        """Generates content for one TOC entry. Returns (index, content, error_message) and never raises."""
+        prompt = _build_seed_section_prompt(title, section_type_for_llm)
+        async with request_semaphore:
+            async with get_provider_semaphore(seed_provider_name):
+                try:
+                    logger.debug(f"Attempting LLM generation for section: '{title}' (Type for LLM: {section_type_for_llm})")
+                    generated_llm_content = await llm_service_instance.generate_section_content(
+                        db_campaign=db_campaign,
+                        db=db,
+                        current_user=current_user,
+                        existing_sections_summary=None,
+                        section_creation_prompt=prompt,
+                        section_title_suggestion=title,
+                        section_type=section_type_for_llm,
+                        model=model_specific_id_for_call
+                    )
+                except Exception as e_llm:
+                    logger.warning(f"LLM generation failed for section '{title}': {type(e_llm).__name__} - {e_llm}. Using placeholder.")
+                    return index, None, f"Auto-population for section '{title}' failed: {type(e_llm).__name__} - {e_llm}. Check LLM provider configuration. Using placeholder content."
+        if not generated_llm_content:
+            logger.warning(f"LLM generated empty content for section '{title}'. Using placeholder.")
+            return index, None, f"Auto-population for section '{title}' failed: LLM returned empty content. Check configuration. Using placeholder content."
+        logger.debug(f"LLM content generated for '{title}' (excerpt): {generated_llm_content[:50]}...")
+        return index, generated_llm_content, None
+
+    async def _placeholder_seed_section(index: int):
+        return index, None, None
+
     async def event_generator():
         total_sections = len(parsed_toc_entries) # Use parsed_toc_entries
         if total_sections == 0:
@@ -555,122 +694,77 @@ async def seed_sections_from_toc_endpoint(
                 logger.error(f"Error yielding initial auto-population error event: {type(e_yield_error).__name__} - {e_yield_error}")
                 # If we can't even yield this error, not much else to do for SSE for this request
 
-        for order, toc_item in enumerate(parsed_toc_entries): # Iterate over toc_item
-            title = toc_item["title"]
-            type_from_toc = toc_item["type"]
-            section_content_for_crud = f"Content for '{title}' to be generated."
-            section_type_for_llm = type_from_toc # Base type for LLM
-
-            # Define AVAILABLE_SECTION_TYPES - ordered by specificity (more specific first)
-            AVAILABLE_SECTION_TYPES = [
-                "monster", "character", "npc", "location", "item", "quest", "chapter", "note", "world_detail", "generic"
-            ] # "npc" is included as it was in previous logic, "generic" as a fallback
-
-            if type_from_toc.lower() in ["unknown", "generic", "other", ""]:
-                title_lower = title.lower()
-                for potential_type in AVAILABLE_SECTION_TYPES:
-                    # Use \b for whole word matching
-                    if re.search(r"\b" + re.escape(potential_type) + r"\b", title_lower):
-                        section_type_for_llm = potential_type
-                        break # Found the first, most specific match
-
-            if auto_populate and llm_service_instance and db_campaign.concept:
-                # Construct prompt based on refined section_type_for_llm
-                prompt = ""
-                if section_type_for_llm == "character" or section_type_for_llm == "npc": # Combined NPC and Character
-                    prompt = f"Generate a detailed description for a character named '{title}'. Include their appearance, personality, motivations, and potential plot hooks related to them."
-                elif section_type_for_llm == "location":
-                    prompt = f"Describe the location '{title}'. Include its key features, atmosphere, inhabitants (if any), and any notable points of interest or secrets."
-                elif section_type_for_llm == "monster":
-                    prompt = f"Generate a detailed description for a monster named '{title}'. Include its appearance, abilities, lair, and potential combat tactics."
-                elif section_type_for_llm == "item":
-                    prompt = f"Describe the magical item '{title}'. Include its appearance, powers, history, and how it can be obtained or used."
-                elif section_type_for_llm == "quest":
-                    prompt = f"Outline the quest '{title}'. Include the objectives, key NPCs involved, steps to complete it, and potential rewards or consequences."
-                elif section_type_for_llm == "chapter":
-                    prompt = f"Outline the main events and encounters for the chapter titled '{title}'. Provide a brief overview of the objectives, challenges, and potential rewards."
-                # Note: "note", "world_detail" will fall into the else "generic" category for now, which is acceptable.
-                else: # Generic or other specific types from TOC not explicitly handled above
-                    prompt = f"Generate content for a section titled '{title}' of type '{section_type_for_llm}' as part of a larger campaign document."
+        use_llm = bool(auto_populate and llm_service_instance and db_campaign.concept)
 
-                try:
-                    logger.debug(f"Attempting LLM generation for section: '{title}' (Type for LLM: {section_type_for_llm})")
-                    _, model_specific_id_for_call = _extract_provider_and_model(db_campaign.selected_llm_id)
-                    generated_llm_content = await llm_service_instance.generate_section_content(
-                        db_campaign=db_campaign,
-                        db=db,
-                        current_user=current_user,
-                        existing_sections_summary=None,
-                        section_creation_prompt=prompt,
-                        section_title_suggestion=title,
-                        section_type=section_type_for_llm,
-                        model=model_specific_id_for_call
-                    )
-                    if generated_llm_content:
-                        section_content_for_crud = generated_llm_content
-                        logger.debug(f"LLM content generated for '{title}' (excerpt): {section_content_for_crud[:50]}...")
-                    else:
-                        logger.warning(f"LLM generated empty content for section '{title}'. Using placeholder.")
-                        error_payload = {
-                            "event_type": "error",
-                            "message": f"Auto-population for section '{title}' failed: LLM returned empty content. Check configuration. Using placeholder content."
-                        }
-                        try:
-                            yield f"data: {json.dumps(error_payload)}\n\n"
-                            await asyncio.sleep(0.01)
-                        except Exception as e_yield_error:
-                            logger.error(f"Error yielding empty content error event for '{title}': {type(e_yield_error).__name__} - {e_yield_error}")
-                except Exception as e_llm:
-                    logger.warning(f"LLM generation failed for section '{title}': {type(e_llm).__name__} - {e_llm}. Using placeholder.")
-                    error_payload = {
-                        "event_type": "error",
-                        "message": f"Auto-population for section '{title}' failed: {type(e_llm).__name__} - {e_llm}. Check LLM provider configuration. Using placeholder content."
-                    }
+        # Generation runs concurrently; DB writes and SSE events happen here, one at a time,
+        # in completion order. Each section keeps its TOC index as its 'order'.
+        tasks = []
+        for order, toc_item in enumerate(parsed_toc_entries):
+            if use_llm:
+                section_type_for_llm = _infer_seed_section_type(toc_item["title"], toc_item["type"])
+                tasks.append(asyncio.ensure_future(_generate_seed_section_content(order, toc_item["title"], section_type_for_llm)))
+            else:
+                tasks.append(asyncio.ensure_future(_placeholder_seed_section(order)))
+
+        processed_count = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                order, generated_content, error_message = await next_done
+                title = parsed_toc_entries[order]["title"]
+                type_from_toc = parsed_toc_entries[order]["type"]
+
+                if error_message:
                     try:
-                        yield f"data: {json.dumps(error_payload)}\n\n"
+                        yield f"data: {json.dumps({'event_type': 'error', 'message': error_message})}\n\n"
                         await asyncio.sleep(0.01)
                     except Exception as e_yield_error:
-                        logger.error(f"Error yielding LLM exception error event for '{title}': {type(e_yield_error).__name__} - {e_yield_error}")
+                        logger.error(f"Error yielding LLM error event for '{title}': {type(e_yield_error).__name__} - {e_yield_error}")
 
-            # Create section in DB, passing the original type from TOC
-            created_section_orm = crud.create_section_with_placeholder_content(
-                db=db,
-                campaign_id=campaign_id,
-                title=title,
-                order=order,
-                placeholder_content=section_content_for_crud,
-                type=type_from_toc
-            )
-            pydantic_section = models.CampaignSection.from_orm(created_section_orm)
-
-            current_progress = round(((order + 1) / total_sections) * 100, 2)
-            event_payload = {
-                "event_type": "section_update",
-                "progress_percent": current_progress,
-                "current_section_title": title,
-                "section_data": pydantic_section.model_dump()
-            }
+                # Create section in DB, passing the original type from TOC
+                created_section_orm = crud.create_section_with_placeholder_content(
+                    db=db,
+                    campaign_id=campaign_id,
+                    title=title,
+                    order=order,
+                    placeholder_content=generated_content or f"Content for '{title}' to be generated.",
+                    type=type_from_toc
+                )
+                pydantic_section = models.CampaignSection.from_orm(created_section_orm)
+                processed_count += 1
+
+                current_progress = round((processed_count / total_sections) * 100, 2)
+                event_payload = {
+                    "event_type": "section_update",
+                    "progress_percent": current_progress,
+                    "current_section_title": title,
+                    "section_data": pydantic_section.model_dump()
+                }
 
-            try:
-                yield f"data: {json.dumps(event_payload)}\n\n"
-                await asyncio.sleep(0.01)
-            except Exception as e_yield:
-                logger.error(f"Error yielding SSE event for section '{title}': {type(e_yield).__name__} - {e_yield}. Stopping.")
-                # Optionally, send one last error event to the client if possible
-                error_event = {"event_type": "error", "message": f"Failed to stream update for section '{title}'. Process halted."}
                 try:
-                    yield f"data: {json.dumps(error_event)}\n\n"
-                except:
-                    pass # If this also fails, nothing more can be done here
-                break # Stop processing further sections
+                    yield f"data: {json.dumps(event_payload)}\n\n"
+                    await asyncio.sleep(0.01)
+                except Exception as e_yield:
+                    logger.error(f"Error yielding SSE event for section '{title}': {type(e_yield).__name__} - {e_yield}. Stopping.")
+                    # Optionally, send one last error event to the client if possible
+                    error_event = {"event_type": "error", "message": f"Failed to stream update for section '{title}'. Process halted."}
+                    try:
+                        yield f"data: {json.dumps(error_event)}\n\n"
+                    except:
+                        pass # If this also fails, nothing more can be done here
+                    break # Stop processing further sections
+        finally:
+            # Client disconnects (or a halted stream) must not leave generation calls running.
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
 
         # After the loop completes (or if broken by yield error)
         # This completion event might not be sent if the client disconnects due to the break.
         completion_message = "Section seeding process finished."
-        if order + 1 < total_sections : # if loop was broken early
-             completion_message = f"Section seeding process interrupted after processing {order + 1} of {total_sections} sections."
+        if processed_count < total_sections: # if loop was broken early
+             completion_message = f"Section seeding process interrupted after processing {processed_count} of {total_sections} sections."
 
-        completion_event = {"event_type": "complete", "message": completion_message, "total_sections_processed": order +1}
+        completion_event = {"event_type": "complete", "message": completion_message, "total_sections_processed": processed_count}
         try:
             yield f"data: {json.dumps(completion_event)}\n\n"
         except Exception as e_complete:
@@ -703,9 +797,8 @@ async def update_section_order_endpoint(
     if db_campaign.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized for this campaign")
 
-    # Fetch all sections for the campaign to ensure all IDs are valid and belong to this campaign
-    existing_sections = crud.get_campaign_sections(db=db, campaign_id=campaign_id, limit=None) # Get all
-    existing_section_ids = {section.id for section in existing_sections}
+    # Fetch the ids of all sections (not their content) to ensure all IDs are valid and belong to this campaign
+    existing_section_ids = {section_id for section_id, _ in crud.get_campaign_section_order(db=db, campaign_id=campaign_id)}
 
     if len(order_update.section_ids) != len(existing_section_ids):
         raise HTTPException(status_code=400, detail="The number of section IDs provided does not match the number of sections in the campaign.")
@@ -722,14 +815,48 @@ async def update_section_order_endpoint(
         logger.error(f"Error updating section order for campaign {campaign_id}: {e}")
         raise HTTPException(status_code=500, detail="An error occurred while updating section order.")
 
+# Pydantic model for the request body of moving a single section
+class SectionMove(BaseModel):
+    position: int = Field(..., ge=0, description="New 0-based position; positions past the end move the section last.")
 
-@router.post("/{campaign_id}/sections", response_model=models.CampaignSection, tags=["Campaign Sections"])
-async def create_new_campaign_section_endpoint(
+@router.put("/{campaign_id}/sections/{section_id}/position", response_model=SectionOrderUpdate, tags=["Campaign Sections"])
+async def move_section_endpoint(
     campaign_id: int,
-    section_input: models.CampaignSectionCreateInput,
-    db: Annotated[Session, Depends(get_db)],
+    section_id: int,
+    move: SectionMove,
+    db: Annotated[AsyncDB, Depends(get_async_db)],
     current_user: Annotated[models.User, Depends(get_current_active_user)]
 ):
+    """
+    Moves one section to a new position within its campaign. Only the sections between its old
+    and new position are renumbered. Returns the campaign's section ids in their new order.
+    """
+    owner_id = await crud.get_campaign_owner_id_async(db, campaign_id=campaign_id)
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized for this campaign")
+
+    try:
+        section_ids = await crud.move_campaign_section_async(db, campaign_id=campaign_id, section_id=section_id, new_position=move.position)
+    except Exception as e:
+        logger.error(f"Error moving section {section_id} in campaign {campaign_id}: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while moving the section.")
+    if section_ids is None:
+        raise HTTPException(status_code=404, detail="Section not found in this campaign")
+    return SectionOrderUpdate(section_ids=section_ids)
+
+
+def _prepare_section_generation(
+    campaign_id: int,
+    section_input: models.CampaignSectionCreateInput,
+    db: Session,
+    current_user: models.User
+) -> tuple[AbstractLLMService, Dict[str, Any]]:
+    """
+    Validates a section creation request and resolves its LLM service.
+    Returns the service and the keyword arguments for generate_section_content / stream_section_content.
+    """
     db_campaign = crud.get_campaign(db=db, campaign_id=campaign_id)
     if db_campaign is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
@@ -741,8 +868,6 @@ async def create_new_campaign_section_endpoint(
     existing_sections = crud.get_campaign_sections(db=db, campaign_id=campaign_id)
     existing_sections_summary = "; ".join([s.title for s in existing_sections if s.title]) if existing_sections else None
 
-    type_from_input = section_input.type or "generic" # Default to "generic" if not provided
-
     try:
         current_user_orm = crud.get_user(db, user_id=current_user.id)
         if not current_user_orm:
@@ -755,24 +880,123 @@ async def create_new_campaign_section_endpoint(
             model_id_with_prefix=section_input.model_id_with_prefix,
             campaign=db_campaign
         )
+    except HTTPException:
+        raise
+    except LLMServiceUnavailableError as e:
+        raise HTTPException(status_code=503, detail=f"LLM Service Error for section content generation: {str(e)}")
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
 
-        final_model_id_for_generation = model_specific_id
-        if not section_input.model_id_with_prefix: # If no model specified in request
-            if db_campaign and db_campaign.selected_llm_id and "/" in db_campaign.selected_llm_id:
-                _, campaign_model_id = db_campaign.selected_llm_id.split("/", 1)
-                final_model_id_for_generation = campaign_model_id
-            # Placeholder for user preference logic
+    final_model_id_for_generation = model_specific_id
+    if not section_input.model_id_with_prefix: # If no model specified in request
+        if db_campaign and db_campaign.selected_llm_id and "/" in db_campaign.selected_llm_id:
+            _, campaign_model_id = db_campaign.selected_llm_id.split("/", 1)
+            final_model_id_for_generation = campaign_model_id
+        # Placeholder for user preference logic
+
+    generation_kwargs = {
+        "db_campaign": db_campaign,
+        "db": db,
+        "existing_sections_summary": existing_sections_summary,
+        "section_creation_prompt": section_input.prompt,
+        "section_title_suggestion": section_input.title,
+        "section_type": section_input.type or "generic", # Default to "generic" if not provided
+        "model": final_model_id_for_generation,
+        "current_user": current_user,
+    }
+    return llm_service, generation_kwargs
 
-        generated_content = await llm_service.generate_section_content(
-            db_campaign=db_campaign,
+
+def _save_generated_section(
+    db: Session,
+    campaign_id: int,
+    section_input: models.CampaignSectionCreateInput,
+    generated_content: str
+) -> orm_models.CampaignSection:
+    new_section_title = section_input.title if section_input.title else "Untitled Section"
+    try:
+        return crud.create_campaign_section(
             db=db,
-            existing_sections_summary=existing_sections_summary,
-            section_creation_prompt=section_input.prompt,
-            section_title_suggestion=section_input.title,
-            section_type=type_from_input,
-            model=final_model_id_for_generation,
-            current_user=current_user # Add this
+            campaign_id=campaign_id,
+            section_title=new_section_title,
+            section_content=generated_content,
+            section_type=section_input.type or "generic"
         )
+    except Exception as e:
+        logger.error(f"Error saving new section for campaign {campaign_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to save the new campaign section.")
+
+
+def _sse_event(payload: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+async def _stream_and_save_section(
+    deltas: AsyncIterator[str],
+    save_section: Callable[[str], orm_models.CampaignSection],
+    db: Session,
+    log_label: str
+):
+    """
+    Relays LLM token deltas as SSE 'delta' events, then persists the full text once through
+    `save_section` and ends with a 'complete' event carrying the saved section.
+    Failures end the stream with an 'error' event and nothing is written.
+
+    The request's `get_db` session is already torn down when the body runs, so anything
+    using `db` here checks out a new connection; it is returned by closing `db` at the end.
+    """
+    try:
+        chunks: List[str] = []
+        try:
+            async for delta in deltas:
+                chunks.append(delta)
+                yield _sse_event({"event_type": "delta", "text": delta})
+        except HTTPException as e:
+            yield _sse_event({"event_type": "error", "status_code": e.status_code, "message": str(e.detail)})
+            return
+        except LLMServiceUnavailableError as e:
+            yield _sse_event({"event_type": "error", "status_code": 503, "message": f"LLM Service Error: {str(e)}"})
+            return
+        except (LLMGenerationError, ValueError) as e:
+            yield _sse_event({"event_type": "error", "status_code": 400, "message": str(e)})
+            return
+        except NotImplementedError:
+            yield _sse_event({"event_type": "error", "status_code": 501, "message": "Streaming generation is not implemented for the selected LLM provider."})
+            return
+        except Exception as e:
+            logger.error(f"Error while streaming {log_label}: {type(e).__name__} - {e}")
+            yield _sse_event({"event_type": "error", "status_code": 500, "message": f"Failed to generate section content: {str(e)}"})
+            return
+
+        generated_content = "".join(chunks).strip()
+        if not generated_content:
+            yield _sse_event({"event_type": "error", "status_code": 500, "message": "LLM generated empty content for the section."})
+            return
+
+        try:
+            db_section = save_section(generated_content)
+        except HTTPException as e:
+            yield _sse_event({"event_type": "error", "status_code": e.status_code, "message": str(e.detail)})
+            return
+        yield _sse_event({
+            "event_type": "complete",
+            "section_data": models.CampaignSection.from_orm(db_section).model_dump(mode="json")
+        })
+    finally:
+        db.close() # Release the connection the save (or the LLM service) reopened
+
+
+@router.post("/{campaign_id}/sections", response_model=models.CampaignSection, tags=["Campaign Sections"])
+async def create_new_campaign_section_endpoint(
+    campaign_id: int,
+    section_input: models.CampaignSectionCreateInput,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[models.User, Depends(get_current_active_user)]
+):
+    llm_service, generation_kwargs = _prepare_section_generation(campaign_id, section_input, db, current_user)
+
+    try:
+        generated_content = await llm_service.generate_section_content(**generation_kwargs)
     except LLMServiceUnavailableError as e:
         raise HTTPException(status_code=503, detail=f"LLM Service Error for section content generation: {str(e)}")
     except LLMGenerationError as e:
@@ -788,38 +1012,78 @@ async def create_new_campaign_section_endpoint(
     if not generated_content:
         raise HTTPException(status_code=500, detail="LLM generated empty content for the section.")
 
-    new_section_title = section_input.title if section_input.title else "Untitled Section"
+    return _save_generated_section(db, campaign_id, section_input, generated_content)
+
+
+@router.post("/{campaign_id}/sections/stream", tags=["Campaign Sections"])
+async def create_new_campaign_section_stream_endpoint(
+    campaign_id: int,
+    section_input: models.CampaignSectionCreateInput,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[models.User, Depends(get_current_active_user)]
+):
+    """
+    Streaming variant of POST /{campaign_id}/sections (SSE). Emits 'delta' events with token
+    text as it is generated, then a single 'complete' event with the saved section.
+    """
+    # Validation and provider errors are still plain HTTP errors, raised before the stream opens
+    llm_service, generation_kwargs = _prepare_section_generation(campaign_id, section_input, db, current_user)
+
+    return EventSourceResponse(_stream_and_save_section(
+        llm_service.stream_section_content(**generation_kwargs),
+        lambda content: _save_generated_section(db, campaign_id, section_input, content),
+        db,
+        log_label=f"new section for campaign {campaign_id}"
+    ))
+
+@router.post("/{campaign_id}/sections/batch", response_model=models.CampaignSectionListResponse, tags=["Campaign Sections"])
+async def create_campaign_sections_batch_endpoint(
+    campaign_id: int,
+    batch: models.CampaignSectionBatchCreate,
+    db: Annotated[AsyncDB, Depends(get_async_db)],
+    current_user: Annotated[models.User, Depends(get_current_active_user)]
+):
+    """
+    Creates sections from the given content (no LLM generation), appended after the campaign's
+    existing sections in one transaction. Returns the new sections.
+    """
+    if not batch.sections:
+        raise HTTPException(status_code=400, detail="At least one section is required.")
+    if len(batch.sections) > settings.SECTION_BATCH_CREATE_MAX_SECTIONS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.SECTION_BATCH_CREATE_MAX_SECTIONS} sections can be created per request.")
+
+    owner_id = await crud.get_campaign_owner_id_async(db, campaign_id=campaign_id)
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to modify sections for this campaign")
 
     try:
-        db_section = crud.create_campaign_section(
-            db=db,
-            campaign_id=campaign_id,
-            section_title=new_section_title,
-            section_content=generated_content,
-            section_type=type_from_input
+        sections = await crud.create_campaign_sections_bulk_async(
+            db, campaign_id=campaign_id, sections=[section.model_dump() for section in batch.sections]
         )
     except Exception as e:
-        logger.error(f"Error saving new section for campaign {campaign_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to save the new campaign section.")
-    return db_section
+        logger.error(f"Error batch-creating sections for campaign {campaign_id}: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while creating the sections.")
+    return models.CampaignSectionListResponse(sections=sections)
 
 @router.put("/{campaign_id}/sections/{section_id}", response_model=models.CampaignSection, tags=["Campaign Sections"])
 async def update_campaign_section_endpoint(
     campaign_id: int,
     section_id: int,
     section_data: models.CampaignSectionUpdateInput,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncDB, Depends(get_async_db)],
     current_user: Annotated[models.User, Depends(get_current_active_user)]
 ):
     # First, check if the campaign itself belongs to the user
-    db_campaign = crud.get_campaign(db=db, campaign_id=campaign_id)
-    if db_campaign is None:
+    owner_id = await crud.get_campaign_owner_id_async(db, campaign_id=campaign_id)
+    if owner_id is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    if db_campaign.owner_id != current_user.id:
+    if owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to modify sections for this campaign")
 
-    updated_section = crud.update_campaign_section(
-        db=db, 
+    updated_section = await crud.update_campaign_section_async(
+        db, 
         section_id=section_id, 
         campaign_id=campaign_id, 
         section_update_data=section_data
@@ -828,35 +1092,38 @@ async def update_campaign_section_endpoint(
         raise HTTPException(status_code=404, detail="Campaign section not found or does not belong to the specified campaign.")
     return updated_section
 
-@router.get("/{campaign_id}/sections", response_model=models.CampaignSectionListResponse, tags=["Campaign Sections"])
+@router.get("/{campaign_id}/sections", response_model=models.CampaignSectionListResponse, tags=["Campaign Sections"], responses={304: {"description": "Not modified"}})
 async def list_campaign_sections(
     campaign_id: int,
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncDB, Depends(get_async_db)],
     current_user: Annotated[models.User, Depends(get_current_active_user)]
 ):
-    db_campaign = crud.get_campaign(db=db, campaign_id=campaign_id)
-    if db_campaign is None:
-        raise HTTPException(status_code=404, detail="Campaign not found")
-    if db_campaign.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to view sections for this campaign")
-    sections = crud.get_campaign_sections(db=db, campaign_id=campaign_id)
+    validators = await crud.get_campaign_validators_async(db, campaign_id=campaign_id)
+    cache_headers = _campaign_cache_headers(campaign_id, *_check_campaign_validators(validators, current_user, "Not authorized to view sections for this campaign"))
+    if _is_not_modified(request, cache_headers):
+        return Response(status_code=304, headers=cache_headers)
+
+    sections = await crud.get_campaign_sections_async(db, campaign_id=campaign_id)
+    response.headers.update(cache_headers)
     return {"sections": sections}
 
 @router.delete("/{campaign_id}/sections/{section_id}", response_model=models.CampaignSection, tags=["Campaign Sections"])
 async def delete_campaign_section_endpoint(
     campaign_id: int,
     section_id: int,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncDB, Depends(get_async_db)],
     current_user: Annotated[models.User, Depends(get_current_active_user)]
 ):
     # First, check if the campaign itself belongs to the user
-    db_campaign = crud.get_campaign(db=db, campaign_id=campaign_id)
-    if db_campaign is None:
+    owner_id = await crud.get_campaign_owner_id_async(db, campaign_id=campaign_id)
+    if owner_id is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    if db_campaign.owner_id != current_user.id:
+    if owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete sections for this campaign")
 
-    deleted_section = crud.delete_campaign_section(db=db, section_id=section_id, campaign_id=campaign_id)
+    deleted_section = await crud.delete_campaign_section_async(db, section_id=section_id, campaign_id=campaign_id)
     # This CRUD already checks if section belongs to campaign
     if deleted_section is None:
         raise HTTPException(status_code=404, detail="Campaign section not found or does not belong to this campaign.")
@@ -868,45 +1135,62 @@ async def delete_campaign_section_endpoint(
 async def export_campaign_homebrewery(
     campaign_id: int,
     db: Annotated[Session, Depends(get_db)],
-    current_user: Annotated[models.User, Depends(get_current_active_user)]
+    current_user: Annotated[models.User, Depends(get_current_active_user)],
+    refresh_toc: bool = Query(False, description="Generate a new TOC even if the stored one matches the current section titles and model.")
 ):
-    db_campaign = crud.get_campaign(db=db, campaign_id=campaign_id)
+    """
+    Streams the campaign as a Homebrewery Markdown file (chunked), starting with the front cover
+    while the TOC is generated and fetching sections in batches as they are written out.
+    """
+    # Characters are loaded here: the request's session is closed before the body is streamed
+    db_campaign = crud.get_campaign(db=db, campaign_id=campaign_id, with_characters=True)
     if db_campaign is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
     if db_campaign.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized for this campaign")
-    sections = crud.get_campaign_sections(db=db, campaign_id=campaign_id, limit=1000) 
     export_service = HomebreweryExportService()
-    try:
-        # Ensure db and current_user are passed
-        formatted_text = await export_service.format_campaign_for_homebrewery(
-            campaign=db_campaign,
-            sections=sections,
-            db=db,
-            current_user=current_user
-        )
-    except Exception as e:
-        logger.error(f"Error during Homebrewery export formatting for campaign {campaign_id}: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to format campaign for Homebrewery export: {str(e)}")
+
+    async def export_stream():
+        try:
+            async for chunk in export_service.stream_campaign_for_homebrewery(
+                campaign=db_campaign,
+                db=db,
+                current_user=current_user,
+                refresh_toc=refresh_toc
+            ):
+                yield chunk
+        except Exception as e:
+            # Headers are already sent, so the client sees a truncated file
+            logger.error(f"Error during Homebrewery export streaming for campaign {campaign_id}: {e}")
+            raise
+        finally:
+            db.close() # Release the connection the section batches reopened
+
     filename_title_part = db_campaign.title.replace(' ', '_') if db_campaign.title else 'campaign_export'
     filename = f"{filename_title_part}_{db_campaign.id}_homebrewery.md"
-    return PlainTextResponse(
-        content=formatted_text, 
+    return StreamingResponse(
+        export_stream(),
         media_type="text/markdown",
         headers={"Content-Disposition": f"attachment; filename=\"{filename}\""}
     )
 
-@router.get("/{campaign_id}/full_content", response_model=models.CampaignFullContentResponse, tags=["Campaigns"])
+@router.get("/{campaign_id}/full_content", response_model=models.CampaignFullContentResponse, tags=["Campaigns"], responses={304: {"description": "Not modified"}})
 async def get_campaign_full_content_endpoint(
     campaign_id: int,
+    request: Request,
+    response: Response,
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[models.User, Depends(get_current_active_user)]
 ):
-    db_campaign = crud.get_campaign(db=db, campaign_id=campaign_id)
+    validators = crud.get_campaign_validators(db, campaign_id=campaign_id)
+    cache_headers = _campaign_cache_headers(campaign_id, *_check_campaign_validators(validators, current_user, "Not authorized for this campaign"))
+    if _is_not_modified(request, cache_headers):
+        return Response(status_code=304, headers=cache_headers)
+
+    db_campaign = crud.get_campaign(db=db, campaign_id=campaign_id, with_characters=False)
     if db_campaign is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    if db_campaign.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized for this campaign")
+    response.headers.update(cache_headers)
     sections = crud.get_campaign_sections(db=db, campaign_id=campaign_id, limit=1000)
     all_content_parts = []
     if db_campaign.concept:
@@ -940,23 +1224,25 @@ async def get_campaign_full_content_endpoint(
 async def prepare_campaign_for_homebrewery_posting(
     campaign_id: int,
     db: Annotated[Session, Depends(get_db)],
-    current_user: Annotated[models.User, Depends(get_current_active_user)]
+    current_user: Annotated[models.User, Depends(get_current_active_user)],
+    refresh_toc: bool = Query(False, description="Generate a new TOC even if the stored one matches the current section titles and model.")
 ):
     db_campaign = crud.get_campaign(db=db, campaign_id=campaign_id)
     if db_campaign is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
     if db_campaign.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized for this campaign")
-    sections = crud.get_campaign_sections(db=db, campaign_id=campaign_id, limit=1000)
     export_service = HomebreweryExportService()
     try:
-        # Ensure db and current_user are passed
-        markdown_content = await export_service.format_campaign_for_homebrewery(
-            campaign=db_campaign,
-            sections=sections,
-            db=db,
-            current_user=current_user
-        )
+        # The response is one JSON document, so the stream is collected; sections are still read in batches
+        markdown_content = "".join([
+            chunk async for chunk in export_service.stream_campaign_for_homebrewery(
+                campaign=db_campaign,
+                db=db,
+                current_user=current_user,
+                refresh_toc=refresh_toc
+            )
+        ])
     except Exception as e:
         logger.error(f"Error during Homebrewery content generation for campaign {campaign_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate Homebrewery Markdown: {str(e)}")
@@ -969,14 +1255,17 @@ async def prepare_campaign_for_homebrewery_posting(
         filename_suggestion=filename_suggestion
     )
 
-@router.post("/{campaign_id}/sections/{section_id}/regenerate", response_model=models.CampaignSection, tags=["Campaign Sections"])
-async def regenerate_campaign_section_endpoint(
+def _prepare_section_regeneration(
     campaign_id: int,
     section_id: int,
     section_input: models.SectionRegenerateInput,
-    db: Annotated[Session, Depends(get_db)],
-    current_user: Annotated[models.User, Depends(get_current_active_user)]
-):
+    db: Session,
+    current_user: models.User
+) -> tuple[AbstractLLMService, Dict[str, Any]]:
+    """
+    Validates a regeneration request, renders the feature template into the final prompt and
+    resolves the LLM service. Returns the service and the keyword arguments for generate_text / stream_text.
+    """
     db_campaign = crud.get_campaign(db=db, campaign_id=campaign_id)
     if db_campaign is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
@@ -1114,45 +1403,32 @@ async def regenerate_campaign_section_endpoint(
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=f"Invalid LLM model ID format ('{llm_model_to_use}'): {ve}")
 
-    # Fetch existing sections summary for context -- This is now done above as part of backend_context
-
-    # Call LLM Service using the generic generate_text method
-    try:
-        logger.debug(f"Regenerating section '{current_title}' (ID: {section_id}) using LLM: {llm_model_to_use} with final prompt (first 100 chars): '{final_prompt_for_llm[:100]}...'")
-
-        # Convert current_user (Pydantic model) to ORM model if needed by get_llm_service,
-        # but llm_service.generate_text expects Pydantic user.
-        # current_user_orm is already fetched and available.
-
-        # The llm_service instance is already initialized.
-        # We need to ensure generate_text can use the fully constructed prompt (final_prompt_for_llm)
-        # and doesn't try to re-fetch campaign concept etc. if they are already in the prompt.
-        # The dummy generate_text tries to fill placeholders, which is what we want.
-
-        generated_content = await llm_service.generate_text(
-            prompt=final_prompt_for_llm, # This is the fully rendered template
-            current_user=current_user,  
-            db=db,
-            model=model_specific_id,     # Specific model ID for the provider
-            temperature=db_campaign.temperature if db_campaign.temperature is not None else 0.7, # Use campaign temp or default
-            # max_tokens can be default or configured
-            # Context fields for generate_text are not strictly needed if prompt is pre-rendered,
-            # but passing them for completeness or if service uses them for other logic.
-            db_campaign=db_campaign,
-            section_title_suggestion=current_title,
-            section_type=determined_section_type,
-            section_creation_prompt=section_input.new_prompt if section_input.feature_id else None
-        )
-
-        if not generated_content:
-            raise HTTPException(status_code=500, detail="LLM generated empty content during regeneration.")
+    logger.debug(f"Regenerating section '{current_title}' (ID: {section_id}) using LLM: {llm_model_to_use} with final prompt (first 100 chars): '{final_prompt_for_llm[:100]}...'")
+
+    # generate_text expects the Pydantic user; the prompt is already fully rendered, so the
+    # context fields are passed only for services that use them for other logic.
+    text_kwargs = {
+        "prompt": final_prompt_for_llm, # This is the fully rendered template
+        "current_user": current_user,
+        "db": db,
+        "model": model_specific_id,     # Specific model ID for the provider
+        "temperature": db_campaign.temperature if db_campaign.temperature is not None else 0.7, # Use campaign temp or default
+        # max_tokens can be default or configured
+        "db_campaign": db_campaign,
+        "section_title_suggestion": current_title,
+        "section_type": determined_section_type,
+        "section_creation_prompt": section_input.new_prompt if section_input.feature_id else None,
+    }
+    return llm_service, text_kwargs
 
-    except LLMGenerationError as e: # This comes from the LLM service if it raises it
-        raise HTTPException(status_code=500, detail=f"LLM Generation Error during regeneration: {str(e)}")
-    except Exception as e:
-        logger.error(f"Unexpected error during LLM regeneration for section ID {section_id}: {e}")
-        raise HTTPException(status_code=500, detail=f"Unexpected error during section regeneration: {str(e)}")
 
+def _save_regenerated_section(
+    db: Session,
+    campaign_id: int,
+    section_id: int,
+    section_input: models.SectionRegenerateInput,
+    generated_content: str
+) -> orm_models.CampaignSection:
     # Prepare data for update
     section_update_payload = models.CampaignSectionUpdateInput(content=generated_content)
     if section_input.new_title is not None:
@@ -1177,6 +1453,54 @@ async def regenerate_campaign_section_endpoint(
 
     return updated_section
 
+
+@router.post("/{campaign_id}/sections/{section_id}/regenerate", response_model=models.CampaignSection, tags=["Campaign Sections"])
+async def regenerate_campaign_section_endpoint(
+    campaign_id: int,
+    section_id: int,
+    section_input: models.SectionRegenerateInput,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[models.User, Depends(get_current_active_user)]
+):
+    llm_service, text_kwargs = _prepare_section_regeneration(campaign_id, section_id, section_input, db, current_user)
+
+    # Call LLM Service using the generic generate_text method
+    try:
+        generated_content = await llm_service.generate_text(**text_kwargs)
+
+        if not generated_content:
+            raise HTTPException(status_code=500, detail="LLM generated empty content during regeneration.")
+
+    except LLMGenerationError as e: # This comes from the LLM service if it raises it
+        raise HTTPException(status_code=500, detail=f"LLM Generation Error during regeneration: {str(e)}")
+    except Exception as e:
+        logger.error(f"Unexpected error during LLM regeneration for section ID {section_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Unexpected error during section regeneration: {str(e)}")
+
+    return _save_regenerated_section(db, campaign_id, section_id, section_input, generated_content)
+
+
+@router.post("/{campaign_id}/sections/{section_id}/regenerate/stream", tags=["Campaign Sections"])
+async def regenerate_campaign_section_stream_endpoint(
+    campaign_id: int,
+    section_id: int,
+    section_input: models.SectionRegenerateInput,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[models.User, Depends(get_current_active_user)]
+):
+    """
+    Streaming variant of POST /{campaign_id}/sections/{section_id}/regenerate (SSE). The section
+    is updated once, after the last token, and returned in the final 'complete' event.
+    """
+    llm_service, text_kwargs = _prepare_section_regeneration(campaign_id, section_id, section_input, db, current_user)
+
+    return EventSourceResponse(_stream_and_save_section(
+        llm_service.stream_text(**text_kwargs),
+        lambda content: _save_regenerated_section(db, campaign_id, section_id, section_input, content),
+        db,
+        log_label=f"regeneration of section {section_id}"
+    ))
+
 # The Config class should be at the module level if it's meant for Pydantic model configuration,
 # or within each Pydantic model that needs it.
 # For example, if SectionOrderUpdate needed it:
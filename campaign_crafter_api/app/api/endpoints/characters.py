@@ -2,14 +2,14 @@ from typing import List, Optional, Annotated, Dict # Added Dict for type hint
 import logging
 from datetime import datetime # Added for timestamping messages
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy.orm.attributes import flag_modified # Added for JSON field modification tracking
 
 from app import crud, models, orm_models
 from app.core.config import settings # Import settings
-from app.db import get_db
+from app.db import AsyncDB, get_async_db, get_db
 from app.services.auth_service import get_current_active_user
+from app.services.conversation_summary_queue import conversation_summary_queue
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -188,7 +188,7 @@ def read_campaign_characters(
     characters = crud.get_characters_by_campaign(db=db, campaign_id=campaign_id, skip=skip, limit=limit)
     return characters
 
-@router.get("/{character_id}/campaigns", response_model=List[models.Campaign])
+@router.get("/{character_id}/campaigns", response_model=List[models.CampaignHeader])
 def read_character_campaigns(
     character_id: int,
     db: Annotated[Session, Depends(get_db)],
@@ -210,7 +210,7 @@ def read_character_campaigns(
     campaigns = crud.get_campaigns_for_character(db=db, character_id=character_id)
 
     # The campaigns returned by crud.get_campaigns_for_character are ORM models.
-    # FastAPI will automatically convert them to List[models.Campaign] Pydantic models.
+    # FastAPI will automatically convert them to List[models.CampaignHeader] Pydantic models (no sections).
     # Note: The crud.get_campaigns_for_character itself doesn't filter by campaign ownership,
     # but since we've verified character ownership, this implies the user has a right to know
     # which of their campaigns this character (that they own) is part of.
@@ -371,13 +371,13 @@ async def generate_character_chat_response( # Renamed function
     character_id: int,
     request_body: models.LLMGenerationRequest,
     db: Annotated[Session, Depends(get_db)],
+    async_db: Annotated[AsyncDB, Depends(get_async_db)],
     current_user: Annotated[models.User, Depends(get_current_active_user)]
 ):
     """
     Generates a text response from the character.
-    The entire conversation history for this user-character pair is stored
-    as a JSON list in a single row in the 'chat_messages' table.
-    This endpoint appends the new user message and AI response to this list.
+    Messages are stored one row each in 'chat_message_entries'; this endpoint
+    appends the new user message and AI response without rewriting earlier messages.
     """
     from datetime import datetime # Import here for usage
 
@@ -386,7 +386,7 @@ async def generate_character_chat_response( # Renamed function
     # MIN_MESSAGES_FOR_SUMMARIZATION_TRIGGER = settings.CHAT_MIN_MESSAGES_FOR_SUMMARY_TRIGGER
     # These specific constants are used in the trigger logic below.
 
-    db_character = crud.get_character(db=db, character_id=character_id)
+    db_character = await crud.get_character_async(async_db, character_id=character_id)
     if db_character is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Character not found")
     if db_character.owner_id != current_user.id:
@@ -395,30 +395,24 @@ async def generate_character_chat_response( # Renamed function
     if not request_body.prompt:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Prompt cannot be empty.")
 
-    # 1. Get or create the conversation record for this user and character
-    conversation_orm_object = crud.get_or_create_user_character_conversation(
-        db=db, character_id=character_id, user_id=current_user.id
+    # 1. Get or create the conversation record for this user and character, and read the
+    # 9 messages preceding this prompt (10 including it) as LLM context.
+    # Only those rows are read, however long the conversation is.
+    conversation_id, memory_summary, previous_messages = await crud.get_chat_context_async(
+        async_db, character_id=character_id, user_id=current_user.id, history_limit=9
     )
 
-    # conversation_history is a Python list of dicts. Initialize if None (though ORM default should handle it).
-    current_conversation_list: List[Dict] = conversation_orm_object.conversation_history if conversation_orm_object.conversation_history is not None else []
-
-    # 2. Append the current user's message to this list
+    # 2. Build the current user's message (persisted together with the reply below)
     user_message_entry = {
         "speaker": "user",
         "text": request_body.prompt,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
     }
-    current_conversation_list.append(user_message_entry)
-
-    # 3. Prepare context for the LLM (e.g., last N messages)
-    # Map to models.ConversationMessageContext (speaker, text) for LLM service
-    # Send up to last 10 entries (including current user's new message) for context
-    history_for_llm_context_dicts = current_conversation_list[-10:]
 
+    # 3. Map the context to models.ConversationMessageContext (speaker, text) for LLM service
     chat_history_for_llm_service = [
         models.ConversationMessageContext(speaker=msg["speaker"], text=msg["text"])
-        for msg in history_for_llm_context_dicts
+        for msg in previous_messages
     ]
 
     provider_name_from_request: Optional[str] = None
@@ -444,8 +438,8 @@ async def generate_character_chat_response( # Renamed function
         # user_prompt is the current raw prompt, chat_history is the context *including* this latest user prompt
         # Prepare augmented character notes including memory summary for the LLM service call
         base_character_notes = db_character.notes_for_llm or ""
-        # The conversation_orm_object was fetched/created earlier and contains the latest memory_summary
-        memory_summary_text = conversation_orm_object.memory_summary or ""
+        # The conversation was fetched/created earlier together with its latest memory_summary
+        memory_summary_text = memory_summary or ""
 
         effective_character_notes_for_llm = base_character_notes
         if memory_summary_text:
@@ -458,7 +452,7 @@ async def generate_character_chat_response( # Renamed function
             character_name=db_character.name,
             character_notes=effective_character_notes_for_llm, # Pass augmented notes
             user_prompt=request_body.prompt, # Current user's immediate message
-            chat_history=chat_history_for_llm_service[:-1] if chat_history_for_llm_service else [], # Pass history *before* current prompt
+            chat_history=chat_history_for_llm_service, # History *before* current prompt
             current_user=current_user,
             db=db,
             model=model_specific_id_from_request,
@@ -466,54 +460,37 @@ async def generate_character_chat_response( # Renamed function
             max_tokens=request_body.max_tokens
         )
 
-        # 5. Append AI's response to the list
+        # 5. Build AI's response entry
         ai_message_entry = {
             "speaker": "assistant", # Using "assistant" for AI role
             "text": generated_text,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
-        current_conversation_list.append(ai_message_entry)
-
-        # Explicitly mark the conversation_history field as modified before saving
-        flag_modified(conversation_orm_object, "conversation_history")
 
-        # 6. Save the updated conversation list back to the database
-        crud.update_user_character_conversation(
-            db=db,
-            conversation_record=conversation_orm_object,
-            new_history_list=current_conversation_list
-            # Note: update_user_character_conversation itself also assigns new_history_list
-            # to conversation_record.conversation_history. The flag_modified ensures this is picked up by SQLAlchemy.
+        # 6. Append both messages (new rows only) and bump the conversation's message_count
+        message_count = await crud.append_conversation_messages_async(
+            async_db,
+            conversation_id=conversation_id,
+            messages=[user_message_entry, ai_message_entry]
         )
-        # logger.debug(f"Conversation (JSON) updated for char_id={character_id}, user_id={current_user.id}") # Debug print removed
 
-        # After saving the current turn, check if summarization should be triggered
-        if len(current_conversation_list) >= settings.CHAT_MIN_MESSAGES_FOR_SUMMARY_TRIGGER and \
-           len(current_conversation_list) % settings.CHAT_SUMMARIZATION_INTERVAL == 0:
-            try:
-                # logger.debug(f"Attempting to summarize conversation for char_id={character_id}, user_id={current_user.id}") # Debug print removed
-                await crud.update_conversation_summary(
-                    db=db,
-                    conversation_orm=conversation_orm_object, # Pass the updated ORM object
-                    llm_service=llm_service, # Reuse the initialized LLM service
-                    current_user_model=current_user, # Pass Pydantic User
-                    character_name=db_character.name,
-                    character_notes=(db_character.notes_for_llm or "") # Pass original notes for summary context
-                )
-                # print(f"Summarization task completed for char_id={character_id}, user_id={current_user.id}") # Debug print removed
-            except Exception as summary_ex:
-                # Log summarization error but don't let it fail the main response to the user
-                # This print is an error log, so it can stay.
-                logger.error(f":API:generate_character_chat_response: Summarization failed for char_id={character_id}, user_id={current_user.id}: {summary_ex}")
+        # After saving the current turn, check if summarization should be triggered.
+        # Summarization runs on the background queue so this response never waits for it.
+        if message_count >= settings.CHAT_MIN_MESSAGES_FOR_SUMMARY_TRIGGER and \
+           message_count % settings.CHAT_SUMMARIZATION_INTERVAL == 0:
+            conversation_summary_queue.enqueue(
+                character_id=character_id,
+                user_id=current_user.id,
+                model_id_with_prefix=request_body.model_id_with_prefix
+            )
 
         # 7. Return the AI's current textual response
         return models.LLMTextGenerationResponse(text=generated_text)
 
     except crud.LLMServiceUnavailableError as e:
         # If LLM fails, we should decide if we still save the user's message.
-        # Current logic: user message was appended to list, but list not yet saved by update_user_character_conversation.
-        # To save user message even if LLM fails, call update_user_character_conversation before LLM call.
-        # For now, if LLM fails, the appended user message (and any AI message) won't be committed.
+        # Current logic: the user message is only appended together with the AI reply,
+        # so if the LLM fails nothing from this turn is committed.
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     except crud.LLMGenerationError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -546,8 +523,8 @@ def get_character_chat_history(
     )
 
     history_as_pydantic = []
-    if conversation_orm_object.conversation_history:
-        for i, msg in enumerate(conversation_orm_object.conversation_history):
+    if conversation_orm_object.message_count:
+        for i, msg in enumerate(crud.get_conversation_messages(db=db, conversation_id=conversation_orm_object.id)):
             if not msg:
                 logger.debug(f"Skipping corrupted (null) message at index {i}")
                 continue
@@ -564,6 +541,33 @@ def get_character_chat_history(
                 continue
     return history_as_pydantic
 
+@router.get("/{character_id}/chat/page", response_model=models.ConversationHistoryPage)
+async def get_character_chat_history_page(
+    character_id: int,
+    db: Annotated[AsyncDB, Depends(get_async_db)],
+    current_user: Annotated[models.User, Depends(get_current_active_user)],
+    limit: int = Query(50, ge=1, le=200, description="Number of messages to return."),
+    before_id: Optional[int] = Query(None, ge=1, description="Return messages older than this message id (the previous page's next_cursor).")
+):
+    """
+    Retrieves one page of the conversation history, newest messages first.
+    Start without `before_id`, then pass `next_cursor` to load older messages.
+    """
+    db_character = await crud.get_character_async(db, character_id=character_id)
+    if db_character is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Character not found")
+    if db_character.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this chat history")
+
+    messages, has_more = await crud.get_chat_history_page_async(
+        db, character_id=character_id, user_id=current_user.id, limit=limit, before_id=before_id
+    )
+    return models.ConversationHistoryPage(
+        messages=[models.ConversationMessagePageEntry(**msg) for msg in messages],
+        next_cursor=messages[-1]["id"] if has_more else None,
+        has_more=has_more
+    )
+
 @router.delete("/{character_id}/chat", status_code=status.HTTP_204_NO_CONTENT)
 async def clear_character_chat_history(
     character_id: int,
@@ -605,7 +609,7 @@ async def force_character_memory_summary(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to force memory summary for this character")
 
     conversation_orm = crud.get_or_create_user_character_conversation(db, character_id, current_user.id)
-    if not conversation_orm.conversation_history:
+    if not conversation_orm.message_count:
         # No history, nothing to summarize. Return early.
         return
 
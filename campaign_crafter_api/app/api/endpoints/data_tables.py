@@ -4,12 +4,16 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app import crud, models # Removed orm_models as not directly used
+from app.core.config import settings
 from app.db import get_db
 from app.services.auth_service import get_current_active_user # Import for auth
+from app.services.random_table_service import RandomTableService, TableNotFoundError
 
 router_features = APIRouter()
 router_roll_tables = APIRouter()
 
+random_table_service = RandomTableService()
+
 # --- Feature Endpoints ---
 @router_features.post("/", response_model=models.Feature)
 def create_feature(
@@ -152,6 +156,41 @@ def create_roll_table(
             )
     return crud.create_roll_table(db=db, roll_table=roll_table, user_id=current_user.id)
 
+@router_roll_tables.post("/roll", response_model=models.RollTableBulkRollResponse)
+def bulk_roll_tables(
+    roll_request: models.RollTableBulkRollRequest,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[models.User, Depends(get_current_active_user)]
+):
+    """
+    Rolls each named table `rolls_per_table` times in one request. The user's own tables take
+    precedence over system tables with the same name. Pass `seed` for repeatable results.
+    """
+    if not roll_request.table_names:
+        raise HTTPException(status_code=400, detail="At least one table name is required.")
+    if len(roll_request.table_names) > settings.ROLL_TABLE_BULK_MAX_TABLES:
+        raise HTTPException(status_code=400, detail=f"At most {settings.ROLL_TABLE_BULK_MAX_TABLES} tables can be rolled per request.")
+    if not 1 <= roll_request.rolls_per_table <= settings.ROLL_TABLE_BULK_MAX_ROLLS:
+        raise HTTPException(status_code=400, detail=f"rolls_per_table must be between 1 and {settings.ROLL_TABLE_BULK_MAX_ROLLS}.")
+
+    try:
+        rolled = random_table_service.roll_many(
+            roll_request.table_names, roll_request.rolls_per_table, db,
+            user_id=current_user.id, seed=roll_request.seed
+        )
+    except TableNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return models.RollTableBulkRollResponse(
+        seed=roll_request.seed,
+        tables=[
+            models.TableRollResults(
+                table_name=table_name,
+                results=[models.RollResult(roll=roll, item=item) for roll, item in results]
+            )
+            for table_name, results in rolled.items()
+        ]
+    )
+
 @router_roll_tables.get("/{roll_table_id}", response_model=models.RollTable)
 def read_roll_table(roll_table_id: int, db: Annotated[Session, Depends(get_db)]):
     db_roll_table = crud.get_roll_table(db, roll_table_id=roll_table_id)
@@ -1,12 +1,15 @@
+import asyncio
 import json
 import logging
 from typing import Optional, List, Dict, Any, Union, Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form
 from sqlalchemy.orm import Session
+from sse_starlette.sse import EventSourceResponse
 
+from app import crud
 from app.db import get_db
-from app.services.import_service import ImportService # DEFAULT_OWNER_ID removed from here
+from app.services.import_service import ImportService, spool_upload # DEFAULT_OWNER_ID removed from here
 from app.external_models.import_models import ImportSummaryResponse, ImportErrorDetail
 from app.models import User as UserModel # For current_user type hint
 from app.services.auth_service import get_current_active_user # For auth dependency
@@ -19,6 +22,16 @@ router = APIRouter()
 def get_import_service():
     return ImportService()
 
+def _authorize_target_campaign(db: Session, target_campaign_id: Optional[int], current_user: UserModel) -> None:
+    """Rejects the import (404/403) before anything is written unless the target campaign is the user's."""
+    if target_campaign_id is None:
+        return
+    db_campaign = crud.get_campaign(db=db, campaign_id=target_campaign_id, with_characters=False)
+    if db_campaign is None:
+        raise HTTPException(status_code=404, detail="Target campaign not found")
+    if db_campaign.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to import into this campaign")
+
 @router.post(
     "/json_file", 
     response_model=ImportSummaryResponse, 
@@ -44,6 +57,7 @@ async def import_json_file_endpoint(
     """
     if not file.filename or not file.filename.lower().endswith(".json"):
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload a .json file.")
+    _authorize_target_campaign(db, target_campaign_id, current_user)
 
     try:
         file_content_bytes = await file.read()
@@ -112,17 +126,14 @@ async def import_zip_file_endpoint(
     """
     if not file.filename or not file.filename.lower().endswith(".zip"):
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload a .zip file.")
+    _authorize_target_campaign(db, target_campaign_id, current_user)
 
     try:
-        file_content_bytes = await file.read()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reading uploaded Zip file: {str(e)}")
-    finally:
-        await file.close()
-
-    try:
-        summary = import_service.import_from_zip_file(
-            file_bytes=file_content_bytes,
+        # The upload is already spooled by the form parser (on disk past 1 MB) and is read
+        # member by member; the import runs on a worker thread to keep the event loop free
+        summary = await asyncio.to_thread(
+            import_service.import_from_zip_file,
+            zip_file=file.file,
             owner_id=current_user.id,
             db=db,
             target_campaign_id=target_campaign_id,
@@ -138,3 +149,70 @@ async def import_zip_file_endpoint(
             message="Import process failed due to an unexpected server error.",
             errors=errors
         )
+    finally:
+        await file.close()
+
+@router.post(
+    "/zip_file/stream",
+    tags=["Import"],
+    summary="Import campaign data from a Zip archive, streaming progress as Server-Sent Events."
+)
+async def import_zip_file_stream_endpoint(
+    db: Annotated[Session, Depends(get_db)],
+    import_service: Annotated[ImportService, Depends(get_import_service)],
+    current_user: Annotated[UserModel, Depends(get_current_active_user)],
+    file: UploadFile = File(..., description="ZIP file containing campaign data, typically exported from Homebrewery or a similar Markdown-based format."),
+    target_campaign_id: Optional[int] = Form(None, description="If provided, import data into this existing campaign ID. Otherwise, a new campaign is created."),
+    process_folders_as_structure: bool = Form(False, description="If true, interpret folder structure within the ZIP as campaign sections and sub-sections.")
+):
+    """
+    Same import as `/zip_file`, for large archives: the upload is spooled to a temp file, the
+    archive's files are imported one at a time, and progress is streamed back as each one is
+    done instead of the request staying silent until the whole archive is imported.
+
+    Events (JSON `data`):
+    - `{"event_type": "progress", "processed_files", "total_files", "current_file", "imported_campaigns_count", "imported_sections_count", "errors_count"}` after each file.
+    - `{"event_type": "complete", "summary": ImportSummaryResponse}` at the end.
+    - `{"event_type": "error", "message": "..."}` if the import stops on an unexpected error.
+    """
+    if not file.filename or not file.filename.lower().endswith(".zip"):
+        raise HTTPException(status_code=400, detail="Invalid file type. Please upload a .zip file.")
+    _authorize_target_campaign(db, target_campaign_id, current_user)
+
+    # The uploaded form file is closed before the response streams, so the import reads its own copy
+    try:
+        spooled_zip = await spool_upload(file)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading uploaded Zip file: {str(e)}")
+    finally:
+        await file.close()
+
+    async def event_generator():
+        summary = ImportSummaryResponse(created_campaign_ids=[], updated_campaign_ids=[], errors=[])
+        progress_updates = import_service.iter_zip_import(
+            spooled_zip, current_user.id, db, summary,
+            target_campaign_id=target_campaign_id,
+            process_folders_as_structure=process_folders_as_structure
+        )
+        next_step = None
+        try:
+            while True:
+                # Each step reads a file and writes to the database on a worker thread; shielded
+                # so a client disconnect lets it finish before the file and session are closed
+                next_step = asyncio.ensure_future(asyncio.to_thread(next, progress_updates, None))
+                progress = await asyncio.shield(next_step)
+                if progress is None:
+                    break
+                yield json.dumps({"event_type": "progress", **progress.model_dump()})
+            yield json.dumps({"event_type": "complete", "summary": summary.model_dump()})
+        except Exception as e:
+            logger.error(f"Error during streaming Zip import: {type(e).__name__} - {e}")
+            yield json.dumps({"event_type": "error", "message": f"An unexpected error occurred during Zip import: {str(e)}"})
+        finally:
+            if next_step is not None and not next_step.done():
+                await asyncio.wait([next_step])
+            progress_updates.close()
+            spooled_zip.close()
+            db.close() # The request's session is closed before the body streams; release what the import reopened
+
+    return EventSourceResponse(event_generator())
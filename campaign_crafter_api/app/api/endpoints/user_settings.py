@@ -9,6 +9,8 @@ from app.core.security import encrypt_key
 from app.models import UserAPIKeyUpdate
 from app.db import get_db
 from app.services.auth_service import get_current_active_user
+from app.services.catalog_cache import bump_catalog_version
+from app.services.user_cache import USER_CATALOG_VERSION_NAME, authenticated_user_cache
 
 router = APIRouter()
 
@@ -48,7 +50,9 @@ def update_user_api_keys(
 
     if updated:
         db.add(user_orm)
+        bump_catalog_version(db, USER_CATALOG_VERSION_NAME)
         db.commit()
+        authenticated_user_cache.invalidate()
         db.refresh(user_orm)
 
     # Populate the 'provided' fields for the response model
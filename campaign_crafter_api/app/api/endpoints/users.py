@@ -13,13 +13,18 @@ router = APIRouter()
 # Order matters for /me vs /{user_id} if /me could be misinterpreted as a user_id.
 # Placing /me first ensures it's matched correctly.
 @router.get("/me", response_model=models.User)
-async def read_users_me(
+def read_users_me(
+    db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[models.User, Depends(get_current_active_user)]
 ):
     """
     Get current logged-in user.
     """
-    return current_user
+    # current_user comes from the auth cache without campaigns/llm_configs; load the full user
+    db_user = crud.get_user(db, user_id=current_user.id)
+    if not db_user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return db_user
 
 @router.put("/me/keys", response_model=models.User)
 def update_my_api_keys(
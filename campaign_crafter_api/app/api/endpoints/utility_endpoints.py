@@ -2,7 +2,7 @@ from typing import List, Optional, Annotated
 import logging
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from app.db import get_db
+from app.db import get_db, database_diagnostics
 
 from app import models # Keep this for other models if used
 # Explicitly import Feature related Pydantic models from app.models
@@ -75,7 +75,7 @@ async def get_feature(feature_name: str, db: Annotated[Session, Depends(get_db)]
         logger.error(f"Error getting feature '{feature_name}': {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve feature '{feature_name}' due to an internal error.")
 
-from app.services.auth_service import get_current_active_user # Correct import path
+from app.services.auth_service import get_current_active_user, get_current_active_superuser # Correct import path
 
 logger = logging.getLogger(__name__)
 # Endpoint to create a new feature
@@ -167,3 +167,16 @@ async def delete_existing_feature(
         # Log the exception e
         logger.error(f"Error deleting feature ID {feature_id}: {e}")
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred while deleting the feature: {str(e)}")
+
+
+@router.get("/diagnostics/database", response_model=models.DatabaseDiagnostics, tags=["Utilities"])
+def get_database_diagnostics(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[models.User, Depends(get_current_active_superuser)]
+):
+    """Engine profile, pool state and (on SQLite) the effective connection PRAGMAs. Superusers only."""
+    try:
+        return database_diagnostics(db.get_bind())
+    except Exception as e:
+        logger.error(f"Error collecting database diagnostics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to collect database diagnostics.")
@@ -33,6 +33,8 @@ class Settings(BaseSettings):
     # Image Storage Settings
     IMAGE_STORAGE_PATH: str = "/app/static/generated_images/"
     IMAGE_BASE_URL: str = "/static/generated_images/" # URL path to access stored images
+    # Where user files are stored: "azure" (Blob Storage) or "local" (IMAGE_STORAGE_PATH, served at IMAGE_BASE_URL)
+    STORAGE_BACKEND: str = "azure"
 
     # Azure Blob Storage Settings
     AZURE_STORAGE_ACCOUNT_NAME: Optional[str] = None
@@ -59,19 +61,67 @@ class Settings(BaseSettings):
     LOCAL_LLM_API_BASE_URL: Optional[str] = None # e.g., "http://localhost:11434/v1" for Ollama's OpenAI compat endpoint
     LOCAL_LLM_DEFAULT_MODEL_ID: Optional[str] = None # e.g., "mistral:latest" or just "mistral"
 
+    # Concurrency limits for LLM fan-out (e.g. auto-populating sections from a TOC)
+    SECTION_SEED_CONCURRENCY: int = 4 # Max sections generated in parallel for a single seed request
+    LLM_PROVIDER_MAX_CONCURRENCY: int = 8 # Max in-flight generation calls per provider across all requests in this process
+
+    # LLM provider availability cache (avoids a live probe before every generation call)
+    LLM_AVAILABILITY_TTL_SECONDS: int = 300 # How long a successful availability check is trusted
+    LLM_AVAILABILITY_NEGATIVE_TTL_SECONDS: int = 30 # How long a failed check is remembered before re-probing
+
+    LLM_CLIENT_POOL_MAX_SIZE: int = 64 # Max long-lived LLM SDK clients kept open (one per provider/key/base URL), LRU-evicted
+    LLM_CLIENT_RETIRE_GRACE_SECONDS: float = 900 # How long an evicted client stays open for requests still using it (longer than the SDKs' 10-min request timeout)
+
+    # Exports
+    EXPORT_SECTION_BATCH_SIZE: int = 50 # Sections fetched per query while streaming a Homebrewery export
+
+    # Section writes
+    SECTION_BULK_INSERT_CHUNK_SIZE: int = 500 # Rows per multi-row INSERT when sections are created in bulk (imports, batch create)
+    SECTION_BATCH_CREATE_MAX_SECTIONS: int = 1000 # Sections accepted by one POST /campaigns/{id}/sections/batch request
+
+    # Imports
+    IMPORT_UPLOAD_CHUNK_SIZE: int = 1024 * 1024 # Bytes read from an upload at a time while spooling it
+    IMPORT_UPLOAD_SPOOL_MAX_MEMORY_BYTES: int = 8 * 1024 * 1024 # Spooled uploads larger than this are moved to a temp file on disk
+    IMPORT_ZIP_MAX_MEMBER_BYTES: int = 50 * 1024 * 1024 # Uncompressed size limit for a single file in an imported Zip; larger files are skipped
+
+    # Process-wide catalog caches (feature templates, compiled roll tables)
+    CATALOG_CACHE_VERSION_CHECK_SECONDS: float = 5.0 # How often a worker re-reads a catalog's shared version to pick up other workers' writes; 0 checks on every lookup
+    ROLL_TABLE_CACHE_MAX_ENTRIES: int = 2048 # Compiled roll tables (and misses) kept per process, LRU-evicted
+    ROLL_TABLE_BULK_MAX_TABLES: int = 50 # Tables accepted by one POST /roll_tables/roll request
+    ROLL_TABLE_BULK_MAX_ROLLS: int = 100 # Rolls per table accepted by one POST /roll_tables/roll request
+
     DATABASE_URL: str = "sqlite:///./campaign_crafter_default.db"
+    ASYNC_DB_ENABLED: bool = True # Use an async engine (aiosqlite/asyncpg) for async endpoints when the driver is installed
+    ASYNC_DATABASE_URL: Optional[str] = None # Override for the async engine URL; derived from DATABASE_URL when unset
+
+    # Database engine profiles
+    SQLITE_JOURNAL_MODE: str = "WAL" # WAL lets readers proceed while a write is in progress
+    SQLITE_SYNCHRONOUS: str = "NORMAL" # Safe with WAL; FULL fsyncs on every commit
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000 # How long a connection waits for a lock before "database is locked"
+    SQLITE_CACHE_SIZE_KB: int = 20000 # Page cache per connection
+    DB_POOL_SIZE: int = 5 # Persistent connections per process (server databases)
+    DB_MAX_OVERFLOW: int = 10 # Extra connections allowed under load beyond DB_POOL_SIZE
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0 # Wait for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 1800 # Replace connections older than this (avoids server-side idle timeouts)
+    DB_POOL_PRE_PING: bool = True # Check connections on checkout so dropped ones are replaced transparently
 
     # JWT Settings
     SECRET_KEY: str = "your-secret-key"  # TODO: Load from environment variable for production
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 1440
+    AUTH_USER_CACHE_TTL_SECONDS: float = 30.0 # How long a token's resolved user is reused without querying the users table
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 4096 # Resolved users kept per process, LRU-evicted
+    BCRYPT_ROUNDS: int = 12 # bcrypt cost factor (2^N rounds) for new password hashes; older hashes are upgraded on the next login
+    PASSWORD_HASH_MAX_WORKERS: int = 4 # Threads that hash new passwords and verify logins off the event loop
 
     # Chat Summarization Settings
     CHAT_SUMMARIZATION_INTERVAL: int = 20  # Summarize after N total messages (user + AI)
     CHAT_MIN_MESSAGES_FOR_SUMMARY_TRIGGER: int = 30 # Min total messages before first summary
     CHAT_MIN_MESSAGES_FOR_SUMMARY_CRUD: int = 15 # Min messages in conversation before crud.update_conversation_summary attempts to summarize
     CHAT_RECENT_MESSAGES_TO_EXCLUDE_FROM_SUMMARY: int = 5 # Number of recent messages to keep out of summary, send as direct short-term context
+    CHAT_SUMMARY_MAX_ATTEMPTS: int = 3 # Background summarization attempts per job before giving up
+    CHAT_SUMMARY_RETRY_BASE_DELAY_SECONDS: float = 5.0 # Delay before the first retry; doubles on each further attempt
 
     class Config:
         env_file = ".env"
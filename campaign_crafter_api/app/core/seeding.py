@@ -5,6 +5,8 @@ from typing import List
 from sqlalchemy.orm import Session
 
 from app import crud, models # Standardized import
+from app.services.catalog_cache import bump_catalog_version
+from app.services.feature_cache import FEATURE_CATALOG_VERSION_NAME, feature_template_cache
 
 logger = logging.getLogger(__name__)
 # Base path for CSV files relative to this file (app/core/seeding.py)
@@ -98,6 +100,11 @@ def seed_features(db: Session):
                     created_count += 1
                     logger.info(f"Created feature: '{feature_name}' Category: '{feature_category}' Context: {required_context_list} Types: {compatible_types_list}")
 
+        if updated_count:
+            # In-place updates are not committed by crud.create_feature; publish them with a version bump
+            bump_catalog_version(db, FEATURE_CATALOG_VERSION_NAME)
+            db.commit()
+
         logger.info(f"--- Feature Seeding Finished ---")
         logger.info(f"Processed {processed_count} data rows. Created {created_count} new features. Updated {updated_count} existing features. Skipped {skipped_malformed} malformed rows.")
 
@@ -105,6 +112,9 @@ def seed_features(db: Session):
         logger.error(f": Features CSV file not found at {FEATURES_CSV_PATH}. Please ensure the file exists.")
     except Exception as e:
         logger.error(f"An error occurred during feature seeding: {e}")
+    finally:
+        # Whatever was applied, templates cached before seeding may now be stale
+        feature_template_cache.invalidate()
 
 
 def parse_roll_range(roll_str: str) -> tuple[int, int]:
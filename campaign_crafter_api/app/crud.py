@@ -1,31 +1,38 @@
-from typing import Optional, List, Dict # Added List and Dict
+from typing import Any, Optional, List, Dict, Iterator, Tuple # Added List and Dict
+import json
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.orm.attributes import flag_modified # Added for flagging JSON field modifications
-from sqlalchemy import text
+from sqlalchemy import text, func, insert, update, case, and_, or_
+from datetime import datetime, timezone
 from fastapi import HTTPException # Added HTTPException
-from passlib.context import CryptContext
 
 from app import models, orm_models # Standardized
+from app.db import AsyncDB
 from app.core.config import settings # Import settings
 from app.core.security import encrypt_key # Added for API key encryption
 from app.services.image_generation_service import ImageGenerationService
+from app.services.storage_backend import get_storage_backend
+from app.services.catalog_cache import bump_catalog_version
+from app.services.feature_cache import FEATURE_CATALOG_VERSION_NAME, feature_template_cache
+from app.services.roll_table_catalog import ROLL_TABLE_CATALOG_VERSION_NAME, RollTableRows, roll_table_catalog
+from app.services.user_cache import USER_CATALOG_VERSION_NAME, authenticated_user_cache
+from app.services.password_hasher import password_hasher
 from app.services.llm_service import AbstractLLMService, LLMGenerationError # Added this import
 from sqlalchemy.orm.attributes import flag_modified # Moved import to top
 # import asyncio # No longer needed here
-from urllib.parse import urlparse
 
 # --- Password Hashing Utilities ---
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
+# Sync helpers; async callers should use password_hasher's *_async methods to stay off the event loop
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    # Runs on the bounded hashing pool (used by create_user and password changes in update_user)
+    return password_hasher.hash_on_pool(password)
 
 # --- User CRUD Functions ---
-def create_user(db: Session, user: models.UserCreate) -> orm_models.User: # pwd_context is global
+def create_user(db: Session, user: models.UserCreate) -> orm_models.User:
     hashed_password = get_password_hash(user.password)
     db_user = orm_models.User(
         username=user.username,
@@ -52,7 +59,7 @@ def get_user_by_email(db: Session, email: str) -> Optional[orm_models.User]:
 def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[orm_models.User]:
     return db.query(orm_models.User).offset(skip).limit(limit).all()
 
-def update_user(db: Session, db_user: orm_models.User, user_in: models.UserUpdate) -> orm_models.User: # pwd_context is global
+def update_user(db: Session, db_user: orm_models.User, user_in: models.UserUpdate) -> orm_models.User:
     update_data = user_in.model_dump(exclude_unset=True) # Use model_dump for Pydantic v2
 
     if "password" in update_data and update_data["password"] is not None:
@@ -81,17 +88,29 @@ def update_user(db: Session, db_user: orm_models.User, user_in: models.UserUpdat
         db_user.avatar_url = user_in.avatar_url # Applies the value (could be None to clear)
 
     db.add(db_user)
+    bump_catalog_version(db, USER_CATALOG_VERSION_NAME)
     db.commit()
+    authenticated_user_cache.invalidate()
     db.refresh(db_user)
     return db_user
 
+def update_user_password_hash(db: Session, db_user: orm_models.User, hashed_password: str) -> orm_models.User:
+    """Stores a re-computed hash of the user's unchanged password (e.g. after the bcrypt cost changed)."""
+    # The hash is not part of the cached models.User, so the auth cache stays valid
+    db_user.hashed_password = hashed_password
+    db.add(db_user)
+    db.commit()
+    return db_user
+
 def delete_user(db: Session, user_id: int) -> Optional[orm_models.User]:
     db_user = get_user(db, user_id=user_id)
     if not db_user:
         return None
 
     db.delete(db_user)
+    bump_catalog_version(db, USER_CATALOG_VERSION_NAME)
     db.commit()
+    authenticated_user_cache.invalidate()
     return db_user
 
 def update_user_api_keys(db: Session, db_user: orm_models.User, api_keys_in: models.UserAPIKeyUpdate) -> orm_models.User:
@@ -120,7 +139,9 @@ def update_user_api_keys(db: Session, db_user: orm_models.User, api_keys_in: mod
             db_user.encrypted_other_llm_api_key = encrypt_key(api_keys_in.other_llm_api_key)
 
     db.add(db_user)
+    bump_catalog_version(db, USER_CATALOG_VERSION_NAME)
     db.commit()
+    authenticated_user_cache.invalidate()
     db.refresh(db_user)
     return db_user
 
@@ -142,39 +163,54 @@ def get_feature_by_name(db: Session, name: str, user_id: Optional[int] = None) -
         orm_models.Feature.user_id == None
     ).first()
 
+GENERIC_MASTER_FEATURE_NAME = "Generate Section Details - Generic"
+
+def _build_master_feature_index(db: Session) -> Tuple[Dict[str, int], Optional[int]]:
+    """
+    Maps every section type listed in a 'FullSection' feature's compatible_types to that
+    feature's id (lowest id wins), plus the id of the generic fallback feature.
+    compatible_types is decoded in Python so this works with both SQLite and PostgreSQL JSON.
+    """
+    rows = db.query(
+        orm_models.Feature.id, orm_models.Feature.name, orm_models.Feature.compatible_types
+    ).filter(
+        orm_models.Feature.feature_category == "FullSection"
+    ).order_by(orm_models.Feature.id).all()
+
+    type_to_feature_id: Dict[str, int] = {}
+    generic_feature_id: Optional[int] = None
+    for feature_id, name, compatible in rows:
+        # compatible_types could be a list or a JSON string
+        if isinstance(compatible, str):
+            try:
+                compatible = json.loads(compatible)
+            except (json.JSONDecodeError, TypeError):
+                compatible = []
+        for section_type in compatible or []:
+            if isinstance(section_type, str):
+                type_to_feature_id.setdefault(section_type, feature_id)
+        if generic_feature_id is None and name == GENERIC_MASTER_FEATURE_NAME:
+            generic_feature_id = feature_id
+    return type_to_feature_id, generic_feature_id
+
 def get_master_feature_for_type(db: Session, section_type: str) -> Optional[orm_models.Feature]:
     """
     Retrieves a 'FullSection' feature compatible with the given section_type.
     Tries to find a specific match first, then a generic 'FullSection' feature if no specific match.
-    Works with both SQLite and PostgreSQL.
+    Resolution goes through a type -> feature id index held in feature_template_cache, so it
+    costs one primary-key lookup however many features exist. Works with both SQLite and PostgreSQL.
     """
-    # Get all FullSection features and check compatible_types in Python
-    # This approach is database-agnostic (works with SQLite JSON and PostgreSQL JSONB)
-    full_section_features = db.query(orm_models.Feature).filter(
-        orm_models.Feature.feature_category == "FullSection"
-    ).all()
-    
-    # Check each feature's compatible_types for the section_type
-    for feature in full_section_features:
-        if feature.compatible_types:
-            # compatible_types could be a list or a JSON string
-            compatible = feature.compatible_types
-            if isinstance(compatible, str):
-                import json
-                try:
-                    compatible = json.loads(compatible)
-                except (json.JSONDecodeError, TypeError):
-                    compatible = []
-            if section_type in compatible:
-                return feature
-
-    # Fallback: If no specific match, try to find a generic "FullSection" feature
-    db_generic_feature = db.query(orm_models.Feature).filter(
-        orm_models.Feature.feature_category == "FullSection",
-        orm_models.Feature.name == "Generate Section Details - Generic"
-    ).first()
-
-    return db_generic_feature
+    for attempt in range(2):
+        type_to_feature_id, generic_feature_id = feature_template_cache.get_master_index(db, lambda: _build_master_feature_index(db))
+        feature_id = type_to_feature_id.get(section_type, generic_feature_id)
+        if feature_id is None:
+            return None
+        db_feature = db.get(orm_models.Feature, feature_id)
+        if db_feature is not None:
+            return db_feature
+        # Deleted by another worker since the index was built; rebuild once
+        feature_template_cache.invalidate()
+    return None
 
 
 def get_features(db: Session, skip: int = 0, limit: int = 100, user_id: Optional[int] = None) -> List[orm_models.Feature]:
@@ -193,7 +229,9 @@ def create_feature(db: Session, feature: models.FeatureCreate, user_id: Optional
     # The user_id explicitly passed to this function (from current_user or None for system features) takes precedence.
     db_feature = orm_models.Feature(**feature_data, user_id=user_id)
     db.add(db_feature)
+    bump_catalog_version(db, FEATURE_CATALOG_VERSION_NAME)
     db.commit()
+    feature_template_cache.invalidate()
     db.refresh(db_feature)
     return db_feature
 
@@ -207,7 +245,9 @@ def update_feature(db: Session, feature_id: int, feature_update: models.FeatureU
         setattr(db_feature, key, value)
 
     db.add(db_feature)
+    bump_catalog_version(db, FEATURE_CATALOG_VERSION_NAME)
     db.commit()
+    feature_template_cache.invalidate()
     db.refresh(db_feature)
     return db_feature
 
@@ -217,7 +257,9 @@ def delete_feature(db: Session, feature_id: int) -> Optional[orm_models.Feature]
         return None
 
     db.delete(db_feature)
+    bump_catalog_version(db, FEATURE_CATALOG_VERSION_NAME)
     db.commit()
+    feature_template_cache.invalidate()
     return db_feature
 
 # --- RollTable and RollTableItem CRUD Functions ---
@@ -240,6 +282,40 @@ def get_roll_table_by_name(db: Session, name: str, user_id: Optional[int] = None
         orm_models.RollTable.user_id == None
     ).first()
 
+def get_roll_table_names(db: Session, user_id: Optional[int] = None) -> List[str]:
+    """
+    Names of the roll tables visible to a user (their own plus system tables), without loading
+    full rows or items. A name shared by a user table and a system table is listed once.
+    """
+    query = db.query(orm_models.RollTable.name)
+    if user_id is not None:
+        query = query.filter((orm_models.RollTable.user_id == user_id) | (orm_models.RollTable.user_id == None))
+    else:
+        query = query.filter(orm_models.RollTable.user_id == None)
+    names: Dict[str, None] = {}
+    for (name,) in query.order_by(orm_models.RollTable.id):
+        names.setdefault(name, None)
+    return list(names)
+
+def get_roll_table_rows(db: Session, name: str, user_id: Optional[int]) -> Optional[RollTableRows]:
+    """
+    The description and (min_roll, max_roll, description) item rows of the table with this name
+    in exactly this scope (user_id=None is the system scope), or None if there is no such table.
+    Used to compile tables for roll_table_catalog.
+    """
+    table_row = db.query(orm_models.RollTable.id, orm_models.RollTable.description).filter(
+        orm_models.RollTable.name == name,
+        orm_models.RollTable.user_id == user_id
+    ).order_by(orm_models.RollTable.id).first()
+    if table_row is None:
+        return None
+    item_rows = db.query(
+        orm_models.RollTableItem.min_roll,
+        orm_models.RollTableItem.max_roll,
+        orm_models.RollTableItem.description
+    ).filter(orm_models.RollTableItem.roll_table_id == table_row.id).order_by(orm_models.RollTableItem.id).all()
+    return table_row.description, [tuple(row) for row in item_rows]
+
 def get_roll_tables(db: Session, skip: int = 0, limit: int = 100, user_id: Optional[int] = None) -> List[orm_models.RollTable]:
     query = db.query(orm_models.RollTable)
     if user_id is not None:
@@ -260,7 +336,9 @@ def create_roll_table(db: Session, roll_table: models.RollTableCreate, user_id:
     db_roll_table.items = [orm_models.RollTableItem(**item.model_dump()) for item in roll_table.items]
 
     db.add(db_roll_table)
+    bump_catalog_version(db, ROLL_TABLE_CATALOG_VERSION_NAME)
     db.commit()
+    roll_table_catalog.invalidate()
     db.refresh(db_roll_table)
     return db_roll_table
 
@@ -286,7 +364,9 @@ def update_roll_table(db: Session, roll_table_id: int, roll_table_update: models
         db_roll_table.items = new_items # Assign new list of items
 
     db.add(db_roll_table) # db.add() is used to stage changes, good practice.
+    bump_catalog_version(db, ROLL_TABLE_CATALOG_VERSION_NAME)
     db.commit()
+    roll_table_catalog.invalidate()
     db.refresh(db_roll_table)
     return db_roll_table
 
@@ -296,7 +376,9 @@ def delete_roll_table(db: Session, roll_table_id: int) -> Optional[orm_models.Ro
         return None
 
     db.delete(db_roll_table)
+    bump_catalog_version(db, ROLL_TABLE_CATALOG_VERSION_NAME)
     db.commit()
+    roll_table_catalog.invalidate()
     # The object is expired after commit, so we can return it as is if needed,
     # or None if we want to indicate it's no longer in DB.
     # For consistency with other delete functions, returning the object.
@@ -385,6 +467,8 @@ def delete_character(db: Session, character_id: int) -> Optional[orm_models.Char
     # If association entries need explicit deletion, that logic would go here.
     # Example: db_character.campaigns.clear() # If using SQLAlchemy's association proxy
 
+    for linked_campaign in db_character.campaigns:
+        touch_campaign(db, linked_campaign.id)
     db.delete(db_character)
     db.commit()
     return db_character
@@ -404,6 +488,7 @@ def add_character_to_campaign(db: Session, character_id: int, campaign_id: int)
     # Check if the character is already in the campaign to prevent duplicates
     if db_campaign not in db_character.campaigns:
         db_character.campaigns.append(db_campaign)
+        touch_campaign(db, campaign_id)
         db.commit()
         db.refresh(db_character)
     return db_character
@@ -413,10 +498,9 @@ def get_campaigns_for_character(db: Session, character_id: int) -> List[orm_mode
     Retrieves all campaigns associated with a specific character.
     Returns an empty list if the character is not found or has no associated campaigns.
     """
-    db_character = get_character(db, character_id=character_id)
-    if not db_character:
-        return [] # Character not found
-    return list(db_character.campaigns) # Access the relationship
+    return db.query(orm_models.Campaign).join(orm_models.Campaign.characters).filter(
+        orm_models.Character.id == character_id
+    ).order_by(orm_models.Campaign.id).all()
 def remove_character_from_campaign(db: Session, character_id: int, campaign_id: int) -> Optional[orm_models.Character]:
     """Removes a character from a campaign."""
     db_character = get_character(db, character_id)
@@ -429,6 +513,7 @@ def remove_character_from_campaign(db: Session, character_id: int, campaign_id:
 
     if db_campaign in db_character.campaigns:
         db_character.campaigns.remove(db_campaign)
+        touch_campaign(db, campaign_id)
         db.commit()
         db.refresh(db_character)
     return db_character
@@ -461,7 +546,9 @@ def copy_system_roll_table_to_user(db: Session, system_table: orm_models.RollTab
     ]
 
     db.add(user_roll_table)
+    bump_catalog_version(db, ROLL_TABLE_CATALOG_VERSION_NAME)
     db.commit()
+    roll_table_catalog.invalidate()
     db.refresh(user_roll_table)
     return user_roll_table
 
@@ -542,11 +629,80 @@ async def create_campaign(db: Session, campaign_payload: models.CampaignCreate,
     db.refresh(db_campaign)
     return db_campaign
 
-def get_campaign(db: Session, campaign_id: int) -> Optional[orm_models.Campaign]:
-    from sqlalchemy.orm import joinedload
-    
+def create_imported_campaign(db: Session, owner_id: int, title: str, concept: Optional[str] = None, commit: bool = True) -> orm_models.Campaign:
+    """
+    Creates a campaign from imported data as given, without LLM concept generation. With
+    commit=False it is only flushed (so it has an id) and committed with the caller's other writes.
+    """
+    db_campaign = orm_models.Campaign(
+        title=title,
+        initial_user_prompt=f"Imported: {title}" if not concept else "Imported campaign concept.",
+        concept=concept,
+        owner_id=owner_id
+    )
+    db.add(db_campaign)
+    if not commit:
+        db.flush()
+        return db_campaign
+    db.commit()
+    db.refresh(db_campaign)
+    return db_campaign
+
+def update_imported_campaign_details(db: Session, campaign_id: int, title: Optional[str] = None, concept: Optional[str] = None) -> None:
+    """Sets the title and/or concept of an imported campaign (None leaves a field unchanged)."""
+    values = {}
+    if title is not None:
+        values[orm_models.Campaign.title] = title
+    if concept is not None:
+        values[orm_models.Campaign.concept] = concept
+    if not values:
+        return
+    db.query(orm_models.Campaign).filter(orm_models.Campaign.id == campaign_id).update(values, synchronize_session=False)
+    touch_campaign(db, campaign_id)
+    db.commit()
+
+def touch_campaign(db: Session, campaign_id: int) -> None:
+    """
+    Marks a campaign as changed by bumping its `version` and `updated_at`, which the read endpoints
+    serve as ETag / Last-Modified. Every write to a campaign, its sections, its TOCs or its
+    character links calls this before committing; it does not commit itself.
+    """
+    db.query(orm_models.Campaign).filter(orm_models.Campaign.id == campaign_id).update(
+        {
+            orm_models.Campaign.version: orm_models.Campaign.version + 1,
+            orm_models.Campaign.updated_at: datetime.now(timezone.utc),
+        },
+        synchronize_session=False
+    )
+
+def get_campaign_validators(db: Session, campaign_id: int) -> Optional[Tuple[int, int, Optional[datetime]]]:
+    """(owner_id, version, updated_at) of a campaign, or None if it does not exist. Reads one row, no sections."""
+    row = db.query(
+        orm_models.Campaign.owner_id, orm_models.Campaign.version, orm_models.Campaign.updated_at
+    ).filter(orm_models.Campaign.id == campaign_id).first()
+    return tuple(row) if row else None
+
+def campaign_load_options(with_sections: bool = False, with_characters: bool = False) -> list:
+    """
+    Loader options for campaign queries. Relationships that are not requested stay lazy, so use
+    with_sections=True whenever the result is serialized as models.Campaign, and
+    models.CampaignHeader for listings that do not need sections.
+    """
+    options = []
+    if with_sections:
+        # One extra SELECT ... WHERE campaign_id IN (...) for all loaded campaigns, in section order (the relationship's order_by)
+        options.append(selectinload(orm_models.Campaign.sections))
+    if with_characters:
+        options.append(selectinload(orm_models.Campaign.characters))
+    return options
+
+def get_campaign(db: Session, campaign_id: int, with_sections: bool = False, with_characters: bool = True) -> Optional[orm_models.Campaign]:
+    """
+    Loads a campaign. Characters are loaded eagerly by default for the LLM prompt builders;
+    pass with_sections=True when the campaign is returned as models.Campaign.
+    """
     db_campaign = db.query(orm_models.Campaign).options(
-        joinedload(orm_models.Campaign.characters)
+        *campaign_load_options(with_sections=with_sections, with_characters=with_characters)
     ).filter(orm_models.Campaign.id == campaign_id).first()
     
     if db_campaign:
@@ -598,13 +754,16 @@ async def update_campaign(db: Session, campaign_id: int, campaign_update: models
 
             if deleted_urls:
                 image_service = ImageGenerationService()
+                # Moodboard URLs come from the client, so only blobs in the owner's own folder are deleted
+                owner_prefix = f"user_uploads/{db_campaign.owner_id}/"
                 for url_to_delete in deleted_urls:
                     try:
-                        parsed_url = urlparse(url_to_delete)
-                        # Assuming blob name is the last part of the path
-                        # e.g., https://<account>.blob.core.windows.net/<container>/<blob_name>
-                        blob_name = parsed_url.path.split('/')[-1]
-                        if blob_name:
+                        # The storage backend maps its own URLs back to the full blob path,
+                        # e.g. https://<account>.blob.core.windows.net/<container>/<blob_name>
+                        blob_name = get_storage_backend().blob_name_from_url(url_to_delete)
+                        if blob_name and (not blob_name.startswith(owner_prefix) or ".." in blob_name.split("/")):
+                            logger.warning(f"Not deleting blob outside the campaign owner's folder: {blob_name} (URL: {url_to_delete})")
+                        elif blob_name:
                             logger.debug(f"Attempting to delete blob: {blob_name} from URL: {url_to_delete}")
                             await image_service.delete_image_from_blob_storage(blob_name)
                         else:
@@ -615,6 +774,7 @@ async def update_campaign(db: Session, campaign_id: int, campaign_update: models
                         # Depending on policy, you might want to collect these errors rather than just print
 
         db.add(db_campaign) # Add to session, SQLAlchemy tracks changes
+        touch_campaign(db, campaign_id)
         db.commit()
         db.refresh(db_campaign)
     return db_campaign
@@ -626,10 +786,23 @@ def update_campaign_toc(db: Session, campaign_id: int, display_toc_content: List
         if homebrewery_toc_content is not None: # Only update if provided
             db_campaign.homebrewery_toc = homebrewery_toc_content
         # db.add(db_campaign) # Not strictly necessary as SQLAlchemy tracks changes on attached objects
+        touch_campaign(db, campaign_id)
         db.commit()
         db.refresh(db_campaign)
     return db_campaign
 
+def update_campaign_homebrewery_toc(db: Session, campaign_id: int, toc_markdown: str, fingerprint: str, model_id: Optional[str]) -> None:
+    """
+    Stores a generated Homebrewery TOC with the fingerprint of the section titles and model it
+    was generated from, so exports can reuse it until either changes.
+    """
+    db.query(orm_models.Campaign).filter(orm_models.Campaign.id == campaign_id).update(
+        {orm_models.Campaign.homebrewery_toc: [{"markdown_string": toc_markdown, "fingerprint": fingerprint, "model": model_id or ""}]},
+        synchronize_session=False
+    )
+    touch_campaign(db, campaign_id)
+    db.commit()
+
 async def delete_campaign(db: Session, campaign_id: int, user_id: int) -> Optional[orm_models.Campaign]:
     """Deletes a campaign after checking ownership and performing placeholder asset deletion tasks."""
     campaign = get_campaign(db, campaign_id)
@@ -674,6 +847,7 @@ async def delete_campaign(db: Session, campaign_id: int, user_id: int) -> Option
 def delete_sections_for_campaign(db: Session, campaign_id: int) -> int:
     """Deletes all sections associated with a given campaign_id. Returns the number of sections deleted."""
     num_deleted = db.query(orm_models.CampaignSection).filter(orm_models.CampaignSection.campaign_id == campaign_id).delete(synchronize_session=False)
+    touch_campaign(db, campaign_id)
     db.commit() # Commit after deletion
     return num_deleted
 
@@ -687,6 +861,7 @@ def create_section_with_placeholder_content(db: Session, campaign_id: int, title
         campaign_id=campaign_id
     )
     db.add(db_section)
+    touch_campaign(db, campaign_id)
     db.commit()
     db.refresh(db_section)
     return db_section
@@ -695,12 +870,11 @@ def get_campaign_sections(db: Session, campaign_id: int, skip: int = 0, limit: i
     return db.query(orm_models.CampaignSection).filter(orm_models.CampaignSection.campaign_id == campaign_id).order_by(orm_models.CampaignSection.order).offset(skip).limit(limit).all()
 
 def create_campaign_section(db: Session, campaign_id: int, section_title: Optional[str], section_content: str, section_type: Optional[str] = "generic") -> orm_models.CampaignSection:
-    existing_sections = get_campaign_sections(db=db, campaign_id=campaign_id, limit=1000) # Get all sections to determine order
-    max_order = -1
-    if existing_sections:
-        max_order = max(section.order for section in existing_sections if section.order is not None)
-    
-    new_order = max_order + 1
+    # New sections go last; MAX(order) avoids loading every existing section's content
+    max_order = db.query(func.max(orm_models.CampaignSection.order)).filter(
+        orm_models.CampaignSection.campaign_id == campaign_id
+    ).scalar()
+    new_order = (max_order if max_order is not None else -1) + 1
 
     db_section = orm_models.CampaignSection(
         title=section_title,
@@ -710,10 +884,73 @@ def create_campaign_section(db: Session, campaign_id: int, section_title: Option
         campaign_id=campaign_id
     )
     db.add(db_section)
+    touch_campaign(db, campaign_id)
     db.commit()
     db.refresh(db_section)
     return db_section
 
+def create_campaign_sections_bulk(db: Session, campaign_id: int, sections: List[Dict[str, Any]], commit: bool = True) -> List[int]:
+    """
+    Appends sections (dicts with "content" and optionally "title" and "type") after the
+    campaign's existing ones, in list order. Orders are assigned in one go from MAX(order) + 1
+    and the rows are written with multi-row INSERTs of settings.SECTION_BULK_INSERT_CHUNK_SIZE
+    sections, all in one transaction (committed unless commit=False). Returns the ids of the
+    new sections, taken from INSERT ... RETURNING (the orders are not locked, so a concurrent
+    append can be given the same ones).
+    """
+    max_order = db.query(func.max(orm_models.CampaignSection.order)).filter(
+        orm_models.CampaignSection.campaign_id == campaign_id
+    ).scalar()
+    first_order = (max_order if max_order is not None else -1) + 1
+    if not sections:
+        return []
+
+    rows = [
+        {
+            "campaign_id": campaign_id,
+            "title": section.get("title"),
+            "content": section["content"],
+            "type": section.get("type") or "generic",
+            "order": first_order + index,
+        }
+        for index, section in enumerate(sections)
+    ]
+    chunk_size = max(settings.SECTION_BULK_INSERT_CHUNK_SIZE, 1)
+    section_ids: List[int] = []
+    for start in range(0, len(rows), chunk_size):
+        section_ids.extend(db.execute(
+            insert(orm_models.CampaignSection).values(rows[start:start + chunk_size]).returning(orm_models.CampaignSection.id)
+        ).scalars().all())
+    touch_campaign(db, campaign_id)
+    if commit:
+        db.commit()
+    return section_ids
+
+def get_campaign_sections_by_ids(db: Session, campaign_id: int, section_ids: List[int]) -> List[orm_models.CampaignSection]:
+    """The campaign's sections with the given ids (e.g. those returned by create_campaign_sections_bulk), in section order."""
+    if not section_ids:
+        return []
+    return db.query(orm_models.CampaignSection).filter(
+        orm_models.CampaignSection.campaign_id == campaign_id,
+        orm_models.CampaignSection.id.in_(section_ids)
+    ).order_by(orm_models.CampaignSection.order, orm_models.CampaignSection.id).all()
+
+def append_campaign_section_content(db: Session, section_id: int, campaign_id: int, text_to_add: str, prepend: bool = False) -> None:
+    """
+    Adds text to the end (or start) of a section's content in the database, so the existing
+    content is never loaded; used to build up a section from many imported files.
+    """
+    content = orm_models.CampaignSection.content
+    db.query(orm_models.CampaignSection).filter(
+        orm_models.CampaignSection.id == section_id,
+        orm_models.CampaignSection.campaign_id == campaign_id
+    ).update(
+        {content: (text_to_add + func.coalesce(content, "")) if prepend else (func.coalesce(content, "") + text_to_add)},
+        synchronize_session=False
+    )
+    touch_campaign(db, campaign_id)
+    db.commit()
+
 def get_section(db: Session, section_id: int, campaign_id: int) -> Optional[orm_models.CampaignSection]:
     return db.query(orm_models.CampaignSection).filter(
         orm_models.CampaignSection.id == section_id,
@@ -730,6 +967,7 @@ def update_campaign_section(db: Session, section_id: int, campaign_id: int, sect
             setattr(db_section, key, value)
         
         db.add(db_section) # Add to session before commit, though often tracked
+        touch_campaign(db, campaign_id)
         db.commit()
         db.refresh(db_section)
     return db_section
@@ -740,6 +978,7 @@ def delete_campaign_section(db: Session, section_id: int, campaign_id: int) -> O
         return None
 
     db.delete(db_section)
+    touch_campaign(db, campaign_id)
     db.commit()
     # After commit, the db_section object is expired. If you need to return the object
     # with its state before deletion, you might need to handle it differently,
@@ -747,37 +986,111 @@ def delete_campaign_section(db: Session, section_id: int, campaign_id: int) -> O
     # returning the object, though its state in session might be "deleted".
     return db_section
 
+def get_campaign_section_titles(db: Session, campaign_id: int) -> List[Optional[str]]:
+    """Section titles in display order, without loading content."""
+    rows = db.query(orm_models.CampaignSection.title).filter(
+        orm_models.CampaignSection.campaign_id == campaign_id
+    ).order_by(orm_models.CampaignSection.order, orm_models.CampaignSection.id).all()
+    return [title for (title,) in rows]
+
+def iter_campaign_section_batches(db: Session, campaign_id: int, batch_size: int) -> Iterator[List[orm_models.CampaignSection]]:
+    """
+    Yields the campaign's sections in display order, `batch_size` at a time. Each batch is one
+    keyset query on (order, id), so only one batch of section content is held at a time.
+    """
+    section = orm_models.CampaignSection
+    last_key: Optional[Tuple[int, int]] = None
+    while True:
+        query = db.query(section).filter(section.campaign_id == campaign_id)
+        if last_key is not None:
+            last_order, last_id = last_key
+            query = query.filter(or_(section.order > last_order, and_(section.order == last_order, section.id > last_id)))
+        batch = query.order_by(section.order, section.id).limit(batch_size).all()
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        last_key = (batch[-1].order, batch[-1].id)
+
+def get_campaign_section_order(db: Session, campaign_id: int) -> List[Tuple[int, int]]:
+    """(section id, order) for every section in the campaign, in display order, without loading content."""
+    rows = db.query(orm_models.CampaignSection.id, orm_models.CampaignSection.order).filter(
+        orm_models.CampaignSection.campaign_id == campaign_id
+    ).order_by(orm_models.CampaignSection.order, orm_models.CampaignSection.id).all()
+    return [(section_id, order) for section_id, order in rows]
+
+def _set_section_orders(db: Session, campaign_id: int, new_orders: Dict[int, int]) -> int:
+    """
+    Writes `order` for the given section ids with a single UPDATE ... CASE statement and returns
+    the number of rows matched. Does not commit.
+    """
+    if not new_orders:
+        return 0
+    stmt = (
+        update(orm_models.CampaignSection)
+        .where(
+            orm_models.CampaignSection.campaign_id == campaign_id,
+            orm_models.CampaignSection.id.in_(list(new_orders)),
+        )
+        .values(order=case(new_orders, value=orm_models.CampaignSection.id))
+        # Sections loaded in this session are expired on commit; nothing to evaluate in Python
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).rowcount
+
 async def update_section_order(db: Session, campaign_id: int, ordered_section_ids: List[int]):
     """
     Updates the order of sections for a given campaign.
+    Only sections whose position actually changes are written, in one UPDATE statement; section
+    content is never loaded.
     :param db: The database session.
     :param campaign_id: The ID of the campaign whose sections are to be reordered.
     :param ordered_section_ids: A list of section IDs in their new desired order.
     """
-    # Fetch sections that belong to the campaign and are in the provided list
-    sections_to_update = db.query(orm_models.CampaignSection).filter(
-        orm_models.CampaignSection.campaign_id == campaign_id,
-        orm_models.CampaignSection.id.in_(ordered_section_ids)
-    ).all()
-
-    # Create a dictionary for quick lookups of sections by ID
-    section_map = {section.id: section for section in sections_to_update}
+    current_orders = dict(get_campaign_section_order(db, campaign_id))
 
+    new_orders = {}
     for index, section_id in enumerate(ordered_section_ids):
-        if section_id in section_map:
-            section = section_map[section_id]
-            if section.order != index: # Only update if the order has actually changed
-                section.order = index
-                db.add(section) # Add to session to mark for update
-        else:
+        if section_id not in current_orders:
             # This case should ideally be prevented by checks in the API endpoint
-            # If a section_id is provided that doesn't belong to the campaign or doesn't exist,
-            # it will be ignored here, or you could raise an error.
             logger.warning(f": Section ID {section_id} not found in campaign {campaign_id} during order update.")
+        elif current_orders[section_id] != index: # Only update if the order has actually changed
+            new_orders[section_id] = index
+
+    if _set_section_orders(db, campaign_id, new_orders):
+        touch_campaign(db, campaign_id)
+    db.commit()
+
+def move_campaign_section(db: Session, campaign_id: int, section_id: int, new_position: int) -> Optional[List[int]]:
+    """
+    Moves one section to `new_position` (0-based, clamped to the campaign's sections) and shifts
+    the sections in between by one place. Only the sections between the old and new position are
+    written: they swap `order` values among themselves, so sections outside that range (and any
+    gaps in the numbering) are left as they are.
+    Returns the section ids in their new order, or None if the section is not in the campaign.
+    """
+    ordering = get_campaign_section_order(db, campaign_id)
+    section_ids = [sid for sid, _ in ordering]
+    if section_id not in section_ids:
+        return None
 
+    old_position = section_ids.index(section_id)
+    new_position = max(0, min(new_position, len(section_ids) - 1))
+    if new_position == old_position:
+        return section_ids
+
+    section_ids.insert(new_position, section_ids.pop(old_position))
+    low, high = sorted((old_position, new_position))
+    # Each slot in the affected range keeps its order value; the ids occupying it change
+    new_orders = {
+        section_ids[position]: ordering[position][1]
+        for position in range(low, high + 1)
+    }
+    if _set_section_orders(db, campaign_id, new_orders):
+        touch_campaign(db, campaign_id)
     db.commit()
-    # No specific return value needed, or perhaps return the updated sections if desired.
-    # For a 204 response, nothing needs to be returned by the CRUD usually.
+    return section_ids
 
 # LLMConfig CRUD functions (example, can be expanded)
 # def create_llm_config(db: Session, config: models.LLMConfigCreate, owner_id: int) -> orm_models.LLMConfig:
@@ -828,12 +1141,43 @@ async def generate_character_aspect_text_new(
     )
     return generated_text
 
-def get_all_campaigns(db: Session):
-    from sqlalchemy.orm import joinedload
+def get_all_campaigns(db: Session, with_sections: bool = False) -> List[orm_models.Campaign]:
     return db.query(orm_models.Campaign).options(
-        joinedload(orm_models.Campaign.characters)
+        *campaign_load_options(with_sections=with_sections, with_characters=True)
     ).all()
 
+# Columns returned by the campaign summary listing; the large concept and
+# homebrewery_export text columns are deliberately left out.
+CAMPAIGN_SUMMARY_COLUMNS = (
+    orm_models.Campaign.id,
+    orm_models.Campaign.owner_id,
+    orm_models.Campaign.title,
+    orm_models.Campaign.initial_user_prompt,
+    orm_models.Campaign.badge_image_url,
+    orm_models.Campaign.thematic_image_url,
+    orm_models.Campaign.selected_llm_id,
+    orm_models.Campaign.temperature,
+)
+
+def _owner_campaigns_page(query, owner_id: int, limit: Optional[int], after_id: Optional[int]):
+    # Keyset pagination on the primary key, served by ix_campaigns_owner_id_id
+    query = query.filter(orm_models.Campaign.owner_id == owner_id)
+    if after_id is not None:
+        query = query.filter(orm_models.Campaign.id > after_id)
+    query = query.order_by(orm_models.Campaign.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+def get_campaigns_by_owner(db: Session, owner_id: int, limit: Optional[int] = None, after_id: Optional[int] = None, with_sections: bool = False) -> List[orm_models.Campaign]:
+    """Returns the owner's campaigns ordered by id, starting after `after_id` (keyset pagination)."""
+    query = db.query(orm_models.Campaign).options(*campaign_load_options(with_sections=with_sections))
+    return _owner_campaigns_page(query, owner_id, limit, after_id).all()
+
+def get_campaign_summaries_by_owner(db: Session, owner_id: int, limit: Optional[int] = None, after_id: Optional[int] = None):
+    """Like get_campaigns_by_owner, but selects only CAMPAIGN_SUMMARY_COLUMNS."""
+    return _owner_campaigns_page(db.query(*CAMPAIGN_SUMMARY_COLUMNS), owner_id, limit, after_id).all()
+
 # --- GeneratedImage CRUD Functions ---
 def delete_generated_image_by_blob_name(db: Session, blob_name: str, user_id: int) -> Optional[orm_models.GeneratedImage]:
     """
@@ -941,14 +1285,13 @@ async def generate_character_aspect_text(
         raise Exception(f"Failed to generate character aspect: {str(e)}") # To be caught by API endpoint
 
 
-# --- New ChatMessage CRUD Functions (Single JSON history per character-user pair) ---
+# --- ChatMessage CRUD Functions (conversation row + append-only chat_message_entries) ---
 
 def get_or_create_user_character_conversation(db: Session, character_id: int, user_id: int) -> orm_models.ChatMessage:
     """
     Retrieves the single conversation record for a character and user.
-    If no record exists, it creates a new one with an empty conversation history.
-    The 'conversation_history' field in the ORM model is expected to be a JSON type
-    that SQLAlchemy handles for list-to-JSON string conversion.
+    If no record exists, it creates a new one with no messages.
+    The messages themselves are stored in chat_message_entries and are not loaded here.
     """
     # Attempt to fetch the existing conversation record
     conversation_record = db.query(orm_models.ChatMessage).filter(
@@ -958,45 +1301,100 @@ def get_or_create_user_character_conversation(db: Session, character_id: int, us
 
     if not conversation_record:
         # Create a new record if one doesn't exist
-        # The 'conversation_history' field in orm_models.ChatMessage has default=[]
         # The 'updated_at' field has server_default and onupdate triggers
         conversation_record = orm_models.ChatMessage(
             character_id=character_id,
-            user_id=user_id
-            # conversation_history will use its default=[]
+            user_id=user_id,
+            message_count=0
         )
         db.add(conversation_record)
         db.commit()
         db.refresh(conversation_record)
-        # logger.debug(f"CRUD: Created new conversation record for char_id={character_id}, user_id={user_id}") # Debug print
-    else:
-        # logger.debug(f"CRUD: Fetched existing conversation record for char_id={character_id}, user_id={user_id}") # Debug print
-        # Ensure conversation_history is a list if it was NULL from DB and default didn't apply post-load
-        if conversation_record.conversation_history is None:
-            conversation_record.conversation_history = []
 
     return conversation_record
 
-def update_user_character_conversation(
+def chat_entry_to_dict(entry: orm_models.ChatMessageEntry) -> Dict:
+    """Shape of a message as returned by the chat API: {"speaker", "text", "timestamp" (ISO string)}."""
+    timestamp = entry.timestamp
+    return {
+        "speaker": entry.speaker,
+        "text": entry.text,
+        "timestamp": timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp
+    }
+
+def append_conversation_messages(
     db: Session,
     conversation_record: orm_models.ChatMessage,
-    new_history_list: List[Dict] # Expects a list of dicts, e.g. [{"speaker": "user", "text": "hi", "timestamp": "iso_str"}]
+    messages: List[Dict] # e.g. [{"speaker": "user", "text": "hi", "timestamp": datetime}]
 ) -> orm_models.ChatMessage:
     """
-    Updates the 'conversation_history' of a given conversation record.
-    SQLAlchemy's JSON type should handle the serialization of the Python list of dicts.
+    Appends messages to a conversation in one transaction. Only the new rows are written;
+    the conversation row just has its message_count bumped, so a turn costs the same
+    regardless of how long the history already is.
     """
-    conversation_record.conversation_history = new_history_list
-    # The 'updated_at' field should update automatically via onupdate=func.now() if defined in ORM
-    db.add(conversation_record) # Add to session to ensure it's persisted
+    for message in messages:
+        timestamp = message.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        db.add(orm_models.ChatMessageEntry(
+            conversation_id=conversation_record.id,
+            speaker=message["speaker"],
+            text=message["text"],
+            timestamp=timestamp or datetime.utcnow()
+        ))
+    # Increment in SQL so concurrent turns don't lose counts
+    conversation_record.message_count = orm_models.ChatMessage.message_count + len(messages)
+    conversation_record.updated_at = func.now()
+    db.add(conversation_record)
     db.commit()
     db.refresh(conversation_record)
-    # logger.debug(f"CRUD: Updated conversation record for char_id={conversation_record.character_id}, user_id={conversation_record.user_id}") # Debug print
     return conversation_record
 
-# Old ChatMessage CRUD functions are now removed.
-# The new functions get_or_create_user_character_conversation and
-# update_user_character_conversation handle the new JSON-based storage.
+def get_recent_conversation_messages(db: Session, conversation_id: int, limit: int) -> List[Dict]:
+    """Returns the last `limit` messages of a conversation, oldest first."""
+    if limit <= 0:
+        return []
+    newest_first = db.query(orm_models.ChatMessageEntry).filter(
+        orm_models.ChatMessageEntry.conversation_id == conversation_id
+    ).order_by(orm_models.ChatMessageEntry.id.desc()).limit(limit).all()
+    return [chat_entry_to_dict(entry) for entry in reversed(newest_first)]
+
+def get_conversation_messages_page(
+    db: Session,
+    conversation_id: int,
+    limit: int,
+    before_id: Optional[int] = None
+) -> Tuple[List[Dict], bool]:
+    """
+    Returns up to `limit` messages newest first, older than `before_id` if given
+    (keyset pagination on the entry id), and whether older messages remain.
+    Each message dict also carries its `id`.
+    """
+    query = db.query(orm_models.ChatMessageEntry).filter(
+        orm_models.ChatMessageEntry.conversation_id == conversation_id
+    )
+    if before_id is not None:
+        query = query.filter(orm_models.ChatMessageEntry.id < before_id)
+    # One extra row tells us whether another page exists without a COUNT
+    entries = query.order_by(orm_models.ChatMessageEntry.id.desc()).limit(limit + 1).all()
+    has_more = len(entries) > limit
+    return [{"id": entry.id, **chat_entry_to_dict(entry)} for entry in entries[:limit]], has_more
+
+def get_conversation_messages(db: Session, conversation_id: int) -> List[Dict]:
+    """Returns every message of a conversation, oldest first."""
+    entries = db.query(orm_models.ChatMessageEntry).filter(
+        orm_models.ChatMessageEntry.conversation_id == conversation_id
+    ).order_by(orm_models.ChatMessageEntry.id).all()
+    return [chat_entry_to_dict(entry) for entry in entries]
+
+def clear_conversation_messages(db: Session, conversation_record: orm_models.ChatMessage) -> None:
+    """Deletes all messages of a conversation, keeping the conversation row and its memory summary."""
+    db.query(orm_models.ChatMessageEntry).filter(
+        orm_models.ChatMessageEntry.conversation_id == conversation_record.id
+    ).delete(synchronize_session=False)
+    conversation_record.message_count = 0
+    db.add(conversation_record)
+    db.commit()
 
 async def update_conversation_summary(
     db: Session,
@@ -1005,12 +1403,14 @@ async def update_conversation_summary(
     current_user_model: models.User,
     character_name: str,
     character_notes: Optional[str],
-    append_to_existing_summary: bool = False
+    append_to_existing_summary: bool = False,
+    raise_errors: bool = False
 ) -> None:
     """
     Generates a summary of the conversation history.
     If append_to_existing_summary is True, it appends the new summary to the existing one.
     Otherwise, it replaces the existing summary.
+    With raise_errors, LLM/DB failures are re-raised (the background queue retries them) instead of only logged.
     """
     # from sqlalchemy.orm.attributes import flag_modified # Moved to top-level import
 
@@ -1018,7 +1418,7 @@ async def update_conversation_summary(
     # MIN_MESSAGES_FOR_SUMMARY_CRUD was defined in config.py
     # RECENT_MESSAGES_TO_EXCLUDE_FROM_SUMMARY was defined in config.py
 
-    history_list: List[Dict] = conversation_orm.conversation_history or []
+    history_list: List[Dict] = get_conversation_messages(db, conversation_orm.id)
 
     if len(history_list) < settings.CHAT_MIN_MESSAGES_FOR_SUMMARY_CRUD:
         # This is a normal operational log, not necessarily a debug print, so it can stay.
@@ -1079,6 +1479,8 @@ async def update_conversation_summary(
     except Exception as e:
         # Using a more structured log for errors
         logger.error(f":CRUD:update_conversation_summary: Failed for char_id={conversation_orm.character_id}, user_id={conversation_orm.user_id}. Error: {e}")
+        if raise_errors:
+            raise
         # Optionally re-raise or handle. For now, just logging as per plan.
         # However, create_chat_message in the endpoint commits, so this runs in its own transaction context effectively if called after.
 
@@ -1088,7 +1490,7 @@ async def summarize_and_clear_conversation(db: Session, character_id: int, user_
     and then clears the conversation history.
     """
     conversation_orm = get_or_create_user_character_conversation(db, character_id, user_id)
-    if not conversation_orm.conversation_history:
+    if not conversation_orm.message_count:
         logger.debug(f"CRUD: No conversation history to summarize or clear for char_id={character_id}, user_id={user_id}.")
         return
 
@@ -1129,8 +1531,108 @@ async def summarize_and_clear_conversation(db: Session, character_id: int, user_
         raise HTTPException(status_code=500, detail="Failed to summarize conversation before clearing.")
 
     # After successful summarization and appending, clear the history.
-    conversation_orm.conversation_history = []
-    flag_modified(conversation_orm, "conversation_history")
-    db.add(conversation_orm)
-    db.commit()
+    clear_conversation_messages(db, conversation_orm)
     logger.debug(f"CRUD: Summarized and cleared conversation history for char_id={character_id}, user_id={user_id}.")
+
+
+# --- Async variants of the hot paths (async endpoints) ---
+# Each runs the sync function above through AsyncDB.run_sync and returns response models
+# built inside that call, so no lazy load happens on the event loop afterwards.
+
+def _campaign_model(db: Session, campaign_id: int) -> Optional[models.Campaign]:
+    db_campaign = get_campaign(db, campaign_id=campaign_id, with_sections=True, with_characters=False)
+    return models.Campaign.model_validate(db_campaign) if db_campaign else None
+
+async def get_campaign_async(db: AsyncDB, campaign_id: int) -> Optional[models.Campaign]:
+    return await db.run_sync(_campaign_model, campaign_id)
+
+def _campaign_owner_id(db: Session, campaign_id: int) -> Optional[int]:
+    return db.query(orm_models.Campaign.owner_id).filter(orm_models.Campaign.id == campaign_id).scalar()
+
+async def get_campaign_owner_id_async(db: AsyncDB, campaign_id: int) -> Optional[int]:
+    """Owner of a campaign (None if it does not exist), without loading the campaign row."""
+    return await db.run_sync(_campaign_owner_id, campaign_id)
+
+async def get_campaign_validators_async(db: AsyncDB, campaign_id: int) -> Optional[Tuple[int, int, Optional[datetime]]]:
+    return await db.run_sync(get_campaign_validators, campaign_id)
+
+def _campaign_models_by_owner(db: Session, owner_id: int, limit: Optional[int], after_id: Optional[int]) -> List[models.CampaignHeader]:
+    return [models.CampaignHeader.model_validate(c) for c in get_campaigns_by_owner(db, owner_id=owner_id, limit=limit, after_id=after_id)]
+
+async def get_campaigns_by_owner_async(db: AsyncDB, owner_id: int, limit: Optional[int] = None, after_id: Optional[int] = None) -> List[models.CampaignHeader]:
+    return await db.run_sync(_campaign_models_by_owner, owner_id, limit, after_id)
+
+def _campaign_summary_models_by_owner(db: Session, owner_id: int, limit: Optional[int], after_id: Optional[int]) -> List[models.CampaignSummary]:
+    return [models.CampaignSummary.model_validate(row) for row in get_campaign_summaries_by_owner(db, owner_id=owner_id, limit=limit, after_id=after_id)]
+
+async def get_campaign_summaries_by_owner_async(db: AsyncDB, owner_id: int, limit: Optional[int] = None, after_id: Optional[int] = None) -> List[models.CampaignSummary]:
+    return await db.run_sync(_campaign_summary_models_by_owner, owner_id, limit, after_id)
+
+def _section_models(db: Session, campaign_id: int) -> List[models.CampaignSection]:
+    return [models.CampaignSection.model_validate(s) for s in get_campaign_sections(db, campaign_id=campaign_id)]
+
+async def get_campaign_sections_async(db: AsyncDB, campaign_id: int) -> List[models.CampaignSection]:
+    return await db.run_sync(_section_models, campaign_id)
+
+def _updated_section_model(db: Session, section_id: int, campaign_id: int, section_update_data: models.CampaignSectionUpdateInput) -> Optional[models.CampaignSection]:
+    db_section = update_campaign_section(db, section_id=section_id, campaign_id=campaign_id, section_update_data=section_update_data)
+    return models.CampaignSection.model_validate(db_section) if db_section else None
+
+async def update_campaign_section_async(db: AsyncDB, section_id: int, campaign_id: int, section_update_data: models.CampaignSectionUpdateInput) -> Optional[models.CampaignSection]:
+    return await db.run_sync(_updated_section_model, section_id, campaign_id, section_update_data)
+
+def _deleted_section_model(db: Session, section_id: int, campaign_id: int) -> Optional[models.CampaignSection]:
+    db_section = get_section(db, section_id=section_id, campaign_id=campaign_id)
+    if not db_section:
+        return None
+    section_model = models.CampaignSection.model_validate(db_section) # Snapshot before the row is gone
+    delete_campaign_section(db, section_id=section_id, campaign_id=campaign_id)
+    return section_model
+
+async def delete_campaign_section_async(db: AsyncDB, section_id: int, campaign_id: int) -> Optional[models.CampaignSection]:
+    return await db.run_sync(_deleted_section_model, section_id, campaign_id)
+
+def _created_section_models(db: Session, campaign_id: int, sections: List[Dict[str, Any]]) -> List[models.CampaignSection]:
+    section_ids = create_campaign_sections_bulk(db, campaign_id=campaign_id, sections=sections)
+    return [models.CampaignSection.model_validate(s) for s in get_campaign_sections_by_ids(db, campaign_id=campaign_id, section_ids=section_ids)]
+
+async def create_campaign_sections_bulk_async(db: AsyncDB, campaign_id: int, sections: List[Dict[str, Any]]) -> List[models.CampaignSection]:
+    return await db.run_sync(_created_section_models, campaign_id, sections)
+
+async def move_campaign_section_async(db: AsyncDB, campaign_id: int, section_id: int, new_position: int) -> Optional[List[int]]:
+    return await db.run_sync(move_campaign_section, campaign_id, section_id, new_position)
+
+def _character_model(db: Session, character_id: int) -> Optional[models.Character]:
+    db_character = get_character(db, character_id=character_id)
+    return models.Character.model_validate(db_character) if db_character else None
+
+async def get_character_async(db: AsyncDB, character_id: int) -> Optional[models.Character]:
+    return await db.run_sync(_character_model, character_id)
+
+def _chat_context(db: Session, character_id: int, user_id: int, history_limit: int) -> Tuple[int, Optional[str], List[Dict]]:
+    conversation_record = get_or_create_user_character_conversation(db, character_id=character_id, user_id=user_id)
+    recent_messages = get_recent_conversation_messages(db, conversation_id=conversation_record.id, limit=history_limit)
+    return conversation_record.id, conversation_record.memory_summary, recent_messages
+
+async def get_chat_context_async(db: AsyncDB, character_id: int, user_id: int, history_limit: int) -> Tuple[int, Optional[str], List[Dict]]:
+    """
+    (conversation id, memory summary, last `history_limit` messages oldest first) for a
+    character and user, creating the conversation row if needed.
+    """
+    return await db.run_sync(_chat_context, character_id, user_id, history_limit)
+
+def _append_messages(db: Session, conversation_id: int, messages: List[Dict]) -> int:
+    conversation_record = db.get(orm_models.ChatMessage, conversation_id)
+    return append_conversation_messages(db, conversation_record=conversation_record, messages=messages).message_count
+
+async def append_conversation_messages_async(db: AsyncDB, conversation_id: int, messages: List[Dict]) -> int:
+    """Appends messages like append_conversation_messages and returns the new message_count."""
+    return await db.run_sync(_append_messages, conversation_id, messages)
+
+def _chat_history_page(db: Session, character_id: int, user_id: int, limit: int, before_id: Optional[int]) -> Tuple[List[Dict], bool]:
+    conversation_record = get_or_create_user_character_conversation(db, character_id=character_id, user_id=user_id)
+    return get_conversation_messages_page(db, conversation_id=conversation_record.id, limit=limit, before_id=before_id)
+
+async def get_chat_history_page_async(db: AsyncDB, character_id: int, user_id: int, limit: int, before_id: Optional[int] = None) -> Tuple[List[Dict], bool]:
+    """One page of a character/user conversation, as get_conversation_messages_page."""
+    return await db.run_sync(_chat_history_page, character_id, user_id, limit, before_id)
@@ -1,23 +1,144 @@
-from sqlalchemy import create_engine
+import asyncio
+import importlib.util
+import logging
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings # Standardized
 
+logger = logging.getLogger(__name__)
+
 # DATABASE_URL is now managed by settings
 # Handle Render.com's postgres:// URL format (SQLAlchemy requires postgresql://)
 database_url = settings.DATABASE_URL
 if database_url.startswith("postgres://"):
     database_url = database_url.replace("postgres://", "postgresql://", 1)
 
-# For SQLite, connect_args might be needed if using check_same_thread=False, but default is fine for now.
-engine_args = {}
-if database_url.startswith("sqlite"):
-    engine_args["connect_args"] = {"check_same_thread": False} # Common for FastAPI + SQLite
 
-engine = create_engine(database_url, **engine_args)
+def sqlite_pragmas() -> Dict[str, Any]:
+    """PRAGMAs applied to every new SQLite connection, from settings."""
+    return {
+        # WAL lets readers run alongside a writer instead of failing with "database is locked"
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB, # Negative values are KiB, not pages
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def engine_profile(url: str) -> Dict[str, Any]:
+    """
+    create_engine keyword arguments for a database URL. SQLite gets a thread-safe connection
+    (pragmas are applied by create_database_engine); server databases get the pool settings.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        # For FastAPI + SQLite; the connect timeout matches busy_timeout (in seconds)
+        return {"connect_args": {"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def create_database_engine(url: str, **overrides: Any) -> Engine:
+    """Creates a sync engine with the profile for its database (see engine_profile)."""
+    db_engine = create_engine(url, **{**engine_profile(url), **overrides})
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine, "connect", _apply_sqlite_pragmas)
+    return db_engine
+
+
+engine_args = engine_profile(database_url)
+engine = create_database_engine(database_url)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# --- Async access ---
+# Needs SQLAlchemy's asyncio extension (the greenlet package) and an async driver for the
+# configured database; without them async endpoints run their database work on worker threads.
+ASYNC_DRIVERS = {"sqlite": ("aiosqlite", "sqlite+aiosqlite"), "postgresql": ("asyncpg", "postgresql+asyncpg")}
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+except ImportError: # greenlet is not installed
+    AsyncSession = async_sessionmaker = create_async_engine = None
+
+
+def _async_engine_args(sync_url: str) -> Optional[tuple]:
+    """(async URL, engine kwargs) for the sync URL, or None if no async driver is available."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL, {}
+    url = make_url(sync_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        return None
+    driver_module, async_drivername = ASYNC_DRIVERS[backend]
+    if importlib.util.find_spec(driver_module) is None:
+        return None
+    async_args = {}
+    if backend == "sqlite":
+        async_args["connect_args"] = {"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000} # aiosqlite has no check_same_thread
+    if backend == "postgresql" and "sslmode" in url.query:
+        # asyncpg takes the SSL mode as a connect argument, not a URL parameter
+        async_args["connect_args"] = {"ssl": url.query["sslmode"]}
+        url = url.difference_update_query(["sslmode"])
+    return url.set(drivername=async_drivername).render_as_string(hide_password=False), async_args
+
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DB_ENABLED and create_async_engine is not None:
+    _async_config = _async_engine_args(database_url)
+    if _async_config is not None:
+        async_engine = create_async_engine(_async_config[0], **{**engine_args, **_async_config[1]})
+        if async_engine.dialect.name == "sqlite":
+            event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        # Objects stay usable after commit; nothing may lazy-load outside run_sync
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+if AsyncSessionLocal is None:
+    logger.info("Async database driver not available; async endpoints run database work on worker threads.")
+
+T = TypeVar("T")
+
+
+class AsyncDB:
+    """
+    Database handle for async endpoints (see get_async_db).
+
+    `run_sync(fn, ...)` calls `fn(session, ...)` with a regular ORM Session, so the sync crud
+    functions can be reused as they are, without blocking the event loop: through
+    AsyncSession.run_sync on the async engine when one is configured, otherwise on a worker
+    thread. `fn` must return plain data or validated Pydantic models, not ORM objects whose
+    relationships would still lazy-load afterwards.
+    """
+
+    def __init__(self, session: Any):
+        self.session = session
+
+    @property
+    def is_async(self) -> bool:
+        return AsyncSession is not None and isinstance(self.session, AsyncSession)
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if self.is_async:
+            return await self.session.run_sync(fn, *args, **kwargs)
+        return await asyncio.to_thread(fn, self.session, *args, **kwargs)
+
 # Function to create database tables
 def init_db():
     # Import all modules here that might define models so that
@@ -33,3 +154,51 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency for async path operations; scripts and seeding keep using SessionLocal/get_db
+async def get_async_db():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield AsyncDB(session)
+        return
+    db = SessionLocal()
+    try:
+        yield AsyncDB(db)
+    finally:
+        await asyncio.to_thread(db.close)
+
+async def dispose_async_engine() -> None:
+    """Closes the async engine's pooled connections on application shutdown."""
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+def database_diagnostics(db_engine: Optional[Engine] = None) -> Dict[str, Any]:
+    """Engine profile and live pool state, plus the effective PRAGMAs on SQLite."""
+    db_engine = db_engine or engine
+    pool = db_engine.pool
+    diagnostics: Dict[str, Any] = {
+        "dialect": db_engine.dialect.name,
+        "driver": db_engine.dialect.driver,
+        "async_engine": async_engine.dialect.driver if async_engine is not None else None,
+        "pool": {
+            "pool_class": type(pool).__name__,
+            "status": pool.status(),
+        },
+        "settings": {},
+        "sqlite_pragmas": None,
+    }
+    for attribute in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, attribute, None)
+        if callable(method):
+            diagnostics["pool"][attribute] = method()
+    if db_engine.dialect.name == "sqlite":
+        diagnostics["settings"] = sqlite_pragmas()
+        with db_engine.connect() as connection:
+            diagnostics["sqlite_pragmas"] = {
+                name: connection.execute(text(f"PRAGMA {name}")).scalar()
+                for name in sqlite_pragmas()
+            }
+    else:
+        diagnostics["settings"] = engine_profile(db_engine.url.render_as_string())
+    return diagnostics
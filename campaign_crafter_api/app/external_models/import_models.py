@@ -22,6 +22,14 @@ class ImportErrorDetail(BaseModel):
     item_identifier: Optional[str] = None # e.g., title of a section that failed
     error: str
 
+class ImportProgress(BaseModel):
+    processed_files: int # Zip members handled so far (including skipped ones)
+    total_files: int
+    current_file: Optional[str] = None
+    imported_campaigns_count: int = 0
+    imported_sections_count: int = 0
+    errors_count: int = 0
+
 class ImportSummaryResponse(BaseModel):
     message: str = "Import process completed."
     imported_campaigns_count: int = 0
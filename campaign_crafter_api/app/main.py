@@ -1,5 +1,8 @@
 from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
 import logging
+from pathlib import Path
+from urllib.parse import urlparse
 from fastapi.middleware.cors import CORSMiddleware # Added import
 from contextlib import asynccontextmanager # Added for lifespan
 
@@ -7,8 +10,12 @@ from contextlib import asynccontextmanager # Added for lifespan
 # We will use a relative import for the seeding module.
 from app.core.config import settings # Corrected
 from app.core.seeding import seed_all_csv_data # Corrected
-from app.db import init_db, SessionLocal, engine, Base # Corrected
+from app.db import init_db, SessionLocal, engine, Base, dispose_async_engine # Corrected
 from app import crud 
+from app.services.llm_factory import shutdown_llm_clients
+from app.services.storage_backend import LocalFileStorageBackend, shutdown_storage_backend
+from app.services.conversation_summary_queue import conversation_summary_queue
+from app.services.password_hasher import password_hasher
 from app.api.endpoints import campaigns as campaigns_router
 from app.api.endpoints import llm_management as llm_management_router
 from app.api.endpoints import utility_endpoints as utility_router
@@ -52,6 +59,16 @@ async def lifespan(app: FastAPI):
         if db:
             db.close()
             logger.info(f"Database session closed after startup/shutdown.")
+        # Close pooled LLM clients (keep-alive connections) on shutdown
+        await shutdown_llm_clients()
+        # Close the storage backend's shared client
+        await shutdown_storage_backend()
+        # Stop the background conversation summarization worker
+        await conversation_summary_queue.aclose()
+        # Stop the password hashing threads
+        password_hasher.shutdown()
+        # Close the async engine's connection pool
+        await dispose_async_engine()
 
 app = FastAPI(title="Campaign Crafter API", version="0.1.0", lifespan=lifespan)
 
@@ -63,6 +80,7 @@ app.add_middleware( # Added middleware
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"], # Keyset pagination cursor on listing endpoints
 )
 
 # Include routers - IMPORTANT: More specific prefixes MUST come before generic ones
@@ -81,6 +99,15 @@ app.include_router(utility_router.router, prefix="/api/v1", tags=["Utilities"])
 app.include_router(image_generation_router.router, prefix="/api/v1", tags=["Image Generation"]) 
 app.include_router(file_uploads_router.router, prefix="/api/v1", tags=["File Uploads"]) # Added file_uploads router
 
+# Files written by the local storage backend are served from IMAGE_BASE_URL
+if settings.STORAGE_BACKEND.lower() == LocalFileStorageBackend.name:
+    Path(settings.IMAGE_STORAGE_PATH).mkdir(parents=True, exist_ok=True)
+    app.mount(
+        urlparse(settings.IMAGE_BASE_URL).path.rstrip('/'),
+        StaticFiles(directory=settings.IMAGE_STORAGE_PATH),
+        name="local_storage"
+    )
+
 @app.get("/", tags=["Root"])
 async def read_root():
     return {"message": "Welcome to Campaign Crafter API"}
@@ -1,5 +1,5 @@
-from typing import Optional, List, Dict
-from pydantic import BaseModel, HttpUrl # Added HttpUrl
+from typing import Optional, List, Dict, Any
+from pydantic import BaseModel
 from datetime import datetime # Added datetime
 
 # Removed ImageData model
@@ -8,10 +8,19 @@ class ConversationMessageContext(BaseModel):
     speaker: str # e.g., "user", "assistant"
     text: str # The text content of the message
 
-# Defines the structure for a message entry as stored in the JSON history and returned by API
+# Defines the structure for a message entry as stored in chat_message_entries and returned by API
 class ConversationMessageEntry(ConversationMessageContext):
     timestamp: datetime
 
+# A message in a paginated history response; `id` doubles as the pagination cursor
+class ConversationMessagePageEntry(ConversationMessageEntry):
+    id: int
+
+class ConversationHistoryPage(BaseModel):
+    messages: List[ConversationMessagePageEntry] # Newest first
+    next_cursor: Optional[int] = None # Pass as `before_id` to load the next (older) page; None when exhausted
+    has_more: bool = False
+
 class LLMConfigBase(BaseModel):
     name: str
     api_key: Optional[str] = None
@@ -98,6 +107,14 @@ class CampaignSection(CampaignSectionBase):
     class Config:
         from_attributes = True
 
+class CampaignSectionBatchItem(BaseModel):
+    title: Optional[str] = None
+    content: str
+    type: Optional[str] = None
+
+class CampaignSectionBatchCreate(BaseModel):
+    sections: List[CampaignSectionBatchItem] # Appended after the campaign's existing sections, in this order
+
 class CampaignSectionListResponse(BaseModel):
     sections: List[CampaignSection] # Reuses the existing CampaignSection model
 
@@ -134,15 +151,36 @@ class CampaignCreate(CampaignBase):
     model_id_with_prefix_for_concept: Optional[str] = None
     skip_concept_generation: Optional[bool] = False # New field
 
-class Campaign(CampaignBase):
+class CampaignHeader(CampaignBase):
+    """A campaign without its sections, for listings; validating it never loads sections."""
     id: int
     owner_id: int # In a real app, this would be properly linked
     concept: Optional[str] = None # LLM-generated campaign overview
     homebrewery_toc: Optional[List[Dict[str, str]]] = None # NEW - To accept {"markdown_string": "..."}
     display_toc: Optional[List[Dict[str, str]]] = None # Should already be like this
     homebrewery_export: Optional[str] = None # Stores the homebrewery export
+    # Bumped on every change to the campaign or its sections (same value as the read endpoints' ETag),
+    # so list clients can tell when a cached copy of the sections is stale
+    version: int = 1
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class Campaign(CampaignHeader):
     sections: List['CampaignSection'] = [] # Assuming CampaignSection is defined elsewhere or properly forward referenced
 
+class CampaignSummary(BaseModel):
+    """Lightweight campaign listing entry (no concept, export, TOCs or sections)."""
+    id: int
+    owner_id: int
+    title: str
+    initial_user_prompt: Optional[str] = None
+    badge_image_url: Optional[str] = None
+    thematic_image_url: Optional[str] = None
+    selected_llm_id: Optional[str] = None
+    temperature: Optional[float] = None
+
     class Config:
         from_attributes = True
 
@@ -301,12 +339,46 @@ class RollTable(RollTableBase):
     class Config:
         from_attributes = True
 
+class RollTableBulkRollRequest(BaseModel):
+    table_names: List[str]
+    rolls_per_table: int = 1
+    seed: Optional[int] = None # Same seed and tables -> same results
+
+class RollResult(BaseModel):
+    roll: Optional[int] # None if the table has no items
+    item: Optional[str] # None if the roll fell in a gap between item ranges
+
+class TableRollResults(BaseModel):
+    table_name: str
+    results: List[RollResult]
+
+class RollTableBulkRollResponse(BaseModel):
+    seed: Optional[int] = None
+    tables: List[TableRollResults]
+
+# --- Database diagnostics ---
+class DatabasePoolStatus(BaseModel):
+    pool_class: str
+    status: str # SQLAlchemy's one-line pool summary
+    size: Optional[int] = None # Only reported by QueuePool-style pools
+    checkedin: Optional[int] = None
+    checkedout: Optional[int] = None
+    overflow: Optional[int] = None
+
+class DatabaseDiagnostics(BaseModel):
+    dialect: str
+    driver: str
+    async_engine: Optional[str] = None # Async driver in use, or None when async endpoints use worker threads
+    pool: DatabasePoolStatus
+    settings: Dict[str, Any] # Configured profile: SQLite PRAGMAs or pool arguments
+    sqlite_pragmas: Optional[Dict[str, Any]] = None # PRAGMA values read back from a live connection
+
 
 # Pydantic model for representing file metadata from Azure Blob Storage
 class BlobFileMetadata(BaseModel):
     name: str # This will store the base filename, e.g., "image.png"
     blob_name: str # This will store the full path in blob storage, e.g., "user_uploads/.../image.png"
-    url: HttpUrl
+    url: str # Absolute for Azure; may be a site-relative path for the local storage backend
     size: int  # Size in bytes
     last_modified: datetime
     content_type: Optional[str] = None
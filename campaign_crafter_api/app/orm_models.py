@@ -44,6 +44,10 @@ class User(Base):
 
 class Campaign(Base):
     __tablename__ = "campaigns"
+    __table_args__ = (
+        # Owner-scoped keyset listing: WHERE owner_id = ? AND id > ? ORDER BY id
+        Index('ix_campaigns_owner_id_id', 'owner_id', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
@@ -71,8 +75,13 @@ class Campaign(Base):
     # New field for Mood Board
     mood_board_image_urls = Column(JSON, nullable=True)
 
+    # Bumped by crud.touch_campaign on every change to the campaign, its sections, TOCs or
+    # character links; served as the ETag / Last-Modified of the campaign read endpoints
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=True)
+
     owner = relationship("User", back_populates="campaigns")
-    sections = relationship("CampaignSection", back_populates="campaign", cascade="all, delete-orphan")
+    sections = relationship("CampaignSection", back_populates="campaign", cascade="all, delete-orphan", order_by="(CampaignSection.order, CampaignSection.id)")
     characters = relationship(
         "Character",
         secondary='character_campaign_association', # Use the string name of the table
@@ -230,7 +239,8 @@ class Character(Base):
 
 from sqlalchemy.schema import UniqueConstraint # Added for UniqueConstraint
 
-# Chat Message Model - Re-architected to store conversation history as JSON
+# Chat Message Model - one row per (character, user) conversation. The messages themselves
+# live in the append-only chat_message_entries table so a turn never rewrites the history.
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
@@ -238,15 +248,47 @@ class ChatMessage(Base):
     character_id = Column(Integer, ForeignKey("characters.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True) # Added user_id
 
-    # conversation_history will store a list of message objects, e.g., [{"speaker": "user", "text": "...", "timestamp": "..."}, ...]
-    conversation_history = Column(JSON, nullable=False, default=[]) # Stores the entire conversation as a JSON list/array
+    message_count = Column(Integer, nullable=False, default=0, server_default="0") # Number of entries, maintained on append/clear
     memory_summary = Column(Text, nullable=True) # Stores the LLM-generated summary of older parts of the conversation
 
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now()) # Tracks last update to this conversation log
 
     character = relationship("Character") # Simpler backref might be handled by SQLAlchemy or defined on Character if needed
     user = relationship("User") # Relationship to User
+    entries = relationship(
+        "ChatMessageEntry",
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="ChatMessageEntry.id"
+    )
 
     __table_args__ = (
         UniqueConstraint('character_id', 'user_id', name='uq_character_user_conversation'),
     )
+
+# A single chat message. Rows are only ever inserted (or deleted when a conversation is cleared);
+# the autoincrement id gives the message order.
+class ChatMessageEntry(Base):
+    __tablename__ = "chat_message_entries"
+
+    id = Column(Integer, primary_key=True)
+    conversation_id = Column(Integer, ForeignKey("chat_messages.id", ondelete="CASCADE"), nullable=False)
+    speaker = Column(String, nullable=False) # "user" or "assistant"
+    text = Column(Text, nullable=False)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    conversation = relationship("ChatMessage", back_populates="entries")
+
+    __table_args__ = (
+        Index('ix_chat_message_entries_conversation_id_id', 'conversation_id', 'id'),
+    )
+
+# Monotonic version stamps for process-level caches (e.g. the feature template cache).
+# Writers bump a row in the same transaction as their change; every worker compares the
+# stamp with the one its cache was filled under to detect changes made by other processes.
+class CacheVersion(Base):
+    __tablename__ = "cache_versions"
+
+    name = Column(String, primary_key=True) # Cache / catalog name, e.g. "features"
+    version = Column(Integer, nullable=False, default=0, server_default="0")
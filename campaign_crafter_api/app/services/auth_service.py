@@ -1,3 +1,4 @@
+import logging
 from typing import Optional, Annotated
 
 from fastapi import Depends, HTTPException, status
@@ -6,9 +7,11 @@ from sqlalchemy.orm import Session
 from app import crud, models
 from app.core.security import decode_access_token, oauth2_scheme
 from app.db import get_db
+from app.services.password_hasher import password_hasher
+from app.services.user_cache import authenticated_user_cache, user_from_orm_without_relationships
 from jose import JWTError # Import JWTError
 
-# Assuming verify_password is in crud.py as confirmed earlier
+logger = logging.getLogger(__name__)
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
@@ -31,12 +34,16 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    db_user_orm = crud.get_user_by_username(db, username=username)
+    def load_user() -> Optional[models.User]:
+        db_user_orm = crud.get_user_by_username(db, username=username)
+        if db_user_orm is None:
+            return None
+        return user_from_orm_without_relationships(db_user_orm)
 
-    if db_user_orm is None:
+    # Cached per username; the copy has empty campaigns/llm_configs (see AuthenticatedUserCache)
+    user_pydantic = authenticated_user_cache.get_user(db, username, load_user)
+    if user_pydantic is None:
         raise credentials_exception
-
-    user_pydantic = models.User.model_validate(db_user_orm)
     return user_pydantic
 
 async def get_current_active_user(
@@ -56,10 +63,14 @@ async def get_current_active_superuser(
         )
     return current_user
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[models.User]:
+async def authenticate_user(db: Session, username: str, password: str) -> Optional[models.User]:
     """
     Authenticates a user.
 
+    The bcrypt check runs on password_hasher's worker pool, not the event loop. If the stored
+    hash was made with a different cost than settings.BCRYPT_ROUNDS it is replaced by a fresh
+    hash of the same password.
+
     Args:
         db: SQLAlchemy session.
         username: The username to authenticate.
@@ -73,8 +84,12 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[mod
         return None
     if db_user.disabled: # Check if the user is disabled
         return None
-    if not crud.verify_password(password, db_user.hashed_password):
+    is_valid, new_hash = await password_hasher.verify_and_update_async(password, db_user.hashed_password)
+    if not is_valid:
         return None
+    if new_hash:
+        logger.info(f"Rehashing password for user '{username}' with the configured bcrypt cost.")
+        crud.update_user_password_hash(db, db_user, new_hash)
 
     # If authentication is successful, return the Pydantic model of the user
     # This ensures that the response (if this function's output is directly used in an API)
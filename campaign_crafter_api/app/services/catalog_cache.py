@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import orm_models
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def read_catalog_version(db: Session, name: str) -> int:
+    """Returns the shared version stamp for a cached catalog (0 if it was never bumped)."""
+    version = db.query(orm_models.CacheVersion.version).filter(orm_models.CacheVersion.name == name).scalar()
+    return version or 0
+
+
+def bump_catalog_version(db: Session, name: str) -> None:
+    """
+    Increments a catalog's shared version stamp. Does not commit: call it in the same
+    transaction as the change it announces.
+    """
+    updated = db.query(orm_models.CacheVersion).filter(orm_models.CacheVersion.name == name).update(
+        {orm_models.CacheVersion.version: orm_models.CacheVersion.version + 1},
+        synchronize_session=False
+    )
+    if not updated:
+        db.add(orm_models.CacheVersion(name=name, version=1))
+
+
+class VersionedCatalogCache:
+    """
+    Base for process-wide caches of rarely-changing catalog data (feature templates, roll tables,
+    authenticated users).
+
+    Entries are loaded on demand and kept until the catalog changes. Writers bump the catalog's
+    row in cache_versions in the same transaction as their change and call `invalidate` after
+    committing. Other workers re-read the shared stamp at most every
+    settings.CATALOG_CACHE_VERSION_CHECK_SECONDS and drop their entries when it has moved.
+    `version` is a local counter that increases on every invalidation; a value loaded while an
+    invalidation ran is returned but not stored. With `ttl_seconds`, entries also expire after
+    that long regardless of the catalog version.
+    """
+
+    catalog_name: str = ""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict() # key -> (value, expires_at)
+        self._max_entries = max_entries # LRU bound; None keeps every entry
+        self._ttl_seconds = ttl_seconds # None keeps entries until the catalog changes
+        self._lock = threading.Lock()
+        self._version = 0
+        self._catalog_version: Optional[int] = None # Shared stamp the entries were loaded under
+        self._catalog_checked_at: Optional[float] = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sync_catalog_version(self, db: Session) -> None:
+        now = time.monotonic()
+        checked_at = self._catalog_checked_at
+        if checked_at is not None and now - checked_at < settings.CATALOG_CACHE_VERSION_CHECK_SECONDS:
+            return
+        catalog_version = read_catalog_version(db, self.catalog_name)
+        with self._lock:
+            if self._catalog_version is not None and catalog_version != self._catalog_version:
+                logger.info(f"Catalog '{self.catalog_name}' changed in another worker (version {self._catalog_version} -> {catalog_version}); clearing cache.")
+                self._entries.clear()
+                self._version += 1
+            self._catalog_version = catalog_version
+            self._catalog_checked_at = now
+
+    def _get_or_load(self, db: Session, key: Hashable, loader: Callable[[], Any], cache_none: bool = True) -> Any:
+        """
+        Returns the cached value for `key`, calling `loader` on a miss. None results are cached
+        too unless `cache_none` is False.
+        """
+        self._sync_catalog_version(db)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+            version_before_load = self._version
+        value = loader()
+        if value is None and not cache_none:
+            return value
+        with self._lock:
+            # Skip the store if an invalidation ran while loading; the result may already be stale
+            if self._version == version_before_load:
+                expires_at = time.monotonic() + self._ttl_seconds if self._ttl_seconds is not None else None
+                self._entries[key] = (value, expires_at)
+                if self._max_entries is not None:
+                    while len(self._entries) > self._max_entries:
+                        self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self) -> None:
+        """Drops every entry. The next lookup also re-reads the shared catalog version."""
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+            self._catalog_version = None
+            self._catalog_checked_at = None
+
+    def clear(self) -> None:
+        """Alias of `invalidate` (e.g. between tests)."""
+        self.invalidate()
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core.config import settings
+from app.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# (character_id, user_id)
+ConversationKey = Tuple[int, int]
+
+
+class ConversationSummaryQueue:
+    """
+    In-process background queue for conversation memory summarization, so the chat
+    response path never waits on a second LLM completion.
+
+    Jobs are de-duplicated per (character, user): enqueueing a conversation that is already
+    waiting only refreshes its model preference. A job that fails is retried up to
+    settings.CHAT_SUMMARY_MAX_ATTEMPTS times with exponential backoff. Each job uses its own
+    database session from `session_factory`. The worker task is started lazily on the running
+    event loop and cancelled by `aclose` on application shutdown.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        self.session_factory = session_factory or SessionLocal
+        self._pending: Dict[ConversationKey, Optional[str]] = {} # Waiting jobs -> model_id_with_prefix
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._retry_tasks: Set[asyncio.Task] = set()
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queues and tasks are bound to the loop they were created on
+            self.reset()
+            self._queue = asyncio.Queue()
+            self._loop = loop
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+
+    def enqueue(self, character_id: int, user_id: int, model_id_with_prefix: Optional[str] = None) -> bool:
+        """Schedules a summary for this conversation. Returns False if one was already waiting."""
+        self._ensure_worker()
+        key = (character_id, user_id)
+        already_pending = key in self._pending
+        self._pending[key] = model_id_with_prefix # The newest model preference wins
+        if already_pending:
+            logger.debug(f"Summary for char_id={character_id}, user_id={user_id} already queued; skipping duplicate.")
+            return False
+        self._queue.put_nowait((key, 1))
+        return True
+
+    def is_pending(self, character_id: int, user_id: int) -> bool:
+        return (character_id, user_id) in self._pending
+
+    async def _run(self) -> None:
+        while True:
+            key, attempt = await self._queue.get()
+            try:
+                if key not in self._pending:
+                    continue
+                model_id_with_prefix = self._pending.pop(key)
+                try:
+                    await self._summarize(key, model_id_with_prefix)
+                except Exception as e:
+                    self._handle_failure(key, model_id_with_prefix, attempt, e)
+            finally:
+                self._queue.task_done()
+
+    def _handle_failure(self, key: ConversationKey, model_id_with_prefix: Optional[str], attempt: int, error: Exception) -> None:
+        character_id, user_id = key
+        if attempt >= settings.CHAT_SUMMARY_MAX_ATTEMPTS:
+            logger.error(f"Summarization for char_id={character_id}, user_id={user_id} failed after {attempt} attempts: {error}")
+            return
+        delay = settings.CHAT_SUMMARY_RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1))
+        logger.warning(f"Summarization for char_id={character_id}, user_id={user_id} failed (attempt {attempt}); retrying in {delay:.1f}s: {error}")
+        task = self._loop.create_task(self._retry_later(key, model_id_with_prefix, attempt + 1, delay))
+        # Keep a reference so the task isn't garbage-collected before it runs
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def _retry_later(self, key: ConversationKey, model_id_with_prefix: Optional[str], attempt: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+        if key in self._pending:
+            return # A newer job for this conversation is already waiting and will cover it
+        self._pending[key] = model_id_with_prefix
+        self._queue.put_nowait((key, attempt))
+
+    async def _summarize(self, key: ConversationKey, model_id_with_prefix: Optional[str]) -> None:
+        character_id, user_id = key
+        db = self.session_factory()
+        try:
+            db_character = crud.get_character(db, character_id)
+            current_user_orm = crud.get_user(db, user_id)
+            if not db_character or not current_user_orm:
+                logger.debug(f"Skipping summary: character {character_id} or user {user_id} no longer exists.")
+                return
+
+            provider_name = model_id_with_prefix.split("/", 1)[0] if model_id_with_prefix and "/" in model_id_with_prefix else None
+            llm_service = crud.get_llm_service(
+                db=db,
+                current_user_orm=current_user_orm,
+                provider_name=provider_name,
+                model_id_with_prefix=model_id_with_prefix,
+            )
+            conversation_orm = crud.get_or_create_user_character_conversation(db, character_id, user_id)
+            await crud.update_conversation_summary(
+                db=db,
+                conversation_orm=conversation_orm,
+                llm_service=llm_service,
+                current_user_model=models.User.from_orm(current_user_orm),
+                character_name=db_character.name,
+                character_notes=(db_character.notes_for_llm or ""), # Pass original notes for summary context
+                raise_errors=True
+            )
+        finally:
+            db.close()
+
+    async def join(self) -> None:
+        """Waits until every queued job, including scheduled retries, has finished."""
+        while self._queue is not None:
+            await self._queue.join()
+            if not self._retry_tasks:
+                return
+            await asyncio.gather(*self._retry_tasks, return_exceptions=True)
+
+    def reset(self) -> None:
+        """Drops all queued work and worker references (e.g. between tests)."""
+        for task in [self._worker, *self._retry_tasks]:
+            if task is not None and not task.done() and not task.get_loop().is_closed():
+                task.cancel()
+        self._pending.clear()
+        self._retry_tasks.clear()
+        self._queue = None
+        self._worker = None
+        self._loop = None
+
+    async def aclose(self) -> None:
+        """Cancels the worker and pending retries. Queued jobs are dropped."""
+        current_loop = asyncio.get_running_loop()
+        tasks = [
+            task for task in [self._worker, *self._retry_tasks]
+            if task is not None and not task.done() and task.get_loop() is current_loop
+        ]
+        self.reset()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Shared by all chat requests in this process
+conversation_summary_queue = ConversationSummaryQueue()
@@ -1,8 +1,11 @@
 import re
+import json
+import hashlib
 import logging
 import math
-from typing import List, Optional, Dict
+from typing import AsyncIterator, List, Optional, Dict
 from app import orm_models, crud
+from app.core.config import settings
 from app.services.llm_factory import get_llm_service
 from app.services.llm_service import LLMServiceUnavailableError, LLMGenerationError
 from sqlalchemy.orm import Session
@@ -276,7 +279,62 @@ VTCNP Enterprises
         output.append("}}")
         return "\n".join(output)
 
-    async def format_campaign_for_homebrewery(self, campaign: orm_models.Campaign, sections: List[orm_models.CampaignSection], db: Session, current_user: UserModel) -> str: # Added db, current_user and async
+    @staticmethod
+    def homebrewery_toc_fingerprint(section_titles: List[Optional[str]], model_id: Optional[str]) -> str:
+        """Hash of the ordered section titles and the model that a generated TOC depends on."""
+        payload = json.dumps({"model": model_id, "titles": [title for title in section_titles if title]})
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def stored_homebrewery_toc(campaign: orm_models.Campaign, fingerprint: str) -> Optional[str]:
+        """The TOC markdown saved on the campaign if it was generated for `fingerprint`, else None."""
+        stored = campaign.homebrewery_toc
+        entries = stored if isinstance(stored, list) else [stored]
+        for entry in entries:
+            if isinstance(entry, dict) and entry.get("fingerprint") == fingerprint and entry.get("markdown_string"):
+                return entry["markdown_string"]
+        return None
+
+    async def format_campaign_for_homebrewery(self, campaign: orm_models.Campaign, sections: List[orm_models.CampaignSection], db: Session, current_user: UserModel, refresh_toc: bool = False) -> str: # Added db, current_user and async
+        """The whole export as one string (see stream_campaign_for_homebrewery)."""
+        return "".join([chunk async for chunk in self.stream_campaign_for_homebrewery(campaign, db, current_user, sections=sections, refresh_toc=refresh_toc)])
+
+    async def stream_campaign_for_homebrewery(
+        self,
+        campaign: orm_models.Campaign,
+        db: Session,
+        current_user: UserModel,
+        sections: Optional[List[orm_models.CampaignSection]] = None,
+        batch_size: Optional[int] = None,
+        refresh_toc: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Yields the Homebrewery document piece by piece: front cover and title page, TOC, each
+        section, each character in the appendix, back cover. The concatenated chunks are the
+        complete document.
+
+        Unless `sections` is given, only the section titles are read up front (for the TOC);
+        the sections themselves are fetched in batches of `batch_size`
+        (settings.EXPORT_SECTION_BATCH_SIZE) as the stream reaches them.
+
+        The TOC stored on the campaign is reused while the section titles and the campaign's
+        model are unchanged (see homebrewery_toc_fingerprint); `refresh_toc` forces a new one.
+        """
+        first_block = True
+        async for block in self._homebrewery_blocks(campaign, db, current_user, sections, batch_size or settings.EXPORT_SECTION_BATCH_SIZE, refresh_toc):
+            # Blocks are joined with blank lines, as if the document were built in one list
+            yield ("" if first_block else "\n\n") + "\n\n".join(block)
+            first_block = False
+
+    async def _homebrewery_blocks(
+        self,
+        campaign: orm_models.Campaign,
+        db: Session,
+        current_user: UserModel,
+        sections: Optional[List[orm_models.CampaignSection]],
+        batch_size: int,
+        refresh_toc: bool
+    ) -> AsyncIterator[List[str]]:
         # TODO: Make page_image_url and stain_images configurable in the future, perhaps via campaign settings or user profile.
         page_image_url = "https://www.gmbinder.com/images/b7OT9E4.png"
         stain_images = [
@@ -309,11 +367,21 @@ VTCNP Enterprises
             homebrewery_content.append(f"{campaign.concept.strip()}\n")
         
         homebrewery_content.append("\\page\n")
+        # Sent before the TOC is generated, so the client gets its first bytes right away
+        yield homebrewery_content
 
-        sections_summary = "\n".join([s.title for s in sections if s.title])
+        if sections is not None:
+            section_titles = [s.title for s in sections]
+        else:
+            section_titles = crud.get_campaign_section_titles(db, campaign_id=campaign.id)
+        sections_summary = "\n".join([title for title in section_titles if title])
         freshly_generated_hb_toc_string: Optional[str] = None
+        toc_fingerprint = self.homebrewery_toc_fingerprint(section_titles, campaign.selected_llm_id)
+        stored_hb_toc_string = None if refresh_toc else self.stored_homebrewery_toc(campaign, toc_fingerprint)
 
-        if sections_summary:
+        if stored_hb_toc_string:
+            logger.info(f" EXPORT: Reusing stored Homebrewery TOC for campaign {campaign.id} (section titles and model unchanged)")
+        elif sections_summary:
             try:
                 provider_name_for_llm = None
                 model_id_for_llm = campaign.selected_llm_id
@@ -342,54 +410,59 @@ VTCNP Enterprises
         else:
             logger.info(f" EXPORT: No sections with titles found for campaign {campaign.id}, skipping Homebrewery TOC generation.")
 
-        if freshly_generated_hb_toc_string:
-            processed_toc = self.process_block(freshly_generated_hb_toc_string)
-            homebrewery_content.append(f"{processed_toc.strip()}\n")
-            homebrewery_content.append("\\page\n")
+        hb_toc_string = stored_hb_toc_string or freshly_generated_hb_toc_string
+        if hb_toc_string:
+            processed_toc = self.process_block(hb_toc_string)
+            yield [f"{processed_toc.strip()}\n", "\\page\n"]
 
-            hb_toc_object_to_save = {"markdown_string": freshly_generated_hb_toc_string}
+        if freshly_generated_hb_toc_string:
             try:
-                from app.models import CampaignUpdate
-                campaign_update_payload = CampaignUpdate(homebrewery_toc=hb_toc_object_to_save)
-                await crud.update_campaign(db=db, campaign_id=campaign.id, campaign_update=campaign_update_payload)
-                logger.info(f" EXPORT: Attempted to save newly generated Homebrewery TOC to DB for campaign {campaign.id}")
+                crud.update_campaign_homebrewery_toc(
+                    db,
+                    campaign_id=campaign.id,
+                    toc_markdown=freshly_generated_hb_toc_string,
+                    fingerprint=toc_fingerprint,
+                    model_id=campaign.selected_llm_id
+                )
+                logger.info(f" EXPORT: Saved newly generated Homebrewery TOC to DB for campaign {campaign.id}")
             except Exception as e:
                 logger.error(f" EXPORT: Failed to save newly generated Homebrewery TOC to DB for campaign {campaign.id}: {type(e).__name__} - {e}")
-        else:
+        elif not hb_toc_string:
             logger.info(f" EXPORT: No Homebrewery TOC was generated or appended for campaign {campaign.id}.")
 
-        for section in sections: 
-            if section.title:
-                homebrewery_content.append(f"## {section.title.strip()}\n")
-            
-            if section.content:
-                homebrewery_content.append(f"{section.content.strip()}\n") 
-            
-            homebrewery_content.append("\\page\n") 
+        section_batches = [sections] if sections is not None else crud.iter_campaign_section_batches(db, campaign_id=campaign.id, batch_size=batch_size)
+        for batch in section_batches:
+            for section in batch:
+                section_content = []
+                if section.title:
+                    section_content.append(f"## {section.title.strip()}\n")
+
+                if section.content:
+                    section_content.append(f"{section.content.strip()}\n")
+
+                section_content.append("\\page\n")
+                yield section_content
 
         # Character Appendix Section (Dramatis Personae)
         if campaign.characters:
-            homebrewery_content.append("\\page\n")
-            homebrewery_content.append("## Dramatis Personae\n")
+            yield ["\\page\n", "## Dramatis Personae\n"]
 
             for character in campaign.characters:
                 if character.export_format_preference == 'simple':
-                    homebrewery_content.append(self._format_character_simple_block(character))
+                    yield [self._format_character_simple_block(character), "\\page\n"]
                 else:
-                    homebrewery_content.append(self._format_character_complex_block(character))
-
-                homebrewery_content.append("\\page\n")
+                    yield [self._format_character_complex_block(character), "\\page\n"]
 
+        closing_content = []
         if stain_images:
             for i, stain_url in enumerate(stain_images):
                 if (i + 1) % 3 == 0 :
-                    homebrewery_content.append(f"{{{{stain:{stain_url}}}}}\n") 
+                    closing_content.append(f"{{{{stain:{stain_url}}}}}\n") 
 
         # Back Cover
         back_cover = self.BACK_COVER_TEMPLATE
         back_cover = back_cover.replace("https://--backcover url image--", "https://via.placeholder.com/816x1056.png?text=Back+Cover+Background")
         back_cover = back_cover.replace("BACKCOVER ONE-LINER", "An Unforgettable Adventure Awaits!")
         back_cover = back_cover.replace("ADD A CAMPAIGN COMMENTARY BLOCK HERE", "Author's notes and commentary on the campaign.")
-        homebrewery_content.append(back_cover)
-
-        return "\n\n".join(homebrewery_content)
+        closing_content.append(back_cover)
+        yield closing_content
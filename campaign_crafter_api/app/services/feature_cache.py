@@ -0,0 +1,40 @@
+import logging
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.services.catalog_cache import VersionedCatalogCache
+
+logger = logging.getLogger(__name__)
+
+# Name of the feature catalog's row in the cache_versions table
+FEATURE_CATALOG_VERSION_NAME = "features"
+
+# (section type -> id of the first compatible FullSection feature, id of the generic fallback feature)
+MasterFeatureIndex = Tuple[Dict[str, int], Optional[int]]
+
+
+class FeatureTemplateCache(VersionedCatalogCache):
+    """
+    Process-wide cache of feature prompt templates keyed by (name, user scope), so building an
+    LLM prompt does not query the features table every time. Missing templates are cached too.
+    It also holds the section type -> master ("FullSection") feature index used by
+    crud.get_master_feature_for_type.
+
+    Writes go through crud.create_feature / update_feature / delete_feature and the seeding
+    routines, which bump the "features" catalog version and call `invalidate`.
+    """
+
+    catalog_name = FEATURE_CATALOG_VERSION_NAME
+
+    def get_template(self, db: Session, name: str, user_id: Optional[int], loader: Callable[[], Optional[str]]) -> Optional[str]:
+        """Returns the cached template for (name, user_id), calling `loader` on a miss."""
+        return self._get_or_load(db, ("template", name, user_id), loader)
+
+    def get_master_index(self, db: Session, builder: Callable[[], MasterFeatureIndex]) -> MasterFeatureIndex:
+        """Returns the section type -> master feature index, calling `builder` if it is not built yet."""
+        return self._get_or_load(db, ("master_index",), builder)
+
+
+# Shared by all prompt builds in this process
+feature_template_cache = FeatureTemplateCache()
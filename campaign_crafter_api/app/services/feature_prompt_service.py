@@ -1,6 +1,7 @@
 from typing import Optional, List
 from sqlalchemy.orm import Session
 from app import crud, models, orm_models # Ensure orm_models is available if crud returns them
+from app.services.feature_cache import feature_template_cache
 
 class FeaturePromptService:
     def __init__(self):
@@ -10,14 +11,16 @@ class FeaturePromptService:
         """
         pass
 
-    def get_prompt(self, feature_name: str, db: Session) -> Optional[str]:
+    def get_prompt(self, feature_name: str, db: Session, user_id: Optional[int] = None) -> Optional[str]:
         """
-        Retrieves a feature prompt template by its name from the database.
+        Retrieves a feature prompt template by its name, preferring the user's own feature
+        over the system one. Served from the process-wide feature_template_cache.
         """
-        db_feature = crud.get_feature_by_name(db, name=feature_name)
-        if db_feature:
-            return db_feature.template
-        return None
+        def load_template() -> Optional[str]:
+            db_feature = crud.get_feature_by_name(db, name=feature_name, user_id=user_id)
+            return db_feature.template if db_feature else None
+
+        return feature_template_cache.get_template(db, feature_name, user_id, load_template)
 
     def get_all_features(self, db: Session) -> List[orm_models.Feature]:
         """
@@ -2,11 +2,13 @@ from google import genai
 import logging
 from google.genai import types
 import re
-from typing import List, Dict, Optional, Any
+from typing import AsyncIterator, List, Dict, Optional, Any
 from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.services.llm_service import AbstractLLMService, LLMServiceUnavailableError, LLMGenerationError
 from app.services.feature_prompt_service import FeaturePromptService
+from app.services.llm_availability import availability_registry
+from app.services.llm_client_pool import llm_client_pool
 from app import models, orm_models
 from app.models import User as UserModel
 from pathlib import Path
@@ -15,6 +17,8 @@ import asyncio
 logger = logging.getLogger(__name__)
 
 class GeminiLLMService(AbstractLLMService):
+    # All SDK I/O goes through the async surface (self.client.aio) so a slow Gemini
+    # call never blocks the event loop for other requests.
     PROVIDER_NAME = "gemini"
     DEFAULT_MODEL = "gemini-2.0-flash"
 
@@ -29,7 +33,11 @@ class GeminiLLMService(AbstractLLMService):
         
         if self.effective_api_key and self.effective_api_key != "YOUR_GEMINI_API_KEY":
             try:
-                self.client = genai.Client(api_key=self.effective_api_key)
+                # Long-lived client shared by every service instance using the same key
+                self.client = llm_client_pool.get_or_create(
+                    self.PROVIDER_NAME, self.effective_api_key, None,
+                    lambda: genai.Client(api_key=self.effective_api_key)
+                )
                 self.configured_successfully = True
             except Exception as e:
                 logger.error(f"Error configuring Gemini client during __init__ with effective_api_key: {e}")
@@ -41,16 +49,13 @@ class GeminiLLMService(AbstractLLMService):
     async def is_available(self, current_user: UserModel, db: Session) -> bool:
         if not self.configured_successfully or not self.client:
             return False
+        # Cached per (provider, key fingerprint); only probes the API on a miss or after invalidation
+        return await availability_registry.check(self.PROVIDER_NAME, self.effective_api_key, self._probe_availability)
+
+    async def _probe_availability(self) -> bool:
         try:
-            # Quick test call with minimal tokens
-            response = self.client.models.generate_content(
-                model=self.DEFAULT_MODEL,
-                contents="test",
-                config=types.GenerateContentConfig(
-                    candidate_count=1,
-                    max_output_tokens=1
-                )
-            )
+            # Metadata lookup for the default model; unlike a test generation this bills no tokens
+            await self.client.aio.models.get(model=self.DEFAULT_MODEL)
             return True
         except Exception as e:
             logger.warning(f"Gemini service not available. API check failed (using effective_api_key): {e}")
@@ -86,7 +91,7 @@ class GeminiLLMService(AbstractLLMService):
             config_params["max_output_tokens"] = max_tokens
 
         try:
-            response = self.client.models.generate_content(
+            response = await self.client.aio.models.generate_content(
                 model=model_id,
                 contents=prompt,
                 config=types.GenerateContentConfig(**config_params) if config_params else None
@@ -107,10 +112,58 @@ class GeminiLLMService(AbstractLLMService):
                 )
         except Exception as e:
             logger.warning(f"Gemini API error (model: {model_id}): {type(e).__name__} - {e}")
+            availability_registry.invalidate(self.PROVIDER_NAME, self.effective_api_key)
             raise LLMServiceUnavailableError(
                 f"Failed to generate text with Gemini model {model_id} due to API error: {str(e)}"
             ) from e
 
+    async def stream_text(
+        self,
+        prompt: str,
+        current_user: UserModel,
+        db: Session,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        # Context fields are accepted for interface compatibility; the prompt is expected to be pre-rendered
+        db_campaign: Optional[orm_models.Campaign] = None,
+        section_title_suggestion: Optional[str] = None,
+        section_type: Optional[str] = None,
+        section_creation_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        if not await self.is_available(current_user=current_user, db=db):
+            raise LLMServiceUnavailableError("Gemini service is not available.")
+        if not prompt:
+            raise ValueError("Prompt cannot be empty.")
+
+        model_id = self._get_model_id(model)
+
+        config_params: Dict[str, Any] = {}
+        if temperature is not None:
+            config_params["temperature"] = max(0.0, min(temperature, 1.0))
+        if max_tokens is not None:
+            config_params["max_output_tokens"] = max_tokens
+
+        produced_content = False
+        try:
+            stream = await self.client.aio.models.generate_content_stream(
+                model=model_id,
+                contents=prompt,
+                config=types.GenerateContentConfig(**config_params) if config_params else None
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    produced_content = True
+                    yield chunk.text
+        except Exception as e:
+            logger.warning(f"Gemini streaming API error (model: {model_id}): {type(e).__name__} - {e}")
+            availability_registry.invalidate(self.PROVIDER_NAME, self.effective_api_key)
+            raise LLMServiceUnavailableError(
+                f"Failed to stream text with Gemini model {model_id} due to API error: {str(e)}"
+            ) from e
+        if not produced_content:
+            raise LLMServiceUnavailableError(f"Gemini API stream returned no usable content. Model: {model_id}.")
+
     async def generate_campaign_concept(
         self,
         user_prompt: str,
@@ -231,25 +284,20 @@ class GeminiLLMService(AbstractLLMService):
         return titles[:count]
 
 
-    async def generate_section_content(
+    def _build_section_prompt(
         self,
         db_campaign: orm_models.Campaign,
         db: Session,
-        current_user: UserModel,
         existing_sections_summary: Optional[str],
         section_creation_prompt: Optional[str],
         section_title_suggestion: Optional[str],
-        model: Optional[str] = None,
-        section_type: Optional[str] = None
+        section_type: Optional[str]
     ) -> str:
-        if not await self.is_available(current_user=current_user, db=db):
-            raise LLMServiceUnavailableError("Gemini service is not available.")
-
+        """Builds the prompt shared by generate_section_content and stream_section_content."""
         campaign_concept = db_campaign.concept
         if not campaign_concept:
             campaign_concept = "A new creative piece."
 
-        model_id = self._get_model_id(model)
         effective_section_prompt = section_creation_prompt
         type_based_instruction = ""
 
@@ -315,15 +363,58 @@ class GeminiLLMService(AbstractLLMService):
                 final_prompt_for_generation += f"Summary of existing sections: {existing_sections_summary}\n"
             final_prompt_for_generation += f"Instruction for new section (titled '{section_title_suggestion or 'Next Part'}', Type: '{section_type or 'Generic'}'): {effective_section_prompt}"
 
+        return final_prompt_for_generation
+
+    async def generate_section_content(
+        self,
+        db_campaign: orm_models.Campaign,
+        db: Session,
+        current_user: UserModel,
+        existing_sections_summary: Optional[str],
+        section_creation_prompt: Optional[str],
+        section_title_suggestion: Optional[str],
+        model: Optional[str] = None,
+        section_type: Optional[str] = None
+    ) -> str:
+        if not await self.is_available(current_user=current_user, db=db):
+            raise LLMServiceUnavailableError("Gemini service is not available.")
+
+        final_prompt_for_generation = self._build_section_prompt(
+            db_campaign, db, existing_sections_summary, section_creation_prompt, section_title_suggestion, section_type
+        )
         return await self.generate_text(
             prompt=final_prompt_for_generation,
             current_user=current_user,
             db=db,
-            model=model_id,
+            model=self._get_model_id(model),
             temperature=0.7,
             max_tokens=4000
         )
 
+    async def stream_section_content(
+        self,
+        db_campaign: orm_models.Campaign,
+        db: Session,
+        current_user: UserModel,
+        existing_sections_summary: Optional[str],
+        section_creation_prompt: Optional[str],
+        section_title_suggestion: Optional[str],
+        model: Optional[str] = None,
+        section_type: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        final_prompt_for_generation = self._build_section_prompt(
+            db_campaign, db, existing_sections_summary, section_creation_prompt, section_title_suggestion, section_type
+        )
+        async for delta in self.stream_text(
+            prompt=final_prompt_for_generation,
+            current_user=current_user,
+            db=db,
+            model=self._get_model_id(model),
+            temperature=0.7,
+            max_tokens=4000
+        ):
+            yield delta
+
     async def list_available_models(self, current_user: UserModel, db: Session) -> List[Dict[str, Any]]:
         if not await self.is_available(current_user=current_user, db=db):
             logger.warning(f": Gemini API key not configured or service unavailable. Cannot fetch models.")
@@ -336,9 +427,10 @@ class GeminiLLMService(AbstractLLMService):
         available_models: List[Dict[str, Any]] = []
         try:
             logger.debug(f"Fetching available models from Gemini API...")
-            api_models = self.client.models.list()
-            
-            for m in api_models:
+            # Async pager: pages are fetched without blocking the event loop
+            api_models = await self.client.aio.models.list()
+
+            async for m in api_models:
                 # Filter for models that support generateContent
                 supported_methods = getattr(m, 'supported_generation_methods', []) or []
                 if 'generateContent' in supported_methods:
@@ -391,8 +483,7 @@ class GeminiLLMService(AbstractLLMService):
         return available_models
 
     async def close(self):
-        """Close any persistent connections if the SDK requires it."""
-        # The new google-genai SDK doesn't require explicit client closing
+        """No-op: the client is pooled and closed by llm_client_pool after eviction or on shutdown."""
         pass
 
     async def generate_homebrewery_toc_from_sections(
@@ -453,7 +544,7 @@ class GeminiLLMService(AbstractLLMService):
         try:
             logger.debug(f"Attempting to generate image with model: {model_id} using prompt: '{prompt[:50]}...'")
 
-            response = self.client.models.generate_content(
+            response = await self.client.aio.models.generate_content(
                 model=model_id,
                 contents=prompt
             )
@@ -477,6 +568,7 @@ class GeminiLLMService(AbstractLLMService):
             raise
         except Exception as e:
             logger.error(f"Error during Gemini image generation (model: {model_id}): {type(e).__name__} - {e}")
+            availability_registry.invalidate(self.PROVIDER_NAME, self.effective_api_key)
             raise LLMGenerationError(f"Failed to generate image with Gemini model {model_id}: {e}") from e
 
     async def generate_character_response(
@@ -534,7 +626,7 @@ class GeminiLLMService(AbstractLLMService):
             contents.append({"role": "user", "parts": [{"text": user_prompt}]})
 
             try:
-                response = self.client.models.generate_content(
+                response = await self.client.aio.models.generate_content(
                     model=model_id,
                     contents=contents,
                     config=generation_config
@@ -548,6 +640,7 @@ class GeminiLLMService(AbstractLLMService):
                     raise LLMGenerationError(f"Gemini API call (character response with history) succeeded but returned no usable content. Model: {model_id}")
             except Exception as e:
                 logger.warning(f"Gemini API error (character response with history, model: {model_id}): {type(e).__name__} - {e}")
+                availability_registry.invalidate(self.PROVIDER_NAME, self.effective_api_key)
                 raise LLMGenerationError(f"Failed to generate character response with Gemini (history) model {model_id}: {str(e)}") from e
 
         else:
@@ -1,7 +1,7 @@
 from typing import Optional
 import logging
 import openai # Direct import of the openai library
-import requests
+import httpx
 # import os # No longer needed for Azure saving
 import base64
 import uuid
@@ -9,9 +9,6 @@ import uuid
 from pathlib import Path
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from io import BytesIO # Restored for Azure
-from azure.storage.blob import BlobServiceClient # Restored for Azure
-from azure.identity import DefaultAzureCredential # Restored for Azure
 
 from app.models import User as UserModel, BlobFileMetadata
 from ..core.security import decrypt_key
@@ -21,8 +18,15 @@ from app.orm_models import GeneratedImage
 from app import crud
 
 logger = logging.getLogger(__name__)
+
+# Timeouts (seconds) for outbound image HTTP calls
+IMAGE_DOWNLOAD_TIMEOUT_SECONDS = 60.0
+STABLE_DIFFUSION_TIMEOUT_SECONDS = 120.0
+
 from app.services.gemini_service import GeminiLLMService
 from app.services.llm_service import LLMGenerationError, LLMServiceUnavailableError
+from app.services.llm_client_pool import llm_client_pool
+from app.services.storage_backend import BlobData, get_storage_backend
 
 
 class ImageGenerationService:
@@ -146,43 +150,17 @@ class ImageGenerationService:
     ) -> str:
         """
         Downloads an image from a temporary URL or uses provided bytes,
-        uploads to Azure Blob Storage (potentially under a campaign-specific path),
+        uploads to the configured storage backend (potentially under a campaign-specific path),
         logs it in the database, and returns the permanent URL.
+        A temporary URL is streamed chunk by chunk into the upload, never buffered whole.
         """
         logger.debug(f"[_save_image_and_log_db] Called with user_id: {user_id}, campaign_id: {campaign_id}, original_filename: {original_filename_from_api}, has_image_bytes: {image_bytes is not None}, has_temporary_url: {temporary_url is not None}") # DIAGNOSTIC
 
         if user_id is None:
             raise ValueError("user_id cannot be None when saving an image")
 
-        blob_service_client = None
-        account_url = None # Will be set if using account name + credential
-
-        if settings.AZURE_STORAGE_CONNECTION_STRING:
-            try:
-                blob_service_client = BlobServiceClient.from_connection_string(settings.AZURE_STORAGE_CONNECTION_STRING)
-                # Try to determine account name from connection string for URL construction
-                # This is a bit fragile; ideally, AZURE_STORAGE_ACCOUNT_NAME is also set.
-                conn_parts = {part.split('=', 1)[0]: part.split('=', 1)[1] for part in settings.AZURE_STORAGE_CONNECTION_STRING.split(';') if '=' in part}
-                account_name_from_conn_str = conn_parts.get('AccountName')
-                if account_name_from_conn_str:
-                    account_url = f"https://{account_name_from_conn_str}.blob.core.windows.net"
-                # If account_url is still None here, permanent_image_url construction might fail later if AZURE_STORAGE_ACCOUNT_NAME is also not set.
-            except Exception as e:
-                logger.error(f"Failed to connect to Azure Storage with connection string: {e}")
-                raise HTTPException(status_code=500, detail="Azure Storage configuration error (connection string).")
-        elif settings.AZURE_STORAGE_ACCOUNT_NAME:
-            try:
-                account_url = f"https://{settings.AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net"
-                default_credential = DefaultAzureCredential()
-                blob_service_client = BlobServiceClient(account_url, credential=default_credential)
-            except Exception as e:
-                logger.error(f"Failed to connect to Azure Storage with DefaultAzureCredential: {e}")
-                raise HTTPException(status_code=500, detail="Azure Storage configuration error (account name/auth).")
-        else:
-            raise HTTPException(status_code=500, detail="Azure Storage is not configured (missing account name or connection string).")
-
-        if not blob_service_client:
-             raise HTTPException(status_code=500, detail="Failed to initialize Azure BlobServiceClient.")
+        if not image_bytes and not temporary_url:
+            raise HTTPException(status_code=400, detail="No image source provided (neither temporary_url nor image_bytes).")
 
         file_extension = ".png" # Default
         if original_filename_from_api:
@@ -197,75 +175,31 @@ class ImageGenerationService:
         if not file_extension.startswith(".") or len(file_extension) > 5: # Sanitize
             file_extension = ".png"
 
-        # Construct blob_name with campaign_id if provided
         file_stem = uuid.uuid4().hex
-        if campaign_id is not None:
-            blob_name = f"user_uploads/{user_id}/campaigns/{campaign_id}/files/{file_stem}{file_extension}"
-        else:
-            # Fallback path if campaign_id is not provided (e.g., general user images not tied to a campaign)
-            # This case might need further review based on whether all images should be campaign-specific.
-            # For now, keeping a distinct path for non-campaign images if that's a valid scenario.
-            blob_name = f"user_uploads/{user_id}/general/files/{file_stem}{file_extension}" # Also adding /files here for consistency
-
-        logger.debug(f"Constructed blob name: {blob_name}") # For debugging path construction
-
-        actual_image_bytes = None
-        content_type = 'application/octet-stream' # Default
 
         if image_bytes:
-            actual_image_bytes = image_bytes
-            if file_extension == ".png": content_type = "image/png"
-            elif file_extension in [".jpg", ".jpeg"]: content_type = "image/jpeg"
-            elif file_extension == ".webp": content_type = "image/webp"
-        elif temporary_url:
+            content_type = self._content_type_for_extension(file_extension)
+            blob_name = self._build_image_blob_name(user_id, campaign_id, file_stem, file_extension)
+            permanent_image_url = await self._upload_blob(blob_name, image_bytes, content_type)
+        else:
             try:
-                response = requests.get(temporary_url, stream=True)
-                response.raise_for_status()
-                actual_image_bytes = response.content
-
-                ct_from_header = response.headers.get('Content-Type')
-                if ct_from_header:
-                    content_type = ct_from_header
-                    # Potentially refine file_extension based on content_type if it was default
-                    if file_extension == ".png": # Only if it was default
-                        if "image/jpeg" in content_type: file_extension = ".jpg"
-                        elif "image/webp" in content_type: file_extension = ".webp"
-                        elif "image/png" in content_type: file_extension = ".png"
-                        # ... any other common types
-                        blob_name = f"user_uploads/{user_id}/{uuid.uuid4().hex}{file_extension}" # Re-generate blob_name if extension changed
-            except requests.exceptions.RequestException as e:
+                async with httpx.AsyncClient(timeout=IMAGE_DOWNLOAD_TIMEOUT_SECONDS, follow_redirects=True) as http_client:
+                    async with http_client.stream("GET", temporary_url) as response:
+                        response.raise_for_status()
+                        content_type = response.headers.get('Content-Type') or self._content_type_for_extension(file_extension)
+                        # Potentially refine file_extension based on content_type if it was default
+                        if file_extension == ".png": # Only if it was default
+                            if "image/jpeg" in content_type: file_extension = ".jpg"
+                            elif "image/webp" in content_type: file_extension = ".webp"
+                            elif "image/png" in content_type: file_extension = ".png"
+                        blob_name = self._build_image_blob_name(user_id, campaign_id, file_stem, file_extension)
+                        # Chunks go straight from the download into the storage upload
+                        permanent_image_url = await self._upload_blob(blob_name, response.aiter_bytes(), content_type)
+            except httpx.HTTPError as e:
                 logger.error(f"Failed to download image from temporary URL {temporary_url}: {e}")
                 raise HTTPException(status_code=502, detail=f"Failed to download image from source: {e}")
-        else:
-            raise HTTPException(status_code=400, detail="No image source provided (neither temporary_url nor image_bytes).")
-
-        if not actual_image_bytes:
-            raise HTTPException(status_code=500, detail="Failed to retrieve image bytes.")
-
-        permanent_image_url = ""
-        try:
-            blob_client = blob_service_client.get_blob_client(container=settings.AZURE_STORAGE_CONTAINER_NAME, blob=blob_name)
-            with BytesIO(actual_image_bytes) as stream:
-                blob_client.upload_blob(stream, overwrite=True, headers={'Content-Type': content_type})
-            
-            logger.info(f"Image uploaded to Azure Blob Storage: {blob_name} in container {settings.AZURE_STORAGE_CONTAINER_NAME}")
-
-            # Construct permanent URL
-            # Priority: 1. account_url (if derived from AZURE_STORAGE_ACCOUNT_NAME), 2. parsed from conn string, 3. settings.AZURE_STORAGE_ACCOUNT_NAME directly
-            final_account_url_base = None
-            if account_url: # This would be set if AZURE_STORAGE_ACCOUNT_NAME was used for DefaultAzureCredential or parsed from conn string.
-                final_account_url_base = account_url.strip('/')
-            elif settings.AZURE_STORAGE_ACCOUNT_NAME: # Fallback if not using conn string and account_url wasn't set by it.
-                 final_account_url_base = f"https://{settings.AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net"
-            
-            if not final_account_url_base:
-                raise HTTPException(status_code=500, detail="Cannot determine Azure account URL for image link. Ensure AZURE_STORAGE_ACCOUNT_NAME is set.")
 
-            permanent_image_url = f"{final_account_url_base}/{settings.AZURE_STORAGE_CONTAINER_NAME.strip('/')}/{blob_name}"
-
-        except Exception as e:
-            logger.error(f"Failed to upload image to Azure Blob Storage: {e}")
-            raise HTTPException(status_code=500, detail=f"Failed to upload image to cloud storage: {str(e)}")
+        logger.debug(f"Constructed blob name: {blob_name}") # For debugging path construction
 
         db_image = GeneratedImage(
             filename=blob_name,
@@ -281,6 +215,30 @@ class ImageGenerationService:
 
         return permanent_image_url
 
+    @staticmethod
+    def _build_image_blob_name(user_id: int, campaign_id: Optional[int], file_stem: str, file_extension: str) -> str:
+        """Blob path for a saved image; campaign images live under the campaign's files prefix."""
+        if campaign_id is not None:
+            return f"user_uploads/{user_id}/campaigns/{campaign_id}/files/{file_stem}{file_extension}"
+        # Fallback path if campaign_id is not provided (e.g., general user images not tied to a campaign)
+        return f"user_uploads/{user_id}/general/files/{file_stem}{file_extension}"
+
+    @staticmethod
+    def _content_type_for_extension(file_extension: str) -> str:
+        if file_extension == ".png": return "image/png"
+        if file_extension in [".jpg", ".jpeg"]: return "image/jpeg"
+        if file_extension == ".webp": return "image/webp"
+        return 'application/octet-stream'
+
+    async def _upload_blob(self, blob_name: str, data: BlobData, content_type: str) -> str:
+        try:
+            return await get_storage_backend().upload(blob_name, data, content_type)
+        except (HTTPException, httpx.HTTPError):
+            raise # Configuration errors and download failures are reported as-is
+        except Exception as e:
+            logger.error(f"Failed to upload image to storage: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to upload image to cloud storage: {str(e)}")
+
     async def generate_image_dalle(
         self,
         prompt: str,
@@ -296,8 +254,11 @@ class ImageGenerationService:
         Generates an image using OpenAI's DALL-E API, saves it (potentially campaign-specific), logs to DB, and returns the permanent image URL.
         """
         openai_api_key = await self._get_openai_api_key_for_user(current_user, db) # Pass db
-        # Initialize client locally
-        dalle_client = openai.OpenAI(api_key=openai_api_key)
+        # Shares the pooled async client (and its connections) with OpenAILLMService for this key
+        dalle_client = llm_client_pool.get_or_create(
+            "openai", openai_api_key, None,
+            lambda: openai.AsyncOpenAI(api_key=openai_api_key)
+        )
 
         if not prompt:
             raise HTTPException(status_code=400, detail="Prompt cannot be empty.")
@@ -333,7 +294,7 @@ class ImageGenerationService:
              # DALL-E 2 does not use 'quality' parameter in the same way, so it might be ignored or error if sent.
 
         try:
-            api_response = dalle_client.images.generate(
+            api_response = await dalle_client.images.generate(
                 model=final_model_name,
                 prompt=prompt,
                 size=final_size, # type: ignore
@@ -463,12 +424,13 @@ class ImageGenerationService:
         files_payload = {'none': (None, '')} # Sends an empty part named "none"
 
         try:
-            api_response = requests.post(
-                target_api_url, # Use the dynamically constructed URL
-                headers=headers,
-                data=form_data,
-                files=files_payload 
-            )
+            async with httpx.AsyncClient(timeout=STABLE_DIFFUSION_TIMEOUT_SECONDS) as http_client:
+                api_response = await http_client.post(
+                    target_api_url, # Use the dynamically constructed URL
+                    headers=headers,
+                    data=form_data,
+                    files=files_payload
+                )
 
             if api_response.status_code == 200:
                 image_bytes_sd = api_response.content
@@ -512,7 +474,9 @@ class ImageGenerationService:
                     detail=detail
                 )
 
-        except requests.exceptions.RequestException as e:
+        except HTTPException:
+            raise
+        except httpx.RequestError as e:
             logger.error(f"Stable Diffusion API request failed: {e}")
             raise HTTPException(status_code=503, detail=f"Failed to connect to Stable Diffusion API: {str(e)}")
         except Exception as e:
@@ -600,130 +564,40 @@ class ImageGenerationService:
 
     async def delete_image_from_blob_storage(self, blob_name: str):
         """
-        Deletes an image from Azure Blob Storage.
+        Deletes an image from the configured storage backend.
         """
-        blob_service_client = None
         if not blob_name:
             logger.warning("Blob name not provided for deletion.")
             raise HTTPException(status_code=400, detail="Blob name must be provided for deletion.")
 
-        if settings.AZURE_STORAGE_CONNECTION_STRING:
-            try:
-                blob_service_client = BlobServiceClient.from_connection_string(settings.AZURE_STORAGE_CONNECTION_STRING)
-            except Exception as e:
-                logger.error(f"Failed to connect to Azure Storage with connection string: {e}")
-                raise HTTPException(status_code=500, detail="Azure Storage configuration error (connection string).")
-        elif settings.AZURE_STORAGE_ACCOUNT_NAME:
-            try:
-                account_url = f"https://{settings.AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net"
-                default_credential = DefaultAzureCredential()
-                blob_service_client = BlobServiceClient(account_url, credential=default_credential)
-            except Exception as e:
-                logger.error(f"Failed to connect to Azure Storage with DefaultAzureCredential: {e}")
-                raise HTTPException(status_code=500, detail="Azure Storage configuration error (account name/auth).")
-        else:
-            raise HTTPException(status_code=500, detail="Azure Storage is not configured (missing account name or connection string).")
-
-        if not blob_service_client:
-             raise HTTPException(status_code=500, detail="Failed to initialize Azure BlobServiceClient for deletion.")
-
         try:
-            blob_client = blob_service_client.get_blob_client(container=settings.AZURE_STORAGE_CONTAINER_NAME, blob=blob_name)
-            blob_client.delete_blob()
-            logger.info(f"Successfully deleted blob {blob_name} from container {settings.AZURE_STORAGE_CONTAINER_NAME}")
+            deleted = await get_storage_backend().delete(blob_name)
+        except HTTPException:
+            raise
         except Exception as e:
-            # Check if the error is because the blob does not exist (Azure SDK typically raises ResourceNotFoundError)
-            # For simplicity, checking common error message patterns. A more robust way is to check e.error_code or specific exception type
-            from azure.core.exceptions import ResourceNotFoundError # Import here for specific check
-            if isinstance(e, ResourceNotFoundError): # More specific check
-                logger.warning(f" Blob {blob_name} not found in container {settings.AZURE_STORAGE_CONTAINER_NAME}. Nothing to delete.")
-                # Not raising an exception as per requirements for "blob not existing"
-            else:
-                logger.error(f"Failed to delete blob {blob_name} from container {settings.AZURE_STORAGE_CONTAINER_NAME}: {e}")
-                raise HTTPException(status_code=500, detail=f"Failed to delete image from cloud storage: {str(e)}")
-
-    def _get_blob_service_client(self) -> BlobServiceClient:
-        """Helper to initialize and return BlobServiceClient based on settings."""
-        blob_service_client = None
-        if settings.AZURE_STORAGE_CONNECTION_STRING:
-            try:
-                blob_service_client = BlobServiceClient.from_connection_string(settings.AZURE_STORAGE_CONNECTION_STRING)
-            except Exception as e:
-                logger.error(f"Failed to connect to Azure Storage with connection string: {e}")
-                raise HTTPException(status_code=500, detail="Azure Storage configuration error (connection string).")
-        elif settings.AZURE_STORAGE_ACCOUNT_NAME:
-            try:
-                account_url = f"https://{settings.AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net"
-                default_credential = DefaultAzureCredential()
-                blob_service_client = BlobServiceClient(account_url, credential=default_credential)
-            except Exception as e:
-                logger.error(f"Failed to connect to Azure Storage with DefaultAzureCredential: {e}")
-                raise HTTPException(status_code=500, detail="Azure Storage configuration error (account name/auth).")
+            logger.error(f"Failed to delete blob {blob_name}: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to delete image from cloud storage: {str(e)}")
+        if deleted:
+            logger.info(f"Successfully deleted blob {blob_name}")
         else:
-            raise HTTPException(status_code=500, detail="Azure Storage is not configured (missing account name or connection string).")
-
-        if not blob_service_client:
-            # This case should be caught by the else above, but as a safeguard:
-            raise HTTPException(status_code=500, detail="Failed to initialize Azure BlobServiceClient.")
-        return blob_service_client
-
-    def _get_blob_account_url(self) -> str:
-        """Helper to determine the account URL for constructing blob URLs."""
-        if settings.AZURE_STORAGE_ACCOUNT_NAME:
-            return f"https://{settings.AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net"
-        elif settings.AZURE_STORAGE_CONNECTION_STRING:
-            # Try to parse from connection string
-            conn_parts = {part.split('=', 1)[0].lower(): part.split('=', 1)[1] for part in settings.AZURE_STORAGE_CONNECTION_STRING.split(';') if '=' in part}
-            account_name_from_conn_str = conn_parts.get('accountname')
-            if account_name_from_conn_str:
-                return f"https://{account_name_from_conn_str}.blob.core.windows.net"
-
-        raise HTTPException(status_code=500, detail="Cannot determine Azure account URL. Ensure AZURE_STORAGE_ACCOUNT_NAME or parsable AZURE_STORAGE_CONNECTION_STRING is set.")
+            # Not raising an exception as per requirements for "blob not existing"
+            logger.warning(f" Blob {blob_name} not found in storage. Nothing to delete.")
 
     async def list_campaign_files(self, user_id: int, campaign_id: int) -> list[BlobFileMetadata]: # Renamed, added campaign_id
         """
         Lists files for a given campaign_id (and user_id for path construction)
-        from their designated prefix in Azure Blob Storage.
+        from their designated prefix in the configured storage backend.
         Returns a list of BlobFileMetadata objects.
         """
         # from app.models import BlobFileMetadata # Moved to top-level import
 
-        blob_service_client = self._get_blob_service_client()
-        container_name = settings.AZURE_STORAGE_CONTAINER_NAME
-        container_client = blob_service_client.get_container_client(container_name)
-
         # Updated prefix to include user_id and campaign_id
         campaign_prefix = f"user_uploads/{user_id}/campaigns/{campaign_id}/"
-        account_url_base = self._get_blob_account_url().strip('/')
-
-        files_metadata: list[BlobFileMetadata] = []
 
         try:
-            blob_list = container_client.list_blobs(name_starts_with=campaign_prefix)
-            for blob in blob_list:
-                # Ensure we don't list "directory" blobs if the prefix itself is inadvertently treated as one
-                # or if the prefix matches a blob that acts as a folder marker.
-                # This check might be overly cautious if your storage doesn't use such markers,
-                # or if list_blobs already handles this well.
-                # A common check is if blob.name == campaign_prefix and blob.size == 0 (for some systems)
-                # For Azure, list_blobs typically doesn't return the prefix itself as a blob unless it actually exists as an empty blob.
-                # However, if a file is named exactly like the prefix (e.g. a file named "campaign_id/"), this could be an issue.
-                # The Path(blob.name).name will correctly extract the filename part.
-                if blob.name == campaign_prefix: # Skip if the blob name is exactly the prefix itself (folder marker)
-                    continue
-
-                blob_client = container_client.get_blob_client(blob.name)
-                properties = blob_client.get_blob_properties()
-
-                file_meta = BlobFileMetadata(
-                    name=Path(blob.name).name, # Base filename
-                    blob_name=blob.name,       # Full path in blob storage
-                    url=f"{account_url_base}/{container_name}/{blob.name}",
-                    size=properties.size,
-                    last_modified=properties.last_modified,
-                    content_type=properties.content_settings.content_type
-                )
-                files_metadata.append(file_meta)
+            files_metadata = await get_storage_backend().list(campaign_prefix)
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error listing blobs for user {user_id}, campaign {campaign_id} with prefix '{campaign_prefix}': {e}")
             raise HTTPException(status_code=500, detail=f"Failed to list campaign files from cloud storage: {str(e)}")
@@ -766,8 +640,6 @@ class ImageGenerationService:
 #             else:
 #                 prompt_sd = "A majestic eagle soaring over a futuristic city, photorealistic"
 #                 try:
-#                     # Note: generate_image_stable_diffusion is async but uses blocking 'requests.post'
-#                     # For a real async application, use httpx or run 'requests.post' in a thread pool.
 #                     image_url_sd = await service_sd.generate_image_stable_diffusion(prompt=prompt_sd, size="1024x1024", steps=30)
 #                 except HTTPException as he:
 #                 except Exception as e:
@@ -2,25 +2,107 @@ import json
 import zipfile
 import io
 import os # For path manipulation
-from typing import List, Optional, Dict, Any, Union
+import tempfile
+from typing import List, Optional, Dict, Any, Union, BinaryIO, IO, Iterator
 
 from sqlalchemy.orm import Session
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
 
 from app import crud
+from app.core.config import settings
 # Ensure correct import for ORM models if they are in a specific module like app.orm_models
 # from app import orm_models 
 from app.db import Base as OrmBase # Or wherever your ORM models are based / can be accessed
 from app.models import CampaignBase  # Actual Pydantic model for creation
-from app.external_models.import_models import ImportSummaryResponse, SectionStructure, CampaignStructure, ImportErrorDetail
+from app.external_models.import_models import ImportSummaryResponse, SectionStructure, CampaignStructure, ImportErrorDetail, ImportProgress
 
 # Placeholder for owner_id until auth is integrated
 DEFAULT_OWNER_ID = 1 
 
+# Title of the campaign that collects files from a Zip's root when no target campaign is given
+ZIP_LOOSE_FILES_CAMPAIGN_TITLE = "Imported Loose Files from Zip"
+
+
+async def spool_upload(file: UploadFile) -> IO[bytes]:
+    """
+    Copies an upload into a SpooledTemporaryFile, settings.IMPORT_UPLOAD_CHUNK_SIZE bytes at a
+    time. Past settings.IMPORT_UPLOAD_SPOOL_MAX_MEMORY_BYTES it lives in a temp file on disk.
+    Returned rewound; closing it deletes the temp file.
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=settings.IMPORT_UPLOAD_SPOOL_MAX_MEMORY_BYTES)
+    try:
+        while chunk := await file.read(settings.IMPORT_UPLOAD_CHUNK_SIZE):
+            spooled.write(chunk)
+        spooled.seek(0)
+    except Exception:
+        spooled.close()
+        raise
+    return spooled
+
+
 class ImportService:
     def __init__(self):
         pass
 
+    def _create_campaign(
+        self,
+        db: Session,
+        owner_id: int,
+        campaign_title: str,
+        campaign_concept: Optional[str],
+        summary: ImportSummaryResponse,
+        source_filename: Optional[str] = None
+    ) -> Optional[int]:
+        """Creates an empty imported campaign and returns its ID, or records the error and returns None."""
+        try:
+            db_campaign = crud.create_imported_campaign(db, owner_id=owner_id, title=campaign_title, concept=campaign_concept)
+        except Exception as e_camp:
+            db.rollback()
+            summary.errors.append(ImportErrorDetail(
+                file_name=source_filename,
+                item_identifier=campaign_title,
+                error=f"Failed to create campaign '{campaign_title}': {str(e_camp)}"
+            ))
+            return None
+        summary.imported_campaigns_count += 1
+        summary.created_campaign_ids.append(db_campaign.id)
+        return db_campaign.id
+
+    def _add_sections(
+        self,
+        db: Session,
+        campaign_id: int,
+        sections_data: List[SectionStructure],
+        summary: ImportSummaryResponse,
+        source_filename: Optional[str] = None
+    ) -> None:
+        """Appends sections to a campaign in one bulk insert, recording an error if it fails."""
+        if not sections_data:
+            return
+        try:
+            crud.create_campaign_sections_bulk(db, campaign_id=campaign_id, sections=self._section_rows(sections_data))
+        except Exception as e_sec:
+            db.rollback()
+            summary.errors.append(ImportErrorDetail(
+                file_name=source_filename,
+                item_identifier=f"{len(sections_data)} sections for campaign ID {campaign_id}",
+                error=f"Failed to create sections: {str(e_sec)}"
+            ))
+            return
+        summary.imported_sections_count += len(sections_data)
+
+    @staticmethod
+    def _section_rows(sections_data: List[SectionStructure]) -> List[Dict[str, Any]]:
+        """
+        Rows for crud.create_campaign_sections_bulk. Sections that give an `order` come first,
+        sorted by it; the others follow in the order they were imported.
+        """
+        ordered = sorted(
+            enumerate(sections_data),
+            key=lambda item: (item[1].order is None, item[1].order or 0, item[0])
+        )
+        return [{"title": section.title, "content": section.content} for _, section in ordered]
+
     def _create_campaign_with_sections(
         self,
         db: Session,
@@ -31,71 +113,28 @@ class ImportService:
         sections_data: List[SectionStructure],
         summary: ImportSummaryResponse,
         source_filename: Optional[str] = None # For richer error reporting
-    ) -> Any: # Return type should be your ORM Campaign model, e.g. orm_models.Campaign
+    ) -> Optional[int]:
         """
-        Helper to create a new campaign and its sections.
-        Prioritizes imported concept and TOC over LLM generation for these fields.
+        Helper to create a new campaign and its sections in one transaction; returns the
+        campaign ID. The imported concept is used as is (no LLM generation). Campaigns only store
+        generated TOCs, so `campaign_toc` is not kept.
         """
         try:
-            # Prepare data for CampaignCreate Pydantic model
-            # If concept is provided, use a generic initial_user_prompt to avoid LLM generation for concept.
-            # If concept is NOT provided, initial_user_prompt can be more descriptive if desired (though not used here for LLM).
-            pydantic_campaign_create = CampaignCreate(
-                title=campaign_title,
-                initial_user_prompt=f"Imported: {campaign_title}" if not campaign_concept else "Imported campaign concept.",
-                model_id_with_prefix_for_concept=None # Explicitly disable LLM generation for concept on import
-            )
-            
-            # Create the campaign object using CRUD
-            db_campaign = crud.create_campaign(
-                db=db,
-                campaign=pydantic_campaign_create,
-                owner_id=owner_id,
-                # Explicitly set concept and toc to None initially if crud op might try to generate them
-                # This depends on crud.create_campaign's behavior.
-                # For now, assuming crud.create_campaign won't auto-generate if model_id is None.
-            )
-
-            # Directly set imported concept and TOC if they exist
-            if campaign_concept is not None:
-                db_campaign.concept = campaign_concept
-            if campaign_toc is not None:
-                db_campaign.toc = campaign_toc
-            
-            # Commit to save campaign and get ID, then refresh
-            db.commit()
-            db.refresh(db_campaign)
-
-            summary.imported_campaigns_count += 1
-            summary.created_campaign_ids.append(db_campaign.id)
-            
-            current_section_order = 0
-            for section_data in sections_data:
-                try:
-                    crud.create_campaign_section(
-                        db=db,
-                        campaign_id=db_campaign.id,
-                        section_title=section_data.title,
-                        section_content=section_data.content,
-                        # Use provided order, or increment if not set
-                        order=section_data.order if section_data.order is not None else current_section_order 
-                    )
-                    summary.imported_sections_count += 1
-                    current_section_order = (section_data.order + 1) if section_data.order is not None else (current_section_order + 1)
-                except Exception as e_sec:
-                    summary.errors.append(ImportErrorDetail(
-                        file_name=source_filename,
-                        item_identifier=section_data.title or f"Section at index {sections_data.index(section_data)} in '{campaign_title}'",
-                        error=f"Failed to create section: {str(e_sec)}"
-                    ))
-            return db_campaign
+            db_campaign = crud.create_imported_campaign(db, owner_id=owner_id, title=campaign_title, concept=campaign_concept, commit=False)
+            campaign_id = db_campaign.id
+            crud.create_campaign_sections_bulk(db, campaign_id=campaign_id, sections=self._section_rows(sections_data))
         except Exception as e_camp:
+            db.rollback()
             summary.errors.append(ImportErrorDetail(
                 file_name=source_filename,
                 item_identifier=campaign_title,
                 error=f"Failed to create campaign '{campaign_title}': {str(e_camp)}"
             ))
             return None
+        summary.imported_campaigns_count += 1
+        summary.created_campaign_ids.append(campaign_id)
+        summary.imported_sections_count += len(sections_data)
+        return campaign_id
 
 
     def import_from_json_content(
@@ -125,12 +164,7 @@ class ImportService:
                 if not db_campaign_target:
                     summary.errors.append(ImportErrorDetail(file_name=source_filename, error=f"Target campaign ID {target_campaign_id} not found."))
                 else:
-                    for section_data in sections_to_import:
-                        try:
-                            crud.create_campaign_section(db, campaign_id=target_campaign_id, section_title=section_data.title, section_content=section_data.content, order=section_data.order)
-                            summary.imported_sections_count += 1
-                        except Exception as e_sec:
-                            summary.errors.append(ImportErrorDetail(file_name=source_filename, item_identifier=section_data.title, error=f"Failed to add section to campaign ID {target_campaign_id}: {str(e_sec)}"))
+                    self._add_sections(db, target_campaign_id, sections_to_import, summary, source_filename=source_filename)
                     if sections_to_import and target_campaign_id not in summary.updated_campaign_ids:
                         summary.updated_campaign_ids.append(target_campaign_id)
             elif sections_to_import: # Create new campaign if sections exist and no target
@@ -153,12 +187,7 @@ class ImportService:
                 if not db_campaign_target:
                     summary.errors.append(ImportErrorDetail(file_name=source_filename, error=f"Target campaign ID {target_campaign_id} not found."))
                 else: # Add sections from this campaign structure to an existing one
-                    for section_data in campaign_data.sections:
-                        try:
-                            crud.create_campaign_section(db, campaign_id=target_campaign_id, section_title=section_data.title, section_content=section_data.content, order=section_data.order)
-                            summary.imported_sections_count += 1
-                        except Exception as e_sec:
-                             summary.errors.append(ImportErrorDetail(file_name=source_filename, item_identifier=section_data.title, error=f"Failed to add section to campaign ID {target_campaign_id}: {str(e_sec)}"))
+                    self._add_sections(db, target_campaign_id, campaign_data.sections, summary, source_filename=source_filename)
                     if campaign_data.sections and target_campaign_id not in summary.updated_campaign_ids:
                         summary.updated_campaign_ids.append(target_campaign_id)
             else: # Create new campaign from this CampaignStructure
@@ -177,158 +206,222 @@ class ImportService:
         return summary
 
 
-    def import_from_zip_file(
-        self, 
-        file_bytes: bytes, 
-        owner_id: int, 
-        db: Session, 
+    def _read_zip_member_text(self, zf: zipfile.ZipFile, member: zipfile.ZipInfo, summary: ImportSummaryResponse) -> Optional[str]:
+        """Reads and decodes one Zip member, or records why it was skipped and returns None."""
+        file_name = member.filename
+        max_bytes = settings.IMPORT_ZIP_MAX_MEMBER_BYTES
+        too_large_error = ImportErrorDetail(file_name=file_name, error=f"File is larger than the import limit of {max_bytes} bytes; skipped.")
+        if member.file_size > max_bytes:
+            summary.errors.append(too_large_error)
+            return None
+        try:
+            with zf.open(member) as member_file:
+                # Read one byte past the limit: the size in the Zip header is not trusted
+                file_content_bytes = member_file.read(max_bytes + 1)
+        except Exception as e_read:
+            summary.errors.append(ImportErrorDetail(file_name=file_name, error=f"Failed to read file from zip: {e_read}"))
+            return None
+        if len(file_content_bytes) > max_bytes:
+            summary.errors.append(too_large_error)
+            return None
+
+        try:
+            return file_content_bytes.decode('utf-8')
+        except UnicodeDecodeError:
+            summary.errors.append(ImportErrorDetail(file_name=file_name, error="File not UTF-8, decoded with replacements."))
+            return file_content_bytes.decode('latin-1', errors='replace')
+
+    def _parse_zip_member(
+        self, file_name: str, base_filename: str, file_content_str: str, summary: ImportSummaryResponse
+    ) -> Optional[Union[CampaignStructure, List[SectionStructure]]]:
+        """
+        A .txt file is one section titled after the file; a .json file is a Campaign object or a
+        list of Sections. Returns None for other files and (after recording the error) invalid JSON.
+        """
+        if base_filename.lower().endswith(".txt"):
+            return [SectionStructure(title=os.path.splitext(base_filename)[0], content=file_content_str)]
+        if not base_filename.lower().endswith(".json"):
+            return None
+        try:
+            json_content = json.loads(file_content_str)
+            if isinstance(json_content, dict) and "title" in json_content and "sections" in json_content: # CampaignStructure
+                return CampaignStructure(**json_content)
+            if isinstance(json_content, list): # List of SectionStructures
+                return [SectionStructure(**s) for s in json_content]
+            summary.errors.append(ImportErrorDetail(file_name=file_name, error="JSON file is not a Campaign object or list of Sections."))
+        except json.JSONDecodeError:
+            summary.errors.append(ImportErrorDetail(file_name=file_name, error="Invalid JSON format."))
+        except Exception as e_parse: # Pydantic validation etc.
+            summary.errors.append(ImportErrorDetail(file_name=file_name, error=f"Error parsing JSON structure: {e_parse}"))
+        return None
+
+    def _add_to_folder_section(
+        self,
+        db: Session,
+        target_campaign_id: int,
+        folder_name: str,
+        campaign_struct: Optional[CampaignStructure],
+        sections_data: List[SectionStructure],
+        folder_section_ids: Dict[str, int],
+        summary: ImportSummaryResponse,
+        source_filename: str
+    ) -> None:
+        """
+        Adds a file from a Zip folder to the section that represents the folder in the target
+        campaign (created on the folder's first file). Files are appended to that section in the
+        database as "### Title" blocks; a Campaign JSON's concept and TOC go at its start.
+        """
+        try:
+            folder_section_id = folder_section_ids.get(folder_name)
+            if folder_section_id is None:
+                db_folder_section = crud.create_campaign_section(db, campaign_id=target_campaign_id, section_title=folder_name, section_content="")
+                folder_section_id = folder_section_ids[folder_name] = db_folder_section.id
+                summary.imported_sections_count += 1
+
+            if campaign_struct is not None and (campaign_struct.concept or campaign_struct.toc):
+                folder_section_header = campaign_struct.concept or ""
+                if campaign_struct.toc:
+                    folder_section_header += f"\n\n## Table of Contents\n{campaign_struct.toc}"
+                crud.append_campaign_section_content(db, folder_section_id, target_campaign_id, folder_section_header, prepend=True)
+
+            additional_content = "".join(f"\n\n### {s_data.title or 'Sub-section'}\n{s_data.content}" for s_data in sections_data)
+            if additional_content:
+                crud.append_campaign_section_content(db, folder_section_id, target_campaign_id, additional_content)
+                summary.imported_sections_count += len(sections_data) # Counting these as imported conceptually
+        except Exception as e_folder_sec:
+            db.rollback()
+            summary.errors.append(ImportErrorDetail(file_name=source_filename, item_identifier=folder_name, error=f"Failed to create section for folder '{folder_name}' in campaign ID {target_campaign_id}: {str(e_folder_sec)}"))
+
+    def _import_zip_member(
+        self,
+        db: Session,
+        owner_id: int,
+        file_name: str,
+        file_content_str: str,
+        summary: ImportSummaryResponse,
+        target_campaign_id: Optional[int],
+        process_folders_as_structure: bool,
+        created_ids: Dict[str, int]
+    ) -> None:
+        """
+        Writes one Zip member's campaign or sections to the database. `created_ids` carries the
+        campaign (or, with a target campaign, the folder section) created for each top-level
+        folder from one member to the next; the key "" is the campaign for loose root files.
+        """
+        path_parts = [part for part in file_name.split('/') if part] # Clean empty parts
+        base_filename = path_parts[-1] if path_parts else file_name
+        # Top-level folder name, when folders are campaigns (or sections of the target campaign)
+        folder_name = path_parts[0] if process_folders_as_structure and len(path_parts) > 1 else None
+
+        parsed = self._parse_zip_member(file_name, base_filename, file_content_str, summary)
+        if parsed is None:
+            return
+        campaign_struct = parsed if isinstance(parsed, CampaignStructure) else None
+        sections_data = campaign_struct.sections if campaign_struct is not None else parsed
+
+        if target_campaign_id:
+            if folder_name is None:
+                self._add_sections(db, target_campaign_id, sections_data, summary, source_filename=file_name)
+            else:
+                self._add_to_folder_section(db, target_campaign_id, folder_name, campaign_struct, sections_data, created_ids, summary, file_name)
+            if target_campaign_id not in summary.updated_campaign_ids:
+                summary.updated_campaign_ids.append(target_campaign_id)
+            return
+
+        if campaign_struct is not None and folder_name is None: # Top-level campaign JSON
+            self._create_campaign_with_sections(
+                db, owner_id, campaign_struct.title or os.path.splitext(base_filename)[0],
+                campaign_struct.concept, campaign_struct.toc, sections_data, summary, source_filename=file_name
+            )
+            return
+
+        collection_key = folder_name or ""
+        campaign_id = created_ids.get(collection_key)
+        if campaign_id is None:
+            campaign_id = self._create_campaign(db, owner_id, folder_name or ZIP_LOOSE_FILES_CAMPAIGN_TITLE, None, summary, source_filename=file_name)
+            if campaign_id is None:
+                return
+            created_ids[collection_key] = campaign_id
+        if campaign_struct is not None: # Campaign JSON inside a folder: its title and concept win
+            crud.update_imported_campaign_details(db, campaign_id, title=campaign_struct.title or None, concept=campaign_struct.concept)
+        self._add_sections(db, campaign_id, sections_data, summary, source_filename=file_name)
+
+    def iter_zip_import(
+        self,
+        zip_file: BinaryIO,
+        owner_id: int,
+        db: Session,
+        summary: ImportSummaryResponse,
         target_campaign_id: Optional[int] = None,
         process_folders_as_structure: bool = False
-    ) -> ImportSummaryResponse:
-        summary = ImportSummaryResponse(created_campaign_ids=[], updated_campaign_ids=[], errors=[])
-        
-        # { "campaign_title_or_path": CampaignStructure, ... }
-        parsed_campaigns_data: Dict[str, CampaignStructure] = {}
-        # Sections for a flat import or to be added to target_campaign_id
-        loose_sections: List[SectionStructure] = [] 
+    ) -> Iterator[ImportProgress]:
+        """
+        Imports a Zip archive from a seekable file one member at a time, yielding progress after
+        each file and filling in `summary` as it goes.
+
+        Only the member being processed is held in memory: its campaign or sections are written
+        (and committed) before the next member is read, so memory does not grow with the size
+        of the archive. Members are processed in file name order.
+        """
+        if target_campaign_id:
+            if crud.get_campaign(db=db, campaign_id=target_campaign_id, with_characters=False) is None:
+                summary.errors.append(ImportErrorDetail(error=f"Target campaign ID {target_campaign_id} not found. Cannot add loose sections or folder contents."))
+                return
 
         try:
-            with zipfile.ZipFile(io.BytesIO(file_bytes)) as zf:
-                file_list = sorted(zf.infolist(), key=lambda x: x.filename) # Process in predictable order
-
-                for member in file_list:
-                    if member.is_dir() or member.filename.startswith('__MACOSX/') or not member.filename.strip():
-                        continue
-
-                    file_name = member.filename
-                    
-                    try:
-                        file_content_bytes = zf.read(member.name)
-                        file_content_str = file_content_bytes.decode('utf-8')
-                    except UnicodeDecodeError:
-                        try:
-                            file_content_str = file_content_bytes.decode('latin-1', errors='replace')
-                            summary.errors.append(ImportErrorDetail(file_name=file_name, error="File not UTF-8, decoded with replacements."))
-                        except Exception as e_decode_fallback:
-                            summary.errors.append(ImportErrorDetail(file_name=file_name, error=f"Failed to decode file: {e_decode_fallback}"))
-                            continue
-                    except Exception as e_read:
-                        summary.errors.append(ImportErrorDetail(file_name=file_name, error=f"Failed to read file from zip: {e_read}"))
-                        continue
-                    
-                    path_parts = [part for part in file_name.split('/') if part] # Clean empty parts
-                    base_filename = path_parts[-1] if path_parts else file_name
-                    title_from_filename = os.path.splitext(base_filename)[0]
-
-                    # Determine target collection based on structure processing and path
-                    current_collection_key = None
-                    is_part_of_structured_campaign = False
-
-                    if process_folders_as_structure and len(path_parts) > 1:
-                        current_collection_key = path_parts[0] # Top-level folder name
-                        is_part_of_structured_campaign = True
-                        if current_collection_key not in parsed_campaigns_data:
-                            parsed_campaigns_data[current_collection_key] = CampaignStructure(title=current_collection_key, sections=[])
-                    
-                    # Process file content
-                    if base_filename.lower().endswith(".txt"):
-                        section = SectionStructure(title=title_from_filename, content=file_content_str)
-                        if is_part_of_structured_campaign and current_collection_key:
-                            parsed_campaigns_data[current_collection_key].sections.append(section)
-                        else:
-                            loose_sections.append(section)
-                    
-                    elif base_filename.lower().endswith(".json"):
-                        try:
-                            json_content = json.loads(file_content_str)
-                            if isinstance(json_content, dict) and "title" in json_content and "sections" in json_content: # CampaignStructure
-                                campaign_struct = CampaignStructure(**json_content)
-                                if is_part_of_structured_campaign and current_collection_key: # Campaign JSON inside a folder
-                                    # Merge this campaign's data into the folder-campaign
-                                    parsed_campaigns_data[current_collection_key].title = campaign_struct.title or current_collection_key # Prefer JSON title
-                                    parsed_campaigns_data[current_collection_key].concept = campaign_struct.concept or parsed_campaigns_data[current_collection_key].concept
-                                    parsed_campaigns_data[current_collection_key].toc = campaign_struct.toc or parsed_campaigns_data[current_collection_key].toc
-                                    parsed_campaigns_data[current_collection_key].sections.extend(campaign_struct.sections)
-                                else: # Top-level campaign JSON
-                                    parsed_campaigns_data[campaign_struct.title or title_from_filename] = campaign_struct
-                            elif isinstance(json_content, list): # List of SectionStructures
-                                sections_from_json = [SectionStructure(**s) for s in json_content]
-                                if is_part_of_structured_campaign and current_collection_key:
-                                    parsed_campaigns_data[current_collection_key].sections.extend(sections_from_json)
-                                else:
-                                    loose_sections.extend(sections_from_json)
-                            else:
-                                summary.errors.append(ImportErrorDetail(file_name=file_name, error="JSON file is not a Campaign object or list of Sections."))
-                        except json.JSONDecodeError:
-                            summary.errors.append(ImportErrorDetail(file_name=file_name, error="Invalid JSON format."))
-                        except Exception as e_parse: # Pydantic validation etc.
-                            summary.errors.append(ImportErrorDetail(file_name=file_name, error=f"Error parsing JSON structure: {e_parse}"))
+            zf = zipfile.ZipFile(zip_file)
         except zipfile.BadZipFile:
             summary.errors.append(ImportErrorDetail(error="Invalid or corrupted Zip file."))
-            return summary
+            return
         except Exception as e_zip:
             summary.errors.append(ImportErrorDetail(error=f"Error processing Zip file: {str(e_zip)}"))
-            return summary
+            return
 
-        # Create/update database entities from parsed_campaigns_data and loose_sections
-        if target_campaign_id:
-            db_campaign_target = crud.get_campaign(db=db, campaign_id=target_campaign_id)
-            if not db_campaign_target:
-                summary.errors.append(ImportErrorDetail(error=f"Target campaign ID {target_campaign_id} not found. Cannot add loose sections or folder contents."))
-            else:
-                # Add loose sections first
-                for section_data in loose_sections:
-                    try:
-                        crud.create_campaign_section(db, campaign_id=target_campaign_id, section_title=section_data.title, section_content=section_data.content, order=section_data.order)
-                        summary.imported_sections_count += 1
-                    except Exception as e_sec:
-                        summary.errors.append(ImportErrorDetail(item_identifier=section_data.title or "Untitled section from Zip root", error=f"Failed to add section to campaign ID {target_campaign_id}: {str(e_sec)}"))
-                
-                # If process_folders_as_structure, treat folders as new top-level sections in target_campaign_id
-                if process_folders_as_structure:
-                    for folder_name, campaign_data_from_folder in parsed_campaigns_data.items():
-                        # Create a main section for the folder
-                        folder_section_content = campaign_data_from_folder.concept or "" # Use concept as main content if available
-                        if campaign_data_from_folder.toc: # Append TOC to folder section content
-                            folder_section_content += f"\n\n## Table of Contents\n{campaign_data_from_folder.toc}"
-                        
-                        try:
-                            # Create the folder as a section
-                            db_folder_section = crud.create_campaign_section(db, campaign_id=target_campaign_id, section_title=folder_name, section_content=folder_section_content)
-                            summary.imported_sections_count += 1
-                            # Now add files from that folder as sub-content (e.g. appended to folder_section content)
-                            # This part needs more thought: how to represent sub-sections?
-                            # For now, just concatenating content from folder's sections into this one section for simplicity.
-                            # A better approach might involve hierarchical sections if the model supports it.
-                            additional_content = []
-                            for s_data in campaign_data_from_folder.sections:
-                                additional_content.append(f"\n\n### {s_data.title or 'Sub-section'}\n{s_data.content}")
-                                summary.imported_sections_count +=1 # Counting these as imported conceptually
-                            
-                            if additional_content:
-                                db_folder_section.content += "".join(additional_content)
-                                db.commit()
-                                db.refresh(db_folder_section)
-
-                        except Exception as e_folder_sec:
-                            summary.errors.append(ImportErrorDetail(item_identifier=folder_name, error=f"Failed to create section for folder '{folder_name}' in campaign ID {target_campaign_id}: {str(e_folder_sec)}"))
-                
-                if (loose_sections or (process_folders_as_structure and parsed_campaigns_data)) and target_campaign_id not in summary.updated_campaign_ids:
-                    summary.updated_campaign_ids.append(target_campaign_id)
-
-        else: # No target_campaign_id, create new campaigns
-            if loose_sections:
-                self._create_campaign_with_sections(db, owner_id, "Imported Loose Files from Zip", None, None, loose_sections, summary, source_filename="Zip Archive (Root)")
-            for campaign_title_key, campaign_obj_data in parsed_campaigns_data.items():
-                self._create_campaign_with_sections(
-                    db, owner_id, campaign_obj_data.title or campaign_title_key, 
-                    campaign_obj_data.concept, campaign_obj_data.toc, 
-                    campaign_obj_data.sections, summary, source_filename=f"Zip Archive ({campaign_title_key})"
+        with zf:
+            members = sorted(
+                (member for member in zf.infolist()
+                 if not (member.is_dir() or member.filename.startswith('__MACOSX/') or not member.filename.strip())),
+                key=lambda x: x.filename # Process in predictable order
+            )
+            created_ids: Dict[str, int] = {}
+            for processed_files, member in enumerate(members, start=1):
+                file_content_str = self._read_zip_member_text(zf, member, summary)
+                if file_content_str is not None:
+                    self._import_zip_member(
+                        db, owner_id, member.filename, file_content_str, summary,
+                        target_campaign_id, process_folders_as_structure, created_ids
+                    )
+                    del file_content_str # Not kept alive while suspended at the yield
+                yield ImportProgress(
+                    processed_files=processed_files,
+                    total_files=len(members),
+                    current_file=member.filename,
+                    imported_campaigns_count=summary.imported_campaigns_count,
+                    imported_sections_count=summary.imported_sections_count,
+                    errors_count=len(summary.errors)
                 )
 
         if not summary.errors and summary.imported_campaigns_count == 0 and summary.imported_sections_count == 0:
             summary.message = "Zip import successful, but no new campaigns or sections were created."
         elif summary.errors:
             summary.message = "Zip import process completed with errors."
-            
+
+    def import_from_zip_file(
+        self, 
+        zip_file: Union[bytes, BinaryIO], 
+        owner_id: int, 
+        db: Session, 
+        target_campaign_id: Optional[int] = None,
+        process_folders_as_structure: bool = False
+    ) -> ImportSummaryResponse:
+        """Imports a whole Zip archive (its bytes or a seekable binary file); see iter_zip_import."""
+        summary = ImportSummaryResponse(created_campaign_ids=[], updated_campaign_ids=[], errors=[])
+        if isinstance(zip_file, bytes):
+            zip_file = io.BytesIO(zip_file)
+        for _ in self.iter_zip_import(
+            zip_file, owner_id, db, summary,
+            target_campaign_id=target_campaign_id,
+            process_folders_as_structure=process_folders_as_structure
+        ):
+            pass
         return summary
@@ -0,0 +1,88 @@
+import hashlib
+import logging
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def key_fingerprint(key_material: Optional[str]) -> str:
+    """
+    Returns a short, non-reversible fingerprint of an API key (or any other credential material).
+    Used so raw keys are never kept as dictionary keys in process memory.
+    """
+    if not key_material:
+        return "none"
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()[:16]
+
+
+class ProviderAvailabilityRegistry:
+    """
+    Process-wide cache of LLM provider availability, keyed by (provider, API-key fingerprint).
+
+    Positive results are kept for settings.LLM_AVAILABILITY_TTL_SECONDS and negative results
+    for settings.LLM_AVAILABILITY_NEGATIVE_TTL_SECONDS, so a provider that is down is re-probed
+    sooner than one that is up. Services call `invalidate` (or `mark_unavailable`) when a real
+    generation call fails so the next request probes again instead of trusting a stale entry.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, provider: str, key_material: Optional[str]) -> Tuple[str, str]:
+        return (provider.lower(), key_fingerprint(key_material))
+
+    def get(self, provider: str, key_material: Optional[str]) -> Optional[bool]:
+        """Returns the cached availability, or None if there is no fresh entry."""
+        cache_key = self._key(provider, key_material)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            available, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[cache_key]
+                return None
+            return available
+
+    def set(self, provider: str, key_material: Optional[str], available: bool) -> None:
+        ttl = settings.LLM_AVAILABILITY_TTL_SECONDS if available else settings.LLM_AVAILABILITY_NEGATIVE_TTL_SECONDS
+        with self._lock:
+            self._entries[self._key(provider, key_material)] = (available, time.monotonic() + max(0, ttl))
+
+    def mark_unavailable(self, provider: str, key_material: Optional[str]) -> None:
+        """Records a definitive failure (e.g. an invalid key) as a negative entry."""
+        self.set(provider, key_material, False)
+
+    def invalidate(self, provider: str, key_material: Optional[str]) -> None:
+        with self._lock:
+            self._entries.pop(self._key(provider, key_material), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    async def check(self, provider: str, key_material: Optional[str], probe: Callable[[], Awaitable[bool]]) -> bool:
+        """
+        Returns the cached availability if fresh, otherwise runs `probe` and caches its result.
+        A probe that raises is treated as unavailable.
+        """
+        cached = self.get(provider, key_material)
+        if cached is not None:
+            return cached
+        try:
+            available = bool(await probe())
+        except Exception as e:
+            logger.warning(f"Availability probe for provider '{provider}' raised {type(e).__name__}: {e}")
+            available = False
+        self.set(provider, key_material, available)
+        logger.debug(f"Availability for provider '{provider}' probed: {available}")
+        return available
+
+
+# Shared by all LLM services in this process
+availability_registry = ProviderAvailabilityRegistry()
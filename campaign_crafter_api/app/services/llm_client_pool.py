@@ -0,0 +1,138 @@
+import asyncio
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.llm_availability import key_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+async def close_llm_client(client: Any) -> None:
+    """
+    Closes an SDK/HTTP client regardless of its flavour:
+    httpx.AsyncClient (aclose), AsyncOpenAI (async close) and genai.Client (sync close + aio.aclose).
+    """
+    try:
+        aclose = getattr(client, "aclose", None)
+        if callable(aclose):
+            await aclose()
+            return
+        close = getattr(client, "close", None)
+        if callable(close):
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        # genai.Client keeps a separate transport for its async surface
+        aio = getattr(client, "aio", None)
+        if aio is not None and callable(getattr(aio, "aclose", None)):
+            await aio.aclose()
+    except Exception as e:
+        logger.warning(f"Error closing pooled LLM client {type(client).__name__}: {type(e).__name__} - {e}")
+
+
+class LLMClientPool:
+    """
+    Process-wide registry of long-lived LLM SDK clients, keyed by
+    (provider, API-key fingerprint, base URL), so keep-alive connections and TLS
+    sessions are reused across requests instead of being rebuilt per service instance.
+
+    The pool is bounded (settings.LLM_CLIENT_POOL_MAX_SIZE) with LRU eviction. A service
+    keeps the client it was given for the rest of its request, so an evicted client is not
+    closed right away: it is retired, held until settings.LLM_CLIENT_RETIRE_GRACE_SECONDS
+    have passed and then closed in the background. `aclose_all` is called from the FastAPI
+    lifespan on shutdown and also closes clients still retiring.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, retire_grace_seconds: Optional[float] = None):
+        self._max_size = max_size
+        self._retire_grace_seconds = retire_grace_seconds
+        self._clients: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Evicted clients by id(), kept alive until closed
+        self._retiring: Dict[int, Any] = {}
+        self._pending_closes: Set[asyncio.Task] = set()
+
+    @property
+    def max_size(self) -> int:
+        return max(1, self._max_size or settings.LLM_CLIENT_POOL_MAX_SIZE)
+
+    @property
+    def retire_grace_seconds(self) -> float:
+        if self._retire_grace_seconds is not None:
+            return self._retire_grace_seconds
+        return settings.LLM_CLIENT_RETIRE_GRACE_SECONDS
+
+    @property
+    def retiring_count(self) -> int:
+        return len(self._retiring)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get_or_create(self, provider: str, key_material: Optional[str], base_url: Optional[str], factory: Callable[[], Any]) -> Any:
+        """Returns the pooled client for this key, creating it with `factory` on a miss."""
+        pool_key = (provider.lower(), key_fingerprint(key_material), base_url or "")
+        evicted = []
+        with self._lock:
+            client = self._clients.get(pool_key)
+            if client is not None:
+                self._clients.move_to_end(pool_key)
+                return client
+            client = factory()
+            self._clients[pool_key] = client
+            while len(self._clients) > self.max_size:
+                _, old_client = self._clients.popitem(last=False)
+                self._retiring[id(old_client)] = old_client
+                evicted.append(old_client)
+        for old_client in evicted:
+            self._schedule_retirement(old_client)
+        logger.debug(f"Created pooled {provider} client (pool size {len(self._clients)}).")
+        return client
+
+    def _schedule_retirement(self, client: Any) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.debug(f"No running event loop; evicted {type(client).__name__} is closed on shutdown.")
+            return
+        task = loop.create_task(self._close_after_grace(client))
+        # Keep a reference so the task isn't garbage-collected before it finishes
+        self._pending_closes.add(task)
+        task.add_done_callback(self._pending_closes.discard)
+
+    async def _close_after_grace(self, client: Any) -> None:
+        await asyncio.sleep(self.retire_grace_seconds)
+        with self._lock:
+            # aclose_all may have taken it already
+            if self._retiring.pop(id(client), None) is None:
+                return
+        await close_llm_client(client)
+        logger.debug(f"Closed retired pooled {type(client).__name__}.")
+
+    async def aclose_all(self) -> None:
+        """Closes every pooled client, including evicted ones still retiring. Used on application shutdown."""
+        with self._lock:
+            clients = list(self._clients.values()) + list(self._retiring.values())
+            self._clients.clear()
+            self._retiring.clear()
+        current_loop = asyncio.get_running_loop()
+        for task in list(self._pending_closes):
+            if task.get_loop() is current_loop:
+                task.cancel()
+        for client in clients:
+            await close_llm_client(client)
+        logger.info(f"Closed {len(clients)} pooled LLM client(s).")
+
+    def clear(self) -> None:
+        """Drops all pooled and retiring clients without closing them (e.g. between tests)."""
+        with self._lock:
+            self._clients.clear()
+            self._retiring.clear()
+
+
+# Shared by all LLM services in this process
+llm_client_pool = LLMClientPool()
@@ -1,3 +1,4 @@
+import asyncio
 import logging # Added logging
 from typing import Optional, Type, Dict, List
 from sqlalchemy.orm import Session
@@ -13,6 +14,7 @@ from app.services.deepseek_service import DeepSeekLLMService
 from app.services.local_llm_service import LocalLLMService # New import
 from app.core.config import settings
 from app.services.llm_service import LLMServiceUnavailableError
+from app.services.llm_client_pool import llm_client_pool
 
 logger = logging.getLogger(__name__) # Added logger
 
@@ -29,6 +31,31 @@ _llm_service_providers: Dict[str, Type[AbstractLLMService]] = {
 if settings.LOCAL_LLM_PROVIDER_NAME:
     _llm_service_providers[settings.LOCAL_LLM_PROVIDER_NAME.lower()] = LocalLLMService
 
+# Process-wide per-provider semaphores limiting in-flight generation calls.
+# asyncio primitives are bound to the loop they are first used on, so each entry
+# remembers its loop and is rebuilt if a different loop (e.g. in tests) asks for it.
+_provider_semaphores: Dict[str, tuple] = {}
+
+
+def get_provider_semaphore(provider_name: Optional[str]) -> asyncio.Semaphore:
+    """
+    Returns the shared semaphore bounding concurrent calls to a single LLM provider.
+    The limit comes from settings.LLM_PROVIDER_MAX_CONCURRENCY.
+    """
+    key = (provider_name or "default").lower()
+    loop = asyncio.get_running_loop()
+    entry = _provider_semaphores.get(key)
+    if entry is None or entry[0] is not loop:
+        limit = max(1, settings.LLM_PROVIDER_MAX_CONCURRENCY)
+        entry = (loop, asyncio.Semaphore(limit))
+        _provider_semaphores[key] = entry
+    return entry[1]
+
+
+async def shutdown_llm_clients() -> None:
+    """Closes every pooled LLM client. Called from the FastAPI lifespan on shutdown."""
+    await llm_client_pool.aclose_all()
+
 
 def get_llm_service(
     db: Session,
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 import logging
-from typing import Optional, List, Dict
+from typing import AsyncIterator, Optional, List, Dict
 from sqlalchemy.orm import Session
 from app import models, orm_models # Changed import, Added orm_models import
 from app.models import User as UserModel
@@ -55,6 +55,38 @@ class AbstractLLMService(ABC):
         """
         pass
 
+    async def stream_text(
+        self,
+        prompt: str,
+        current_user: UserModel,
+        db: Session,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        db_campaign: Optional[orm_models.Campaign] = None,
+        section_title_suggestion: Optional[str] = None,
+        section_type: Optional[str] = None,
+        section_creation_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming counterpart of generate_text: yields the completion as token deltas.
+        The default implementation yields the whole generate_text result as a single chunk.
+        """
+        content = await self.generate_text(
+            prompt=prompt,
+            current_user=current_user,
+            db=db,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            db_campaign=db_campaign,
+            section_title_suggestion=section_title_suggestion,
+            section_type=section_type,
+            section_creation_prompt=section_creation_prompt
+        )
+        if content:
+            yield content
+
     @abstractmethod
     async def generate_campaign_concept(self, user_prompt: str, db: Session, current_user: UserModel, model: Optional[str] = None) -> str: # Changed signature
         """
@@ -100,6 +132,35 @@ class AbstractLLMService(ABC):
         """
         pass
 
+    async def stream_section_content(
+        self,
+        db_campaign: orm_models.Campaign,
+        db: Session,
+        current_user: UserModel,
+        existing_sections_summary: Optional[str],
+        section_creation_prompt: Optional[str],
+        section_title_suggestion: Optional[str],
+        model: Optional[str] = None,
+        section_type: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming counterpart of generate_section_content: yields the section text as token deltas.
+        Providers without native streaming inherit this default, which yields the whole
+        generate_section_content result as a single chunk.
+        """
+        content = await self.generate_section_content(
+            db_campaign=db_campaign,
+            db=db,
+            current_user=current_user,
+            existing_sections_summary=existing_sections_summary,
+            section_creation_prompt=section_creation_prompt,
+            section_title_suggestion=section_title_suggestion,
+            model=model,
+            section_type=section_type
+        )
+        if content:
+            yield content
+
     @abstractmethod
     async def generate_homebrewery_toc_from_sections(self, sections_summary: str, db: Session, current_user: UserModel, model: Optional[str] = None) -> str:
         '''
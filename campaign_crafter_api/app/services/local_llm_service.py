@@ -1,7 +1,8 @@
 import httpx # For making async HTTP requests
+import json
 import logging
 import re
-from typing import Optional, List, Dict, Any, AsyncGenerator
+from typing import Optional, List, Dict, Any, AsyncGenerator, AsyncIterator
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app import models, orm_models
@@ -9,6 +10,8 @@ from app.models import User as UserModel
 from app.core.config import settings
 from app.services.llm_service import AbstractLLMService, LLMGenerationError
 from app.services.feature_prompt_service import FeaturePromptService
+from app.services.llm_availability import availability_registry
+from app.services.llm_client_pool import llm_client_pool
 
 logger = logging.getLogger(__name__)
 # Standard ignored API key for local OpenAI-compatible servers
@@ -29,17 +32,25 @@ class LocalLLMService(AbstractLLMService):
         if not self.api_base_url.endswith('/'):
             self.api_base_url += '/'
             
-        self.client = httpx.AsyncClient(base_url=self.api_base_url, timeout=60.0)
+        # Long-lived client (and connection pool) shared by every service instance for this server
+        self.client = llm_client_pool.get_or_create(
+            self.PROVIDER_NAME, None, self.api_base_url,
+            lambda: httpx.AsyncClient(base_url=self.api_base_url, timeout=60.0)
+        )
         self.default_model_id = settings.LOCAL_LLM_DEFAULT_MODEL_ID
         self.feature_prompt_service = FeaturePromptService()
 
     async def close(self):
-        """Closes the HTTP client session."""
-        await self.client.aclose()
+        """No-op: the HTTP client is pooled and closed by llm_client_pool after eviction or on shutdown."""
+        pass
 
     async def is_available(self, current_user: UserModel, db: Session) -> bool:
         if not self.configured_successfully: # Relies on __init__ to set this based on api_base_url
             return False
+        # Local servers have no real key, so the base URL identifies the cache entry
+        return await availability_registry.check(self.PROVIDER_NAME, self.api_base_url, self._probe_availability)
+
+    async def _probe_availability(self) -> bool:
         try:
             response = await self.client.get("models", headers={"Authorization": f"Bearer {LOCAL_LLM_DUMMY_API_KEY}"})
             return response.status_code == 200
@@ -103,10 +114,13 @@ class LocalLLMService(AbstractLLMService):
             except Exception:
                 pass # Keep the original text if JSON parsing fails
             logger.error(error_detail)
+            if e.response.status_code >= 500:
+                availability_registry.invalidate(self.PROVIDER_NAME, self.api_base_url)
             raise HTTPException(status_code=e.response.status_code, detail=error_detail)
         except httpx.RequestError as e: # Network errors
             error_detail = f"Network error connecting to {self.PROVIDER_NAME.title()} API: {e}"
             logger.error(error_detail)
+            availability_registry.invalidate(self.PROVIDER_NAME, self.api_base_url)
             raise HTTPException(status_code=503, detail=error_detail) # Service Unavailable
         except Exception as e: # Other unexpected errors
             error_detail = f"Unexpected error during {self.PROVIDER_NAME.title()} text generation: {type(e).__name__} - {e}"
@@ -114,6 +128,70 @@ class LocalLLMService(AbstractLLMService):
             raise HTTPException(status_code=500, detail=error_detail)
 
 
+    async def stream_text(
+        self,
+        prompt: str,
+        current_user: UserModel,
+        db: Session,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        # Context fields are accepted for interface compatibility; the prompt is expected to be pre-rendered
+        db_campaign: Optional[orm_models.Campaign] = None,
+        section_title_suggestion: Optional[str] = None,
+        section_type: Optional[str] = None,
+        section_creation_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        if not await self.is_available(current_user=current_user, db=db):
+            raise HTTPException(status_code=503, detail=f"{self.PROVIDER_NAME.title()} service is not available or configured.")
+
+        selected_model = model or self.default_model_id
+        if not selected_model:
+            raise HTTPException(status_code=400, detail=f"No model specified and no default model configured for {self.PROVIDER_NAME.title()}.")
+
+        payload = {
+            "model": selected_model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+        }
+        headers = {"Authorization": f"Bearer {LOCAL_LLM_DUMMY_API_KEY}"}
+
+        try:
+            async with self.client.stream("POST", "chat/completions", json=payload, headers=headers) as response:
+                if response.status_code >= 400:
+                    error_body = (await response.aread()).decode(errors="replace")
+                    error_detail = f"Error from {self.PROVIDER_NAME.title()} API: {response.status_code} - {error_body}"
+                    logger.error(error_detail)
+                    if response.status_code >= 500:
+                        availability_registry.invalidate(self.PROVIDER_NAME, self.api_base_url)
+                    raise HTTPException(status_code=response.status_code, detail=error_detail)
+
+                # OpenAI-compatible servers send "data: {chunk}" lines terminated by "data: [DONE]"
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data_str = line[len("data:"):].strip()
+                    if data_str == "[DONE]":
+                        break
+                    try:
+                        chunk = json.loads(data_str)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping malformed {self.PROVIDER_NAME.title()} stream chunk: {data_str[:100]}")
+                        continue
+                    choices = chunk.get("choices") or []
+                    delta = choices[0].get("delta") if choices and isinstance(choices[0], dict) else None
+                    if delta and delta.get("content"):
+                        yield delta["content"]
+        except HTTPException:
+            raise
+        except httpx.RequestError as e: # Network errors
+            error_detail = f"Network error connecting to {self.PROVIDER_NAME.title()} API: {e}"
+            logger.error(error_detail)
+            availability_registry.invalidate(self.PROVIDER_NAME, self.api_base_url)
+            raise HTTPException(status_code=503, detail=error_detail)
+
     async def list_available_models(self, current_user: UserModel, db: Session) -> List[Dict[str, Any]]:
         if not await self.is_available(current_user=current_user, db=db):
             return []
@@ -250,17 +328,16 @@ class LocalLLMService(AbstractLLMService):
             "homebrewery_toc": generated_homebrewery_toc
         }
 
-    async def generate_section_content(
+    def _build_section_prompt(
         self,
-        db_campaign: orm_models.Campaign, # Changed campaign_concept to db_campaign
+        db_campaign: orm_models.Campaign,
         db: Session,
-        current_user: UserModel,
         existing_sections_summary: Optional[str],
         section_creation_prompt: Optional[str],
         section_title_suggestion: Optional[str],
-        model: Optional[str] = None,
-        section_type: Optional[str] = None
+        section_type: Optional[str]
     ) -> str:
+        """Builds the prompt shared by generate_section_content and stream_section_content."""
         campaign_concept = db_campaign.concept if db_campaign else "A general creative writing piece."
         effective_section_prompt = section_creation_prompt
         type_based_instruction = ""
@@ -340,8 +417,41 @@ class LocalLLMService(AbstractLLMService):
             prompt_parts.append("Generate detailed and engaging content for this new section.")
             final_prompt_for_generation = "\n".join(prompt_parts)
             
+        return final_prompt_for_generation
+
+    async def generate_section_content(
+        self,
+        db_campaign: orm_models.Campaign, # Changed campaign_concept to db_campaign
+        db: Session,
+        current_user: UserModel,
+        existing_sections_summary: Optional[str],
+        section_creation_prompt: Optional[str],
+        section_title_suggestion: Optional[str],
+        model: Optional[str] = None,
+        section_type: Optional[str] = None
+    ) -> str:
+        final_prompt_for_generation = self._build_section_prompt(
+            db_campaign, db, existing_sections_summary, section_creation_prompt, section_title_suggestion, section_type
+        )
         return await self.generate_text(prompt=final_prompt_for_generation, current_user=current_user, db=db, model=model, temperature=0.7, max_tokens=4000)
 
+    async def stream_section_content(
+        self,
+        db_campaign: orm_models.Campaign,
+        db: Session,
+        current_user: UserModel,
+        existing_sections_summary: Optional[str],
+        section_creation_prompt: Optional[str],
+        section_title_suggestion: Optional[str],
+        model: Optional[str] = None,
+        section_type: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        final_prompt_for_generation = self._build_section_prompt(
+            db_campaign, db, existing_sections_summary, section_creation_prompt, section_title_suggestion, section_type
+        )
+        async for delta in self.stream_text(prompt=final_prompt_for_generation, current_user=current_user, db=db, model=model, temperature=0.7, max_tokens=4000):
+            yield delta
+
     async def generate_homebrewery_toc_from_sections(self, sections_summary: str, db: Session, current_user: UserModel, model: Optional[str] = None) -> str:
         if not await self.is_available(current_user=current_user, db=db):
             raise HTTPException(status_code=503, detail=f"{self.PROVIDER_NAME.title()} service is not available or configured.")
@@ -448,10 +558,13 @@ class LocalLLMService(AbstractLLMService):
             except Exception:
                 pass
             logger.error(error_detail)
+            if e.response.status_code >= 500:
+                availability_registry.invalidate(self.PROVIDER_NAME, self.api_base_url)
             raise HTTPException(status_code=e.response.status_code, detail=error_detail)
         except httpx.RequestError as e:
             error_detail = f"Network error connecting to {self.PROVIDER_NAME.title()} API: {e}"
             logger.error(error_detail)
+            availability_registry.invalidate(self.PROVIDER_NAME, self.api_base_url)
             raise HTTPException(status_code=503, detail=error_detail)
         except Exception as e:
             error_detail = f"Unexpected error during {self.PROVIDER_NAME.title()} character response generation: {type(e).__name__} - {e}"
@@ -1,7 +1,7 @@
 import re
 import logging
 from openai import AsyncOpenAI, APIError
-from typing import Optional, List, Dict
+from typing import AsyncIterator, Optional, List, Dict, Tuple
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
@@ -9,6 +9,8 @@ from app.core.config import settings
 from app.core.security import decrypt_key
 from app.services.llm_service import AbstractLLMService, LLMServiceUnavailableError, LLMGenerationError
 from app.services.feature_prompt_service import FeaturePromptService
+from app.services.llm_availability import availability_registry
+from app.services.llm_client_pool import llm_client_pool
 from app import models, orm_models
 from app.models import User as UserModel
 from app import crud
@@ -30,7 +32,11 @@ class OpenAILLMService(AbstractLLMService):
         self.configured_successfully = False
         if self.effective_api_key and self.effective_api_key not in ["YOUR_API_KEY_HERE", "YOUR_OPENAI_API_KEY", ""]:
             try:
-                self.client = AsyncOpenAI(api_key=self.effective_api_key)
+                # Long-lived client shared by every service instance using the same key
+                self.client = llm_client_pool.get_or_create(
+                    self.PROVIDER_NAME, self.effective_api_key, None,
+                    lambda: AsyncOpenAI(api_key=self.effective_api_key)
+                )
                 self.configured_successfully = True
             except Exception as e:
                 logger.error(f"Error initializing AsyncOpenAI client: {e}")
@@ -43,6 +49,10 @@ class OpenAILLMService(AbstractLLMService):
     async def is_available(self, current_user: UserModel, db: Session) -> bool:
         if not self.configured_successfully or not self.client:
             return False
+        # Cached per (provider, key fingerprint); only probes the API on a miss or after invalidation
+        return await availability_registry.check(self.PROVIDER_NAME, self.effective_api_key, self._probe_availability)
+
+    async def _probe_availability(self) -> bool:
         try:
             await self.client.models.list() # Test call
             return True
@@ -77,15 +87,53 @@ class OpenAILLMService(AbstractLLMService):
             error_detail = f"OpenAI API Error ({e.status_code}): {e.message or str(e)}"
             logger.error(error_detail)
             if e.status_code == 401:
+                availability_registry.mark_unavailable(self.PROVIDER_NAME, self.effective_api_key)
                 raise LLMServiceUnavailableError(f"OpenAI API key is invalid or unauthorized. Detail: {error_detail}") from e
             elif e.status_code == 429:
                 raise LLMGenerationError(f"OpenAI rate limit exceeded. Detail: {error_detail}") from e
             else:
+                availability_registry.invalidate(self.PROVIDER_NAME, self.effective_api_key)
                 raise LLMGenerationError(error_detail) from e
         except Exception as e:
             logger.error(f"Unexpected error with model {selected_model} (ChatCompletion): {e}")
+            availability_registry.invalidate(self.PROVIDER_NAME, self.effective_api_key)
             raise LLMGenerationError(f"Unexpected error during OpenAI call: {str(e)}") from e
 
+    async def _stream_chat_completion(self, selected_model: str, messages: List[Dict[str,str]], temperature: float, max_tokens: int) -> AsyncIterator[str]:
+        """Like _perform_chat_completion, but yields content deltas as the API produces them."""
+        if not self.client:
+            raise LLMServiceUnavailableError("OpenAI client not initialized.")
+        produced_content = False
+        try:
+            stream = await self.client.chat.completions.create(
+                model=selected_model,
+                messages=messages,
+                temperature=temperature,
+                max_completion_tokens=max_tokens,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                    produced_content = True
+                    yield chunk.choices[0].delta.content
+        except APIError as e:
+            error_detail = f"OpenAI API Error ({e.status_code}): {e.message or str(e)}"
+            logger.error(error_detail)
+            if e.status_code == 401:
+                availability_registry.mark_unavailable(self.PROVIDER_NAME, self.effective_api_key)
+                raise LLMServiceUnavailableError(f"OpenAI API key is invalid or unauthorized. Detail: {error_detail}") from e
+            elif e.status_code == 429:
+                raise LLMGenerationError(f"OpenAI rate limit exceeded. Detail: {error_detail}") from e
+            else:
+                availability_registry.invalidate(self.PROVIDER_NAME, self.effective_api_key)
+                raise LLMGenerationError(error_detail) from e
+        except Exception as e:
+            logger.error(f"Unexpected error with model {selected_model} (streaming ChatCompletion): {e}")
+            availability_registry.invalidate(self.PROVIDER_NAME, self.effective_api_key)
+            raise LLMGenerationError(f"Unexpected error during OpenAI streaming call: {str(e)}") from e
+        if not produced_content:
+            raise LLMGenerationError("OpenAI API stream (ChatCompletion) finished without producing any content.")
+
     async def _perform_legacy_completion(self, selected_model: str, prompt: str, temperature: float, max_tokens: int) -> str: # Removed api_key parameter
         if not self.client:
             raise LLMServiceUnavailableError("OpenAI client not initialized.")
@@ -104,40 +152,31 @@ class OpenAILLMService(AbstractLLMService):
             error_detail = f"OpenAI API Error ({e.status_code}): {e.message or str(e)}"
             logger.error(error_detail)
             if e.status_code == 401:
+                availability_registry.mark_unavailable(self.PROVIDER_NAME, self.effective_api_key)
                 raise LLMServiceUnavailableError(f"OpenAI API key is invalid or unauthorized. Detail: {error_detail}") from e
             elif e.status_code == 429:
                 raise LLMGenerationError(f"OpenAI rate limit exceeded. Detail: {error_detail}") from e
             else:
+                availability_registry.invalidate(self.PROVIDER_NAME, self.effective_api_key)
                 raise LLMGenerationError(error_detail) from e
         except Exception as e:
             logger.error(f"Unexpected error with model {selected_model} (Legacy Completion): {e}")
+            availability_registry.invalidate(self.PROVIDER_NAME, self.effective_api_key)
             raise LLMGenerationError(f"Unexpected error during OpenAI legacy completion call: {str(e)}") from e
 
-    async def generate_text(
+    def _build_text_prompt(
         self,
-        prompt: str, # This is expected to be the template string if context is provided
-        current_user: UserModel,
+        prompt: str,
         db: Session,
-        model: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: int = 500,
-        # Context fields
-        db_campaign: Optional[orm_models.Campaign] = None,
-        section_title_suggestion: Optional[str] = None,
-        section_type: Optional[str] = None,
-        section_creation_prompt: Optional[str] = None # Added
-    ) -> str:
-        # --- DEBUG: Log entry parameters ---
-        logger.debug(f"--- DEBUG OpenAI generate_text ENTRY: db_campaign_id: {db_campaign.id if db_campaign else 'None'}, title_suggestion: {section_title_suggestion}, section_type: {section_type}, section_creation_prompt: {section_creation_prompt[:50] if section_creation_prompt else 'None'}... ---")
-        # --- END DEBUG ---
-        if not await self.is_available(current_user, db):
-            raise LLMServiceUnavailableError("OpenAI service not available or not configured.")
-
-        if not prompt: # Prompt here is the template string from the request
-            raise ValueError("Prompt template cannot be empty.")
-
+        model: Optional[str],
+        db_campaign: Optional[orm_models.Campaign],
+        section_title_suggestion: Optional[str],
+        section_type: Optional[str],
+        section_creation_prompt: Optional[str]
+    ) -> Tuple[str, str, str]:
+        """Returns (model, system message, formatted user prompt) for generate_text and stream_text."""
         selected_model = self._get_model(model, use_chat_model=True)
-        
+
         # This will be the string that might get formatted with context
         prompt_to_format = prompt
         system_message_content = "You are a helpful assistant." # Default system message
@@ -201,10 +240,42 @@ class OpenAILLMService(AbstractLLMService):
         logger.debug(f"--- DEBUG PROMPT END ({self.PROVIDER_NAME} - Generic Generate Text) ---")
         # --- END DEBUG LOGGING ---
 
+        return selected_model, system_message_content, prompt_to_format
+
+    @staticmethod
+    def _is_legacy_completion_model(selected_model: str) -> bool:
+        return selected_model in ["text-davinci-003", "text-davinci-002", "davinci", "curie", "babbage", "ada"]
+
+    async def generate_text(
+        self,
+        prompt: str, # This is expected to be the template string if context is provided
+        current_user: UserModel,
+        db: Session,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        # Context fields
+        db_campaign: Optional[orm_models.Campaign] = None,
+        section_title_suggestion: Optional[str] = None,
+        section_type: Optional[str] = None,
+        section_creation_prompt: Optional[str] = None # Added
+    ) -> str:
+        # --- DEBUG: Log entry parameters ---
+        logger.debug(f"--- DEBUG OpenAI generate_text ENTRY: db_campaign_id: {db_campaign.id if db_campaign else 'None'}, title_suggestion: {section_title_suggestion}, section_type: {section_type}, section_creation_prompt: {section_creation_prompt[:50] if section_creation_prompt else 'None'}... ---")
+        # --- END DEBUG ---
+        if not await self.is_available(current_user, db):
+            raise LLMServiceUnavailableError("OpenAI service not available or not configured.")
+
+        if not prompt: # Prompt here is the template string from the request
+            raise ValueError("Prompt template cannot be empty.")
+
+        selected_model, system_message_content, prompt_to_format = self._build_text_prompt(
+            prompt, db, model, db_campaign, section_title_suggestion, section_type, section_creation_prompt
+        )
+
         # Actual call to LLM
-        if selected_model.endswith("-instruct") or "davinci" in selected_model or "curie" in selected_model or "babbage" in selected_model or "ada" in selected_model:
-            if selected_model in ["text-davinci-003", "text-davinci-002", "davinci", "curie", "babbage", "ada"]:
-                 return await self._perform_legacy_completion(selected_model, prompt_to_format, temperature, max_tokens)
+        if self._is_legacy_completion_model(selected_model):
+            return await self._perform_legacy_completion(selected_model, prompt_to_format, temperature, max_tokens)
 
         messages = [{"role": "system", "content": system_message_content}, {"role": "user", "content": prompt_to_format}]
         # Handle gpt-3.5-turbo-instruct specifically if it prefers no system message, though unlikely with context.
@@ -213,6 +284,37 @@ class OpenAILLMService(AbstractLLMService):
 
         return await self._perform_chat_completion(selected_model, messages, temperature, max_tokens)
 
+    async def stream_text(
+        self,
+        prompt: str,
+        current_user: UserModel,
+        db: Session,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        db_campaign: Optional[orm_models.Campaign] = None,
+        section_title_suggestion: Optional[str] = None,
+        section_type: Optional[str] = None,
+        section_creation_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        if not await self.is_available(current_user, db):
+            raise LLMServiceUnavailableError("OpenAI service not available or not configured.")
+
+        if not prompt:
+            raise ValueError("Prompt template cannot be empty.")
+
+        selected_model, system_message_content, prompt_to_format = self._build_text_prompt(
+            prompt, db, model, db_campaign, section_title_suggestion, section_type, section_creation_prompt
+        )
+        if self._is_legacy_completion_model(selected_model):
+            # The legacy completions endpoint is not streamed; deliver it as one chunk
+            yield await self._perform_legacy_completion(selected_model, prompt_to_format, temperature, max_tokens)
+            return
+
+        messages = [{"role": "system", "content": system_message_content}, {"role": "user", "content": prompt_to_format}]
+        async for delta in self._stream_chat_completion(selected_model, messages, temperature, max_tokens):
+            yield delta
+
     async def generate_campaign_concept(self, user_prompt: str, db: Session, current_user: UserModel, model: Optional[str] = None) -> str:
         if not await self.is_available(current_user, db):
             raise LLMServiceUnavailableError("OpenAI service not available or not configured.")
@@ -324,20 +426,17 @@ class OpenAILLMService(AbstractLLMService):
         titles_list = [title.strip() for title in titles_text.split('\n') if title.strip()]
         return titles_list[:count]
 
-    async def generate_section_content(
+    def _build_section_messages(
         self,
-        db_campaign: orm_models.Campaign, # Changed campaign_concept to db_campaign
+        db_campaign: orm_models.Campaign,
         db: Session,
-        current_user: UserModel,
         existing_sections_summary: Optional[str],
         section_creation_prompt: Optional[str],
         section_title_suggestion: Optional[str],
-        model: Optional[str] = None,
-        section_type: Optional[str] = None
-    ) -> str:
-        if not await self.is_available(current_user, db):
-            raise LLMServiceUnavailableError("OpenAI service not available or not configured.")
-
+        model: Optional[str],
+        section_type: Optional[str]
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        """Builds the (model, chat messages) pair shared by generate_section_content and stream_section_content."""
         campaign_concept = db_campaign.concept if db_campaign else "A general creative writing piece."
         if not campaign_concept: # Should ideally not happen if db_campaign is valid
             raise ValueError("Campaign concept is required and missing from campaign data.")
@@ -436,8 +535,47 @@ class OpenAILLMService(AbstractLLMService):
         logger.debug(f"--- DEBUG PROMPT END ({self.PROVIDER_NAME} - generate_section_content) ---")
         # --- END DEBUG LOGGING ---
 
+        return selected_model, messages
+
+    async def generate_section_content(
+        self,
+        db_campaign: orm_models.Campaign, # Changed campaign_concept to db_campaign
+        db: Session,
+        current_user: UserModel,
+        existing_sections_summary: Optional[str],
+        section_creation_prompt: Optional[str],
+        section_title_suggestion: Optional[str],
+        model: Optional[str] = None,
+        section_type: Optional[str] = None
+    ) -> str:
+        if not await self.is_available(current_user, db):
+            raise LLMServiceUnavailableError("OpenAI service not available or not configured.")
+
+        selected_model, messages = self._build_section_messages(
+            db_campaign, db, existing_sections_summary, section_creation_prompt, section_title_suggestion, model, section_type
+        )
         return await self._perform_chat_completion(selected_model, messages, temperature=0.7, max_tokens=1500)
 
+    async def stream_section_content(
+        self,
+        db_campaign: orm_models.Campaign,
+        db: Session,
+        current_user: UserModel,
+        existing_sections_summary: Optional[str],
+        section_creation_prompt: Optional[str],
+        section_title_suggestion: Optional[str],
+        model: Optional[str] = None,
+        section_type: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        if not await self.is_available(current_user, db):
+            raise LLMServiceUnavailableError("OpenAI service not available or not configured.")
+
+        selected_model, messages = self._build_section_messages(
+            db_campaign, db, existing_sections_summary, section_creation_prompt, section_title_suggestion, model, section_type
+        )
+        async for delta in self._stream_chat_completion(selected_model, messages, temperature=0.7, max_tokens=1500):
+            yield delta
+
     async def list_available_models(self, current_user: UserModel, db: Session) -> List[Dict[str, any]]:
         if not await self.is_available(current_user, db):
             raise LLMServiceUnavailableError("OpenAI service not available or not configured.")
@@ -517,10 +655,7 @@ class OpenAILLMService(AbstractLLMService):
         return sorted_models_list
 
     async def close(self):
-        """Close the AsyncOpenAI client if it was initialized."""
-        # Since clients are created per-request with 'async with',
-        # a global self.async_client no longer exists to be closed here.
-        # This method can be removed or left as a no-op.
+        """No-op: the AsyncOpenAI client is pooled and closed by llm_client_pool after eviction or on shutdown."""
         pass
         # if self.async_client:
         #     await self.async_client.close()
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """
+    bcrypt hashing and verification for user passwords.
+
+    Each call costs 2^settings.BCRYPT_ROUNDS key-expansion rounds (100-300 ms of CPU at the
+    default cost), so logins (`verify_and_update_async`) and new or changed passwords
+    (`hash_on_pool`) run on a dedicated pool of settings.PASSWORD_HASH_MAX_WORKERS threads
+    instead of the event loop. bcrypt releases the GIL while hashing, and the pool bounds how
+    many cores a login or sign-up storm can take. Hashes made with a different cost than the
+    configured one are reported for rehashing by `verify_and_update`.
+    """
+
+    def __init__(self, rounds: Optional[int] = None, max_workers: Optional[int] = None):
+        self._rounds = rounds
+        self._max_workers = max_workers
+        self._context: Optional[CryptContext] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def rounds(self) -> int:
+        return self._rounds or settings.BCRYPT_ROUNDS
+
+    @property
+    def context(self) -> CryptContext:
+        if self._context is None:
+            self._context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=self.rounds)
+        return self._context
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers or settings.PASSWORD_HASH_MAX_WORKERS,
+                    thread_name_prefix="password-hash"
+                )
+            return self._executor
+
+    def hash(self, password: str) -> str:
+        return self.context.hash(password)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self.context.verify(plain_password, hashed_password)
+
+    def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns (valid, new_hash). `new_hash` is set when the password is valid but its hash was
+        made with a different cost (or scheme) than the configured one.
+        """
+        return self.context.verify_and_update(plain_password, hashed_password)
+
+    def hash_on_pool(self, password: str) -> str:
+        """
+        Hashes on the worker pool and waits for the result. For sync callers (which FastAPI
+        already runs off the event loop) so they share the pool's bound with logins.
+        """
+        return self._get_executor().submit(self.hash, password).result()
+
+    async def verify_and_update_async(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self.verify_and_update, plain_password, hashed_password)
+
+    def configure(self, rounds: Optional[int] = None) -> None:
+        """Changes the cost for new hashes (None re-reads settings.BCRYPT_ROUNDS on next use)."""
+        self._rounds = rounds
+        self._context = None
+
+    def shutdown(self) -> None:
+        """Stops the worker threads. Called on application shutdown; a later call recreates the pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+# Shared by all logins and password changes in this process
+password_hasher = PasswordHasher()
@@ -1,10 +1,11 @@
 import csv
 import logging
 import random
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from sqlalchemy.orm import Session
 from app import crud, models, orm_models # Assuming models might be needed for Pydantic types if returned
+from app.services.roll_table_catalog import CompiledRollTable, roll_table_catalog
 
 logger = logging.getLogger(__name__)
 class TableNotFoundError(Exception):
@@ -18,78 +19,62 @@ class RandomTableService:
         Retrieves a list of all available roll table names from the database.
         If a user_id is provided, it includes tables owned by that user and system tables.
         Otherwise, it includes only system tables.
-        User-specific tables take precedence in case of name collision with system tables.
+        A name shared by a user table and a system table is listed once.
         """
-        tables = crud.get_roll_tables(db, limit=1000, user_id=user_id) # Assuming a reasonable limit
+        return roll_table_catalog.get_table_names(
+            db, user_id, lambda: crud.get_roll_table_names(db, user_id=user_id)
+        )
 
-        # Prioritize user-specific tables in case of name collision
-        table_names_map: Dict[str, bool] = {} # Using a more descriptive name
-        for table in tables:
-            # If table name not in map, add it.
-            # If table name IS in map, but current table is user-owned (user_id is not None),
-            # it means the existing one must be a system table, so overwrite.
-            if table.name not in table_names_map or table.user_id is not None:
-                table_names_map[table.name] = True
-        return list(table_names_map.keys())
+    def get_compiled_table(self, table_name: str, db: Session, user_id: Optional[int] = None) -> CompiledRollTable:
+        """
+        Returns the compiled table for `table_name` from the process-wide catalog.
+        If user_id is provided, the user's table takes precedence over a system table.
+        """
+        if user_id is not None:
+            user_table = roll_table_catalog.get_table(
+                db, table_name, user_id, lambda: crud.get_roll_table_rows(db, name=table_name, user_id=user_id)
+            )
+            if user_table is not None:
+                return user_table
+        system_table = roll_table_catalog.get_table(
+            db, table_name, None, lambda: crud.get_roll_table_rows(db, name=table_name, user_id=None)
+        )
+        if system_table is None:
+            raise TableNotFoundError(f"Table '{table_name}' not found for the user or as a system table.")
+        return system_table
 
     def get_random_item_from_table(self, table_name: str, db: Session, user_id: Optional[int] = None) -> Optional[str]:
         """
         Retrieves a random item from the specified roll table using dice roll logic.
         If user_id is provided, it prioritizes the user's table, then system tables.
         """
-        db_roll_table = crud.get_roll_table_by_name(db, name=table_name, user_id=user_id)
-
-        if not db_roll_table:
-            raise TableNotFoundError(f"Table '{table_name}' not found for the user or as a system table.")
-        
-        if not db_roll_table.items:
-            # Table exists but has no items
-            return None 
-
-        min_possible_roll = 1
-        max_possible_roll = 0
+        _, item = self.get_compiled_table(table_name, db, user_id=user_id).roll()
+        return item
 
-        # Attempt to parse max roll from table description (e.g., "d100", "d20")
-        if db_roll_table.description and db_roll_table.description.startswith('d'):
+    def roll_many(self, table_names: List[str], rolls_per_table: int, db: Session, user_id: Optional[int] = None, seed: Optional[int] = None) -> Dict[str, List[Tuple[Optional[int], Optional[str]]]]:
+        """
+        Rolls every table in `table_names` `rolls_per_table` times and returns
+        {table name: [(roll, item), ...]} in request order. The same seed with the same tables
+        gives the same results. Raises TableNotFoundError naming every missing table before
+        any roll is made.
+        """
+        tables: Dict[str, CompiledRollTable] = {}
+        missing: List[str] = []
+        for table_name in table_names:
+            if table_name in tables or table_name in missing:
+                continue
             try:
-                max_possible_roll = int(db_roll_table.description[1:])
-            except ValueError:
-                # Description is not in "dX" format, try to infer from items
-                pass # Fall through to infer from items
-        
-        if max_possible_roll == 0: # If not determined from description or parsing failed
-            # Infer from actual min/max values in items if not standard dX table
-            # This provides a fallback if description isn't dX or is missing
-            if not db_roll_table.items: return None # Should be caught above, but defensive
-            
-            # min_roll_in_items = min(item.min_roll for item in db_roll_table.items)
-            # This is not necessarily the dice min, dice usually start at 1.
-            # We should use the max_roll from items as the max dice roll value.
-            max_roll_in_items = max(item.max_roll for item in db_roll_table.items)
-            
-            # If description was not like "d100", use the max roll found in items.
-            # Min roll is still assumed to be 1 for typical dice.
-            max_possible_roll = max_roll_in_items
-            # min_possible_roll could be set to min_roll_in_items if non-standard dice.
-            # For now, assume standard dice start at 1.
-
-        if max_possible_roll == 0 : # Still zero, means no items or bad data.
-             # This case should ideally be prevented by data validation or if table has no items.
-            return None
-
-
-        # Perform the roll
-        roll = random.randint(min_possible_roll, max_possible_roll)
+                tables[table_name] = self.get_compiled_table(table_name, db, user_id=user_id)
+            except TableNotFoundError:
+                missing.append(table_name)
+        if missing:
+            raise TableNotFoundError(f"Tables not found: {', '.join(missing)}")
 
-        for item in db_roll_table.items:
-            if item.min_roll <= roll <= item.max_roll:
-                return item.description
-        
-        # This should ideally not be reached if the table items cover the full roll range.
-        # Could indicate a gap in the table data.
-        # For example, d100 table where items only go up to 90. A roll of 95 would find nothing.
-        logger.warning(f": Rolled {roll} for table '{table_name}', but no matching item found. Check table data for gaps.")
-        return None
+        rng = random.Random(seed)
+        return {
+            table_name: [table.roll(rng) for _ in range(rolls_per_table)]
+            for table_name, table in tables.items()
+        }
 
 
 # Example usage (for testing - requires database setup and data):
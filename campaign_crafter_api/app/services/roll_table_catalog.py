@@ -0,0 +1,122 @@
+import logging
+import random
+from bisect import bisect_left
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.catalog_cache import VersionedCatalogCache
+
+logger = logging.getLogger(__name__)
+
+# Name of the roll table catalog's row in the cache_versions table
+ROLL_TABLE_CATALOG_VERSION_NAME = "roll_tables"
+
+# (min_roll, max_roll, description)
+RollTableItemRow = Tuple[int, int, str]
+# (table description, item rows in table order)
+RollTableRows = Tuple[Optional[str], List[RollTableItemRow]]
+
+
+class CompiledRollTable:
+    """
+    A roll table flattened for fast repeated rolls.
+
+    Items are turned into disjoint roll ranges sorted by their upper bound, so a roll is one
+    bisect instead of a scan over the items. Where item ranges overlap, the item listed first
+    wins (as with a linear scan); rolls that fall in a gap map to None.
+    """
+
+    def __init__(self, name: str, die_size: int, lower_bounds: List[int], upper_bounds: List[int], descriptions: List[Optional[str]]):
+        self.name = name
+        self.die_size = die_size
+        self.lower_bounds = lower_bounds
+        self.upper_bounds = upper_bounds
+        self.descriptions = descriptions
+
+    @classmethod
+    def compile(cls, name: str, description: Optional[str], items: Sequence[RollTableItemRow]) -> "CompiledRollTable":
+        die_size = 0
+        # A "dX" description (e.g. "d100") sets the die; otherwise the highest max_roll is used
+        if description and description.startswith('d'):
+            try:
+                die_size = int(description[1:])
+            except ValueError:
+                pass
+        if die_size <= 0 and items:
+            die_size = max(max_roll for _, max_roll, _ in items)
+
+        # Split the die into elementary ranges at every item boundary and give each range to
+        # the first item covering it
+        boundaries = sorted({min_roll for min_roll, _, _ in items} | {max_roll + 1 for _, max_roll, _ in items})
+        lower_bounds: List[int] = []
+        upper_bounds: List[int] = []
+        descriptions: List[Optional[str]] = []
+        for start, next_start in zip(boundaries, boundaries[1:]):
+            end = next_start - 1
+            item_description = next((desc for min_roll, max_roll, desc in items if min_roll <= start and end <= max_roll), None)
+            if item_description is None:
+                continue
+            if descriptions and descriptions[-1] == item_description and upper_bounds[-1] == start - 1:
+                upper_bounds[-1] = end # Extend the previous range
+            else:
+                lower_bounds.append(start)
+                upper_bounds.append(end)
+                descriptions.append(item_description)
+        return cls(name, max(die_size, 0), lower_bounds, upper_bounds, descriptions)
+
+    def lookup(self, roll: int) -> Optional[str]:
+        """The item for a die result, or None if the roll falls in a gap."""
+        index = bisect_left(self.upper_bounds, roll)
+        if index < len(self.upper_bounds) and self.lower_bounds[index] <= roll:
+            return self.descriptions[index]
+        return None
+
+    def roll(self, rng=random) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Rolls the table's die with `rng` (the random module or a random.Random) and returns
+        (roll, item). Tables without items return (None, None).
+        """
+        if self.die_size <= 0 or not self.upper_bounds:
+            return None, None
+        roll = rng.randint(1, self.die_size)
+        item = self.lookup(roll)
+        if item is None:
+            logger.warning(f"Rolled {roll} for table '{self.name}', but no matching item found. Check table data for gaps.")
+        return roll, item
+
+
+class RollTableCatalog(VersionedCatalogCache):
+    """
+    Process-wide cache of compiled roll tables keyed by (name, owner scope), plus the table names
+    visible to each user. Unknown tables are cached as None. Bounded by
+    settings.ROLL_TABLE_CACHE_MAX_ENTRIES.
+
+    Writes go through the crud roll table functions, which bump the "roll_tables" catalog version
+    and call `invalidate`.
+    """
+
+    catalog_name = ROLL_TABLE_CATALOG_VERSION_NAME
+
+    def get_table(self, db: Session, name: str, user_id: Optional[int], loader: Callable[[], Optional[RollTableRows]]) -> Optional[CompiledRollTable]:
+        """
+        Returns the compiled table owned by exactly this scope (user_id=None is the system scope),
+        calling `loader` for its rows on a miss.
+        """
+        def load_and_compile() -> Optional[CompiledRollTable]:
+            rows = loader()
+            if rows is None:
+                return None
+            description, items = rows
+            return CompiledRollTable.compile(name, description, items)
+
+        return self._get_or_load(db, ("table", name, user_id), load_and_compile)
+
+    def get_table_names(self, db: Session, user_id: Optional[int], loader: Callable[[], List[str]]) -> List[str]:
+        """Returns the table names visible to `user_id`, calling `loader` on a miss."""
+        return list(self._get_or_load(db, ("names", user_id), loader))
+
+
+# Shared by all roll requests in this process
+roll_table_catalog = RollTableCatalog(max_entries=settings.ROLL_TABLE_CACHE_MAX_ENTRIES)
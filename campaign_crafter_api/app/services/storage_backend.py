@@ -0,0 +1,316 @@
+import asyncio
+import logging
+import mimetypes
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterable, List, Optional, Union
+from urllib.parse import quote, unquote, urlparse
+
+import certifi
+from fastapi import HTTPException
+from azure.core.exceptions import ResourceNotFoundError
+from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
+from azure.storage.blob import ContentSettings
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+
+from app.core.config import settings
+from app.models import BlobFileMetadata
+
+logger = logging.getLogger(__name__)
+
+
+def _origin(url: str) -> tuple:
+    """(scheme, host) of a URL, lowercased; both empty for a relative URL."""
+    parsed = urlparse(url)
+    return parsed.scheme.lower(), parsed.netloc.lower()
+
+
+# Data accepted by StorageBackend.upload: a whole payload or a stream of chunks
+BlobData = Union[bytes, AsyncIterable[bytes]]
+
+
+class StorageBackend(ABC):
+    """
+    Interface for where user files (generated images, uploads, moodboard assets) are stored.
+
+    Blob names are "/"-separated relative paths such as
+    "user_uploads/{user_id}/campaigns/{campaign_id}/files/{uuid}.png". Implementations own a
+    single long-lived client, created on first use and released by `aclose`.
+    """
+
+    name: str = "abstract"
+
+    @abstractmethod
+    async def upload(self, blob_name: str, data: BlobData, content_type: str) -> str:
+        """Stores `data` under `blob_name` (overwriting) and returns its public URL."""
+
+    @abstractmethod
+    async def delete(self, blob_name: str) -> bool:
+        """Deletes a blob. Returns False if it did not exist."""
+
+    @abstractmethod
+    async def list(self, prefix: str) -> List[BlobFileMetadata]:
+        """Lists the blobs whose names start with `prefix`."""
+
+    @abstractmethod
+    def url_for(self, blob_name: str) -> str:
+        """Public URL a stored blob is served from."""
+
+    @abstractmethod
+    def blob_name_from_url(self, url: str) -> Optional[str]:
+        """
+        Inverse of `url_for`; None if the URL does not point into this backend. The URL's
+        scheme and host must match the backend's own, not just its path.
+        """
+
+    async def aclose(self) -> None:
+        """Releases the backend's client. Called on application shutdown."""
+
+
+class AzureBlobStorageBackend(StorageBackend):
+    """Azure Blob Storage via one shared async BlobServiceClient per event loop."""
+
+    name = "azure"
+
+    def __init__(self):
+        self._client: Optional[AsyncBlobServiceClient] = None
+        self._credential = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def container_name(self) -> str:
+        return settings.AZURE_STORAGE_CONTAINER_NAME
+
+    def account_url(self) -> str:
+        """Account URL derived from AZURE_STORAGE_ACCOUNT_NAME or the connection string."""
+        if settings.AZURE_STORAGE_ACCOUNT_NAME:
+            return f"https://{settings.AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net"
+        elif settings.AZURE_STORAGE_CONNECTION_STRING:
+            conn_parts = {part.split('=', 1)[0].lower(): part.split('=', 1)[1] for part in settings.AZURE_STORAGE_CONNECTION_STRING.split(';') if '=' in part}
+            account_name_from_conn_str = conn_parts.get('accountname')
+            if account_name_from_conn_str:
+                return f"https://{account_name_from_conn_str}.blob.core.windows.net"
+
+        raise HTTPException(status_code=500, detail="Cannot determine Azure account URL. Ensure AZURE_STORAGE_ACCOUNT_NAME or parsable AZURE_STORAGE_CONNECTION_STRING is set.")
+
+    def _build_client(self) -> AsyncBlobServiceClient:
+        # certifi's CA bundle avoids certificate failures on hosts with an outdated trust store
+        ca_bundle = certifi.where()
+        if settings.AZURE_STORAGE_CONNECTION_STRING:
+            try:
+                return AsyncBlobServiceClient.from_connection_string(settings.AZURE_STORAGE_CONNECTION_STRING, connection_verify=ca_bundle)
+            except Exception as e:
+                logger.error(f"Failed to connect to Azure Storage with connection string: {e}")
+                raise HTTPException(status_code=500, detail="Azure Storage configuration error (connection string).")
+        try:
+            self._credential = AsyncDefaultAzureCredential()
+            return AsyncBlobServiceClient(self.account_url(), credential=self._credential, connection_verify=ca_bundle)
+        except Exception as e:
+            logger.error(f"Failed to connect to Azure Storage with DefaultAzureCredential: {e}")
+            raise HTTPException(status_code=500, detail="Azure Storage configuration error (account name/auth).")
+
+    async def get_client(self) -> AsyncBlobServiceClient:
+        if not settings.AZURE_STORAGE_CONNECTION_STRING and not settings.AZURE_STORAGE_ACCOUNT_NAME:
+            raise HTTPException(status_code=500, detail="Azure Storage is not configured (missing account name or connection string).")
+
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is loop:
+            return self._client
+        if self._lock is None or self._loop is not loop:
+            # The client's aiohttp session is bound to the loop it was created on
+            self._lock = asyncio.Lock()
+            self._client = None
+            self._loop = loop
+        async with self._lock:
+            if self._client is None:
+                self._client = self._build_client()
+                logger.info(f"Created shared Azure BlobServiceClient for container '{self.container_name}'.")
+        return self._client
+
+    async def upload(self, blob_name: str, data: BlobData, content_type: str) -> str:
+        client = await self.get_client()
+        blob_client = client.get_blob_client(container=self.container_name, blob=blob_name)
+        await blob_client.upload_blob(data, overwrite=True, content_settings=ContentSettings(content_type=content_type))
+        logger.info(f"Uploaded {blob_name} to Azure container {self.container_name}")
+        return self.url_for(blob_name)
+
+    async def delete(self, blob_name: str) -> bool:
+        client = await self.get_client()
+        blob_client = client.get_blob_client(container=self.container_name, blob=blob_name)
+        try:
+            await blob_client.delete_blob()
+        except ResourceNotFoundError:
+            return False
+        return True
+
+    async def list(self, prefix: str) -> List[BlobFileMetadata]:
+        client = await self.get_client()
+        container_client = client.get_container_client(self.container_name)
+        files_metadata: List[BlobFileMetadata] = []
+        # list_blobs already returns size, last_modified and content settings,
+        # so no per-blob get_blob_properties round trip is needed.
+        async for blob in container_client.list_blobs(name_starts_with=prefix):
+            if blob.name == prefix: # Skip a folder-marker blob named exactly like the prefix
+                continue
+            files_metadata.append(BlobFileMetadata(
+                name=Path(blob.name).name,
+                blob_name=blob.name,
+                url=self.url_for(blob.name),
+                size=blob.size,
+                last_modified=blob.last_modified,
+                content_type=blob.content_settings.content_type if blob.content_settings else None
+            ))
+        return files_metadata
+
+    def url_for(self, blob_name: str) -> str:
+        return f"{self.account_url().strip('/')}/{self.container_name.strip('/')}/{blob_name}"
+
+    def blob_name_from_url(self, url: str) -> Optional[str]:
+        # e.g. https://<account>.blob.core.windows.net/<container>/<blob_name>
+        try:
+            account_url = self.account_url()
+        except HTTPException:
+            return None
+        if _origin(url) != _origin(account_url):
+            return None
+        container_prefix = f"/{self.container_name.strip('/')}/"
+        path = unquote(urlparse(url).path)
+        if path.startswith(container_prefix) and len(path) > len(container_prefix):
+            return path[len(container_prefix):]
+        return None
+
+    async def aclose(self) -> None:
+        client, credential = self._client, self._credential
+        self._client, self._credential, self._loop, self._lock = None, None, None, None
+        try:
+            if client is not None:
+                await client.close()
+            if credential is not None:
+                await credential.close()
+        except Exception as e:
+            logger.warning(f"Error closing Azure storage client: {type(e).__name__} - {e}")
+
+
+class LocalFileStorageBackend(StorageBackend):
+    """
+    Stores blobs under settings.IMAGE_STORAGE_PATH and serves them from settings.IMAGE_BASE_URL
+    (mounted as a static route in app.main). Needs no cloud account, which makes it suitable
+    for local development and benchmarking.
+    """
+
+    name = "local"
+
+    # Size of the chunks read back by the upload endpoint and written to disk
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, root: Optional[str] = None, base_url: Optional[str] = None):
+        self.root = Path(root or settings.IMAGE_STORAGE_PATH).resolve()
+        self.base_url = (base_url or settings.IMAGE_BASE_URL).rstrip('/')
+
+    def _path_for(self, blob_name: str) -> Path:
+        path = (self.root / blob_name).resolve()
+        if path == self.root or self.root not in path.parents:
+            raise ValueError(f"Blob name '{blob_name}' resolves outside the storage root.")
+        return path
+
+    async def upload(self, blob_name: str, data: BlobData, content_type: str) -> str:
+        path = self._path_for(blob_name)
+        partial_path = path.with_name(path.name + ".part")
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+        handle = await asyncio.to_thread(open, partial_path, "wb")
+        try:
+            if isinstance(data, (bytes, bytearray)):
+                await asyncio.to_thread(handle.write, data)
+            else:
+                async for chunk in data:
+                    await asyncio.to_thread(handle.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(partial_path.unlink, missing_ok=True)
+            raise
+        await asyncio.to_thread(handle.close)
+        # Readers never see a half-written file
+        await asyncio.to_thread(os.replace, partial_path, path)
+        logger.info(f"Stored {blob_name} on local disk at {path}")
+        return self.url_for(blob_name)
+
+    async def delete(self, blob_name: str) -> bool:
+        path = self._path_for(blob_name)
+        try:
+            await asyncio.to_thread(path.unlink)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _list_sync(self, prefix: str) -> List[BlobFileMetadata]:
+        search_dir = self.root / prefix if prefix.endswith('/') else (self.root / prefix).parent
+        if not search_dir.is_dir():
+            return []
+        files_metadata: List[BlobFileMetadata] = []
+        for path in sorted(search_dir.rglob('*')):
+            blob_name = path.relative_to(self.root).as_posix()
+            if not path.is_file() or not blob_name.startswith(prefix) or path.name.endswith(".part"):
+                continue
+            stat = path.stat()
+            files_metadata.append(BlobFileMetadata(
+                name=path.name,
+                blob_name=blob_name,
+                url=self.url_for(blob_name),
+                size=stat.st_size,
+                last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+                content_type=mimetypes.guess_type(path.name)[0]
+            ))
+        return files_metadata
+
+    async def list(self, prefix: str) -> List[BlobFileMetadata]:
+        return await asyncio.to_thread(self._list_sync, prefix)
+
+    def url_for(self, blob_name: str) -> str:
+        return f"{self.base_url}/{quote(blob_name)}"
+
+    def blob_name_from_url(self, url: str) -> Optional[str]:
+        if _origin(url) != _origin(self.base_url):
+            return None
+        base_path = urlparse(self.base_url).path.rstrip('/') + '/'
+        path = unquote(urlparse(url).path)
+        if path.startswith(base_path) and len(path) > len(base_path):
+            return path[len(base_path):]
+        return None
+
+
+STORAGE_BACKENDS = {
+    AzureBlobStorageBackend.name: AzureBlobStorageBackend,
+    LocalFileStorageBackend.name: LocalFileStorageBackend,
+}
+
+_storage_backend: Optional[StorageBackend] = None
+
+
+def get_storage_backend() -> StorageBackend:
+    """Returns the process-wide backend selected by settings.STORAGE_BACKEND."""
+    global _storage_backend
+    if _storage_backend is None:
+        backend_name = (settings.STORAGE_BACKEND or AzureBlobStorageBackend.name).lower()
+        backend_class = STORAGE_BACKENDS.get(backend_name)
+        if backend_class is None:
+            raise HTTPException(status_code=500, detail=f"Unknown storage backend '{settings.STORAGE_BACKEND}'. Supported: {', '.join(STORAGE_BACKENDS)}.")
+        _storage_backend = backend_class()
+        logger.info(f"Using '{backend_name}' storage backend.")
+    return _storage_backend
+
+
+def set_storage_backend(backend: Optional[StorageBackend]) -> None:
+    """Replaces the process-wide backend (None re-selects from settings on next use)."""
+    global _storage_backend
+    _storage_backend = backend
+
+
+async def shutdown_storage_backend() -> None:
+    """Closes the backend's long-lived client on application shutdown."""
+    global _storage_backend
+    backend, _storage_backend = _storage_backend, None
+    if backend is not None:
+        await backend.aclose()
@@ -0,0 +1,54 @@
+import logging
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app import models, orm_models
+from app.core.config import settings
+from app.services.catalog_cache import VersionedCatalogCache
+
+logger = logging.getLogger(__name__)
+
+# Name of the user catalog's row in the cache_versions table
+USER_CATALOG_VERSION_NAME = "users"
+
+# Relationship lists on models.User that the cached copy leaves empty
+_USER_RELATIONSHIP_FIELDS = ("campaigns", "llm_configs")
+
+
+def user_from_orm_without_relationships(db_user: orm_models.User) -> models.User:
+    """
+    Builds models.User from the user's own columns only, so validating it does not lazy-load
+    every campaign (and its sections) and LLM config the user owns.
+    """
+    data = {
+        field: getattr(db_user, field)
+        for field in models.User.model_fields
+        if field not in _USER_RELATIONSHIP_FIELDS
+    }
+    return models.User.model_validate(data)
+
+
+class AuthenticatedUserCache(VersionedCatalogCache):
+    """
+    Process-wide cache from a token's subject (the username) to the validated user, so
+    auth_service.get_current_user does not query the users table on every request.
+
+    Entries live for settings.AUTH_USER_CACHE_TTL_SECONDS and are scoped to the shared "users"
+    version stamp: crud.update_user, update_user_api_keys and delete_user (disabling a user is an
+    update_user) bump it and call `invalidate`. Cached users have empty `campaigns` and
+    `llm_configs`; unknown usernames are not cached.
+    """
+
+    catalog_name = USER_CATALOG_VERSION_NAME
+
+    def get_user(self, db: Session, username: str, loader: Callable[[], Optional[models.User]]) -> Optional[models.User]:
+        """Returns the cached user for `username`, calling `loader` on a miss."""
+        return self._get_or_load(db, username, loader, cache_none=False)
+
+
+# Shared by all authenticated requests in this process
+authenticated_user_cache = AuthenticatedUserCache(
+    max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
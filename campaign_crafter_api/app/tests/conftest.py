@@ -3,18 +3,26 @@ Shared pytest fixtures for Campaign Crafter API tests.
 """
 import pytest
 import pytest_asyncio
-from typing import Generator, AsyncGenerator, Optional
+from contextlib import contextmanager
+from typing import Generator, AsyncGenerator, Iterator, List, Optional
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db import Base, get_db
+from app.db import AsyncDB, Base, get_async_db, get_db
 from app.orm_models import User as ORMUser
 from app.models import User as PydanticUser
 from app.crud import get_password_hash
 from app.services.auth_service import get_current_active_user
+from app.services.llm_availability import availability_registry
+from app.services.llm_client_pool import llm_client_pool
+from app.services.storage_backend import set_storage_backend
+from app.services.conversation_summary_queue import conversation_summary_queue
+from app.services.feature_cache import feature_template_cache
+from app.services.roll_table_catalog import roll_table_catalog
+from app.services.user_cache import authenticated_user_cache
 
 # In-memory SQLite database for testing with StaticPool for connection reuse
 DATABASE_URL = "sqlite:///:memory:"
@@ -26,6 +34,24 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@contextmanager
+def capture_sql() -> Iterator[List[str]]:
+    """Collects the SQL statements run on the test engine inside the block (for query-count assertions)."""
+    statements: List[str] = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def select_statements(statements: List[str], table: Optional[str] = None) -> List[str]:
+    """The SELECTs among captured statements, optionally only those reading `table`."""
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT") and (table is None or f"FROM {table}" in s)]
+
+
 @pytest.fixture(scope="function")
 def db_session() -> Generator[Session, None, None]:
     """Provide a database session for tests."""
@@ -56,9 +82,32 @@ def setup_test_database(db_session: Session):
     """Set up database override for each test."""
     # Override the get_db dependency to use our test session
     app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_async_db] = lambda: AsyncDB(db_session)
     yield
     # Clean up override
     app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_async_db, None)
+
+
+@pytest.fixture(autouse=True)
+def reset_llm_availability_cache():
+    """Keep process-wide caches, pools, the storage backend and the summary queue from leaking between tests."""
+    availability_registry.clear()
+    llm_client_pool.clear()
+    set_storage_backend(None)
+    conversation_summary_queue.reset()
+    conversation_summary_queue.session_factory = TestingSessionLocal
+    feature_template_cache.clear()
+    roll_table_catalog.clear()
+    authenticated_user_cache.clear()
+    yield
+    availability_registry.clear()
+    llm_client_pool.clear()
+    set_storage_backend(None)
+    conversation_summary_queue.reset()
+    feature_template_cache.clear()
+    roll_table_catalog.clear()
+    authenticated_user_cache.clear()
 
 
 def create_test_user_in_db(
@@ -8,7 +8,12 @@ from datetime import timedelta
 
 from app.tests.conftest import create_test_user_in_db
 from app.core.security import create_access_token, decode_access_token, create_refresh_token, decode_refresh_token
-from app.services.auth_service import authenticate_user
+from unittest.mock import patch
+from fastapi import HTTPException
+
+from app import crud, models
+from app.orm_models import Campaign as ORMCampaign
+from app.services.auth_service import authenticate_user, get_current_active_user, get_current_user
 from app.core.config import settings
 
 
@@ -195,28 +200,32 @@ class TestTokenSecurity:
 class TestAuthenticateUserService:
     """Tests for authenticate_user service function."""
 
-    def test_authenticate_valid_user(self, db_session: Session):
+    @pytest.mark.asyncio
+    async def test_authenticate_valid_user(self, db_session: Session):
         """Test authenticating valid user."""
         create_test_user_in_db(db_session, username="authuser", password="authpass123")
         
-        user = authenticate_user(db_session, username="authuser", password="authpass123")
+        user = await authenticate_user(db_session, username="authuser", password="authpass123")
         
         assert user is not None
         assert user.username == "authuser"
 
-    def test_authenticate_invalid_username(self, db_session: Session):
+    @pytest.mark.asyncio
+    async def test_authenticate_invalid_username(self, db_session: Session):
         """Test authenticating with invalid username."""
-        user = authenticate_user(db_session, username="nonexistent", password="anypass")
+        user = await authenticate_user(db_session, username="nonexistent", password="anypass")
         assert user is None
 
-    def test_authenticate_invalid_password(self, db_session: Session):
+    @pytest.mark.asyncio
+    async def test_authenticate_invalid_password(self, db_session: Session):
         """Test authenticating with invalid password."""
         create_test_user_in_db(db_session, username="authuser2", password="correctpass")
         
-        user = authenticate_user(db_session, username="authuser2", password="wrongpass")
+        user = await authenticate_user(db_session, username="authuser2", password="wrongpass")
         assert user is None
 
-    def test_authenticate_disabled_user(self, db_session: Session):
+    @pytest.mark.asyncio
+    async def test_authenticate_disabled_user(self, db_session: Session):
         """Test authenticating disabled user returns None."""
         create_test_user_in_db(
             db_session, 
@@ -225,5 +234,74 @@ class TestAuthenticateUserService:
             disabled=True
         )
         
-        user = authenticate_user(db_session, username="disabledauth", password="password123")
+        user = await authenticate_user(db_session, username="disabledauth", password="password123")
         assert user is None
+
+    @pytest.mark.asyncio
+    async def test_authenticate_rehashes_when_cost_changes(self, db_session: Session):
+        """Test a hash made with an old bcrypt cost is upgraded on successful login."""
+        from app.services.password_hasher import password_hasher
+        try:
+            password_hasher.configure(rounds=4)
+            db_user = create_test_user_in_db(db_session, username="rehashuser", password="rehashpass")
+            assert db_user.hashed_password.startswith("$2b$04$")
+
+            password_hasher.configure(rounds=5)
+            assert await authenticate_user(db_session, username="rehashuser", password="wrongpass") is None
+            assert db_user.hashed_password.startswith("$2b$04$") # Only a successful login rehashes
+
+            user = await authenticate_user(db_session, username="rehashuser", password="rehashpass")
+            assert user is not None
+            db_session.refresh(db_user)
+            assert db_user.hashed_password.startswith("$2b$05$")
+            assert await authenticate_user(db_session, username="rehashuser", password="rehashpass") is not None
+        finally:
+            password_hasher.configure(rounds=None)
+
+
+class TestCurrentUserCache:
+    """Tests for the token -> user cache behind get_current_user."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_requests_skip_the_user_query(self, db_session: Session):
+        create_test_user_in_db(db_session, username="cacheduser", email="cached@example.com")
+        token = create_access_token(data={"sub": "cacheduser"})
+
+        with patch("app.crud.get_user_by_username", wraps=crud.get_user_by_username) as mock_get_user:
+            first = await get_current_user(token, db_session)
+            second = await get_current_user(token, db_session)
+
+        assert mock_get_user.call_count == 1
+        assert first.username == second.username == "cacheduser"
+        assert first.campaigns == [] # Relationship lists are not loaded for auth
+
+    @pytest.mark.asyncio
+    async def test_user_changes_invalidate_the_cache(self, db_session: Session):
+        db_user = create_test_user_in_db(db_session, username="changinguser", email="changing@example.com")
+        token = create_access_token(data={"sub": "changinguser"})
+        assert (await get_current_user(token, db_session)).openai_api_key_provided is False
+
+        crud.update_user_api_keys(db_session, db_user, models.UserAPIKeyUpdate(openai_api_key="sk-new"))
+        assert (await get_current_user(token, db_session)).openai_api_key_provided is True
+
+        crud.update_user(db_session, db_user, models.UserUpdate(disabled=True))
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_active_user(await get_current_user(token, db_session))
+        assert exc_info.value.status_code == 400
+
+        crud.delete_user(db_session, user_id=db_user.id)
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(token, db_session)
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_users_me_still_lists_campaigns(self, async_client: AsyncClient, db_session: Session):
+        db_user = create_test_user_in_db(db_session, username="meuser", email="me@example.com")
+        db_session.add(ORMCampaign(title="My Campaign", owner_id=db_user.id))
+        db_session.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'meuser'})}"}
+
+        for _ in range(2): # The second request is served from the cache
+            response = await async_client.get("/api/v1/users/me", headers=headers)
+            assert response.status_code == 200
+            assert [campaign["title"] for campaign in response.json()["campaigns"]] == ["My Campaign"]
@@ -13,7 +13,7 @@ from app import models as pydantic_models
 from app.models import Campaign as PydanticCampaign, User as PydanticUser, CampaignTitlesResponse, LLMGenerationRequest
 from app.services.llm_service import AbstractLLMService, LLMServiceUnavailableError, LLMGenerationError
 from app.services.openai_service import OpenAILLMService
-from app.tests.conftest import create_mock_campaign_orm
+from app.tests.conftest import capture_sql, create_mock_campaign_orm, create_test_user_in_db, select_statements
 
 @pytest.fixture
 def db_campaign(db_session: Session, current_active_user_override: PydanticUser) -> ORMCampaign:
@@ -71,6 +71,46 @@ async def test_list_campaigns_with_data(async_client: AsyncClient, db_session: S
     assert "homebrewery_toc" in ret_campaign
     assert "homebrewery_export" in ret_campaign
 
+@pytest.mark.asyncio
+async def test_list_campaigns_is_owner_scoped_and_keyset_paginated(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    other_user = create_test_user_in_db(db_session, username="otherowner", email="other@example.com")
+    own_ids = []
+    for i in range(3):
+        db_session.add(ORMCampaign(title=f"Other {i}", owner_id=other_user.id))
+        own = ORMCampaign(title=f"Mine {i}", owner_id=current_active_user_override.id, concept="long concept " * 50)
+        db_session.add(own)
+        db_session.commit()
+        own_ids.append(own.id)
+
+    first_page = await async_client.get("/api/v1/campaigns/", params={"limit": 2})
+    assert first_page.status_code == 200
+    assert [c["id"] for c in first_page.json()] == own_ids[:2]
+    cursor = first_page.headers["X-Next-Cursor"]
+    assert cursor == str(own_ids[1])
+
+    second_page = await async_client.get("/api/v1/campaigns/", params={"limit": 2, "after_id": cursor})
+    assert [c["id"] for c in second_page.json()] == own_ids[2:]
+    assert "X-Next-Cursor" not in second_page.headers
+
+    unpaginated = await async_client.get("/api/v1/campaigns/")
+    assert [c["id"] for c in unpaginated.json()] == own_ids
+
+@pytest.mark.asyncio
+async def test_list_campaign_summaries_excludes_large_columns(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    campaign = ORMCampaign(title="Summary Campaign", owner_id=current_active_user_override.id,
+                           concept="A very long concept", homebrewery_export="# Export")
+    db_session.add(campaign)
+    db_session.commit()
+
+    response = await async_client.get("/api/v1/campaigns/summaries")
+    assert response.status_code == 200
+    summaries = response.json()
+    assert len(summaries) == 1
+    assert summaries[0]["id"] == campaign.id
+    assert summaries[0]["title"] == "Summary Campaign"
+    for excluded in ("concept", "homebrewery_export", "sections", "homebrewery_toc"):
+        assert excluded not in summaries[0]
+
 @pytest.mark.asyncio
 async def test_create_campaign_full_data(async_client: AsyncClient, current_active_user_override: PydanticUser):
     payload = {
@@ -600,6 +640,269 @@ async def test_seed_sections_from_toc_endpoint_uses_type(
     assert mock_llm_instance.generate_section_content.call_args_list[1].kwargs['section_type'] == "generic"
     assert mock_llm_instance.generate_section_content.call_args_list[2].kwargs['section_type'] == "Location"
 
+@pytest.mark.asyncio
+@patch('app.api.endpoints.campaigns.crud.get_user')
+@patch('app.api.endpoints.campaigns.get_llm_service')
+async def test_seed_sections_from_toc_runs_generation_concurrently(
+    mock_get_llm_service: MagicMock,
+    mock_crud_get_user: MagicMock,
+    db_campaign: ORMCampaign,
+    async_client: AsyncClient,
+    current_active_user_override: PydanticUser,
+    db_session: Session
+):
+    import asyncio
+    import json
+    from sse_starlette.sse import AppStatus
+
+    # sse_starlette keeps a module-level exit event bound to the first loop that streamed
+    AppStatus.should_exit_event = None
+
+    toc_data = [{"title": f"Chapter {i}", "type": "chapter"} for i in range(6)]
+    db_campaign.display_toc = toc_data
+    db_campaign.selected_llm_id = "openai/gpt-4"
+    db_session.commit()
+
+    mock_user_orm = MagicMock(spec=ORMUser)
+    mock_user_orm.id = current_active_user_override.id
+    mock_crud_get_user.return_value = mock_user_orm
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_generate(**kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Earlier sections take longer, so completion order differs from TOC order
+        index = int(kwargs["section_title_suggestion"].split()[-1])
+        await asyncio.sleep(0.05 * (6 - index))
+        in_flight -= 1
+        return f"Generated {kwargs['section_title_suggestion']}"
+
+    mock_llm_instance = AsyncMock(spec=AbstractLLMService)
+    mock_llm_instance.generate_section_content = AsyncMock(side_effect=slow_generate)
+    mock_get_llm_service.return_value = mock_llm_instance
+
+    response = await async_client.post(
+        f"/api/v1/campaigns/{db_campaign.id}/seed_sections_from_toc?auto_populate=true&max_concurrency=3"
+    )
+    events = []
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            payload = line[len("data:"):].strip()
+            if payload.startswith("data:"): # sse_starlette prefixes our pre-formatted strings again
+                payload = payload[len("data:"):].strip()
+            if payload:
+                events.append(json.loads(payload))
+
+    assert response.status_code == 200
+    assert max_in_flight == 3
+
+    section_events = [e for e in events if e["event_type"] == "section_update"]
+    assert len(section_events) == 6
+    # Events are emitted as sections finish, not in TOC order
+    assert [e["current_section_title"] for e in section_events] != [t["title"] for t in toc_data]
+    assert section_events[-1]["progress_percent"] == 100.0
+    assert events[-1]["event_type"] == "complete"
+    assert events[-1]["total_sections_processed"] == 6
+
+    # Stored order still follows the TOC
+    sections = crud.get_campaign_sections(db_session, campaign_id=db_campaign.id)
+    assert [(s.order, s.title) for s in sections] == [(i, f"Chapter {i}") for i in range(6)]
+    assert all(s.content == f"Generated {s.title}" for s in sections)
+
+async def _read_sse_events(response) -> list:
+    import json
+    events = []
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            payload = line[len("data:"):].strip()
+            if payload.startswith("data:"): # sse_starlette prefixes our pre-formatted strings again
+                payload = payload[len("data:"):].strip()
+            if payload:
+                events.append(json.loads(payload))
+    return events
+
+@pytest.mark.asyncio
+@patch('app.api.endpoints.campaigns.get_llm_service')
+async def test_create_section_stream_emits_deltas_and_saves_once(
+    mock_get_llm_service: MagicMock,
+    db_campaign: ORMCampaign,
+    async_client: AsyncClient,
+    db_session: Session
+):
+    # The stream closes the request session, detaching the fixture objects
+    campaign_id = db_campaign.id
+    from sse_starlette.sse import AppStatus
+    AppStatus.should_exit_event = None
+
+    async def fake_stream(**kwargs):
+        # Nothing may be written until the last token has arrived
+        assert crud.get_campaign_sections(db_session, campaign_id=campaign_id) == []
+        for delta in ["The old ", "mill ", "creaks."]:
+            yield delta
+
+    mock_llm_instance = MagicMock(spec=AbstractLLMService)
+    mock_llm_instance.stream_section_content = MagicMock(side_effect=fake_stream)
+    mock_get_llm_service.return_value = mock_llm_instance
+
+    response = await async_client.post(
+        f"/api/v1/campaigns/{campaign_id}/sections/stream",
+        json={"title": "The Mill", "type": "location", "model_id_with_prefix": "openai/gpt-4"}
+    )
+    events = await _read_sse_events(response)
+
+    assert response.status_code == 200
+    assert [e["text"] for e in events if e["event_type"] == "delta"] == ["The old ", "mill ", "creaks."]
+    assert events[-1]["event_type"] == "complete"
+    assert events[-1]["section_data"]["content"] == "The old mill creaks."
+    assert mock_llm_instance.stream_section_content.call_args.kwargs["section_type"] == "location"
+    assert mock_llm_instance.stream_section_content.call_args.kwargs["model"] == "gpt-4"
+
+    sections = crud.get_campaign_sections(db_session, campaign_id=campaign_id)
+    assert [(s.title, s.content, s.type) for s in sections] == [("The Mill", "The old mill creaks.", "location")]
+
+@pytest.mark.asyncio
+@patch('app.api.endpoints.campaigns.get_llm_service')
+async def test_regenerate_section_stream_error_leaves_section_unchanged(
+    mock_get_llm_service: MagicMock,
+    db_campaign: ORMCampaign,
+    db_section: ORMCampaignSection,
+    async_client: AsyncClient,
+    db_session: Session
+):
+    # The stream closes the request session, detaching the fixture objects
+    campaign_id = db_campaign.id
+    section_id = db_section.id
+    from sse_starlette.sse import AppStatus
+    AppStatus.should_exit_event = None
+
+    async def failing_stream(**kwargs):
+        yield "Half a "
+        raise LLMGenerationError("connection dropped")
+
+    mock_llm_instance = MagicMock(spec=AbstractLLMService)
+    mock_llm_instance.stream_text = MagicMock(side_effect=failing_stream)
+    mock_get_llm_service.return_value = mock_llm_instance
+
+    response = await async_client.post(
+        f"/api/v1/campaigns/{campaign_id}/sections/{section_id}/regenerate/stream",
+        json={"new_prompt": "Rewrite it.", "model_id_with_prefix": "openai/gpt-4"}
+    )
+    events = await _read_sse_events(response)
+
+    assert [e["event_type"] for e in events] == ["delta", "error"]
+    assert "connection dropped" in events[-1]["message"]
+    db_session.expire_all()
+    assert crud.get_section(db_session, section_id=section_id, campaign_id=campaign_id).content == "Initial content"
+
+@pytest.mark.asyncio
+@patch('app.api.endpoints.campaigns.get_llm_service')
+async def test_regenerate_section_stream_updates_section(
+    mock_get_llm_service: MagicMock,
+    db_campaign: ORMCampaign,
+    db_section: ORMCampaignSection,
+    async_client: AsyncClient,
+    db_session: Session
+):
+    # The stream closes the request session, detaching the fixture objects
+    campaign_id = db_campaign.id
+    section_id = db_section.id
+    from sse_starlette.sse import AppStatus
+    AppStatus.should_exit_event = None
+
+    async def fake_stream(**kwargs):
+        for delta in ["Fresh ", "content."]:
+            yield delta
+
+    mock_llm_instance = MagicMock(spec=AbstractLLMService)
+    mock_llm_instance.stream_text = MagicMock(side_effect=fake_stream)
+    mock_get_llm_service.return_value = mock_llm_instance
+
+    response = await async_client.post(
+        f"/api/v1/campaigns/{campaign_id}/sections/{section_id}/regenerate/stream",
+        json={"new_title": "Renamed", "model_id_with_prefix": "openai/gpt-4"}
+    )
+    events = await _read_sse_events(response)
+
+    assert events[-1]["event_type"] == "complete"
+    assert events[-1]["section_data"]["title"] == "Renamed"
+    db_session.expire_all()
+    refreshed = crud.get_section(db_session, section_id=section_id, campaign_id=campaign_id)
+    assert (refreshed.title, refreshed.content) == ("Renamed", "Fresh content.")
+
+@pytest.mark.asyncio
+@patch('app.api.endpoints.campaigns.get_llm_service')
+async def test_section_streams_return_their_connection_to_the_pool(
+    mock_get_llm_service: MagicMock,
+    tmp_path,
+    async_client: AsyncClient,
+    current_active_user_override: PydanticUser
+):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sse_starlette.sse import AppStatus
+    from app.db import Base, get_db
+    from app.main import app
+    AppStatus.should_exit_event = None
+
+    # A real QueuePool, so connections checked out after the request's session was torn down show up
+    pooled_engine = create_engine(f"sqlite:///{tmp_path / 'stream.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=pooled_engine)
+    PooledSession = sessionmaker(autocommit=False, autoflush=False, bind=pooled_engine)
+    with PooledSession() as setup_db:
+        # The endpoints look up the user's ORM row and need a campaign concept to generate from
+        setup_db.add(ORMUser(
+            id=current_active_user_override.id,
+            username=current_active_user_override.username,
+            email=current_active_user_override.email,
+            hashed_password="not-used"
+        ))
+        campaign = ORMCampaign(title="Pooled", concept="A haunted mill town.", owner_id=current_active_user_override.id)
+        setup_db.add(campaign)
+        setup_db.commit()
+        campaign_id = campaign.id
+
+    def pooled_get_db():
+        db = PooledSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def fake_stream(**kwargs):
+        for delta in ["Fresh ", "content."]:
+            yield delta
+
+    mock_llm_instance = MagicMock(spec=AbstractLLMService)
+    mock_llm_instance.stream_section_content = MagicMock(side_effect=fake_stream)
+    mock_llm_instance.stream_text = MagicMock(side_effect=fake_stream)
+    mock_get_llm_service.return_value = mock_llm_instance
+
+    app.dependency_overrides[get_db] = pooled_get_db
+    try:
+        response = await async_client.post(f"/api/v1/campaigns/{campaign_id}/sections/stream", json={"title": "New", "model_id_with_prefix": "openai/gpt-4"})
+        assert response.status_code == 200, response.text
+        events = await _read_sse_events(response)
+        assert events[-1]["event_type"] == "complete"
+        section_id = events[-1]["section_data"]["id"]
+
+        response = await async_client.post(f"/api/v1/campaigns/{campaign_id}/sections/{section_id}/regenerate/stream", json={"model_id_with_prefix": "openai/gpt-4"})
+        assert response.status_code == 200, response.text
+        events = await _read_sse_events(response)
+        assert events[-1]["event_type"] == "complete"
+
+        assert pooled_engine.pool.checkedout() == 0
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        pooled_engine.dispose()
+
+@pytest.mark.asyncio
+async def test_create_section_stream_validates_before_streaming(db_campaign: ORMCampaign, async_client: AsyncClient):
+    response = await async_client.post(f"/api/v1/campaigns/{db_campaign.id + 999}/sections/stream", json={"title": "Nowhere"})
+    assert response.status_code == 404
+
 @pytest.mark.asyncio
 async def test_get_campaign_full_content_formats_new_toc(db_campaign: ORMCampaign, async_client: AsyncClient, db_session: Session):
     toc_data = [{"title": "Entry 1", "type": "chapter"}, {"title": "Entry 2", "type": "location"}]
@@ -784,11 +1087,13 @@ async def test_regenerate_campaign_section_endpoint_uses_type(
 
 @pytest.mark.asyncio
 @patch('app.crud.ImageGenerationService.delete_image_from_blob_storage', new_callable=AsyncMock)
+@patch.object(settings, 'AZURE_STORAGE_ACCOUNT_NAME', 'mockaccount')
 async def test_update_campaign_remove_moodboard_image_deletes_blob(
     mock_delete_blob, db_campaign: ORMCampaign, async_client: AsyncClient, db_session: Session
 ):
-    initial_url1 = f"https://mockaccount.blob.core.windows.net/{settings.AZURE_STORAGE_CONTAINER_NAME}/blob1.png"
-    initial_url2 = f"https://mockaccount.blob.core.windows.net/{settings.AZURE_STORAGE_CONTAINER_NAME}/blob2.jpg"
+    owner_folder = f"user_uploads/{db_campaign.owner_id}/campaigns/{db_campaign.id}/files"
+    initial_url1 = f"https://mockaccount.blob.core.windows.net/{settings.AZURE_STORAGE_CONTAINER_NAME}/{owner_folder}/blob1.png"
+    initial_url2 = f"https://mockaccount.blob.core.windows.net/{settings.AZURE_STORAGE_CONTAINER_NAME}/{owner_folder}/blob2.jpg"
     
     campaign_to_update = db_session.query(ORMCampaign).filter(ORMCampaign.id == db_campaign.id).first()
     if not campaign_to_update:
@@ -799,11 +1104,36 @@ async def test_update_campaign_remove_moodboard_image_deletes_blob(
     update_payload = { "mood_board_image_urls": [initial_url1] }
     response = await async_client.put(f"/api/v1/campaigns/{db_campaign.id}", json=update_payload)
     assert response.status_code == 200, response.text
-    mock_delete_blob.assert_called_once_with("blob2.jpg")
+    mock_delete_blob.assert_called_once_with(f"{owner_folder}/blob2.jpg")
     
     updated_db_campaign = db_session.query(ORMCampaign).filter(ORMCampaign.id == db_campaign.id).first()
     assert updated_db_campaign.mood_board_image_urls == [initial_url1]
 
+@pytest.mark.asyncio
+@patch('app.crud.ImageGenerationService.delete_image_from_blob_storage', new_callable=AsyncMock)
+@patch.object(settings, 'AZURE_STORAGE_ACCOUNT_NAME', 'mockaccount')
+async def test_update_campaign_remove_moodboard_image_skips_foreign_blobs(
+    mock_delete_blob, db_campaign: ORMCampaign, async_client: AsyncClient, db_session: Session
+):
+    container = settings.AZURE_STORAGE_CONTAINER_NAME
+    other_owner_id = db_campaign.owner_id + 1
+    foreign_urls = [
+        # Another user's blob on the real account
+        f"https://mockaccount.blob.core.windows.net/{container}/user_uploads/{other_owner_id}/campaigns/1/files/theirs.png",
+        # The owner's path, but on a host that is not the storage account
+        f"https://any-host.example/{container}/user_uploads/{db_campaign.owner_id}/campaigns/1/files/mine.png",
+        # Escaping the owner's folder with a relative segment
+        f"https://mockaccount.blob.core.windows.net/{container}/user_uploads/{db_campaign.owner_id}/../{other_owner_id}/x.png",
+    ]
+
+    campaign_to_update = db_session.query(ORMCampaign).filter(ORMCampaign.id == db_campaign.id).first()
+    campaign_to_update.mood_board_image_urls = foreign_urls
+    db_session.commit()
+
+    response = await async_client.put(f"/api/v1/campaigns/{db_campaign.id}", json={"mood_board_image_urls": []})
+    assert response.status_code == 200, response.text
+    mock_delete_blob.assert_not_called()
+
 @pytest.mark.asyncio
 @patch('app.api.endpoints.campaigns.ImageGenerationService._save_image_and_log_db', new_callable=AsyncMock)
 async def test_upload_moodboard_image_success(
@@ -1130,3 +1460,341 @@ async def test_delete_campaign_endpoint_crud_fails_unexpectedly(
         db_session.commit()
     except:
         pass
+
+
+@pytest.mark.asyncio
+async def test_async_db_runs_crud_off_the_event_loop(db_session: Session, current_active_user_override: PydanticUser):
+    import threading
+    from app.db import AsyncDB
+
+    loop_thread = threading.get_ident()
+    calls = []
+    def probe(session, value):
+        calls.append((threading.get_ident(), session))
+        return value * 2
+
+    async_db = AsyncDB(db_session)
+    assert await async_db.run_sync(probe, 21) == 42
+    assert calls[0][0] != loop_thread and calls[0][1] is db_session
+
+    campaign = ORMCampaign(title="Async Campaign", owner_id=current_active_user_override.id)
+    db_session.add(campaign)
+    db_session.commit()
+    section = ORMCampaignSection(title="Doomed", content="Bye", order=0, campaign_id=campaign.id)
+    db_session.add(section)
+    db_session.commit()
+
+    assert await crud.get_campaign_owner_id_async(async_db, campaign.id) == current_active_user_override.id
+    assert await crud.get_campaign_owner_id_async(async_db, campaign.id + 1000) is None
+    loaded = await crud.get_campaign_async(async_db, campaign.id)
+    assert isinstance(loaded, PydanticCampaign) and [s.title for s in loaded.sections] == ["Doomed"]
+
+    deleted = await crud.delete_campaign_section_async(async_db, section_id=section.id, campaign_id=campaign.id)
+    assert deleted.title == "Doomed" # Snapshot taken before the row was removed
+    assert await crud.get_campaign_sections_async(async_db, campaign.id) == []
+
+
+def _add_sections(db_session: Session, campaign: ORMCampaign, orders: list) -> list:
+    sections = [ORMCampaignSection(title=f"S{i}", content="x" * 100, order=order, campaign_id=campaign.id) for i, order in enumerate(orders)]
+    db_session.add_all(sections)
+    db_session.commit()
+    return [s.id for s in sections]
+
+def _section_orders(db_session: Session, campaign_id: int) -> list:
+    db_session.expire_all()
+    return [(s.id, s.order) for s in crud.get_campaign_sections(db_session, campaign_id)]
+
+@pytest.mark.asyncio
+async def test_update_section_order_is_one_update_without_content(db_campaign: ORMCampaign, async_client: AsyncClient, db_session: Session):
+    ids = _add_sections(db_session, db_campaign, [0, 1, 2, 3])
+    new_order = [ids[0], ids[2], ids[1], ids[3]]
+    with capture_sql() as statements:
+        response = await async_client.put(f"/api/v1/campaigns/{db_campaign.id}/sections/order", json={"section_ids": new_order})
+
+    assert response.status_code == 204
+    section_statements = [s for s in statements if "campaign_sections" in s]
+    assert not any("campaign_sections.content" in s for s in section_statements)
+    updates = [s for s in section_statements if s.lstrip().upper().startswith("UPDATE")]
+    assert len(updates) == 1 and "CASE" in updates[0]
+    assert [sid for sid, _ in _section_orders(db_session, db_campaign.id)] == new_order
+
+@pytest.mark.asyncio
+async def test_move_section_only_renumbers_affected_range(db_campaign: ORMCampaign, async_client: AsyncClient, db_session: Session):
+    # Gaps in the numbering, as left behind by deleted sections
+    ids = _add_sections(db_session, db_campaign, [0, 2, 5, 6, 9])
+
+    response = await async_client.put(f"/api/v1/campaigns/{db_campaign.id}/sections/{ids[3]}/position", json={"position": 1})
+    assert response.status_code == 200
+    expected = [ids[0], ids[3], ids[1], ids[2], ids[4]]
+    assert response.json()["section_ids"] == expected
+    # Moved range takes over the existing order values; the first and last sections are untouched
+    assert _section_orders(db_session, db_campaign.id) == list(zip(expected, [0, 2, 5, 6, 9]))
+
+    response = await async_client.put(f"/api/v1/campaigns/{db_campaign.id}/sections/{ids[0]}/position", json={"position": 99})
+    assert response.status_code == 200
+    assert response.json()["section_ids"] == expected[1:] + [ids[0]]
+
+@pytest.mark.asyncio
+async def test_move_section_not_found_or_not_owned(db_campaign: ORMCampaign, async_client: AsyncClient, db_session: Session):
+    ids = _add_sections(db_session, db_campaign, [0, 1])
+    response = await async_client.put(f"/api/v1/campaigns/{db_campaign.id}/sections/{ids[1] + 100}/position", json={"position": 0})
+    assert response.status_code == 404
+
+    other_user = create_test_user_in_db(db_session, username="mover", email="mover@example.com")
+    other_campaign = ORMCampaign(title="Not Mine", owner_id=other_user.id)
+    db_session.add(other_campaign)
+    db_session.commit()
+    response = await async_client.put(f"/api/v1/campaigns/{other_campaign.id}/sections/{ids[0]}/position", json={"position": 0})
+    assert response.status_code == 403
+
+
+def _add_campaigns_with_sections(db_session: Session, owner_id: int, count: int, sections_each: int = 3) -> list:
+    campaigns = [ORMCampaign(title=f"Campaign {i}", owner_id=owner_id) for i in range(count)]
+    db_session.add_all(campaigns)
+    db_session.commit()
+    for campaign in campaigns:
+        _add_sections(db_session, campaign, list(range(sections_each)))
+    campaign_ids = [campaign.id for campaign in campaigns]
+    db_session.expunge_all() # Start each request from an empty identity map
+    return campaign_ids
+
+@pytest.mark.asyncio
+async def test_list_campaigns_query_count_does_not_grow_with_campaigns(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    _add_campaigns_with_sections(db_session, current_active_user_override.id, 1)
+    with capture_sql() as one_campaign:
+        response = await async_client.get("/api/v1/campaigns/")
+    assert response.status_code == 200 and "sections" not in response.json()[0]
+
+    _add_campaigns_with_sections(db_session, current_active_user_override.id, 4)
+    with capture_sql() as five_campaigns:
+        response = await async_client.get("/api/v1/campaigns/")
+    assert response.status_code == 200 and len(response.json()) == 5
+
+    assert select_statements(five_campaigns, "campaign_sections") == []
+    assert len(select_statements(five_campaigns)) == len(select_statements(one_campaign)) == 1
+
+@pytest.mark.asyncio
+async def test_list_campaigns_reports_version_that_changes_with_sections(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    campaign_id = _add_campaigns_with_sections(db_session, current_active_user_override.id, 1, sections_each=1)[0]
+
+    listed = (await async_client.get("/api/v1/campaigns/")).json()[0]
+    read = await async_client.get(f"/api/v1/campaigns/{campaign_id}")
+    assert read.headers["etag"] == f'W/"campaign-{campaign_id}-v{listed["version"]}"'
+    assert listed["updated_at"] is not None
+
+    response = await async_client.post(f"/api/v1/campaigns/{campaign_id}/sections/batch", json={"sections": [{"content": "New"}]})
+    assert response.status_code == 200, response.text
+    assert (await async_client.get("/api/v1/campaigns/")).json()[0]["version"] > listed["version"]
+
+@pytest.mark.asyncio
+async def test_read_campaign_loads_sections_in_one_query(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    campaign_id = _add_campaigns_with_sections(db_session, current_active_user_override.id, 1, sections_each=5)[0]
+    with capture_sql() as statements:
+        response = await async_client.get(f"/api/v1/campaigns/{campaign_id}")
+
+    assert response.status_code == 200
+    assert [s["order"] for s in response.json()["sections"]] == [0, 1, 2, 3, 4]
+    # The ETag validators (one narrow row), then the campaign and all of its sections
+    assert len(select_statements(statements, "campaigns")) == 2
+    assert len(select_statements(statements, "campaign_sections")) == 1
+    assert len(select_statements(statements)) == 3
+
+@pytest.mark.asyncio
+async def test_read_campaign_returns_sections_in_order(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    campaign = ORMCampaign(title="Out of order", owner_id=current_active_user_override.id)
+    db_session.add(campaign)
+    db_session.commit()
+    campaign_id = campaign.id
+    _add_sections(db_session, campaign, [2, 0, 1])
+    db_session.expunge_all()
+
+    response = await async_client.get(f"/api/v1/campaigns/{campaign_id}")
+    assert response.status_code == 200
+    assert [(s["title"], s["order"]) for s in response.json()["sections"]] == [("S1", 0), ("S2", 1), ("S0", 2)]
+
+@pytest.mark.asyncio
+async def test_character_campaigns_do_not_load_sections(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    from app.orm_models import Character as ORMCharacter
+
+    campaign_ids = _add_campaigns_with_sections(db_session, current_active_user_override.id, 3)
+    character = ORMCharacter(name="Wanderer", owner_id=current_active_user_override.id)
+    character.campaigns.extend(db_session.query(ORMCampaign).filter(ORMCampaign.id.in_(campaign_ids)).all())
+    db_session.add(character)
+    db_session.commit()
+    character_id = character.id
+    db_session.expunge_all()
+
+    with capture_sql() as statements:
+        response = await async_client.get(f"/api/v1/characters/{character_id}/campaigns")
+
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()] == campaign_ids
+    assert select_statements(statements, "campaign_sections") == []
+    assert len(select_statements(statements)) == 2 # The character (ownership check), then its campaigns
+
+@pytest.mark.asyncio
+async def test_export_homebrewery_streams_sections_in_batches(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser, monkeypatch):
+    campaign_id = _add_campaigns_with_sections(db_session, current_active_user_override.id, 1, sections_each=0)[0]
+    # Two sections share an order value; batching must neither skip nor repeat either of them
+    section_orders = [0, 1, 1, 2, 3, 4, 5]
+    for i, order in enumerate(section_orders):
+        db_session.add(ORMCampaignSection(title=f"Part {i}", content=f"Body of part {i}", order=order, campaign_id=campaign_id))
+    db_session.commit()
+    db_session.expunge_all()
+    monkeypatch.setattr(settings, "EXPORT_SECTION_BATCH_SIZE", 3)
+
+    with patch("app.services.export_service.get_llm_service", return_value=None), capture_sql() as statements:
+        async with async_client.stream("GET", f"/api/v1/campaigns/{campaign_id}/export/homebrewery") as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/markdown")
+            chunks = [chunk async for chunk in response.aiter_text()]
+
+    document = "".join(chunks)
+    assert document.startswith("{{frontCover}}") and "{{backCover}}" in document
+    positions = [document.index(f"## Part {i}\n") for i in range(len(section_orders))]
+    assert all(f"Body of part {i}" in document for i in range(len(section_orders)))
+    assert positions == sorted(positions)
+    section_queries = select_statements(statements, "campaign_sections")
+    # One titles-only query for the TOC, then ceil(7 / 3) batches
+    assert len(section_queries) == 1 + 3
+    assert "campaign_sections.content" not in section_queries[0]
+
+@pytest.mark.asyncio
+async def test_homebrewery_toc_is_reused_until_titles_model_or_refresh_change(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    campaign_id = _add_campaigns_with_sections(db_session, current_active_user_override.id, 1, sections_each=2)[0]
+    mock_llm = MagicMock()
+    mock_llm.generate_homebrewery_toc_from_sections = AsyncMock(side_effect=["{{toc\n- First TOC\n}}", "{{toc\n- Second TOC\n}}", "{{toc\n- Third TOC\n}}"])
+    url = f"/api/v1/campaigns/{campaign_id}/prepare_for_homebrewery"
+
+    with patch("app.services.export_service.get_llm_service", return_value=mock_llm):
+        first = await async_client.get(url)
+        second = await async_client.get(url)
+        assert mock_llm.generate_homebrewery_toc_from_sections.await_count == 1
+        assert "First TOC" in first.json()["markdown_content"]
+        assert second.json()["markdown_content"] == first.json()["markdown_content"]
+
+        # Renaming a section changes the fingerprint
+        section = db_session.query(ORMCampaignSection).filter(ORMCampaignSection.campaign_id == campaign_id).first()
+        section.title = "Renamed"
+        db_session.commit()
+        third = await async_client.get(url)
+        assert mock_llm.generate_homebrewery_toc_from_sections.await_count == 2
+        assert "Second TOC" in third.json()["markdown_content"]
+
+        forced = await async_client.get(url, params={"refresh_toc": True})
+        assert mock_llm.generate_homebrewery_toc_from_sections.await_count == 3
+        assert "Third TOC" in forced.json()["markdown_content"]
+
+    # The stored TOC still fits the campaign response model
+    response = await async_client.get(f"/api/v1/campaigns/{campaign_id}")
+    assert response.status_code == 200
+    stored = response.json()["homebrewery_toc"]
+    assert len(stored) == 1 and "Third TOC" in stored[0]["markdown_string"] and stored[0]["fingerprint"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["", "/sections", "/full_content"])
+async def test_campaign_reads_answer_conditional_get_without_loading_sections(path: str, async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    campaign_id = _add_campaigns_with_sections(db_session, current_active_user_override.id, 1, sections_each=2)[0]
+    url = f"/api/v1/campaigns/{campaign_id}{path}"
+
+    first = await async_client.get(url)
+    assert first.status_code == 200
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+    with capture_sql() as statements:
+        cached = await async_client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert select_statements(statements, "campaign_sections") == []
+    assert len(select_statements(statements)) == 1
+
+    assert (await async_client.get(url, headers={"If-Modified-Since": last_modified})).status_code == 304
+
+    # Any section write bumps the version
+    section_id = db_session.query(ORMCampaignSection.id).filter(ORMCampaignSection.campaign_id == campaign_id).first()[0]
+    response = await async_client.put(f"/api/v1/campaigns/{campaign_id}/sections/{section_id}", json={"content": "Changed"})
+    assert response.status_code == 200
+    changed = await async_client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+@pytest.mark.asyncio
+async def test_campaign_version_bumped_by_section_toc_and_character_writes(db_session: Session, current_active_user_override: PydanticUser):
+    from app.orm_models import Character as ORMCharacter
+
+    campaign_id = _add_campaigns_with_sections(db_session, current_active_user_override.id, 1, sections_each=3)[0]
+    def version() -> int:
+        return crud.get_campaign_validators(db_session, campaign_id)[1]
+
+    start = version()
+    section = crud.create_campaign_section(db_session, campaign_id, "New", "Text")
+    assert section.order == 3 and version() == start + 1
+    ids = [sid for sid, _ in crud.get_campaign_section_order(db_session, campaign_id)]
+    await crud.update_section_order(db_session, campaign_id, list(reversed(ids)))
+    assert version() == start + 2
+    await crud.update_section_order(db_session, campaign_id, list(reversed(ids))) # Nothing moves
+    assert version() == start + 2
+    crud.move_campaign_section(db_session, campaign_id, ids[0], 0)
+    crud.delete_campaign_section(db_session, section.id, campaign_id)
+    crud.update_campaign_toc(db_session, campaign_id, [{"title": "Intro", "type": "generic"}], None)
+    crud.update_campaign_homebrewery_toc(db_session, campaign_id, "toc", "fingerprint", None)
+    assert version() == start + 6
+
+    character = ORMCharacter(name="Linked", owner_id=current_active_user_override.id)
+    db_session.add(character)
+    db_session.commit()
+    crud.add_character_to_campaign(db_session, character.id, campaign_id)
+    crud.remove_character_from_campaign(db_session, character.id, campaign_id)
+    assert version() == start + 8
+
+@pytest.mark.asyncio
+async def test_batch_create_sections_appends_in_one_insert(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser, monkeypatch):
+    campaign_id = _add_campaigns_with_sections(db_session, current_active_user_override.id, 1, sections_each=2)[0]
+    monkeypatch.setattr(settings, "SECTION_BULK_INSERT_CHUNK_SIZE", 2)
+    payload = {"sections": [
+        {"title": "Act I", "content": "One"},
+        {"title": "Act II", "content": "Two", "type": "chapter"},
+        {"content": "Three"},
+    ]}
+
+    with capture_sql() as statements:
+        response = await async_client.post(f"/api/v1/campaigns/{campaign_id}/sections/batch", json=payload)
+    assert response.status_code == 200, response.text
+    sections = response.json()["sections"]
+    assert [(s["title"], s["order"], s["type"]) for s in sections] == [("Act I", 2, "generic"), ("Act II", 3, "chapter"), (None, 4, "generic")]
+    # Two multi-row INSERTs for three sections with a chunk size of 2
+    assert len([s for s in statements if s.lstrip().upper().startswith("INSERT INTO CAMPAIGN_SECTIONS")]) == 2
+    assert [order for _, order in crud.get_campaign_section_order(db_session, campaign_id)] == [0, 1, 2, 3, 4]
+
+@pytest.mark.asyncio
+async def test_batch_create_sections_returns_only_its_own_rows(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser, monkeypatch):
+    campaign_id = _add_campaigns_with_sections(db_session, current_active_user_override.id, 1, sections_each=0)[0]
+    bulk_create = crud.create_campaign_sections_bulk
+
+    def racing_bulk_create(db, campaign_id, sections, commit=True):
+        section_ids = bulk_create(db, campaign_id=campaign_id, sections=sections, commit=commit)
+        # A concurrent append that read the same MAX(order) lands on the same orders
+        bulk_create(db, campaign_id=campaign_id, sections=[{"title": "Other request", "content": "x"}])
+        db.query(ORMCampaignSection).filter(ORMCampaignSection.title == "Other request").update({"order": 0})
+        db.commit()
+        return section_ids
+
+    monkeypatch.setattr(crud, "create_campaign_sections_bulk", racing_bulk_create)
+    response = await async_client.post(f"/api/v1/campaigns/{campaign_id}/sections/batch", json={"sections": [{"title": "Mine", "content": "a"}]})
+    assert response.status_code == 200, response.text
+    assert [s["title"] for s in response.json()["sections"]] == ["Mine"]
+
+@pytest.mark.asyncio
+async def test_batch_create_sections_validation(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser, another_user: ORMUser, monkeypatch):
+    other_user_id = another_user.id
+    campaign_id = _add_campaigns_with_sections(db_session, current_active_user_override.id, 1, sections_each=0)[0]
+    url = f"/api/v1/campaigns/{campaign_id}/sections/batch"
+
+    assert (await async_client.post(url, json={"sections": []})).status_code == 400
+    monkeypatch.setattr(settings, "SECTION_BATCH_CREATE_MAX_SECTIONS", 1)
+    assert (await async_client.post(url, json={"sections": [{"content": "a"}, {"content": "b"}]})).status_code == 400
+    assert (await async_client.post("/api/v1/campaigns/999999/sections/batch", json={"sections": [{"content": "a"}]})).status_code == 404
+
+    other_campaign_id = _add_campaigns_with_sections(db_session, other_user_id, 1, sections_each=0)[0]
+    response = await async_client.post(f"/api/v1/campaigns/{other_campaign_id}/sections/batch", json={"sections": [{"content": "a"}]})
+    assert response.status_code == 403
@@ -1,15 +1,18 @@
 """
 Tests for Characters API endpoints.
 """
+import asyncio
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.orm import Session
 from unittest.mock import patch, AsyncMock, MagicMock
 
 from app.tests.conftest import create_test_user_in_db
-from app.orm_models import Character as ORMCharacter, Campaign as ORMCampaign
+from app.orm_models import Character as ORMCharacter, Campaign as ORMCampaign, ChatMessage as ORMChatMessage, ChatMessageEntry as ORMChatMessageEntry
 from app.models import User as PydanticUser
 from app import crud
+from app.core.config import settings
+from app.services.conversation_summary_queue import ConversationSummaryQueue, conversation_summary_queue
 
 
 class TestCharacterCRUD:
@@ -386,6 +389,126 @@ class TestCharacterChat:
         data = response.json()
         assert data["text"] == "Hello, adventurer!"
 
+        history = await async_client.get(f"/api/v1/characters/{char.id}/chat")
+        assert history.status_code == 200
+        assert [(m["speaker"], m["text"]) for m in history.json()] == [
+            ("user", "Hello there!"),
+            ("assistant", "Hello, adventurer!"),
+        ]
+
+    @pytest.mark.asyncio
+    @patch('app.api.endpoints.characters.crud.get_llm_service')
+    async def test_generate_response_appends_rows_and_sends_recent_context(
+        self,
+        mock_get_llm_service: MagicMock,
+        async_client: AsyncClient,
+        db_session: Session,
+        current_active_user_override: PydanticUser
+    ):
+        """Each turn inserts two message rows; only the 9 preceding messages go to the LLM."""
+        char = ORMCharacter(name="Long Talker", owner_id=current_active_user_override.id)
+        db_session.add(char)
+        db_session.commit()
+        db_session.refresh(char)
+
+        mock_llm = AsyncMock()
+        mock_llm.generate_character_response = AsyncMock(side_effect=[f"reply {i}" for i in range(6)])
+        mock_get_llm_service.return_value = mock_llm
+
+        for i in range(6):
+            response = await async_client.post(
+                f"/api/v1/characters/{char.id}/generate-response",
+                json={"prompt": f"prompt {i}"}
+            )
+            assert response.status_code == 200
+
+        conversation = db_session.query(ORMChatMessage).filter_by(character_id=char.id).one()
+        db_session.refresh(conversation)
+        assert conversation.message_count == 12
+        assert db_session.query(ORMChatMessageEntry).filter_by(conversation_id=conversation.id).count() == 12
+
+        last_call_history = mock_llm.generate_character_response.call_args.kwargs["chat_history"]
+        assert [m.text for m in last_call_history] == [
+            "reply 0", "prompt 1", "reply 1", "prompt 2", "reply 2",
+            "prompt 3", "reply 3", "prompt 4", "reply 4",
+        ]
+        assert mock_llm.generate_character_response.call_args.kwargs["user_prompt"] == "prompt 5"
+
+        history = (await async_client.get(f"/api/v1/characters/{char.id}/chat")).json()
+        assert len(history) == 12
+        assert history[0]["text"] == "prompt 0"
+        assert history[-1]["text"] == "reply 5"
+
+    @pytest.mark.asyncio
+    @patch('app.crud.get_llm_service')
+    async def test_clear_chat_history_summarizes_and_deletes_messages(
+        self,
+        mock_get_llm_service: MagicMock,
+        async_client: AsyncClient,
+        db_session: Session,
+        current_active_user_override: PydanticUser
+    ):
+        char = ORMCharacter(name="Forgetful", owner_id=current_active_user_override.id)
+        db_session.add(char)
+        db_session.commit()
+        db_session.refresh(char)
+
+        conversation = crud.get_or_create_user_character_conversation(db_session, char.id, current_active_user_override.id)
+        crud.append_conversation_messages(db_session, conversation, [
+            {"speaker": "user" if i % 2 == 0 else "assistant", "text": f"message {i}"} for i in range(20)
+        ])
+
+        mock_llm = AsyncMock()
+        mock_llm.generate_text = AsyncMock(return_value="They talked a lot.")
+        mock_get_llm_service.return_value = mock_llm
+
+        response = await async_client.delete(f"/api/v1/characters/{char.id}/chat")
+        assert response.status_code == 204
+
+        summary_prompt = mock_llm.generate_text.call_args.kwargs["prompt"]
+        assert "user: message 0" in summary_prompt
+        assert "message 19" not in summary_prompt # Recent messages are kept out of the summary
+
+        assert (await async_client.get(f"/api/v1/characters/{char.id}/chat")).json() == []
+        summary = (await async_client.get(f"/api/v1/characters/{char.id}/memory-summary")).json()
+        assert summary["memory_summary"] == "They talked a lot."
+
+    @pytest.mark.asyncio
+    async def test_chat_history_page_returns_newest_first_with_cursor(
+        self,
+        async_client: AsyncClient,
+        db_session: Session,
+        current_active_user_override: PydanticUser
+    ):
+        char = ORMCharacter(name="Paged", owner_id=current_active_user_override.id)
+        db_session.add(char)
+        db_session.commit()
+        db_session.refresh(char)
+        conversation = crud.get_or_create_user_character_conversation(db_session, char.id, current_active_user_override.id)
+        crud.append_conversation_messages(db_session, conversation, [
+            {"speaker": "user", "text": f"message {i}"} for i in range(5)
+        ])
+
+        first = await async_client.get(f"/api/v1/characters/{char.id}/chat/page", params={"limit": 2})
+        assert first.status_code == 200
+        first_page = first.json()
+        assert [m["text"] for m in first_page["messages"]] == ["message 4", "message 3"]
+        assert first_page["has_more"] is True
+
+        second_page = (await async_client.get(
+            f"/api/v1/characters/{char.id}/chat/page",
+            params={"limit": 2, "before_id": first_page["next_cursor"]}
+        )).json()
+        assert [m["text"] for m in second_page["messages"]] == ["message 2", "message 1"]
+
+        last_page = (await async_client.get(
+            f"/api/v1/characters/{char.id}/chat/page",
+            params={"limit": 2, "before_id": second_page["next_cursor"]}
+        )).json()
+        assert [m["text"] for m in last_page["messages"]] == ["message 0"]
+        assert last_page["has_more"] is False
+        assert last_page["next_cursor"] is None
+
     @pytest.mark.asyncio
     async def test_generate_response_empty_prompt(
         self, 
@@ -407,6 +530,71 @@ class TestCharacterChat:
         assert response.status_code == 400
 
 
+class TestConversationSummaryQueue:
+    """Tests for background conversation summarization."""
+
+    @pytest.mark.asyncio
+    @patch('app.api.endpoints.characters.crud.get_llm_service')
+    async def test_chat_response_does_not_wait_for_summarization(
+        self,
+        mock_get_llm_service: MagicMock,
+        async_client: AsyncClient,
+        db_session: Session,
+        current_active_user_override: PydanticUser,
+        monkeypatch
+    ):
+        monkeypatch.setattr(settings, "CHAT_MIN_MESSAGES_FOR_SUMMARY_TRIGGER", 2)
+        monkeypatch.setattr(settings, "CHAT_SUMMARIZATION_INTERVAL", 2)
+        monkeypatch.setattr(settings, "CHAT_MIN_MESSAGES_FOR_SUMMARY_CRUD", 2)
+        monkeypatch.setattr(settings, "CHAT_RECENT_MESSAGES_TO_EXCLUDE_FROM_SUMMARY", 1)
+
+        char = ORMCharacter(name="Rememberer", owner_id=current_active_user_override.id)
+        db_session.add(char)
+        db_session.commit()
+        db_session.refresh(char)
+
+        release_summary = asyncio.Event()
+
+        async def slow_summary(**kwargs):
+            await release_summary.wait()
+            return "Summary of the first turn."
+
+        mock_llm = AsyncMock()
+        mock_llm.generate_character_response = AsyncMock(return_value="Greetings!")
+        mock_llm.generate_text = AsyncMock(side_effect=slow_summary)
+        mock_get_llm_service.return_value = mock_llm
+
+        response = await asyncio.wait_for(async_client.post(
+            f"/api/v1/characters/{char.id}/generate-response",
+            json={"prompt": "Remember me?"}
+        ), timeout=5)
+        assert response.status_code == 200
+        assert response.json()["text"] == "Greetings!"
+
+        release_summary.set()
+        await asyncio.wait_for(conversation_summary_queue.join(), timeout=5)
+        mock_llm.generate_text.assert_awaited_once()
+        summary = (await async_client.get(f"/api/v1/characters/{char.id}/memory-summary")).json()
+        assert summary["memory_summary"] == "Summary of the first turn."
+
+    @pytest.mark.asyncio
+    async def test_queue_deduplicates_and_retries(self, monkeypatch):
+        monkeypatch.setattr(settings, "CHAT_SUMMARY_RETRY_BASE_DELAY_SECONDS", 0)
+        monkeypatch.setattr(settings, "CHAT_SUMMARY_MAX_ATTEMPTS", 3)
+        queue = ConversationSummaryQueue()
+        queue._summarize = AsyncMock(side_effect=[RuntimeError("LLM down"), None, None])
+
+        assert queue.enqueue(1, 1, "openai/gpt-4") is True
+        assert queue.enqueue(1, 1, "openai/gpt-4o") is False # Duplicate only refreshes the model
+        assert queue.enqueue(2, 1) is True
+        await asyncio.wait_for(queue.join(), timeout=5)
+
+        calls = [c.args for c in queue._summarize.await_args_list]
+        assert calls == [((1, 1), "openai/gpt-4o"), ((2, 1), None), ((1, 1), "openai/gpt-4o")]
+        assert not queue.is_pending(1, 1)
+        await queue.aclose()
+
+
 class TestCharacterAspectGeneration:
     """Tests for character aspect generation."""
 
@@ -237,3 +237,118 @@ async def test_delete_system_feature_as_superuser(async_client: AsyncClient, sup
 async def test_delete_nonexistent_feature(async_client: AsyncClient, current_active_user_override: models.User):
     response = await async_client.delete(f"{FEATURES_ENDPOINT}99999")
     assert response.status_code == 404
+
+
+# --- Feature template cache ---
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.services.catalog_cache import bump_catalog_version, read_catalog_version
+from app.services.feature_cache import FEATURE_CATALOG_VERSION_NAME, feature_template_cache
+from app.services.feature_prompt_service import FeaturePromptService
+
+
+def test_get_prompt_is_served_from_cache(db_session: Session):
+    create_db_feature(db_session, name="Section Content", template="System template")
+    service = FeaturePromptService()
+
+    with patch("app.services.feature_prompt_service.crud.get_feature_by_name", wraps=crud.get_feature_by_name) as get_by_name:
+        assert service.get_prompt("Section Content", db=db_session) == "System template"
+        assert service.get_prompt("Section Content", db=db_session) == "System template"
+        # Missing templates are cached as well
+        assert service.get_prompt("Nonexistent", db=db_session) is None
+        assert service.get_prompt("Nonexistent", db=db_session) is None
+    assert get_by_name.call_count == 2
+
+
+def test_get_prompt_cache_is_keyed_by_user_scope(db_session: Session, current_active_user_override: models.User):
+    create_db_feature(db_session, name="Campaign", template="System campaign")
+    create_db_feature(db_session, name="Campaign", template="My campaign", user_id=current_active_user_override.id)
+    service = FeaturePromptService()
+
+    assert service.get_prompt("Campaign", db=db_session) == "System campaign"
+    assert service.get_prompt("Campaign", db=db_session, user_id=current_active_user_override.id) == "My campaign"
+
+
+@pytest.mark.asyncio
+async def test_feature_writes_invalidate_cached_template(async_client: AsyncClient, current_active_user_override: models.User, db_session: Session):
+    service = FeaturePromptService()
+    create_response = await async_client.post(FEATURES_ENDPOINT, json={"name": "Mine", "template": "v1"})
+    assert create_response.status_code == 200, create_response.text
+    feature_id = create_response.json()["id"]
+    user_id = current_active_user_override.id
+    assert service.get_prompt("Mine", db=db_session, user_id=user_id) == "v1"
+
+    version_before = feature_template_cache.version
+    update_response = await async_client.put(f"{FEATURES_ENDPOINT}{feature_id}", json={"template": "v2"})
+    assert update_response.status_code == 200, update_response.text
+    assert feature_template_cache.version > version_before
+    assert service.get_prompt("Mine", db=db_session, user_id=user_id) == "v2"
+
+    delete_response = await async_client.delete(f"{FEATURES_ENDPOINT}{feature_id}")
+    assert delete_response.status_code == 200, delete_response.text
+    assert service.get_prompt("Mine", db=db_session, user_id=user_id) is None
+    assert read_catalog_version(db_session, FEATURE_CATALOG_VERSION_NAME) == 3
+
+
+def test_cache_detects_writes_from_other_workers(db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "CATALOG_CACHE_VERSION_CHECK_SECONDS", 0)
+    feature = create_db_feature(db_session, name="TOC Display", template="Old TOC")
+    service = FeaturePromptService()
+    assert service.get_prompt("TOC Display", db=db_session) == "Old TOC"
+
+    # Another process updates the row and bumps the shared stamp; this process' cache was not told
+    feature.template = "New TOC"
+    bump_catalog_version(db_session, FEATURE_CATALOG_VERSION_NAME)
+    db_session.commit()
+
+    assert service.get_prompt("TOC Display", db=db_session) == "New TOC"
+
+
+# --- Section type -> master feature resolution ---
+from sqlalchemy import event
+
+
+def _create_full_section_feature(db: Session, name: str, compatible_types, user_id: int = None) -> orm_models.Feature:
+    feature_orm = orm_models.Feature(name=name, template=f"{name} template", user_id=user_id,
+                                     compatible_types=compatible_types, feature_category="FullSection")
+    db.add(feature_orm)
+    db.commit()
+    db.refresh(feature_orm)
+    return feature_orm
+
+
+def test_master_feature_resolution_uses_cached_index(db_session: Session):
+    npc = _create_full_section_feature(db_session, "Generate NPC", ["NPC", "Character"])
+    location = _create_full_section_feature(db_session, "Generate Location", '["Location"]') # JSON stored as a string
+    generic = _create_full_section_feature(db_session, crud.GENERIC_MASTER_FEATURE_NAME, [])
+    _create_full_section_feature(db_session, "Later NPC", ["NPC"]) # Lower ids win
+    db_session.expire_all()
+
+    assert crud.get_master_feature_for_type(db_session, "NPC").id == npc.id
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        assert crud.get_master_feature_for_type(db_session, "Character").id == npc.id
+        assert crud.get_master_feature_for_type(db_session, "Location").id == location.id
+        assert crud.get_master_feature_for_type(db_session, "Monster").id == generic.id
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+    # The index is not rebuilt; each resolution is at most one primary-key lookup
+    assert not any("features.feature_category =" in statement for statement in statements)
+    assert len(statements) <= 3
+
+
+def test_master_feature_index_is_rebuilt_after_feature_changes(db_session: Session):
+    npc = _create_full_section_feature(db_session, "Generate NPC", ["NPC"])
+    assert crud.get_master_feature_for_type(db_session, "Monster") is None
+
+    monster = crud.create_feature(db_session, models.FeatureCreate(
+        name="Generate Monster", template="Monster template", compatible_types=["Monster"], feature_category="FullSection"
+    ))
+    assert crud.get_master_feature_for_type(db_session, "Monster").id == monster.id
+
+    crud.delete_feature(db_session, feature_id=npc.id)
+    assert crud.get_master_feature_for_type(db_session, "NPC") is None
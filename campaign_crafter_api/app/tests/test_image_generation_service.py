@@ -5,8 +5,8 @@ import uuid
 
 from fastapi import HTTPException
 from app.services.llm_service import LLMServiceUnavailableError, LLMGenerationError
-import requests
 from sqlalchemy.orm import Session
+from pytest_httpx import IteratorStream
 
 from app.services.image_generation_service import ImageGenerationService
 from app.core.config import settings
@@ -196,7 +196,7 @@ async def test_get_gemini_api_key_decryption_fails_superuser_fallback(mock_decry
 # --- Tests for _save_image_and_log_db ---
 
 @pytest.mark.asyncio
-@patch('app.services.image_generation_service.BlobServiceClient')
+@patch('app.services.storage_backend.AsyncBlobServiceClient')
 @patch('uuid.uuid4')
 async def test_save_image_and_log_db_with_image_bytes(mock_uuid, mock_blob_service_client_class, image_service, mock_db_session):
     # Setup
@@ -211,6 +211,7 @@ async def test_save_image_and_log_db_with_image_bytes(mock_uuid, mock_blob_servi
     # Mock Azure Blob Storage
     mock_bsc_instance = MagicMock()
     mock_blob_client = MagicMock()
+    mock_blob_client.upload_blob = AsyncMock()
     mock_blob_service_client_class.from_connection_string.return_value = mock_bsc_instance
     mock_bsc_instance.get_blob_client.return_value = mock_blob_client
     
@@ -232,7 +233,8 @@ async def test_save_image_and_log_db_with_image_bytes(mock_uuid, mock_blob_servi
         )
         
         # Verify blob upload
-        mock_blob_client.upload_blob.assert_called_once()
+        mock_blob_client.upload_blob.assert_awaited_once()
+        assert mock_blob_client.upload_blob.call_args[0][0] == image_bytes
         
         # Verify database interaction
         mock_db_session.add.assert_called_once()
@@ -255,6 +257,56 @@ async def test_save_image_and_log_db_with_image_bytes(mock_uuid, mock_blob_servi
         settings.AZURE_STORAGE_CONTAINER_NAME = original_container
 
 
+@pytest.mark.asyncio
+@patch('app.services.storage_backend.AsyncBlobServiceClient')
+@patch('uuid.uuid4')
+async def test_save_image_and_log_db_streams_temporary_url(mock_uuid, mock_blob_service_client_class, image_service, mock_db_session, httpx_mock):
+    mock_uuid.return_value.hex = "streamuuid"
+    temporary_url = "https://images.example.com/tmp/generated"
+    image_chunks = [b"chunk-one", b"chunk-two", b"chunk-three"]
+    httpx_mock.add_response(url=temporary_url, stream=IteratorStream(image_chunks), headers={"Content-Type": "image/jpeg"})
+
+    received_chunks = []
+
+    async def fake_upload_blob(data, **kwargs):
+        # The download must arrive as an async iterator, not as one buffered bytes object
+        assert not isinstance(data, (bytes, bytearray))
+        async for chunk in data:
+            received_chunks.append(chunk)
+
+    mock_bsc_instance = MagicMock()
+    mock_blob_client = MagicMock()
+    mock_blob_client.upload_blob = AsyncMock(side_effect=fake_upload_blob)
+    mock_blob_service_client_class.from_connection_string.return_value = mock_bsc_instance
+    mock_bsc_instance.get_blob_client.return_value = mock_blob_client
+
+    original_conn_str = settings.AZURE_STORAGE_CONNECTION_STRING
+    original_container = settings.AZURE_STORAGE_CONTAINER_NAME
+    settings.AZURE_STORAGE_CONNECTION_STRING = "DefaultEndpointsProtocol=https;AccountName=testaccount;AccountKey=testkey;EndpointSuffix=core.windows.net"
+    settings.AZURE_STORAGE_CONTAINER_NAME = "testcontainer"
+
+    try:
+        permanent_url = await image_service._save_image_and_log_db(
+            prompt="a dragon",
+            model_used="dall-e-3",
+            size_used="1024x1024",
+            db=mock_db_session,
+            temporary_url=temporary_url,
+            user_id=1,
+            campaign_id=10
+        )
+
+        assert b"".join(received_chunks) == b"".join(image_chunks)
+        content_settings = mock_blob_client.upload_blob.call_args.kwargs["content_settings"]
+        assert content_settings.content_type == "image/jpeg"
+        # Extension refined from the content type, campaign path preserved
+        assert permanent_url.endswith("/testcontainer/user_uploads/1/campaigns/10/files/streamuuid.jpg")
+        mock_db_session.commit.assert_called_once()
+    finally:
+        settings.AZURE_STORAGE_CONNECTION_STRING = original_conn_str
+        settings.AZURE_STORAGE_CONTAINER_NAME = original_container
+
+
 @pytest.mark.asyncio
 async def test_save_image_and_log_db_no_user_id(image_service, mock_db_session):
     with pytest.raises(ValueError) as exc_info:
@@ -272,7 +324,7 @@ async def test_save_image_and_log_db_no_user_id(image_service, mock_db_session):
 # --- Tests for generate_image_dalle ---
 
 @pytest.mark.asyncio
-@patch('openai.OpenAI')
+@patch('openai.AsyncOpenAI')
 async def test_generate_image_dalle_success(mock_openai_class, image_service, mock_current_user, mock_db_session):
     # Setup
     prompt = "a cat playing chess"
@@ -282,7 +334,7 @@ async def test_generate_image_dalle_success(mock_openai_class, image_service, mo
     mock_client = MagicMock()
     mock_response = MagicMock()
     mock_response.data = [MagicMock(url=expected_temp_url)]
-    mock_client.images.generate.return_value = mock_response
+    mock_client.images.generate = AsyncMock(return_value=mock_response)
     mock_openai_class.return_value = mock_client
     
     # Mock key retrieval
@@ -303,7 +355,7 @@ async def test_generate_image_dalle_success(mock_openai_class, image_service, mo
     
     # Verify
     image_service._get_openai_api_key_for_user.assert_called_once_with(mock_current_user, mock_db_session)
-    mock_client.images.generate.assert_called_once()
+    mock_client.images.generate.assert_awaited_once()
     assert actual_url == "http://permanent.url/image.png"
 
 
@@ -405,12 +457,11 @@ async def test_generate_image_gemini_generation_error(mock_gemini_class, image_s
 # --- Tests for delete_image_from_blob_storage ---
 
 @pytest.mark.asyncio
-@patch('app.services.image_generation_service.BlobServiceClient')
+@patch('app.services.storage_backend.AsyncBlobServiceClient')
 async def test_delete_image_successfully(mock_blob_service_client_class, image_service):
     mock_bsc_instance = MagicMock()
     mock_blob_client = MagicMock()
-    # delete_blob is NOT async in the actual service - it's a sync method
-    mock_blob_client.delete_blob = MagicMock()
+    mock_blob_client.delete_blob = AsyncMock()
     
     mock_blob_service_client_class.from_connection_string.return_value = mock_bsc_instance
     mock_bsc_instance.get_blob_client.return_value = mock_blob_client
@@ -422,7 +473,7 @@ async def test_delete_image_successfully(mock_blob_service_client_class, image_s
         blob_name = "test_blob.png"
         await image_service.delete_image_from_blob_storage(blob_name)
         
-        mock_blob_client.delete_blob.assert_called_once()
+        mock_blob_client.delete_blob.assert_awaited_once()
     finally:
         settings.AZURE_STORAGE_CONNECTION_STRING = original_conn_str
 
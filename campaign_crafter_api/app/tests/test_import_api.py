@@ -0,0 +1,227 @@
+import io
+import json
+import zipfile
+from typing import Dict, List
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.orm_models import Campaign as ORMCampaign, CampaignSection as ORMCampaignSection, User as ORMUser
+from app.models import User as PydanticUser
+from app.services.import_service import ZIP_LOOSE_FILES_CAMPAIGN_TITLE
+from app.tests.conftest import capture_sql
+
+
+def _zip_bytes(files: Dict[str, str]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return buffer.getvalue()
+
+
+def _zip_upload(files: Dict[str, str]) -> dict:
+    return {"file": ("campaign_notes.zip", _zip_bytes(files), "application/zip")}
+
+
+def _sse_payloads(body: str) -> List[dict]:
+    return [json.loads(line[len("data:"):].strip()) for line in body.splitlines() if line.startswith("data:")]
+
+
+def _section_inserts(statements: List[str]) -> List[str]:
+    return [s for s in statements if s.lstrip().upper().startswith("INSERT INTO CAMPAIGN_SECTIONS")]
+
+
+def _section_titles(db_session: Session, campaign_id: int) -> List[str]:
+    return [
+        title for (title,) in db_session.query(ORMCampaignSection.title)
+        .filter(ORMCampaignSection.campaign_id == campaign_id)
+        .order_by(ORMCampaignSection.order)
+    ]
+
+
+ARCHIVE = {
+    "intro.txt": "Welcome, adventurers.",
+    "Keep/rooms.json": json.dumps([{"title": "Gatehouse", "content": "Two guards."}, {"title": "Hall", "content": "A long table."}]),
+    "Keep/campaign.json": json.dumps({"title": "The Keep", "concept": "A border fortress.", "sections": []}),
+    "notes.bin": "ignored",
+    "__MACOSX/._intro.txt": "resource fork",
+}
+
+
+@pytest.mark.asyncio
+async def test_zip_import_creates_campaigns_per_folder(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    response = await async_client.post(
+        "/api/v1/import/zip_file",
+        files=_zip_upload(ARCHIVE),
+        data={"process_folders_as_structure": "true"}
+    )
+    assert response.status_code == 200, response.text
+    summary = response.json()
+    assert summary["errors"] == []
+    assert summary["imported_campaigns_count"] == 2
+    assert summary["imported_sections_count"] == 3
+
+    campaigns = {c.title: c for c in db_session.query(ORMCampaign).filter(ORMCampaign.id.in_(summary["created_campaign_ids"]))}
+    assert set(campaigns) == {"The Keep", ZIP_LOOSE_FILES_CAMPAIGN_TITLE}
+    assert campaigns["The Keep"].concept == "A border fortress."
+    assert all(c.owner_id == current_active_user_override.id for c in campaigns.values())
+    assert _section_titles(db_session, campaigns["The Keep"].id) == ["Gatehouse", "Hall"]
+    assert _section_titles(db_session, campaigns[ZIP_LOOSE_FILES_CAMPAIGN_TITLE].id) == ["intro"]
+
+
+@pytest.mark.asyncio
+async def test_zip_import_into_target_builds_folder_sections(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    target = ORMCampaign(title="Existing", owner_id=current_active_user_override.id)
+    db_session.add(target)
+    db_session.commit()
+    target_id = target.id
+
+    response = await async_client.post(
+        "/api/v1/import/zip_file",
+        files=_zip_upload(ARCHIVE),
+        data={"process_folders_as_structure": "true", "target_campaign_id": str(target_id)}
+    )
+    assert response.status_code == 200, response.text
+    summary = response.json()
+    assert summary["updated_campaign_ids"] == [target_id]
+    assert summary["created_campaign_ids"] == []
+
+    db_session.expire_all()
+    sections = db_session.query(ORMCampaignSection).filter(ORMCampaignSection.campaign_id == target_id).order_by(ORMCampaignSection.order).all()
+    assert [s.title for s in sections] == ["Keep", "intro"] # Files are imported in name order
+    # campaign.json is read before rooms.json here, and its concept leads the folder section either way
+    assert sections[0].content == "A border fortress.\n\n### Gatehouse\nTwo guards.\n\n### Hall\nA long table."
+    assert db_session.get(ORMCampaign, target_id).version > 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/v1/import/zip_file", "/api/v1/import/zip_file/stream"])
+async def test_zip_import_into_another_users_campaign_is_forbidden(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser, another_user: ORMUser, path: str):
+    target = ORMCampaign(title="Not mine", owner_id=another_user.id)
+    db_session.add(target)
+    db_session.commit()
+    target_id = target.id
+
+    response = await async_client.post(path, files=_zip_upload(ARCHIVE), data={"target_campaign_id": str(target_id)})
+    assert response.status_code == 403
+    assert _section_titles(db_session, target_id) == []
+    assert (await async_client.post(path, files=_zip_upload(ARCHIVE), data={"target_campaign_id": "999999"})).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_zip_import_skips_members_over_size_limit(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_ZIP_MAX_MEMBER_BYTES", 10)
+    response = await async_client.post(
+        "/api/v1/import/zip_file",
+        files=_zip_upload({"short.txt": "Small.", "long.txt": "This file is too large."})
+    )
+    assert response.status_code == 200, response.text
+    summary = response.json()
+    assert summary["imported_sections_count"] == 1
+    assert [e["file_name"] for e in summary["errors"]] == ["long.txt"]
+    assert summary["message"] == "Zip import process completed with errors."
+
+
+@pytest.mark.asyncio
+async def test_zip_import_rejects_invalid_archive(async_client: AsyncClient, current_active_user_override: PydanticUser):
+    response = await async_client.post(
+        "/api/v1/import/zip_file",
+        files={"file": ("broken.zip", b"not a zip", "application/zip")}
+    )
+    assert response.status_code == 200
+    assert response.json()["errors"] == [{"file_name": None, "item_identifier": None, "error": "Invalid or corrupted Zip file."}]
+
+
+@pytest.mark.asyncio
+async def test_zip_import_stream_reports_progress(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser, monkeypatch):
+    from sse_starlette.sse import AppStatus
+    AppStatus.should_exit_event = None # Otherwise bound to the loop of an earlier streaming test
+    # Spool to disk even for this small upload
+    monkeypatch.setattr(settings, "IMPORT_UPLOAD_SPOOL_MAX_MEMORY_BYTES", 16)
+    monkeypatch.setattr(settings, "IMPORT_UPLOAD_CHUNK_SIZE", 64)
+    response = await async_client.post(
+        "/api/v1/import/zip_file/stream",
+        files=_zip_upload(ARCHIVE),
+        data={"process_folders_as_structure": "true"}
+    )
+    assert response.status_code == 200, response.text
+    events = _sse_payloads(response.text)
+
+    progress = [e for e in events if e["event_type"] == "progress"]
+    assert [e["current_file"] for e in progress] == ["Keep/campaign.json", "Keep/rooms.json", "intro.txt", "notes.bin"]
+    assert [e["processed_files"] for e in progress] == [1, 2, 3, 4]
+    assert all(e["total_files"] == 4 for e in progress)
+    assert progress[-1]["imported_sections_count"] == 3
+
+    assert events[-1]["event_type"] == "complete"
+    summary = events[-1]["summary"]
+    assert summary["imported_campaigns_count"] == 2
+    assert db_session.query(ORMCampaign).filter(ORMCampaign.id.in_(summary["created_campaign_ids"])).count() == 2
+
+
+@pytest.mark.asyncio
+async def test_zip_import_stream_rejects_non_zip(async_client: AsyncClient, current_active_user_override: PydanticUser):
+    response = await async_client.post(
+        "/api/v1/import/zip_file/stream",
+        files={"file": ("notes.txt", b"hello", "text/plain")}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_json_import_creates_campaign_and_sections_in_one_insert(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    campaign_json = {"title": "Imported", "concept": "From JSON.", "sections": [{"title": f"Part {i}", "content": f"Body {i}"} for i in range(20)]}
+    with capture_sql() as statements:
+        response = await async_client.post(
+            "/api/v1/import/json_file",
+            files={"file": ("campaign.json", json.dumps(campaign_json).encode(), "application/json")}
+        )
+    assert response.status_code == 200, response.text
+    summary = response.json()
+    assert summary["errors"] == []
+    assert summary["imported_campaigns_count"] == 1 and summary["imported_sections_count"] == 20
+    assert len(_section_inserts(statements)) == 1
+    assert _section_titles(db_session, summary["created_campaign_ids"][0]) == [f"Part {i}" for i in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_json_import_into_target_uses_given_order(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser):
+    target = ORMCampaign(title="Existing", owner_id=current_active_user_override.id)
+    db_session.add(target)
+    db_session.commit()
+    target_id = target.id
+    db_session.add(ORMCampaignSection(title="Already there", content="...", order=0, campaign_id=target_id))
+    db_session.commit()
+
+    sections = [
+        {"title": "Unordered", "content": "c"},
+        {"title": "Second", "content": "b", "order": 5},
+        {"title": "First", "content": "a", "order": 1},
+    ]
+    response = await async_client.post(
+        "/api/v1/import/json_file",
+        files={"file": ("sections.json", json.dumps(sections).encode(), "application/json")},
+        data={"target_campaign_id": str(target_id)}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["updated_campaign_ids"] == [target_id]
+    assert _section_titles(db_session, target_id) == ["Already there", "First", "Second", "Unordered"]
+
+
+@pytest.mark.asyncio
+async def test_json_import_into_another_users_campaign_is_forbidden(async_client: AsyncClient, db_session: Session, current_active_user_override: PydanticUser, another_user: ORMUser):
+    target = ORMCampaign(title="Not mine", owner_id=another_user.id)
+    db_session.add(target)
+    db_session.commit()
+    target_id = target.id
+
+    response = await async_client.post(
+        "/api/v1/import/json_file",
+        files={"file": ("sections.json", json.dumps([{"title": "pwn", "content": "injected"}]).encode(), "application/json")},
+        data={"target_campaign_id": str(target_id)}
+    )
+    assert response.status_code == 403
+    assert _section_titles(db_session, target_id) == []
@@ -153,3 +153,63 @@ async def test_api_create_roll_table_name_conflict_user_and_system(async_client:
     response_user = await async_client.post("/api/v1/roll_tables/", json=table_data_user)
     assert response_user.status_code == 400
     assert "already exists" in response_user.json()["detail"]
+
+# --- Bulk roll endpoint ---
+
+@pytest.mark.asyncio
+async def test_api_bulk_roll_is_repeatable_with_seed(async_client: AsyncClient, current_active_user_override: models.User, db_session: Session):
+    create_db_roll_table(db_session, name="Bulk Weather", user_id=None, items_data=[
+        {"min_roll": 1, "max_roll": 5, "description": "Clear"},
+        {"min_roll": 6, "max_roll": 10, "description": "Storm"},
+    ])
+    create_db_roll_table(db_session, name="Bulk Loot", user_id=None, items_data=[{"min_roll": 1, "max_roll": 10, "description": "System Loot"}])
+    create_db_roll_table(db_session, name="Bulk Loot", user_id=current_active_user_override.id, items_data=[{"min_roll": 1, "max_roll": 10, "description": "My Loot"}])
+
+    request_body = {"table_names": ["Bulk Weather", "Bulk Loot"], "rolls_per_table": 25, "seed": 42}
+    response = await async_client.post("/api/v1/roll_tables/roll", json=request_body)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["seed"] == 42
+    assert [table["table_name"] for table in data["tables"]] == ["Bulk Weather", "Bulk Loot"]
+
+    weather, loot = data["tables"]
+    assert len(weather["results"]) == 25
+    for result in weather["results"]:
+        assert 1 <= result["roll"] <= 10
+        assert result["item"] == ("Clear" if result["roll"] <= 5 else "Storm")
+    # The user's own table shadows the system table with the same name
+    assert {result["item"] for result in loot["results"]} == {"My Loot"}
+
+    repeat = await async_client.post("/api/v1/roll_tables/roll", json=request_body)
+    assert repeat.json() == data
+
+
+@pytest.mark.asyncio
+async def test_api_bulk_roll_reports_missing_tables(async_client: AsyncClient, current_active_user_override: models.User, db_session: Session):
+    create_db_roll_table(db_session, name="Bulk Present", user_id=None)
+
+    response = await async_client.post("/api/v1/roll_tables/roll", json={"table_names": ["Bulk Present", "Nope A", "Nope B"]})
+    assert response.status_code == 404
+    assert "Nope A" in response.json()["detail"] and "Nope B" in response.json()["detail"]
+
+    response = await async_client.post("/api/v1/roll_tables/roll", json={"table_names": ["Bulk Present"], "rolls_per_table": 0})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_api_bulk_roll_sees_table_updates(async_client: AsyncClient, current_active_user_override: models.User, db_session: Session):
+    table = create_db_roll_table(db_session, name="Bulk Mutable", user_id=current_active_user_override.id, items_data=[{"min_roll": 1, "max_roll": 6, "description": "Before"}])
+    request_body = {"table_names": ["Bulk Mutable"], "rolls_per_table": 3}
+
+    first = await async_client.post("/api/v1/roll_tables/roll", json=request_body)
+    assert {result["item"] for result in first.json()["tables"][0]["results"]} == {"Before"}
+
+    # Updating the table invalidates its compiled copy in the catalog
+    update = await async_client.put(f"/api/v1/roll_tables/{table.id}", json={"items": [{"min_roll": 1, "max_roll": 6, "description": "After"}]})
+    assert update.status_code == 200
+    second = await async_client.post("/api/v1/roll_tables/roll", json=request_body)
+    assert {result["item"] for result in second.json()["tables"][0]["results"]} == {"After"}
+
+    names = await async_client.get("/api/v1/random-tables")
+    assert names.status_code == 200
+    assert "Bulk Mutable" not in names.json()["table_names"] # Only system tables are listed there
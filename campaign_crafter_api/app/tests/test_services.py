@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 from app.services.random_table_service import RandomTableService
 from app import models
@@ -245,88 +246,70 @@ async def test_format_campaign_for_homebrewery_back_cover_content():
 def test_service_get_available_table_names_user_priority(random_table_service: RandomTableService, db_mock: MagicMock):
     # Arrange
     user_id = 1
-    system_table_same_name = MagicMock(spec=models.RollTable) # Using models.RollTable as per service type hint
-    system_table_same_name.name = "Duplicate Name Table"
-    system_table_same_name.user_id = None
+    # crud.get_roll_table_names already de-duplicates names shared by a user table and a system table
+    names_from_crud = ["Duplicate Name Table", "Unique System Table"]
 
-    user_table_same_name = MagicMock(spec=models.RollTable)
-    user_table_same_name.name = "Duplicate Name Table"
-    user_table_same_name.user_id = user_id
-
-    another_system_table = MagicMock(spec=models.RollTable)
-    another_system_table.name = "Unique System Table"
-    another_system_table.user_id = None
-
-    # Mock crud.get_roll_tables to return these tables
-    # The service sorts, so the order here shouldn't strictly matter for the test outcome,
-    # but good to have user table after system table with same name to test prioritization.
-    mock_tables_from_crud = [system_table_same_name, user_table_same_name, another_system_table]
-
-    with patch('app.crud.get_roll_tables', return_value=mock_tables_from_crud) as mock_crud_get_tables:
+    with patch('app.services.roll_table_catalog.roll_table_catalog._sync_catalog_version'), \
+         patch('app.crud.get_roll_table_names', return_value=names_from_crud) as mock_crud_get_names:
         # Act
         available_names = random_table_service.get_available_table_names(db=db_mock, user_id=user_id)
+        cached_names = random_table_service.get_available_table_names(db=db_mock, user_id=user_id)
 
         # Assert
-        mock_crud_get_tables.assert_called_once()
-        # Check the call was made with correct arguments (positional, not keyword)
-        call_args = mock_crud_get_tables.call_args
+        mock_crud_get_names.assert_called_once() # The second call is served from the catalog
+        call_args = mock_crud_get_names.call_args
         assert call_args[0][0] == db_mock  # First positional arg is db
-        assert call_args[1]['limit'] == 1000
         assert call_args[1]['user_id'] == user_id
-
-        # Check that "Duplicate Name Table" appears only once
-        assert available_names.count("Duplicate Name Table") == 1
-        # Check that "Unique System Table" is also present
-        assert "Unique System Table" in available_names
-        # Total unique names
-        assert len(available_names) == 2
-        # Ensure the order is not implicitly tested if not guaranteed by the function
-        assert set(available_names) == {"Duplicate Name Table", "Unique System Table"}
+        assert available_names == cached_names == names_from_crud
 
 
 def test_service_get_random_item_from_table_user_priority(random_table_service: RandomTableService, db_mock: MagicMock):
     # Arrange
     user_id = 1
     table_name = "TestTable"
+    user_table_rows = ("d10", [(1, 5, "User Item A"), (6, 10, "User Item B")])
 
-    # This mock will simulate that the user's table is found and returned by CRUD
-    mock_user_table = MagicMock(spec=models.RollTable) # Assuming crud returns ORM model, service handles it
-    mock_user_table.name = table_name
-    mock_user_table.user_id = user_id
-    mock_user_table.description = "d10" # Example for dice roll logic
-
-    # Define some items for the mock table
-    item1 = MagicMock()
-    item1.min_roll = 1
-    item1.max_roll = 5
-    item1.description = "User Item A"
-
-    item2 = MagicMock()
-    item2.min_roll = 6
-    item2.max_roll = 10
-    item2.description = "User Item B"
-    mock_user_table.items = [item1, item2]
-
-    with patch('app.crud.get_roll_table_by_name', return_value=mock_user_table) as mock_crud_get_by_name:
-        # Act
-        # We don't need to check the random selection logic here, just that it called the right crud method
-        # and would operate on the user's table.
-        # To make the test deterministic for item selection, we could mock random.randint
+    with patch('app.services.roll_table_catalog.roll_table_catalog._sync_catalog_version'), \
+         patch('app.crud.get_roll_table_rows', return_value=user_table_rows) as mock_crud_get_rows:
+        # To make the test deterministic for item selection, mock random.randint
         with patch('random.randint', return_value=3) as mock_randint: # Simulate rolling a 3
             item_description = random_table_service.get_random_item_from_table(
                 table_name=table_name, db=db_mock, user_id=user_id
             )
 
             # Assert
-            # Check that crud.get_roll_table_by_name was called with user_id
-            mock_crud_get_by_name.assert_called_once()
-            call_args = mock_crud_get_by_name.call_args
+            # The user's table was found, so the system scope was never queried
+            mock_crud_get_rows.assert_called_once()
+            call_args = mock_crud_get_rows.call_args
             assert call_args[0][0] == db_mock  # First positional arg is db
             assert call_args[1]['name'] == table_name
             assert call_args[1]['user_id'] == user_id
             mock_randint.assert_called_once_with(1, 10) # Based on "d10" description
             assert item_description == "User Item A" # Item for roll 3
 
+
+def test_compiled_roll_table_bisect_lookup():
+    from app.services.roll_table_catalog import CompiledRollTable
+
+    table = CompiledRollTable.compile("Encounters", "d20", [
+        (1, 8, "Goblins"),
+        (6, 12, "Wolves"), # Overlaps Goblins on 6-8; the first listed item keeps those rolls
+        (15, 20, "Dragon"), # 13-14 is a gap
+    ])
+
+    assert table.die_size == 20
+    assert table.lower_bounds == [1, 9, 15]
+    assert table.upper_bounds == [8, 12, 20]
+    assert [table.lookup(roll) for roll in (1, 6, 8, 9, 12, 13, 14, 15, 20)] == [
+        "Goblins", "Goblins", "Goblins", "Wolves", "Wolves", None, None, "Dragon", "Dragon"
+    ]
+
+    # Without a "dX" description the die is the highest max_roll
+    inferred = CompiledRollTable.compile("Loot", "Treasure", [(1, 3, "Copper"), (4, 6, "Silver")])
+    assert inferred.die_size == 6
+    assert CompiledRollTable.compile("Empty", "d6", []).roll() == (None, None)
+
+
 # if __name__ == '__main__':
 #     unittest.main() # Keep if other unittest tests are still relevant
 # Pytest will discover tests without this, so it can be removed if fully on pytest
@@ -519,3 +502,204 @@ async def test_generate_homebrewery_toc_from_sections_none_summary(llm_service:
         current_user=mock_current_user
     )
     assert homebrewery_toc == ""
+
+# Tests for the shared provider availability cache
+from app.services.llm_availability import availability_registry
+from app.core.config import settings as app_settings
+
+@pytest.mark.asyncio
+async def test_openai_is_available_is_cached_per_key(mock_db_session, mock_current_user):
+    service = OpenAILLMService(api_key="sk-test-key-one")
+    service.client.models.list = AsyncMock(return_value=[])
+
+    assert await service.is_available(current_user=mock_current_user, db=mock_db_session) is True
+    assert await service.is_available(current_user=mock_current_user, db=mock_db_session) is True
+    # A second instance with the same key reuses the cached result
+    other_instance = OpenAILLMService(api_key="sk-test-key-one")
+    assert await other_instance.is_available(current_user=mock_current_user, db=mock_db_session) is True
+
+    service.client.models.list.assert_awaited_once()
+
+    # A different key is probed separately
+    different_key = OpenAILLMService(api_key="sk-test-key-two")
+    different_key.client.models.list = AsyncMock(return_value=[])
+    assert await different_key.is_available(current_user=mock_current_user, db=mock_db_session) is True
+    different_key.client.models.list.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_openai_failed_call_invalidates_cached_availability(mock_db_session, mock_current_user):
+    service = OpenAILLMService(api_key="sk-test-key-invalidate")
+    service.client.models.list = AsyncMock(return_value=[])
+    service.client.chat.completions.create = AsyncMock(side_effect=RuntimeError("connection reset"))
+
+    assert await service.is_available(current_user=mock_current_user, db=mock_db_session) is True
+    with pytest.raises(LLMGenerationError):
+        await service._perform_chat_completion("gpt-test", [{"role": "user", "content": "hi"}], 0.5, 10)
+
+    assert availability_registry.get("openai", "sk-test-key-invalidate") is None
+    assert await service.is_available(current_user=mock_current_user, db=mock_db_session) is True
+    assert service.client.models.list.await_count == 2
+
+@pytest.mark.asyncio
+async def test_availability_negative_result_is_cached_until_negative_ttl(mock_db_session, mock_current_user, monkeypatch):
+    service = OpenAILLMService(api_key="sk-test-key-down")
+    service.client.models.list = AsyncMock(side_effect=RuntimeError("provider down"))
+
+    assert await service.is_available(current_user=mock_current_user, db=mock_db_session) is False
+    assert await service.is_available(current_user=mock_current_user, db=mock_db_session) is False
+    service.client.models.list.assert_awaited_once()
+
+    # Once the negative TTL has elapsed the provider is probed again
+    monkeypatch.setattr(app_settings, "LLM_AVAILABILITY_NEGATIVE_TTL_SECONDS", 0)
+    availability_registry.mark_unavailable("openai", "sk-test-key-down")
+    service.client.models.list = AsyncMock(return_value=[])
+    assert await service.is_available(current_user=mock_current_user, db=mock_db_session) is True
+    service.client.models.list.assert_awaited_once()
+
+# Tests for the pooled LLM client registry
+from app.services.llm_client_pool import LLMClientPool, llm_client_pool
+
+def test_llm_services_share_pooled_client_per_key():
+    first = OpenAILLMService(api_key="sk-pool-key-a")
+    second = OpenAILLMService(api_key="sk-pool-key-a")
+    different_key = OpenAILLMService(api_key="sk-pool-key-b")
+
+    assert first.client is second.client
+    assert different_key.client is not first.client
+    assert len(llm_client_pool) == 2
+
+@pytest.mark.asyncio
+async def test_llm_client_pool_retires_evicted_clients_before_closing_them():
+    pool = LLMClientPool(max_size=2, retire_grace_seconds=0.05)
+    clients = {name: MagicMock(aclose=AsyncMock()) for name in ("a", "b", "c")}
+
+    pool.get_or_create("openai", "key-a", None, lambda: clients["a"])
+    in_use = pool.get_or_create("openai", "key-b", None, lambda: clients["b"])
+    # Touch "a" so "b" becomes the least recently used entry
+    assert pool.get_or_create("openai", "key-a", None, lambda: MagicMock()) is clients["a"]
+    pool.get_or_create("openai", "key-c", None, lambda: clients["c"])
+
+    await asyncio.sleep(0)
+    assert len(pool) == 2
+    assert pool.retiring_count == 1
+    # "b" is evicted while a caller still holds it, so it stays open during the grace period
+    in_use.aclose.assert_not_awaited()
+
+    await asyncio.sleep(0.1)
+    clients["b"].aclose.assert_awaited_once()
+    assert pool.retiring_count == 0
+    clients["a"].aclose.assert_not_awaited()
+
+    await pool.aclose_all()
+    assert len(pool) == 0
+    for name in ("a", "b", "c"):
+        clients[name].aclose.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_llm_client_pool_closes_retiring_clients_on_shutdown():
+    pool = LLMClientPool(max_size=1, retire_grace_seconds=3600)
+    evicted = MagicMock(aclose=AsyncMock())
+    pool.get_or_create("openai", "key-a", None, lambda: evicted)
+    pool.get_or_create("openai", "key-b", None, lambda: MagicMock(aclose=AsyncMock()))
+    assert pool.retiring_count == 1
+
+    await pool.aclose_all()
+    evicted.aclose.assert_awaited_once()
+    assert pool.retiring_count == 0
+
+@pytest.mark.asyncio
+@patch('app.services.gemini_service.genai.Client')
+async def test_gemini_generate_text_does_not_block_event_loop(mock_client_class, mock_db_session, mock_current_user):
+    import time
+
+    def blocking_generate_content(**kwargs):
+        time.sleep(0.2) # The sync SDK call blocks the whole loop
+        return MagicMock(text="sync")
+
+    async def non_blocking_generate_content(**kwargs):
+        await asyncio.sleep(0.2)
+        return MagicMock(text="async")
+
+    mock_client = MagicMock()
+    mock_client.models.generate_content.side_effect = blocking_generate_content
+    mock_client.aio.models.generate_content = AsyncMock(side_effect=non_blocking_generate_content)
+    mock_client.aio.models.get = AsyncMock(return_value=MagicMock())
+    mock_client_class.return_value = mock_client
+
+    service = GeminiLLMService(api_key="gemini-test-key")
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*[
+        service.generate_text(prompt=f"prompt {i}", current_user=mock_current_user, db=mock_db_session)
+        for i in range(3)
+    ])
+    elapsed = time.perf_counter() - started
+
+    assert results == ["async", "async", "async"]
+    # Three 0.2s calls overlap instead of running back to back
+    assert elapsed < 0.45
+    mock_client.models.generate_content.assert_not_called()
+
+# Tests for token streaming
+from types import SimpleNamespace
+
+def _openai_stream_chunk(content):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+async def _async_iter(items):
+    for item in items:
+        yield item
+
+@pytest.mark.asyncio
+async def test_openai_stream_text_yields_deltas(mock_db_session, mock_current_user):
+    service = OpenAILLMService(api_key="sk-test-key-stream")
+    service.client.models.list = AsyncMock(return_value=[])
+    chunks = [_openai_stream_chunk("The "), _openai_stream_chunk(None), _openai_stream_chunk("tavern"), _openai_stream_chunk(" burns.")]
+    service.client.chat.completions.create = AsyncMock(return_value=_async_iter(chunks))
+
+    deltas = [delta async for delta in service.stream_text(prompt="Describe the tavern.", current_user=mock_current_user, db=mock_db_session, model="gpt-test")]
+
+    assert deltas == ["The ", "tavern", " burns."]
+    assert service.client.chat.completions.create.call_args.kwargs["stream"] is True
+
+@pytest.mark.asyncio
+async def test_openai_stream_without_content_raises(mock_db_session, mock_current_user):
+    service = OpenAILLMService(api_key="sk-test-key-stream-empty")
+    service.client.models.list = AsyncMock(return_value=[])
+    service.client.chat.completions.create = AsyncMock(return_value=_async_iter([_openai_stream_chunk(None)]))
+
+    with pytest.raises(LLMGenerationError):
+        async for _ in service.stream_text(prompt="Describe the tavern.", current_user=mock_current_user, db=mock_db_session):
+            pass
+
+@pytest.mark.asyncio
+@patch('app.services.gemini_service.genai.Client')
+async def test_gemini_stream_text_yields_deltas(mock_client_class, mock_db_session, mock_current_user):
+    mock_client = MagicMock()
+    mock_client.aio.models.get = AsyncMock(return_value=MagicMock())
+    mock_client.aio.models.generate_content_stream = AsyncMock(
+        return_value=_async_iter([MagicMock(text="Dragons "), MagicMock(text=""), MagicMock(text="sleep.")])
+    )
+    mock_client_class.return_value = mock_client
+
+    service = GeminiLLMService(api_key="gemini-stream-key")
+    deltas = [delta async for delta in service.stream_text(prompt="Tell me.", current_user=mock_current_user, db=mock_db_session)]
+
+    assert deltas == ["Dragons ", "sleep."]
+
+@pytest.mark.asyncio
+async def test_default_stream_section_content_yields_full_text_once(llm_service: LLMService, mock_db_session: Session, mock_current_user: UserModel):
+    campaign = MagicMock(spec=Campaign)
+    campaign.id = 7
+    campaign.concept = "A haunted lighthouse"
+    campaign.characters = []
+
+    deltas = [
+        delta async for delta in llm_service.stream_section_content(
+            db_campaign=campaign, db=mock_db_session, current_user=mock_current_user,
+            existing_sections_summary=None, section_creation_prompt=None, section_title_suggestion="The Keeper"
+        )
+    ]
+
+    assert len(deltas) == 1
+    assert "A haunted lighthouse" in deltas[0]
@@ -0,0 +1,123 @@
+import pytest
+from io import BytesIO
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.services.image_generation_service import ImageGenerationService
+from app.services.storage_backend import (
+    AzureBlobStorageBackend,
+    LocalFileStorageBackend,
+    get_storage_backend,
+    set_storage_backend,
+)
+
+
+@pytest.fixture
+def local_backend(tmp_path):
+    backend = LocalFileStorageBackend(root=str(tmp_path), base_url="/static/generated_images/")
+    set_storage_backend(backend)
+    return backend
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_local_backend_upload_list_delete(local_backend, tmp_path):
+    url = await local_backend.upload("user_uploads/1/campaigns/5/files/a.png", b"png-bytes", "image/png")
+    await local_backend.upload("user_uploads/1/campaigns/5/files/b.webp", _chunks(b"web", b"p"), "image/webp")
+    await local_backend.upload("user_uploads/1/campaigns/6/files/c.png", b"other", "image/png")
+
+    assert url == "/static/generated_images/user_uploads/1/campaigns/5/files/a.png"
+    assert (tmp_path / "user_uploads/1/campaigns/5/files/b.webp").read_bytes() == b"webp"
+
+    files = await local_backend.list("user_uploads/1/campaigns/5/")
+    assert [f.blob_name for f in files] == [
+        "user_uploads/1/campaigns/5/files/a.png",
+        "user_uploads/1/campaigns/5/files/b.webp",
+    ]
+    assert files[0].size == len(b"png-bytes")
+    assert files[0].content_type == "image/png"
+
+    assert await local_backend.delete("user_uploads/1/campaigns/5/files/a.png") is True
+    assert await local_backend.delete("user_uploads/1/campaigns/5/files/a.png") is False
+    assert len(await local_backend.list("user_uploads/1/campaigns/5/")) == 1
+
+
+@pytest.mark.asyncio
+async def test_local_backend_rejects_paths_outside_root(local_backend):
+    with pytest.raises(ValueError):
+        await local_backend.upload("../escape.png", b"x", "image/png")
+
+
+def test_blob_name_from_url_round_trips():
+    local = LocalFileStorageBackend(root="/tmp/unused", base_url="/static/generated_images/")
+    blob_name = "user_uploads/1/general/files/x.png"
+    assert local.blob_name_from_url(local.url_for(blob_name)) == blob_name
+    assert local.blob_name_from_url("https://example.com/elsewhere/x.png") is None
+    # Same path on another host does not belong to the backend
+    assert local.blob_name_from_url(f"https://example.com{local.url_for(blob_name)}") is None
+
+    azure = AzureBlobStorageBackend()
+    url = f"https://acct.blob.core.windows.net/{settings.AZURE_STORAGE_CONTAINER_NAME}/{blob_name}"
+    with patch.object(settings, 'AZURE_STORAGE_ACCOUNT_NAME', 'acct'):
+        assert azure.blob_name_from_url(url) == blob_name
+        assert azure.blob_name_from_url(url.replace("acct.blob.core.windows.net", "any-host")) is None
+        assert azure.blob_name_from_url(url.replace("https://", "http://")) is None
+
+
+@pytest.mark.asyncio
+@patch('app.services.storage_backend.AsyncBlobServiceClient')
+async def test_azure_backend_reuses_one_client(mock_blob_service_client_class):
+    mock_bsc_instance = MagicMock()
+    mock_blob_client = MagicMock()
+    mock_blob_client.upload_blob = AsyncMock()
+    mock_blob_client.delete_blob = AsyncMock()
+    mock_blob_service_client_class.from_connection_string.return_value = mock_bsc_instance
+    mock_bsc_instance.get_blob_client.return_value = mock_blob_client
+
+    original_conn_str = settings.AZURE_STORAGE_CONNECTION_STRING
+    settings.AZURE_STORAGE_CONNECTION_STRING = "DefaultEndpointsProtocol=https;AccountName=test;AccountKey=key;EndpointSuffix=core.windows.net"
+    try:
+        backend = AzureBlobStorageBackend()
+        await backend.upload("a.png", b"a", "image/png")
+        await backend.upload("b.png", b"b", "image/png")
+        await backend.delete("a.png")
+        mock_blob_service_client_class.from_connection_string.assert_called_once()
+        assert mock_blob_client.upload_blob.await_count == 2
+    finally:
+        settings.AZURE_STORAGE_CONNECTION_STRING = original_conn_str
+
+
+@pytest.mark.asyncio
+async def test_image_service_saves_to_local_backend(local_backend, tmp_path):
+    db = MagicMock()
+    url = await ImageGenerationService()._save_image_and_log_db(
+        prompt="a castle", model_used="test", size_used="1024x1024", db=db,
+        image_bytes=b"castle", user_id=3, campaign_id=9
+    )
+    blob_name = local_backend.blob_name_from_url(url)
+    assert blob_name.startswith("user_uploads/3/campaigns/9/files/")
+    assert (tmp_path / blob_name).read_bytes() == b"castle"
+
+    files = await ImageGenerationService().list_campaign_files(user_id=3, campaign_id=9)
+    assert [f.blob_name for f in files] == [blob_name]
+    await ImageGenerationService().delete_image_from_blob_storage(blob_name)
+    assert not (tmp_path / blob_name).exists()
+
+
+@pytest.mark.asyncio
+async def test_upload_image_endpoint_uses_local_backend(local_backend, tmp_path, current_active_user_override, async_client: AsyncClient):
+    response = await async_client.post(
+        "/api/v1/files/upload_image",
+        files={"file": ("portrait.png", BytesIO(b"portrait-bytes"), "image/png")}
+    )
+    assert response.status_code == 200, response.text
+    image_url = response.json()["imageUrl"]
+    assert image_url.startswith("/static/generated_images/user_uploads/")
+    assert get_storage_backend() is local_backend
+    assert (tmp_path / local_backend.blob_name_from_url(image_url)).read_bytes() == b"portrait-bytes"
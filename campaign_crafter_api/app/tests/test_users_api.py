@@ -25,6 +25,24 @@ async def test_create_user_success_as_superuser(async_client: AsyncClient, super
     assert data["email"] == "newuser@example.com"
     assert "hashed_password" not in data
 
+@pytest.mark.asyncio
+async def test_create_user_hashes_on_the_password_pool(async_client: AsyncClient, superuser_auth_headers: dict):
+    import threading
+    from unittest.mock import patch
+    from app.services.password_hasher import password_hasher
+
+    hashing_threads = []
+    original_hash = password_hasher.hash
+    def recording_hash(password):
+        hashing_threads.append(threading.current_thread().name)
+        return original_hash(password)
+
+    user_data = {"username": "pooleduser", "email": "pooled@example.com", "password": "password123"}
+    with patch.object(password_hasher, "hash", side_effect=recording_hash):
+        response = await async_client.post("/api/v1/users/", json=user_data, headers=superuser_auth_headers)
+    assert response.status_code == 201, response.text
+    assert len(hashing_threads) == 1 and hashing_threads[0].startswith("password-hash")
+
 @pytest.mark.asyncio
 async def test_create_user_duplicate_email_as_superuser(async_client: AsyncClient, superuser_auth_headers: dict):
     user_data1 = {